@@ -4,8 +4,10 @@ Artifact Manager - Helper and utility functions for BlazeMeter session artifact
 
 This module provides:
 - Session manifest management (create, load, save)
-- JTL file concatenation with header deduplication
-- Artifact ZIP download with built-in retry logic
+- JTL file concatenation with header deduplication, either from extracted
+  files or streamed straight out of the session ZIP
+- Artifact ZIP download with built-in retry logic, streamed to disk through
+  an optionally shared (pooled) HTTP client
 
 These helpers are consumed by the core orchestration function `session_artifact_processor`
 in blazemeter_api.py.
@@ -13,6 +15,8 @@ in blazemeter_api.py.
 import os
 import json
 import asyncio
+import shutil
+import zipfile
 import httpx
 from datetime import datetime, timezone
 from typing import Optional, Union
@@ -22,6 +26,7 @@ from utils.config import (
     get_artifact_download_max_retries,
     get_artifact_download_retry_delay,
 )
+from utils.jtl_cache import append_jtl_cache
 
 # Load config at module level (same pattern as blazemeter_api.py)
 config = load_config()
@@ -29,6 +34,20 @@ artifacts_base = config['artifacts']['artifacts_path']
 
 MANIFEST_FILENAME = "session_manifest.json"
 
+# Bytes read per chunk when streaming an artifact ZIP to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Bytes read per block when streaming a ZIP member into the combined CSV
+STREAM_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Line terminator append_jtl_to_csv's text-mode copy writes
+_NEWLINE = os.linesep.encode()
+
+_MINIMAL_DOWNLOAD_HEADERS = {
+    "Accept": "*/*",
+    "User-Agent": "Mozilla/5.0 (compatible; BlazeMeter-MCP/1.0)",
+}
+
 
 # ===============================================
 # Session Manifest Helpers
@@ -148,10 +167,182 @@ def append_jtl_to_csv(jtl_path: str, csv_path: str, is_first: bool = False) -> i
     return row_count
 
 
+# ===============================================
+# Streaming ZIP -> CSV Helpers
+# ===============================================
+
+def find_zip_member(zf: zipfile.ZipFile, filename: str) -> Optional[str]:
+    """
+    Returns the top-level ZIP member named `filename` (case-insensitive),
+    i.e. the file extraction would have put directly in the artifacts folder.
+    """
+    target = filename.lower()
+    for name in zf.namelist():
+        if "/" not in name and name.lower() == target:
+            return name
+    return None
+
+
+def copy_zip_member(zf: zipfile.ZipFile, member: str, dest_path: str) -> None:
+    """Copies one ZIP member to dest_path without extracting anything else."""
+    with zf.open(member) as src, open(dest_path, "wb") as dest:
+        shutil.copyfileobj(src, dest, STREAM_BLOCK_SIZE)
+
+
+class _JtlMemberTee:
+    """
+    Binary reader over a JTL member that copies everything it reads into the
+    combined CSV, with the same newline translation and header skipping as
+    append_jtl_to_csv. read() hands back the raw bytes so a second consumer
+    (the columnar cache) can parse the member in the same pass.
+    """
+
+    def __init__(self, src, dest, skip_header: bool):
+        self._src = src
+        self._dest = dest
+        self._skip_header = skip_header
+        self._pending_cr = False
+        self._last = b""
+        self.lines = 0
+        self.closed = False
+
+    def read(self, size: int = -1) -> bytes:
+        raw = self._src.read(size if size and size > 0 else STREAM_BLOCK_SIZE)
+        self._copy(raw)
+        return raw
+
+    def drain(self) -> None:
+        while self.read(STREAM_BLOCK_SIZE):
+            pass
+
+    @property
+    def rows(self) -> int:
+        """Data rows copied so far (lines after the header)."""
+        lines = self.lines + (1 if self._last not in (b"", b"\n") else 0)
+        return max(0, lines - 1)
+
+    @property
+    def ends_with_newline(self) -> bool:
+        return self._last in (b"", b"\n")
+
+    def _copy(self, raw: bytes) -> None:
+        data = raw
+        if self._pending_cr:
+            data = b"\r" + data
+            self._pending_cr = False
+        if raw and data.endswith(b"\r"):
+            # "\r\n" may be split across blocks; decide with the next one
+            data = data[:-1]
+            self._pending_cr = True
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        if not data:
+            return
+
+        self.lines += data.count(b"\n")
+        self._last = data[-1:]
+
+        if self._skip_header:
+            newline = data.find(b"\n")
+            if newline < 0:
+                return
+            data = data[newline + 1:]
+            self._skip_header = False
+        if _NEWLINE != b"\n":
+            data = data.replace(b"\n", _NEWLINE)
+        if data:
+            self._dest.write(data)
+
+
+def stream_jtl_member_to_csv(
+    zf: zipfile.ZipFile,
+    member: str,
+    csv_path: str,
+    is_first: bool = False,
+    cache_state: Optional[dict] = None,
+) -> dict:
+    """
+    Appends a kpi.jtl member of a session ZIP to the combined test-results.csv
+    in binary blocks, without extracting it. Produces the same bytes and row
+    count as extracting the member and calling append_jtl_to_csv.
+
+    If `cache_state` (from utils.jtl_cache.open_jtl_cache_writer) is given,
+    the rows are also parsed into the columnar sidecar from the same read.
+
+    Args:
+        zf: Open session ZIP.
+        member: Name of the JTL member (see find_zip_member).
+        csv_path: Path to the destination test-results.csv.
+        is_first: Whether this is the first session being written (include header).
+        cache_state: Optional columnar sidecar writer state.
+
+    Returns:
+        dict with keys:
+            - "rows": number of data rows written (excludes header)
+            - "ends_with_newline": False if the member's last line is unterminated
+            - "cache_error": why the sidecar could not be fed (None if fine or unused)
+    """
+    cache_error = None
+    mode = "wb" if is_first else "ab"
+    with zf.open(member) as src, open(csv_path, mode) as dest:
+        tee = _JtlMemberTee(src, dest, skip_header=not is_first)
+        # An empty member has no rows for the cache (and pyarrow rejects it)
+        if cache_state is not None and zf.getinfo(member).file_size > 0:
+            try:
+                append_jtl_cache(cache_state, tee)
+            except Exception as e:
+                cache_error = str(e)
+        tee.drain()
+
+    return {
+        "rows": tee.rows,
+        "ends_with_newline": tee.ends_with_newline,
+        "cache_error": cache_error,
+    }
+
+
 # ===============================================
 # Download with Retry
 # ===============================================
 
+def create_download_client(
+    ssl_verify_setting: Union[str, bool] = False,
+    max_connections: int = 4,
+) -> httpx.AsyncClient:
+    """
+    Creates an HTTP client whose connection pool is shared by concurrent
+    session downloads (and their BlazeMeter API lookups).
+
+    Args:
+        ssl_verify_setting: SSL verification setting (False to disable, str for CA bundle path).
+        max_connections: Pool size; match it to the number of concurrent sessions.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+    return httpx.AsyncClient(verify=ssl_verify_setting, limits=limits)
+
+
+async def _stream_to_file(client: httpx.AsyncClient, url: str, headers: dict, dest_path: str) -> None:
+    """
+    Streams a GET response to dest_path in chunks. The body is written to
+    a .part file first, so an interrupted download never leaves a truncated
+    ZIP at dest_path.
+    """
+    part_path = f"{dest_path}.part"
+    try:
+        async with client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            with open(part_path, "wb") as f:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(part_path, dest_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
 async def download_with_retry(
     artifact_zip_url: str,
     dest_path: str,
@@ -160,23 +351,28 @@ async def download_with_retry(
     max_retries: int = None,
     retry_delay: int = None,
     ctx=None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> dict:
     """
     Downloads an artifact ZIP file with built-in retry logic.
 
     Uses a two-tier header strategy: first tries minimal headers (like a browser),
     then falls back to BlazeMeter auth headers if the first attempt fails.
+    The response is streamed to disk in chunks rather than held in memory.
 
     Args:
         artifact_zip_url: Signed S3 URL for the artifacts.zip download.
         dest_path: Local file path to write the downloaded ZIP to.
         ssl_verify_setting: SSL verification setting (False to disable, str for CA bundle path).
+            Only used when no client is passed.
         auth_headers_func: Callable that returns BlazeMeter auth headers dict.
             Signature: auth_headers_func(extra: dict = None) -> dict.
             Passed from blazemeter_api.get_headers to avoid circular imports.
         max_retries: Max download attempts. Defaults to config value or 3.
         retry_delay: Seconds between retries. Defaults to config value or 2.
         ctx: FastMCP context for logging (optional).
+        client: Shared client from create_download_client (optional). Without
+            one, a client is created for this download and reused across attempts.
 
     Returns:
         dict with keys:
@@ -192,40 +388,37 @@ async def download_with_retry(
 
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            async with httpx.AsyncClient(verify=ssl_verify_setting) as client:
-                minimal_headers = {
-                    "Accept": "*/*",
-                    "User-Agent": "Mozilla/5.0 (compatible; BlazeMeter-MCP/1.0)",
-                }
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(verify=ssl_verify_setting)
+
+    try:
+        for attempt in range(1, max_retries + 1):
+            try:
                 # First try: minimal headers (works for signed S3 URLs)
                 try:
-                    response = await client.get(artifact_zip_url, headers=minimal_headers)
-                    response.raise_for_status()
+                    await _stream_to_file(client, artifact_zip_url, _MINIMAL_DOWNLOAD_HEADERS, dest_path)
                 except Exception:
                     # Fallback: BlazeMeter auth headers
                     if auth_headers_func:
-                        response = await client.get(
-                            artifact_zip_url,
-                            headers=auth_headers_func({"Accept": "*/*"}),
+                        await _stream_to_file(
+                            client, artifact_zip_url, auth_headers_func({"Accept": "*/*"}), dest_path,
                         )
-                        response.raise_for_status()
                     else:
                         raise
 
-                with open(dest_path, "wb") as f:
-                    f.write(response.content)
-
                 if ctx:
                     await ctx.info(f"Download succeeded on attempt {attempt}: {os.path.basename(dest_path)}")
                 return {"status": "completed", "path": dest_path, "attempts": attempt}
 
-        except Exception as e:
-            if ctx:
-                await ctx.warning(f"Download attempt {attempt}/{max_retries} failed: {e}")
-            if attempt < max_retries:
-                await asyncio.sleep(retry_delay)
+            except Exception as e:
+                if ctx:
+                    await ctx.warning(f"Download attempt {attempt}/{max_retries} failed: {e}")
+                if attempt < max_retries:
+                    await asyncio.sleep(retry_delay)
+    finally:
+        if own_client:
+            await client.aclose()
 
     return {
         "status": "failed",
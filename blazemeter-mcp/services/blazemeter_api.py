@@ -1,5 +1,6 @@
 # services/blazemeter_api.py
 import os
+import asyncio
 import httpx
 import base64
 import time
@@ -11,11 +12,16 @@ from datetime import datetime
 from typing import Dict, Any, List, Union
 from dotenv import load_dotenv
 from fastmcp import FastMCP, Context        # ✅ FastMCP 3.x import
-from utils.config import load_config, get_cleanup_session_folders, get_shared_folder_allowed_extensions
+from utils.config import (
+    load_config, get_cleanup_session_folders, get_shared_folder_allowed_extensions,
+    get_artifact_download_concurrency, get_artifact_merge_mode,
+)
+from utils.jtl_cache import open_jtl_cache_writer, close_jtl_cache_writer
 from utils.file_utils import write_public_report_json
 from services.artifact_manager import (
     get_manifest_path, load_manifest, save_manifest, create_manifest,
-    append_jtl_to_csv, download_with_retry,
+    append_jtl_to_csv, download_with_retry, create_download_client,
+    find_zip_member, copy_zip_member, stream_jtl_member_to_csv,
 )
 
 # Load environment variables from .env file such as API keys and secrets
@@ -435,25 +441,31 @@ async def get_session_artifacts(session_id: str, ctx: Context) -> dict:
     Returns:
         Dict mapping each filename to its downloadable URL (dataUrl). Updates context with file list if present.
     """
-    url = f"{BLAZEMETER_API_BASE}/sessions/{session_id}/reports/logs"
     verify_ssl = get_ssl_verify_setting()
     async with httpx.AsyncClient(verify=verify_ssl) as client:
-        resp = await client.get(url, headers=get_headers())
-        resp.raise_for_status()
-        result = resp.json().get("result", {})
-        files = {}
-        for item in result.get("data", []):
-            filename = item.get("filename")
-            data_url = item.get("dataUrl")
-            if filename and data_url:
-                files[filename] = data_url
-            if filename and filename.lower() == "artifacts.zip":
-                await ctx.set_state("artifact_zip_url", data_url)
-                await ctx.set_state("artifact_zip_filename", filename)
-        if ctx is not None:
-            await ctx.set_state("artifact_file_list", files)
-            await ctx.set_state("artifact_file_session_id", session_id)
-        return files if files else {"message": "No files found in this session's logs report."}
+        files = await fetch_session_log_files(client, session_id)
+    for filename, data_url in files.items():
+        if filename.lower() == "artifacts.zip":
+            await ctx.set_state("artifact_zip_url", data_url)
+            await ctx.set_state("artifact_zip_filename", filename)
+    if ctx is not None:
+        await ctx.set_state("artifact_file_list", files)
+        await ctx.set_state("artifact_file_session_id", session_id)
+    return files if files else {"message": "No files found in this session's logs report."}
+
+async def fetch_session_log_files(client: httpx.AsyncClient, session_id: str) -> dict:
+    """Returns {filename: dataUrl} from a session's logs report, using the given client."""
+    url = f"{BLAZEMETER_API_BASE}/sessions/{session_id}/reports/logs"
+    resp = await client.get(url, headers=get_headers())
+    resp.raise_for_status()
+    result = resp.json().get("result", {})
+    files = {}
+    for item in result.get("data", []):
+        filename = item.get("filename")
+        data_url = item.get("dataUrl")
+        if filename and data_url:
+            files[filename] = data_url
+    return files
 
 async def download_artifact_zip_file(artifact_zip_url: str, run_id: str, ctx: Context) -> str:
     """
@@ -578,6 +590,152 @@ async def process_extracted_artifact_files(run_id: str, extracted_files: list, c
 # Session Artifact Processor (Composite)
 # ===============================================
 
+def _extract_session_zip(zip_path: str, extract_dir: str) -> int:
+    """Extracts a session's artifacts.zip; returns the number of entries."""
+    os.makedirs(extract_dir, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        zf.extractall(extract_dir)
+        return len(zf.namelist())
+
+
+def _count_zip_members(zip_path: str) -> int:
+    """Opens a session's artifacts.zip (validating its directory) without extracting it."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        return len(zf.namelist())
+
+
+def _read_zip_jtl_header(zip_path: str) -> list:
+    """Column names from the first line of a session ZIP's kpi.jtl ([] if absent)."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        member = find_zip_member(zf, "kpi.jtl")
+        if member is None:
+            return []
+        with zf.open(member) as f:
+            first_line = f.readline().decode("utf-8", errors="replace")
+    return next(csv.reader([first_line]), [])
+
+
+async def _download_and_extract_session(
+    client: httpx.AsyncClient,
+    run_id: str,
+    manifest: dict,
+    session_key: str,
+    session_id: str,
+    session_dir: str,
+    max_retries: int,
+    retry_delay: int,
+    merge_mode: str,
+    ctx: Context,
+) -> bool:
+    """
+    Runs the download and extract stages for one session, recording each
+    stage in the manifest. Returns True when the session is ready to process.
+    """
+    session_data = manifest["sessions"].get(session_key, {})
+    os.makedirs(session_dir, exist_ok=True)
+
+    # ---- STAGE 1: Download ----
+    dl_stage = session_data.get("stages", {}).get("download", {})
+    zip_path = os.path.join(session_dir, "artifacts.zip")
+
+    if dl_stage.get("status") != "completed":
+        await ctx.info(f"Downloading artifacts for {session_key} ({session_id})...")
+        manifest["sessions"][session_key]["status"] = "downloading"
+        manifest["sessions"][session_key]["stages"]["download"]["status"] = "in_progress"
+        save_manifest(run_id, manifest)
+
+        # Get artifact file list for this session
+        try:
+            files = await fetch_session_log_files(client, session_id)
+            lookup_error = None
+        except Exception as e:
+            files = {}
+            lookup_error = f"Could not list artifacts for session {session_id}: {e}"
+        artifact_zip_url = next(
+            (url for name, url in files.items() if name.lower() == "artifacts.zip"), None
+        )
+
+        if not artifact_zip_url:
+            manifest["sessions"][session_key]["status"] = "failed"
+            manifest["sessions"][session_key]["stages"]["download"] = {
+                "status": "failed", "attempts": 0,
+                "error": lookup_error or f"No artifacts.zip URL found for session {session_id}",
+            }
+            save_manifest(run_id, manifest)
+            await ctx.error(f"No artifacts.zip URL for {session_key}")
+            return False
+
+        dl_result = await download_with_retry(
+            artifact_zip_url=artifact_zip_url,
+            dest_path=zip_path,
+            auth_headers_func=get_headers,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            ctx=ctx,
+            client=client,
+        )
+        manifest["sessions"][session_key]["stages"]["download"] = {
+            "status": dl_result["status"],
+            "file": zip_path if dl_result["status"] == "completed" else None,
+            "attempts": dl_result["attempts"],
+            "error": dl_result.get("error"),
+        }
+        if dl_result["status"] == "failed":
+            manifest["sessions"][session_key]["status"] = "failed"
+            save_manifest(run_id, manifest)
+            await ctx.error(f"Download failed for {session_key}: {dl_result['error']}")
+            return False
+        save_manifest(run_id, manifest)
+
+    # ---- STAGE 2: Extract ----
+    ext_stage = session_data.get("stages", {}).get("extract", {})
+    extract_dir = os.path.join(session_dir, "artifacts")
+
+    if ext_stage.get("status") != "completed":
+        manifest["sessions"][session_key]["status"] = "extracting"
+        manifest["sessions"][session_key]["stages"]["extract"]["status"] = "in_progress"
+        save_manifest(run_id, manifest)
+
+        try:
+            # Off the event loop, so other sessions keep downloading meanwhile
+            if merge_mode == "stream":
+                # Nothing is extracted; the process stage reads members from the ZIP
+                file_count = await asyncio.to_thread(_count_zip_members, zip_path)
+            else:
+                file_count = await asyncio.to_thread(_extract_session_zip, zip_path, extract_dir)
+            manifest["sessions"][session_key]["stages"]["extract"] = {
+                "status": "completed", "file_count": file_count, "mode": merge_mode,
+            }
+            save_manifest(run_id, manifest)
+        except Exception as e:
+            manifest["sessions"][session_key]["status"] = "failed"
+            manifest["sessions"][session_key]["stages"]["extract"] = {
+                "status": "failed", "error": str(e),
+            }
+            save_manifest(run_id, manifest)
+            await ctx.error(f"Extraction failed for {session_key}: {e}")
+            return False
+
+    return True
+
+
+async def _reset_jtl_cache_writer(ctx: Context, cache_state, csv_path: str = None, zip_path: str = None):
+    """
+    Discards any open columnar cache writer and, when csv_path is given,
+    opens a new one using the header of the session ZIP's kpi.jtl.
+    """
+    if cache_state is not None:
+        await asyncio.to_thread(close_jtl_cache_writer, cache_state, False)
+    if csv_path is None:
+        return None
+    try:
+        header = await asyncio.to_thread(_read_zip_jtl_header, zip_path)
+        return open_jtl_cache_writer(csv_path, header)
+    except Exception as e:
+        await ctx.warning(f"Skipping columnar cache for {os.path.basename(csv_path)}: {e}")
+        return None
+
+
 async def session_artifact_processor(
     run_id: str,
     sessions_id: list,
@@ -590,6 +748,16 @@ async def session_artifact_processor(
     Supports idempotent re-runs using a session manifest -- if called again after a
     partial failure, it skips already-completed sessions and retries only the failed ones.
 
+    Up to `artifact_download_concurrency` sessions are downloaded and extracted at
+    once over one pooled HTTP client. The process stage (log copy + JTL append)
+    runs in session order as sessions become ready, so the combined CSV is the
+    same as with sequential processing.
+
+    With `artifact_merge_mode: "stream"`, ZIPs are not extracted: jmeter.log and
+    kpi.jtl are streamed straight out of each ZIP, and when every session is
+    merged in one call the JTL columnar cache (test-results.csv.parquet) is
+    written in the same pass.
+
     Args:
         run_id: BlazeMeter run/master ID.
         sessions_id: List of session IDs from get_run_results (sessionsId field).
@@ -603,6 +771,8 @@ async def session_artifact_processor(
     # Load config values (with defaults)
     max_retries = bz_config.get("artifact_download_max_retries", 3)
     retry_delay = bz_config.get("artifact_download_retry_delay", 2)
+    concurrency = get_artifact_download_concurrency(config)
+    merge_mode = get_artifact_merge_mode(config)
     cleanup = get_cleanup_session_folders(config)
 
     dest_folder = os.path.join(artifacts_base, str(run_id), "blazemeter")
@@ -621,150 +791,160 @@ async def session_artifact_processor(
     else:
         await ctx.info(f"Resuming from existing manifest. {total_sessions} session(s).")
 
-    # --- Process each session ---
-    for i, session_id in enumerate(sessions_id, start=1):
-        session_key = f"session-{i}"
-        session_data = manifest["sessions"].get(session_key, {})
-
-        # Skip completed sessions
-        if session_data.get("status") == "completed":
-            continue
-
-        session_dir = os.path.join(sessions_folder, session_key)
-        os.makedirs(session_dir, exist_ok=True)
-
-        # ---- STAGE 1: Download ----
-        dl_stage = session_data.get("stages", {}).get("download", {})
-        zip_path = os.path.join(session_dir, "artifacts.zip")
-
-        if dl_stage.get("status") != "completed":
-            await ctx.info(f"Downloading artifacts for {session_key} ({session_id})...")
-            manifest["sessions"][session_key]["status"] = "downloading"
-            manifest["sessions"][session_key]["stages"]["download"]["status"] = "in_progress"
-            save_manifest(run_id, manifest)
-
-            # Get artifact file list for this session
-            await get_session_artifacts(session_id, ctx)
-            artifact_zip_url = (await ctx.get_state("artifact_zip_url")) if ctx else None
-
-            if not artifact_zip_url:
-                manifest["sessions"][session_key]["status"] = "failed"
-                manifest["sessions"][session_key]["stages"]["download"] = {
-                    "status": "failed", "attempts": 0,
-                    "error": f"No artifacts.zip URL found for session {session_id}",
-                }
-                save_manifest(run_id, manifest)
-                await ctx.error(f"No artifacts.zip URL for {session_key}")
-                continue
+    # --- Download + extract sessions concurrently ---
+    semaphore = asyncio.Semaphore(concurrency)
 
-            dl_result = await download_with_retry(
-                artifact_zip_url=artifact_zip_url,
-                dest_path=zip_path,
-                ssl_verify_setting=get_ssl_verify_setting(),
-                auth_headers_func=get_headers,
-                max_retries=max_retries,
-                retry_delay=retry_delay,
-                ctx=ctx,
+    async def _fetch(session_key: str, session_id: str) -> bool:
+        async with semaphore:
+            return await _download_and_extract_session(
+                client, run_id, manifest, session_key, session_id,
+                os.path.join(sessions_folder, session_key),
+                max_retries, retry_delay, merge_mode, ctx,
             )
-            manifest["sessions"][session_key]["stages"]["download"] = {
-                "status": dl_result["status"],
-                "file": zip_path if dl_result["status"] == "completed" else None,
-                "attempts": dl_result["attempts"],
-                "error": dl_result.get("error"),
-            }
-            if dl_result["status"] == "failed":
-                manifest["sessions"][session_key]["status"] = "failed"
-                save_manifest(run_id, manifest)
-                await ctx.error(f"Download failed for {session_key}: {dl_result['error']}")
-                continue
-        # ---- STAGE 2: Extract ----
-        ext_stage = session_data.get("stages", {}).get("extract", {})
-        extract_dir = os.path.join(session_dir, "artifacts")
 
-        if ext_stage.get("status") != "completed":
-            manifest["sessions"][session_key]["status"] = "extracting"
-            manifest["sessions"][session_key]["stages"]["extract"]["status"] = "in_progress"
-            save_manifest(run_id, manifest)
+    # Columnar cache writer for a CSV started from scratch in stream mode
+    cache_state = None
+    cache_unterminated = False
 
-            try:
-                os.makedirs(extract_dir, exist_ok=True)
-                with zipfile.ZipFile(zip_path, "r") as zf:
-                    zf.extractall(extract_dir)
-                    file_count = len(zf.namelist())
-                manifest["sessions"][session_key]["stages"]["extract"] = {
-                    "status": "completed", "file_count": file_count,
-                }
-            except Exception as e:
-                manifest["sessions"][session_key]["status"] = "failed"
-                manifest["sessions"][session_key]["stages"]["extract"] = {
-                    "status": "failed", "error": str(e),
-                }
-                save_manifest(run_id, manifest)
-                await ctx.error(f"Extraction failed for {session_key}: {e}")
+    async with create_download_client(get_ssl_verify_setting(), concurrency) as client:
+        fetch_tasks = {}
+        for i, session_id in enumerate(sessions_id, start=1):
+            session_key = f"session-{i}"
+            # Skip completed sessions
+            if manifest["sessions"].get(session_key, {}).get("status") == "completed":
                 continue
-        # ---- STAGE 3: Process (move logs + append JTL) ----
-        proc_stage = session_data.get("stages", {}).get("process", {})
+            fetch_tasks[session_key] = asyncio.create_task(_fetch(session_key, session_id))
 
-        if proc_stage.get("status") != "completed":
-            manifest["sessions"][session_key]["status"] = "processing"
-            manifest["sessions"][session_key]["stages"]["process"]["status"] = "in_progress"
-            save_manifest(run_id, manifest)
-
-            try:
-                extracted_files = [
-                    os.path.join(extract_dir, f) for f in os.listdir(extract_dir)
-                ]
-
-                # --- Move JMeter log ---
-                log_file = next(
-                    (f for f in extracted_files if os.path.basename(f).lower() == "jmeter.log"),
-                    None,
-                )
-                log_dest_name = f"jmeter-{i}.log" if is_multi else "jmeter.log"
-                log_dest = os.path.join(dest_folder, log_dest_name)
-
-                if log_file and os.path.exists(log_file):
-                    shutil.copy2(log_file, log_dest)
-                else:
-                    await ctx.warning(f"jmeter.log not found in {session_key}")
-
-                # --- Append JTL to combined CSV ---
-                kpi_file = next(
-                    (f for f in extracted_files if os.path.basename(f).lower() == "kpi.jtl"),
-                    None,
-                )
-                csv_path = os.path.join(dest_folder, "test-results.csv")
-                jtl_rows = 0
-
-                if kpi_file and os.path.exists(kpi_file):
-                    # Check if this session's data is already in the combined CSV
-                    sessions_included = manifest["combined_csv"].get("sessions_included", [])
-                    if session_key not in sessions_included:
-                        is_first = len(sessions_included) == 0
-                        jtl_rows = append_jtl_to_csv(kpi_file, csv_path, is_first=is_first)
-                        manifest["combined_csv"]["sessions_included"].append(session_key)
-                        manifest["combined_csv"]["total_rows"] += jtl_rows
-                        await ctx.info(f"Appended {jtl_rows} rows from {session_key} to test-results.csv")
-                else:
-                    await ctx.warning(f"kpi.jtl not found in {session_key}")
-
-                # Mark session completed
-                manifest["sessions"][session_key]["status"] = "completed"
-                manifest["sessions"][session_key]["stages"]["process"] = {
-                    "status": "completed",
-                    "jtl_rows": jtl_rows,
-                    "log_file": log_dest_name if log_file else None,
-                }
-                save_manifest(run_id, manifest)
-
-            except Exception as e:
-                manifest["sessions"][session_key]["status"] = "failed"
-                manifest["sessions"][session_key]["stages"]["process"] = {
-                    "status": "failed", "error": str(e),
-                }
-                save_manifest(run_id, manifest)
-                await ctx.error(f"Processing failed for {session_key}: {e}")
-                continue
+        try:
+            # --- Process each session in order as it becomes ready ---
+            for i, session_id in enumerate(sessions_id, start=1):
+                session_key = f"session-{i}"
+                if session_key not in fetch_tasks or not await fetch_tasks[session_key]:
+                    continue
+
+                session_data = manifest["sessions"].get(session_key, {})
+                session_dir = os.path.join(sessions_folder, session_key)
+                extract_dir = os.path.join(session_dir, "artifacts")
+                zip_path = os.path.join(session_dir, "artifacts.zip")
+                from_zip = session_data.get("stages", {}).get("extract", {}).get("mode") == "stream"
+
+                # ---- STAGE 3: Process (move logs + append JTL) ----
+                proc_stage = session_data.get("stages", {}).get("process", {})
+
+                if proc_stage.get("status") != "completed":
+                    manifest["sessions"][session_key]["status"] = "processing"
+                    manifest["sessions"][session_key]["stages"]["process"]["status"] = "in_progress"
+                    save_manifest(run_id, manifest)
+
+                    zf = None
+                    try:
+                        if from_zip:
+                            zf = zipfile.ZipFile(zip_path, "r")
+                            log_file = find_zip_member(zf, "jmeter.log")
+                            kpi_file = find_zip_member(zf, "kpi.jtl")
+                        else:
+                            extracted_files = [
+                                os.path.join(extract_dir, f) for f in os.listdir(extract_dir)
+                            ]
+                            log_file = next(
+                                (f for f in extracted_files if os.path.basename(f).lower() == "jmeter.log"),
+                                None,
+                            )
+                            kpi_file = next(
+                                (f for f in extracted_files if os.path.basename(f).lower() == "kpi.jtl"),
+                                None,
+                            )
+                            if log_file and not os.path.exists(log_file):
+                                log_file = None
+                            if kpi_file and not os.path.exists(kpi_file):
+                                kpi_file = None
+
+                        # --- Move JMeter log ---
+                        log_dest_name = f"jmeter-{i}.log" if is_multi else "jmeter.log"
+                        log_dest = os.path.join(dest_folder, log_dest_name)
+
+                        if log_file and from_zip:
+                            await asyncio.to_thread(copy_zip_member, zf, log_file, log_dest)
+                        elif log_file:
+                            shutil.copy2(log_file, log_dest)
+                        else:
+                            await ctx.warning(f"jmeter.log not found in {session_key}")
+
+                        # --- Append JTL to combined CSV ---
+                        csv_path = os.path.join(dest_folder, "test-results.csv")
+                        jtl_rows = 0
+
+                        if kpi_file:
+                            # Check if this session's data is already in the combined CSV
+                            sessions_included = manifest["combined_csv"].get("sessions_included", [])
+                            if session_key not in sessions_included:
+                                is_first = len(sessions_included) == 0
+                                if from_zip:
+                                    if is_first:
+                                        # A fresh CSV: build its columnar cache in the same pass
+                                        cache_state = await _reset_jtl_cache_writer(ctx, cache_state, csv_path, zip_path)
+                                    elif cache_state is not None and cache_unterminated:
+                                        # The previous JTL's last line runs into this one's first row
+                                        await ctx.warning(
+                                            f"Skipping columnar cache for test-results.csv: "
+                                            f"unterminated last line before {session_key}"
+                                        )
+                                        cache_state = await _reset_jtl_cache_writer(ctx, cache_state)
+                                    merged = await asyncio.to_thread(
+                                        stream_jtl_member_to_csv, zf, kpi_file, csv_path, is_first, cache_state,
+                                    )
+                                    jtl_rows = merged["rows"]
+                                    cache_unterminated = not merged["ends_with_newline"]
+                                    if cache_state is not None and merged["cache_error"]:
+                                        await ctx.warning(
+                                            f"Skipping columnar cache for test-results.csv: {merged['cache_error']}"
+                                        )
+                                        cache_state = await _reset_jtl_cache_writer(ctx, cache_state)
+                                else:
+                                    # Rows the cache writer never sees; drop it
+                                    cache_state = await _reset_jtl_cache_writer(ctx, cache_state)
+                                    jtl_rows = await asyncio.to_thread(
+                                        append_jtl_to_csv, kpi_file, csv_path, is_first,
+                                    )
+                                manifest["combined_csv"]["sessions_included"].append(session_key)
+                                manifest["combined_csv"]["total_rows"] += jtl_rows
+                                await ctx.info(f"Appended {jtl_rows} rows from {session_key} to test-results.csv")
+                        else:
+                            await ctx.warning(f"kpi.jtl not found in {session_key}")
+
+                        # Mark session completed
+                        manifest["sessions"][session_key]["status"] = "completed"
+                        manifest["sessions"][session_key]["stages"]["process"] = {
+                            "status": "completed",
+                            "jtl_rows": jtl_rows,
+                            "log_file": log_dest_name if log_file else None,
+                        }
+                        save_manifest(run_id, manifest)
+
+                    except Exception as e:
+                        cache_state = await _reset_jtl_cache_writer(ctx, cache_state)
+                        manifest["sessions"][session_key]["status"] = "failed"
+                        manifest["sessions"][session_key]["stages"]["process"] = {
+                            "status": "failed", "error": str(e),
+                        }
+                        save_manifest(run_id, manifest)
+                        await ctx.error(f"Processing failed for {session_key}: {e}")
+                        continue
+                    finally:
+                        if zf is not None:
+                            zf.close()
+
+            # The combined CSV is complete for this call; stamp its columnar cache
+            if cache_state is not None:
+                cache_path = await asyncio.to_thread(close_jtl_cache_writer, cache_state, True)
+                cache_state = None
+                await ctx.info(f"Wrote columnar cache {os.path.basename(cache_path)}")
+        finally:
+            for task in fetch_tasks.values():
+                task.cancel()
+            await asyncio.gather(*fetch_tasks.values(), return_exceptions=True)
+            if cache_state is not None:
+                close_jtl_cache_writer(cache_state, commit=False)
 
     # --- Cleanup session folders if configured ---
     if cleanup:
@@ -65,6 +65,25 @@ def get_artifact_download_retry_delay(config: dict = None) -> int:
     return config.get("blazemeter", {}).get("artifact_download_retry_delay", 2)
 
 
+def get_artifact_download_concurrency(config: dict = None) -> int:
+    """Sessions downloaded/extracted at the same time. Default: 4."""
+    if config is None:
+        config = load_config()
+    return max(1, int(config.get("blazemeter", {}).get("artifact_download_concurrency", 4)))
+
+
+def get_artifact_merge_mode(config: dict = None) -> str:
+    """
+    How session JTLs are merged into test-results.csv. Default: "extract".
+      - "extract": extract every ZIP, then copy kpi.jtl line by line
+      - "stream": stream kpi.jtl / jmeter.log straight out of each ZIP
+    """
+    if config is None:
+        config = load_config()
+    mode = str(config.get("blazemeter", {}).get("artifact_merge_mode", "extract")).lower()
+    return mode if mode in ("extract", "stream") else "extract"
+
+
 def get_cleanup_session_folders(config: dict = None) -> bool:
     """Whether to remove sessions/ subfolder after combining artifacts. Default: False."""
     if config is None:
@@ -1,6 +1,9 @@
 # Confluence API client
 import re
+import asyncio
+import hashlib
 from fastmcp import FastMCP, Context
+from fastmcp.server.lifespan import lifespan
 from services.confluence_api_v1 import (
     list_spaces_v1, 
     get_space_details_v1,
@@ -10,6 +13,7 @@ from services.confluence_api_v1 import (
     create_page_v1, 
     search_content_v1,
     attach_file_v1,
+    list_attachments_v1,
     update_page_v1,
 )
 from services.confluence_api_v2 import (
@@ -21,12 +25,24 @@ from services.confluence_api_v2 import (
     create_page_v2,
     search_content_v2,
     attach_file_v2,
+    list_attachments_v2,
     update_page_v2,
 )
 from services.artifact_manager import list_available_reports, list_available_charts
 from services.content_parser import markdown_to_confluence_xhtml, replace_chart_placeholders, _flatten_xhtml
+from services.http_client import ATTACHMENT_CONCURRENCY, close_client
 
-mcp = FastMCP("confluence")
+
+@lifespan
+async def _http_client_lifespan(server):
+    """Close the pooled HTTP clients on shutdown, inside the server's event loop."""
+    try:
+        yield {}
+    finally:
+        await close_client()
+
+
+mcp = FastMCP("confluence", lifespan=_http_client_lifespan)
 
 # -----------------------------
 # Validation Helper Functions
@@ -87,6 +103,39 @@ def validate_page_title(title: str) -> dict:
     
     return {"valid": True, "error": None}
 
+# -----------------------------
+# Attachment Helper Functions
+# -----------------------------
+
+# Attachment comment prefix for the uploaded content hash (used to skip unchanged charts)
+ATTACHMENT_HASH_PREFIX = "sha256:"
+
+def _file_sha256(path) -> tuple:
+    """Returns (hex SHA-256 digest, size in bytes) of a file."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+def _is_unchanged_attachment(existing: dict, digest: str, size: int) -> bool:
+    """
+    True when an existing attachment already holds this content: same size and
+    the content hash recorded in its comment by a previous attach_images run.
+    Attachments without a recorded hash are treated as changed.
+    """
+    if not existing:
+        return False
+    try:
+        existing_size = int(existing.get("file_size"))
+    except (TypeError, ValueError):
+        existing_size = None
+    if existing_size is not None and existing_size != size:
+        return False
+    return f"{ATTACHMENT_HASH_PREFIX}{digest}" in (existing.get("comment") or "")
+
 # -----------------------------
 # MCP Tool Definitions
 # -----------------------------
@@ -323,11 +372,17 @@ async def create_page(space_ref: str, test_run_id: str, filename: str, mode: str
     return result
 
 @mcp.tool
-async def attach_images(page_ref: str, test_run_id: str, mode: str, ctx: Context, report_type: str = "single_run") -> dict:
+async def attach_images(page_ref: str, test_run_id: str, mode: str, ctx: Context, report_type: str = "single_run", max_concurrency: int = 0, force: bool = False) -> dict:
     """
     Attaches all PNG chart images from a test run to an existing Confluence page.
     
-    Uploads all PNG files from the appropriate charts folder to the specified page.
+    Uploads all PNG files from the appropriate charts folder to the specified page,
+    several at a time over a shared connection pool. The page's existing attachments
+    are listed once up front:
+    - Charts already attached with the same content are skipped (no upload).
+    - Charts attached under the same filename but with different content are
+      updated in place as a new attachment version.
+    - New charts are attached as new attachments.
     Continues on partial failures and reports which images succeeded/failed.
     
     Args:
@@ -338,16 +393,24 @@ async def attach_images(page_ref: str, test_run_id: str, mode: str, ctx: Context
         report_type (str): Type of report - "single_run" (default) or "comparison".
             - "single_run": Path is artifacts/{test_run_id}/charts/
             - "comparison": Path is artifacts/comparisons/{test_run_id}/charts/
+        max_concurrency (int): Uploads in flight at once (0 = attachment_concurrency from config).
+        force (bool): Upload every chart, even those already attached unchanged.
     
     Returns:
         dict containing:
             - 'page_ref': Target page ID
             - 'test_run_id': Test run ID or comparison_id
             - 'attached': List of successfully attached images with details
+              ('action' is "created" or "updated")
+            - 'skipped': List of images already attached unchanged
             - 'failed': List of failed attachments with error details
             - 'total_attempted': Total number of files attempted
-            - 'total_attached': Number of files successfully attached
-            - 'status': "success" (all attached), "partial" (some failed), or "error" (all failed)
+            - 'total_attached': Number of files successfully attached (created or updated)
+            - 'total_updated': Number of attached files that were new versions of existing attachments
+            - 'total_skipped': Number of files skipped as unchanged
+            - 'bytes_uploaded': Bytes sent for attached files
+            - 'bytes_saved': Bytes not sent because the files were skipped
+            - 'status': "success" (none failed), "partial" (some failed), or "error" (all failed)
     
     Example:
         # Single-run charts
@@ -393,7 +456,7 @@ async def attach_images(page_ref: str, test_run_id: str, mode: str, ctx: Context
         }
     
     # Find all PNG files in the charts folder
-    png_files = list(charts_folder.glob("*.png"))
+    png_files = sorted(charts_folder.glob("*.png"))
     
     if not png_files:
         error_msg = f"No PNG files found in: {charts_folder}"
@@ -401,60 +464,118 @@ async def attach_images(page_ref: str, test_run_id: str, mode: str, ctx: Context
             "page_ref": page_ref,
             "test_run_id": test_run_id,
             "attached": [],
+            "skipped": [],
             "failed": [],
             "total_attempted": 0,
             "total_attached": 0,
+            "total_updated": 0,
+            "total_skipped": 0,
+            "bytes_uploaded": 0,
+            "bytes_saved": 0,
             "status": "error",
             "message": error_msg
         }
     
     await ctx.info(f"Found {len(png_files)} PNG files to attach in {charts_folder}")
     
-    # Select the appropriate attach function based on mode
+    # Select the appropriate API functions based on mode
     attach_func = attach_file_v2 if mode == "cloud" else attach_file_v1
+    list_func = list_attachments_v2 if mode == "cloud" else list_attachments_v1
     
-    attached = []
-    failed = []
+    # Existing attachments by filename, fetched once. If listing fails, every
+    # chart is attached as new (previous behavior).
+    existing = {}
+    try:
+        for attachment in await list_func(page_ref, ctx):
+            existing[attachment.get("filename")] = attachment
+    except Exception as e:
+        await ctx.warning(f"Could not list existing attachments on page {page_ref}, attaching all charts: {str(e)}")
     
-    # Attach each file, continuing on errors
-    for png_file in png_files:
-        try:
-            result = await attach_func(page_ref, str(png_file), ctx)
-            
-            if result.get("status") == "attached":
-                attached.append(result)
-            else:
-                failed.append(result)
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency or ATTACHMENT_CONCURRENCY)))
+    
+    async def _attach_one(png_file: Path) -> tuple:
+        # Returns ("attached" | "skipped" | "failed", result dict, size in bytes)
+        async with semaphore:
+            try:
+                digest, size = await asyncio.to_thread(_file_sha256, png_file)
+                current = existing.get(png_file.name)
                 
-        except Exception as e:
-            error_msg = f"Unexpected error attaching {png_file.name}: {str(e)}"
-            await ctx.error(error_msg)
-            failed.append({
-                "filename": png_file.name,
-                "error": error_msg,
-                "status": "error"
-            })
+                if not force and _is_unchanged_attachment(current, digest, size):
+                    return "skipped", {
+                        "attachment_id": current.get("attachment_id"),
+                        "filename": png_file.name,
+                        "page_ref": page_ref,
+                        "download_url": current.get("download_url", ""),
+                        "version": current.get("version"),
+                        "status": "unchanged"
+                    }, size
+                
+                result = await attach_func(
+                    page_ref,
+                    str(png_file),
+                    ctx,
+                    attachment_id=current.get("attachment_id") if current else None,
+                    comment=f"{ATTACHMENT_HASH_PREFIX}{digest}",
+                )
+                return ("attached" if result.get("status") == "attached" else "failed"), result, size
+                
+            except Exception as e:
+                error_msg = f"Unexpected error attaching {png_file.name}: {str(e)}"
+                await ctx.error(error_msg)
+                return "failed", {
+                    "filename": png_file.name,
+                    "error": error_msg,
+                    "status": "error"
+                }, 0
+    
+    attached = []
+    skipped = []
+    failed = []
+    bytes_uploaded = 0
+    bytes_saved = 0
+    
+    # Attach files concurrently, continuing on errors
+    for outcome, result, size in await asyncio.gather(*(_attach_one(f) for f in png_files)):
+        if outcome == "attached":
+            attached.append(result)
+            bytes_uploaded += size
+        elif outcome == "skipped":
+            skipped.append(result)
+            bytes_saved += size
+        else:
+            failed.append(result)
     
     # Determine overall status
     total_attempted = len(png_files)
     total_attached = len(attached)
+    total_updated = sum(1 for a in attached if a.get("action") == "updated")
+    total_skipped = len(skipped)
     
-    if total_attached == total_attempted:
+    if not failed:
         status = "success"
-    elif total_attached > 0:
+    elif total_attached + total_skipped > 0:
         status = "partial"
     else:
         status = "error"
     
-    await ctx.info(f"Attachment complete: {total_attached}/{total_attempted} images attached to page {page_ref}")
+    await ctx.info(
+        f"Attachment complete: {total_attached}/{total_attempted} images attached to page {page_ref} "
+        f"({total_updated} updated, {total_skipped} unchanged skipped, {len(failed)} failed; "
+        f"{bytes_saved} bytes saved)"
+    )
     
     return {
         "page_ref": page_ref,
         "test_run_id": test_run_id,
         "attached": attached,
+        "skipped": skipped,
         "failed": failed,
         "total_attempted": total_attempted,
         "total_attached": total_attached,
+        "total_updated": total_updated,
+        "total_skipped": total_skipped,
+        "bytes_uploaded": bytes_uploaded,
+        "bytes_saved": bytes_saved,
         "status": status
     }
 
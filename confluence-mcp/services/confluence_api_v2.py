@@ -1,11 +1,13 @@
 # Confluence v2 APIs (Cloud)
 import os
 import json
+import asyncio
 import httpx
 import base64
 from fastmcp import Context
 from dotenv import load_dotenv
 from utils.config import load_config
+from services.http_client import get_client
 
 # Load environment variables from .env file such as API keys and secrets
 load_dotenv()
@@ -387,17 +389,70 @@ async def update_page_v2(page_ref: str, storage_xhtml: str, ctx: Context) -> dic
         return {"error": error_msg, "status": "error", "page_ref": page_ref}
 
 
-async def attach_file_v2(page_ref: str, file_path: str, ctx: Context) -> dict:
+async def list_attachments_v2(page_ref: str, ctx: Context) -> list:
+    """
+    Lists all attachments on a Confluence Cloud page.
+    
+    Uses the v1 attachment endpoint: GET /wiki/rest/api/content/{pageId}/child/attachment
+    (the v2 attachment API does not return attachment comments), following pages
+    of results until exhausted.
+    
+    Args:
+        page_ref (str): Page ID whose attachments to list.
+        ctx (Context): FastMCP invocation context.
+    
+    Returns:
+        List of attachments with 'attachment_id', 'filename', 'file_size',
+        'comment', 'version', and 'download_url'.
+    """
+    base_url = CONFLUENCE_V2_BASE_URL
+    url = f"{base_url}/wiki/rest/api/content/{page_ref}/child/attachment"
+    headers = get_headers({"Accept": "application/json"})
+    limit = cnf_config.get('pagination_limit', 150)
+    
+    attachments = []
+    start = 0
+    client = get_client()
+    while True:
+        params = {"start": start, "limit": limit, "expand": "version,metadata"}
+        response = await client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        results = data.get("results", [])
+        for item in results:
+            download_link = item.get("_links", {}).get("download", "")
+            attachments.append({
+                "attachment_id": item.get("id"),
+                "filename": item.get("title"),
+                "file_size": item.get("extensions", {}).get("fileSize"),
+                "comment": item.get("metadata", {}).get("comment", ""),
+                "version": item.get("version", {}).get("number"),
+                "download_url": f"{base_url}/wiki{download_link}" if download_link else "",
+            })
+        
+        if not results or "next" not in data.get("_links", {}):
+            break
+        start += len(results)
+    
+    return attachments
+
+
+async def attach_file_v2(page_ref: str, file_path: str, ctx: Context, attachment_id: str = None, comment: str = None) -> dict:
     """
     Attaches a file (typically a PNG chart image) to an existing Confluence Cloud page.
     
     Uses the v1 attachment endpoint: POST /wiki/rest/api/content/{pageId}/child/attachment
-    (Cloud uses v1-style endpoints for attachments)
+    (Cloud uses v1-style endpoints for attachments). When attachment_id is given, the
+    existing attachment is updated in place as a new version instead:
+    POST /wiki/rest/api/content/{pageId}/child/attachment/{attachmentId}/data
     
     Args:
         page_ref (str): Page ID to attach the file to.
         file_path (str): Full path to the file to upload.
         ctx (Context): FastMCP invocation context.
+        attachment_id (str, optional): Existing attachment to upload a new version of.
+        comment (str, optional): Attachment comment (attach_images stores the content hash here).
     
     Returns:
         dict: Attachment result including:
@@ -405,6 +460,8 @@ async def attach_file_v2(page_ref: str, file_path: str, ctx: Context) -> dict:
             - filename: Name of the attached file
             - page_ref: Page the file was attached to
             - download_url: URL to download the attachment
+            - version: Attachment version number
+            - action: "created" or "updated"
             - status: "attached" on success, "error" on failure
     
     Example:
@@ -420,6 +477,8 @@ async def attach_file_v2(page_ref: str, file_path: str, ctx: Context) -> dict:
     base_url = CONFLUENCE_V2_BASE_URL
     # Cloud uses v1-style attachment endpoint
     url = f"{base_url}/wiki/rest/api/content/{page_ref}/child/attachment"
+    if attachment_id:
+        url = f"{url}/{attachment_id}/data"
     
     # Headers for multipart upload - no Content-Type header (httpx sets it with boundary)
     # X-Atlassian-Token: nocheck is required to bypass XSRF protection
@@ -431,9 +490,8 @@ async def attach_file_v2(page_ref: str, file_path: str, ctx: Context) -> dict:
     filename = file_path_obj.name
     
     try:
-        # Read file content
-        with open(file_path, 'rb') as f:
-            file_content = f.read()
+        # Read file content off the event loop (attach_images uploads several at once)
+        file_content = await asyncio.to_thread(file_path_obj.read_bytes)
         
         # Determine content type
         content_type = "image/png" if filename.lower().endswith('.png') else "application/octet-stream"
@@ -442,11 +500,13 @@ async def attach_file_v2(page_ref: str, file_path: str, ctx: Context) -> dict:
         files = {
             'file': (filename, file_content, content_type)
         }
+        data = {"minorEdit": "true"}
+        if comment:
+            data["comment"] = comment
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, headers=headers, files=files)
-            response.raise_for_status()
-            result = response.json()
+        response = await get_client().post(url, headers=headers, files=files, data=data)
+        response.raise_for_status()
+        result = response.json()
         
         # Parse response - v1 API returns results array
         results = result.get("results", [result])
@@ -458,9 +518,11 @@ async def attach_file_v2(page_ref: str, file_path: str, ctx: Context) -> dict:
                 "filename": attachment.get("title", filename),
                 "page_ref": page_ref,
                 "download_url": f"{base_url}/wiki{download_link}" if download_link else "",
+                "version": attachment.get("version", {}).get("number"),
+                "action": "updated" if attachment_id else "created",
                 "status": "attached"
             }
-            await ctx.info(f"Successfully attached '{filename}' to page {page_ref} (v2/cloud).")
+            await ctx.info(f"Successfully {attachment_data['action']} '{filename}' on page {page_ref} (v2/cloud).")
             return attachment_data
         else:
             error_msg = "No attachment returned in response"
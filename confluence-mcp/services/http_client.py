@@ -0,0 +1,57 @@
+# Shared HTTP client for the Confluence v1 (On-Prem) and v2 (Cloud) APIs
+import asyncio
+from typing import Dict, Union
+
+import httpx
+from utils.config import load_config
+
+# Load the config.yaml which contains path folder settings. NOTE: OS specific yaml files will override default config.yaml
+config = load_config()
+cnf_config = config.get('confluence', {})
+
+# Attachment uploads in flight at once (attach_images)
+ATTACHMENT_CONCURRENCY = max(1, int(cnf_config.get('attachment_concurrency', 4) or 1))
+
+# One pooled client per SSL verify setting, bound to the event loop that created them
+_clients: Dict[Union[str, bool], httpx.AsyncClient] = {}
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_client(verify: Union[str, bool] = True) -> httpx.AsyncClient:
+    """
+    Return the shared pooled HTTP client for the running event loop.
+
+    Args:
+        verify: SSL verification setting (CA bundle path or bool); calls
+            with the same setting share one connection pool.
+    """
+    global _client_loop
+    loop = asyncio.get_running_loop()
+    if _client_loop is not loop:
+        # Clients of another event loop cannot be used from this one
+        _clients.clear()
+        _client_loop = loop
+
+    client = _clients.get(verify)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=verify,
+            timeout=60.0,
+            limits=httpx.Limits(
+                max_connections=max(10, ATTACHMENT_CONCURRENCY * 2),
+                max_keepalive_connections=max(5, ATTACHMENT_CONCURRENCY),
+            ),
+        )
+        _clients[verify] = client
+    return client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP clients (they are recreated on the next request)."""
+    global _client_loop
+    clients = list(_clients.values())
+    _clients.clear()
+    _client_loop = None
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
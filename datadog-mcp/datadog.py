@@ -5,7 +5,8 @@ from fastmcp import FastMCP, Context    # ✅ FastMCP 3.x import
 from services.datadog_api import (
     load_environment_json, 
     collect_host_metrics,
-    collect_kubernetes_metrics
+    collect_kubernetes_metrics,
+    get_metrics_cache_info,
 )
 from services.datadog_logs import collect_logs
 from services.datadog_apm import collect_apm_traces
@@ -159,6 +160,22 @@ async def get_apm_traces(env_name: str, start_time: str, end_time: str, query_ty
     """
     return await collect_apm_traces(env_name, start_time, end_time, query_type, run_id, ctx, custom_query)
 
+@mcp.tool()
+async def get_metrics_cache_stats(ctx: Context, clear: bool = False) -> Dict[str, Any]:
+    """
+    Reports the local Datadog time-series cache used by get_host_metrics,
+    get_kubernetes_metrics and get_kpi_timeseries.
+
+    Args:
+        ctx (Context, optional): Workflow context for chaining state/status/errors.
+        clear (bool, optional): Remove every cached entry (and reset the counters) before reporting.
+
+    Returns:
+        dict: Cache path, entry count, estimated/file size in MB, limits (max_size_mb, ttl_hours)
+              and lifetime counters (cache_hits, cache_partial_hits, cache_misses).
+    """
+    return await get_metrics_cache_info(ctx, clear)
+
 
 if __name__ == "__main__":
     try:
@@ -2,14 +2,28 @@
 import os
 import re
 import json
+import time
 import httpx
 import csv
+import asyncio
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Tuple, Optional, Union
 from dotenv import load_dotenv
 from fastmcp import FastMCP, Context    # ✅ FastMCP 2.x import
 from utils.config import load_config
 from utils.datadog_config_loader import load_environment_json
+from utils.timeseries_cache import (
+    get_timeseries_cache,
+    make_cache_key,
+    missing_ranges,
+    store_segment,
+    load_series,
+    drop_entry,
+    evict,
+    record_stats,
+    cache_stats,
+    clear_cache,
+)
 
 # -----------------------------------------------
 # Bootstrap
@@ -30,6 +44,18 @@ V2_TIMESERIES_URL = f"{DD_API_BASE_URL}/api/v2/query/timeseries"
 # CA bundle path for SSL verification
 CA_BUNDLE = os.getenv("REQUESTS_CA_BUNDLE") or os.getenv("SSL_CERT_FILE")
 
+# Concurrent metric collection (hosts / services / pods / KPI entities)
+MAX_CONCURRENT_REQUESTS = max(1, int(dd_config.get("max_concurrent_requests", 8) or 1))
+METRICS_BATCH_SIZE = max(1, int(dd_config.get("metrics_batch_size", 1) or 1))
+RATE_LIMIT_MAX_RETRIES = max(0, int(dd_config.get("rate_limit_max_retries", 3) or 0))
+RETRY_BASE_DELAY = 1.0     # seconds, doubled per attempt when no rate-limit headers are sent
+RETRY_MAX_DELAY = 60.0
+RETRYABLE_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+# Bucket sizes of the built-in queries (used as part of the cache key)
+HOST_METRICS_INTERVAL_MS = 60000     # .rollup(avg,60) in collect_host_metrics
+K8S_METRICS_INTERVAL_MS = 20000      # _build_combined_metrics_request() default
+
 # -----------------------------------------------
 # Helpers
 # -----------------------------------------------
@@ -157,10 +183,10 @@ def _build_combined_metrics_request(
     return {
         "data": {
             "type": "timeseries_request",
-            "interval": interval,
             "attributes": {
                 "from": from_ms,
                 "to": to_ms,
+                "interval": interval,
                 "queries": [
                     {"data_source": "metrics", "name": "usage", "query": usage_query},
                     {"data_source": "metrics", "name": "limits", "query": limits_query}
@@ -173,6 +199,479 @@ def _build_combined_metrics_request(
         }
     }
 
+def _build_batched_metrics_request(
+    from_ms: int,
+    to_ms: int,
+    query_pairs: List[Tuple[str, str]],
+    interval: int = 20000
+) -> Dict[str, Any]:
+    """
+    Build one v2 timeseries request for several (usage_query, limits_query) pairs.
+
+    Entity k's usage and limits come back as query_index 2k and 2k+1; use
+    _split_batched_attrs() to get one response per entity. A single pair
+    produces exactly the _build_combined_metrics_request() body.
+    """
+    if len(query_pairs) == 1:
+        return _build_combined_metrics_request(from_ms, to_ms, *query_pairs[0], interval=interval)
+
+    queries = []
+    formulas = []
+    for k, (usage_query, limits_query) in enumerate(query_pairs):
+        queries.append({"data_source": "metrics", "name": f"usage_{k}", "query": usage_query})
+        queries.append({"data_source": "metrics", "name": f"limits_{k}", "query": limits_query})
+        formulas.append({"formula": f"usage_{k}"})
+        formulas.append({"formula": f"limits_{k}"})
+
+    return {
+        "data": {
+            "type": "timeseries_request",
+            "attributes": {
+                "from": from_ms,
+                "to": to_ms,
+                "interval": interval,
+                "queries": queries,
+                "formulas": formulas,
+            }
+        }
+    }
+
+
+def _split_batched_attrs(attrs: Dict[str, Any], entities: int, queries_per_entity: int) -> List[Dict[str, Any]]:
+    """
+    Split the attributes of a batched v2 response into one attributes dict
+    per entity, with query_index renumbered from 0 as if each entity had
+    been requested on its own.
+    """
+    series_list = attrs.get("series", []) or []
+    values = attrs.get("values", []) or []
+    parts = [{"times": attrs.get("times", []) or [], "series": [], "values": []} for _ in range(entities)]
+
+    for s_idx, series in enumerate(series_list):
+        query_index = series.get("query_index", 0)
+        entity, local_index = divmod(query_index, queries_per_entity)
+        if entity >= entities:
+            continue
+        parts[entity]["series"].append({**series, "query_index": local_index})
+        parts[entity]["values"].append(values[s_idx] if s_idx < len(values) else [])
+
+    return parts
+
+
+# -----------------------------------------------
+# Concurrent requests with rate-limit backoff
+# -----------------------------------------------
+
+def _new_request_limiter(max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Shared state for one collection run: a semaphore bounding in-flight
+    requests, the time before which no new request should be sent (set
+    when Datadog reports the rate-limit window as exhausted) and the
+    request / cache counters reported in the run summary.
+    """
+    return {
+        "semaphore": asyncio.Semaphore(max_concurrency or MAX_CONCURRENT_REQUESTS),
+        "resume_at": 0.0,
+        "stats": {
+            "api_requests": 0, "cache_hits": 0, "cache_partial_hits": 0, "cache_misses": 0,
+            "cache_grid_refetches": 0,
+        },
+    }
+
+
+def _rate_limit_delay(resp: httpx.Response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a throttled/failed request.
+
+    Prefers Datadog's X-RateLimit-Reset (seconds until the window resets),
+    then Retry-After, then exponential backoff.
+    """
+    for header in ("X-RateLimit-Reset", "Retry-After"):
+        value = resp.headers.get(header)
+        if value:
+            try:
+                return min(max(float(value), 0.0), RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+    return min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY)
+
+
+async def _dd_request(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    method: str,
+    url: str,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Send one Datadog API request under the limiter.
+
+    429 and 5xx responses are retried up to rate_limit_max_retries times.
+    When a response reports X-RateLimit-Remaining: 0, every request sharing
+    the limiter waits for X-RateLimit-Reset before going out. The last
+    response is returned as-is; callers still call raise_for_status().
+    """
+    attempt = 0
+    while True:
+        async with limiter["semaphore"]:
+            wait = limiter["resume_at"] - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            resp = await client.request(method, url, **kwargs)
+            limiter["stats"]["api_requests"] += 1
+
+        if resp.headers.get("X-RateLimit-Remaining") == "0":
+            limiter["resume_at"] = max(limiter["resume_at"], time.monotonic() + _rate_limit_delay(resp, attempt))
+
+        if resp.status_code not in RETRYABLE_STATUS_CODES or attempt >= RATE_LIMIT_MAX_RETRIES:
+            return resp
+
+        delay = _rate_limit_delay(resp, attempt)
+        if resp.status_code == 429:
+            limiter["resume_at"] = max(limiter["resume_at"], time.monotonic() + delay)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def _post_timeseries(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    body: Dict[str, Any],
+) -> Dict[str, Any]:
+    """POST a v2 timeseries request and return data.attributes."""
+    resp = await _dd_request(client, limiter, "POST", V2_TIMESERIES_URL, headers=headers, json=body, timeout=60.0)
+    resp.raise_for_status()
+    return resp.json().get("data", {}).get("attributes", {})
+
+
+async def _gather_results(coros: List[Any]) -> List[Any]:
+    """
+    Run request coroutines concurrently and return their results in order.
+    A failed request yields its exception instead of a result, so one bad
+    entity does not abort the others; see _unwrap().
+    """
+    async def _capture(coro):
+        try:
+            return await coro
+        except Exception as e:
+            return e
+
+    return list(await asyncio.gather(*(_capture(c) for c in coros)))
+
+
+def _unwrap(result: Any) -> Any:
+    """Return a _gather_results() result, re-raising it if it is an exception."""
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+# -----------------------------------------------
+# Time-series cache (utils/timeseries_cache.py)
+# -----------------------------------------------
+
+def _unique_sids(sids: List[str]) -> List[str]:
+    """Suffix repeated series ids so every series of a response is kept."""
+    seen: Dict[str, int] = {}
+    unique = []
+    for sid in sids:
+        n = seen.get(sid, 0)
+        seen[sid] = n + 1
+        unique.append(sid if n == 0 else f"{sid}#{n}")
+    return unique
+
+
+def _v2_attrs_to_segment(attrs: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any], List[Tuple[int, Any]]]]:
+    """v2 timeseries attributes -> cache series (sid, meta, points)."""
+    times = attrs.get("times", []) or []
+    series_list = attrs.get("series", []) or []
+    values = attrs.get("values", []) or []
+
+    sids = _unique_sids([
+        json.dumps([series.get("query_index", 0), series.get("group_tags", []) or []])
+        for series in series_list
+    ])
+    segment = []
+    for s_idx, (sid, series) in enumerate(zip(sids, series_list)):
+        row_vals = values[s_idx] if s_idx < len(values) else []
+        points = [(int(ts_ms), row_vals[t_idx]) for t_idx, ts_ms in enumerate(times) if t_idx < len(row_vals)]
+        segment.append((sid, series, points))
+    return segment
+
+
+def _segment_to_v2_attrs(stored: List[Tuple[Dict[str, Any], List[Tuple[int, Any]]]]) -> Dict[str, Any]:
+    """Cached series -> v2 timeseries attributes (shared times, None-filled values)."""
+    times = sorted({ts for _, points in stored for ts, _ in points})
+    position = {ts: i for i, ts in enumerate(times)}
+    series_list = []
+    values = []
+    for meta, points in stored:
+        row: List[Any] = [None] * len(times)
+        for ts, val in points:
+            row[position[ts]] = val
+        series_list.append(meta)
+        values.append(row)
+    return {"times": times, "series": series_list, "values": values}
+
+
+def _v1_data_to_segment(data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any], List[Tuple[int, Any]]]]:
+    """v1 query response -> cache series (sid, meta, points)."""
+    series_list = data.get("series", []) or []
+    sids = _unique_sids([
+        json.dumps([series.get("query_index", 0), series.get("metric"), series.get("scope")])
+        for series in series_list
+    ])
+    segment = []
+    for sid, series in zip(sids, series_list):
+        # start/end/length describe the fetched window, not the series
+        meta = {k: v for k, v in series.items() if k not in ("pointlist", "start", "end", "length")}
+        points = [(int(ts), val) for ts, val in series.get("pointlist", [])]
+        segment.append((sid, meta, points))
+    return segment
+
+
+def _segment_to_v1_data(stored: List[Tuple[Dict[str, Any], List[Tuple[int, Any]]]]) -> Dict[str, Any]:
+    """Cached series -> v1 query response."""
+    return {
+        "status": "ok",
+        "series": [{**meta, "pointlist": [[ts, val] for ts, val in points]} for meta, points in stored],
+    }
+
+
+def _on_bucket_grid(series: List[Tuple[Any, ...]], interval_ms: int) -> bool:
+    """
+    True if the timestamps of ``series`` (entries ending in a points list)
+    lie on one grid of ``interval_ms`` buckets: adjacent timestamps are a
+    multiple of it apart and the closest pair exactly one bucket apart.
+    Segments rolled up at another width, or offset from each other, fail.
+    """
+    times = sorted({int(ts) for entry in series for ts, _ in entry[-1]})
+    if interval_ms <= 0 or len(times) < 2:
+        return True
+    steps = [b - a for a, b in zip(times, times[1:])]
+    return min(steps) == interval_ms and all(step % interval_ms == 0 for step in steps)
+
+
+async def _fetch_cached(
+    limiter: Dict[str, Any],
+    kind: str,
+    request_keys: List[Any],
+    intervals: List[int],
+    from_ms: int,
+    to_ms: int,
+    fetch_window,
+    to_segment,
+    from_segment,
+) -> List[Any]:
+    """
+    Fetch one response per entity, asking the API only for uncovered ranges.
+
+    Args:
+        request_keys: Per-entity query description, stable across runs.
+        intervals: Per-entity bucket size in ms.
+        fetch_window: async (indices, from_ms, to_ms) -> results for those
+            entities over that window (response or exception each).
+        to_segment / from_segment: Convert a response to cache series and
+            back.
+
+    Entities missing the same ranges are fetched together, so batching and
+    concurrency still apply. A full miss returns the API response itself;
+    hits and partial hits are rebuilt from the cache. Any failed range
+    makes that entity's result the exception.
+
+    Responses whose buckets are not ``interval`` apart are never stored. A
+    hit or partial hit whose rebuilt buckets are off that grid (e.g. an
+    entry written before the rollup was pinned) is dropped and the whole
+    window is fetched again, so a cached result always has the timestamps
+    of a single full fetch.
+    """
+    conn = get_timeseries_cache()
+    if conn is None:
+        return await fetch_window(list(range(len(request_keys))), from_ms, to_ms)
+
+    stats = limiter["stats"]
+    keys = [make_cache_key(kind, DD_API_BASE_URL, rk, iv) for rk, iv in zip(request_keys, intervals)]
+    gaps_by_entity = [missing_ranges(conn, key, from_ms, to_ms) for key in keys]
+
+    run_counts = {"cache_hits": 0, "cache_partial_hits": 0, "cache_misses": 0, "cache_grid_refetches": 0}
+    groups: Dict[Tuple[Tuple[int, int], ...], List[int]] = {}
+    for i, gaps in enumerate(gaps_by_entity):
+        if not gaps:
+            run_counts["cache_hits"] += 1
+        elif gaps == [(from_ms, to_ms)]:
+            run_counts["cache_misses"] += 1
+        else:
+            run_counts["cache_partial_hits"] += 1
+        if gaps:
+            groups.setdefault(tuple(gaps), []).append(i)
+    for name, value in run_counts.items():
+        stats[name] += value
+
+    jobs = [(indices, gap) for gaps, indices in groups.items() for gap in gaps]
+    job_results = await asyncio.gather(*(fetch_window(indices, *gap) for indices, gap in jobs))
+
+    fetched: Dict[int, Any] = {}
+    errors: Dict[int, Exception] = {}
+    for (indices, (gap_from, gap_to)), results in zip(jobs, job_results):
+        for i, result in zip(indices, results):
+            if isinstance(result, Exception):
+                errors.setdefault(i, result)
+                continue
+            fetched[i] = result
+            segment = to_segment(result)
+            if _on_bucket_grid(segment, intervals[i]):
+                store_segment(conn, keys[i], kind, gap_from, gap_to, segment)
+
+    out: List[Any] = []
+    regrid: List[int] = []
+    for i, key in enumerate(keys):
+        if i in errors:
+            out.append(errors[i])
+        elif gaps_by_entity[i] == [(from_ms, to_ms)]:
+            out.append(fetched[i])
+        else:
+            stored = load_series(conn, key, from_ms, to_ms, intervals[i])
+            if not _on_bucket_grid(stored, intervals[i]):
+                regrid.append(i)
+            out.append(from_segment(stored))
+
+    if regrid:
+        run_counts["cache_grid_refetches"] += len(regrid)
+        stats["cache_grid_refetches"] += len(regrid)
+        for i in regrid:
+            drop_entry(conn, keys[i])
+        for i, result in zip(regrid, await fetch_window(regrid, from_ms, to_ms)):
+            out[i] = result
+            if not isinstance(result, Exception):
+                segment = to_segment(result)
+                if _on_bucket_grid(segment, intervals[i]):
+                    store_segment(conn, keys[i], kind, from_ms, to_ms, segment)
+
+    evict(conn)
+    record_stats(conn, run_counts)
+    return out
+
+
+def _with_window(body: Dict[str, Any], from_ms: int, to_ms: int) -> Dict[str, Any]:
+    """Copy of a v2 timeseries request body with another from/to."""
+    data = body["data"]
+    return {**body, "data": {**data, "attributes": {**data["attributes"], "from": from_ms, "to": to_ms}}}
+
+
+async def _fetch_timeseries_bodies(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    bodies: List[Dict[str, Any]],
+) -> List[Any]:
+    """
+    POST prebuilt v2 timeseries bodies concurrently, reusing cached ranges.
+    All bodies must share one from/to window. Returns one attributes dict
+    (or exception) per body, in input order.
+    """
+    if not bodies:
+        return []
+    attributes = bodies[0]["data"]["attributes"]
+    from_ms, to_ms = attributes["from"], attributes["to"]
+
+    async def _fetch_window(indices: List[int], window_from: int, window_to: int) -> List[Any]:
+        return await _gather_results([
+            _post_timeseries(client, limiter, headers, _with_window(bodies[i], window_from, window_to))
+            for i in indices
+        ])
+
+    return await _fetch_cached(
+        limiter, "v2", [_with_window(body, 0, 0) for body in bodies],
+        [int(body["data"]["attributes"].get("interval") or 0) for body in bodies],
+        from_ms, to_ms, _fetch_window, _v2_attrs_to_segment, _segment_to_v2_attrs,
+    )
+
+
+def _cache_summary(limiter: Dict[str, Any]) -> Dict[str, Any]:
+    """Request / cache counters for a collection summary."""
+    return {"enabled": get_timeseries_cache() is not None, **limiter["stats"]}
+
+
+async def _fetch_combined_series(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    from_ms: int,
+    to_ms: int,
+    query_pairs: List[Tuple[str, str]],
+) -> List[Any]:
+    """
+    Fetch usage+limits attributes for many entities, reusing cached ranges.
+    Returns one attributes dict (or exception) per pair, in input order.
+    """
+    async def _fetch_window(indices: List[int], window_from: int, window_to: int) -> List[Any]:
+        return await _fetch_combined_window(
+            client, limiter, headers, window_from, window_to, [query_pairs[i] for i in indices]
+        )
+
+    return await _fetch_cached(
+        limiter, "v2", [list(pair) for pair in query_pairs], [K8S_METRICS_INTERVAL_MS] * len(query_pairs),
+        from_ms, to_ms, _fetch_window, _v2_attrs_to_segment, _segment_to_v2_attrs,
+    )
+
+
+async def _fetch_combined_window(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    from_ms: int,
+    to_ms: int,
+    query_pairs: List[Tuple[str, str]],
+    batch_size: Optional[int] = None,
+) -> List[Any]:
+    """
+    Fetch usage+limits attributes for many entities from the API.
+
+    Entities are grouped into metrics_batch_size pairs per request and the
+    batches are sent concurrently. A failed batch is retried one entity per
+    request, so a single bad query only fails its own entity. Returns one
+    attributes dict (or exception) per pair, in input order.
+    """
+    batch_size = batch_size or METRICS_BATCH_SIZE
+
+    async def _fetch_batch(pairs: List[Tuple[str, str]]) -> List[Any]:
+        body = _build_batched_metrics_request(from_ms, to_ms, pairs)
+        if len(pairs) == 1:
+            return await _gather_results([_post_timeseries(client, limiter, headers, body)])
+        try:
+            attrs = await _post_timeseries(client, limiter, headers, body)
+        except Exception:
+            return await _fetch_combined_window(client, limiter, headers, from_ms, to_ms, pairs, batch_size=1)
+        return _split_batched_attrs(attrs, len(pairs), 2)
+
+    batches = [query_pairs[i:i + batch_size] for i in range(0, len(query_pairs), batch_size)]
+    results = await asyncio.gather(*(_fetch_batch(pairs) for pairs in batches))
+    return [result for batch in results for result in batch]
+
+
+# -----------------------------------------------
+# Metrics cache stats
+# -----------------------------------------------
+async def get_metrics_cache_info(ctx: Context, clear: bool = False) -> Dict[str, Any]:
+    """
+    Report the local time-series cache (size, entries, lifetime hit/miss
+    counters), optionally clearing it first.
+    """
+    conn = get_timeseries_cache()
+    if conn is None:
+        msg = "Metrics cache is disabled (metrics_cache.enabled: false) or could not be opened."
+        await ctx.info(msg)
+        return {"enabled": False, "message": msg}
+
+    result: Dict[str, Any] = {"enabled": True}
+    if clear:
+        result["cleared_entries"] = clear_cache(conn)
+        await ctx.info(f"Metrics cache cleared ({result['cleared_entries']} entries)")
+    result.update(cache_stats(conn))
+    return result
+
+
 # -----------------------------------------------
 # Hosts (v1) — per-host CSV + aggregates
 # -----------------------------------------------
@@ -236,23 +735,25 @@ async def collect_host_metrics(env_name: str, start_time: str, end_time: str, ru
 
     headers = {"DD-API-KEY": DD_API_KEY, "DD-APPLICATION-KEY": DD_APP_KEY}
 
+    hostnames = [h.get("hostname") for h in hosts if h.get("hostname")]
+
     verify_ssl = get_ssl_verify_setting()
     async with httpx.AsyncClient(verify=verify_ssl) as client:
-        for h in hosts:
-            hostname = h.get("hostname")
-            if not hostname:
-                continue
+        # Fetch all hosts concurrently (metrics_batch_size hosts per query),
+        # then write files in configuration order.
+        limiter = _new_request_limiter()
+        host_results = await _fetch_host_series(client, limiter, headers, v1_from_s, v1_to_s, q_tpl, hostnames)
 
+        for hostname, host_result in zip(hostnames, host_results):
             query = q_tpl % {"h": hostname}
             params = {"from": v1_from_s, "to": v1_to_s, "query": query}
 
             # Collect series values keyed by metric name
             series_map: Dict[str, List[Tuple[int, float]]] = {}
             cpu_unit_family: Optional[str] = None
+            data = None
             try:
-                resp = await client.get(V1_QUERY_URL, params=params, headers=headers, timeout=60.0)
-                resp.raise_for_status()
-                data = resp.json()
+                data = _unwrap(host_result)
                 for series in data.get("series", []):
                     metric = series.get("metric") or series.get("display_name")
                     pts = series.get("pointlist", [])
@@ -264,7 +765,7 @@ async def collect_host_metrics(env_name: str, start_time: str, end_time: str, ru
                         if unit_info and isinstance(unit_info, list) and len(unit_info) > 0 and unit_info[0]:
                             cpu_unit_family = unit_info[0].get("family", "").lower()
             except Exception as e:
-                warnings.append(f"Host '{hostname}': API error — {e}; Request params: {params}; Response: {json.dumps(data, indent=2) if 'data' in locals() else 'N/A'}")
+                warnings.append(f"Host '{hostname}': API error — {e}; Request params: {params}; Response: {json.dumps(data, indent=2) if data is not None else 'N/A'}")
                 await ctx.error(f"Host '{hostname}': API error — {e}")
                 continue
 
@@ -346,10 +847,79 @@ async def collect_host_metrics(env_name: str, start_time: str, end_time: str, ru
         "date_range": {"start": str(start_time), "end": str(end_time), "tz": tz_label},
         "aggregates": aggregates,
         "warnings": warnings,
+        "cache": _cache_summary(limiter),
     }
 
     return {"files": files, "summary": summary}
 
+def _count_queries(query: str) -> int:
+    """Count the comma-separated queries in a v1 query string (commas inside () or {} don't split)."""
+    depth = 0
+    count = 1
+    for ch in query:
+        if ch in "({":
+            depth += 1
+        elif ch in ")}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            count += 1
+    return count
+
+
+async def _fetch_host_series(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    from_s: int,
+    to_s: int,
+    q_tpl: str,
+    hostnames: List[str],
+) -> List[Any]:
+    """
+    Fetch the v1 query response for every host, reusing cached ranges.
+
+    The v1 query endpoint accepts comma-separated queries, so
+    metrics_batch_size hosts share one request; each host's series are
+    picked out by query_index. A failed batch is retried one host per
+    request. Returns one response dict (or exception) per host, in input
+    order.
+    """
+    queries_per_host = _count_queries(q_tpl)
+
+    async def _fetch_window(indices: List[int], window_from: int, window_to: int) -> List[Any]:
+        window = (window_from // 1000, -(-window_to // 1000))
+        batch_hosts = [hostnames[i] for i in indices]
+        batches = [batch_hosts[i:i + METRICS_BATCH_SIZE] for i in range(0, len(batch_hosts), METRICS_BATCH_SIZE)]
+        results = await asyncio.gather(*(_fetch_batch(batch, window) for batch in batches))
+        return [result for batch in results for result in batch]
+
+    async def _query(batch: List[str], window: Tuple[int, int]) -> Dict[str, Any]:
+        query = ",".join(q_tpl % {"h": hostname} for hostname in batch)
+        params = {"from": window[0], "to": window[1], "query": query}
+        resp = await _dd_request(client, limiter, "GET", V1_QUERY_URL, params=params, headers=headers, timeout=60.0)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _fetch_batch(batch: List[str], window: Tuple[int, int]) -> List[Any]:
+        if len(batch) == 1:
+            return await _gather_results([_query(batch, window)])
+        try:
+            data = await _query(batch, window)
+        except Exception:
+            return await _gather_results([_query([hostname], window) for hostname in batch])
+        parts = [{**data, "series": []} for _ in batch]
+        for series in data.get("series", []):
+            host_index = series.get("query_index", 0) // queries_per_host
+            if host_index < len(parts):
+                parts[host_index]["series"].append(series)
+        return parts
+
+    return await _fetch_cached(
+        limiter, "v1", [q_tpl % {"h": hostname} for hostname in hostnames],
+        [HOST_METRICS_INTERVAL_MS] * len(hostnames), from_s * 1000, to_s * 1000,
+        _fetch_window, _v1_data_to_segment, _segment_to_v1_data,
+    )
+
 # -----------------------------------------------
 # Kubernetes (v2) — per-service CSV (merged CPU+Mem) + aggregates
 # -----------------------------------------------
@@ -420,11 +990,22 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
     verify_ssl = get_ssl_verify_setting()
 
     async with httpx.AsyncClient(verify=verify_ssl) as client:
+        # Issue every service/pod request up front (bounded by the limiter),
+        # then build files and aggregates in configuration order below.
+        limiter = _new_request_limiter()
+        svc_filters = [svc.get("service_filter") or svc.get("kube_service") for svc in services]
+        pod_filters = [pod.get("pod_filter") or pod.get("kube_service") for pod in pods]
+        svc_results, pod_results = await asyncio.gather(
+            _fetch_service_series(client, limiter, headers, env_tag, v2_from_ms, v2_to_ms, [f for f in svc_filters if f]),
+            _fetch_pod_series(client, limiter, headers, kube_namespace, v2_from_ms, v2_to_ms, [f for f in pod_filters if f]),
+        )
+        svc_results = iter(svc_results)
+        pod_results = iter(pod_results)
+
         # -------------------------------------------------------------
         # 1) Services - Using DYNAMIC limits from Datadog
         # -------------------------------------------------------------
-        for svc in services:
-            s_filter = svc.get("service_filter") or svc.get("kube_service")
+        for svc, s_filter in zip(services, svc_filters):
             if not s_filter:
                 warn_msg = f"Service entry skipped — no 'service_filter' or 'kube_service' key found. Keys present: {list(svc.keys())}"
                 warnings.append(warn_msg)
@@ -433,17 +1014,13 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
 
             # NOTE: We no longer use static limits from environments.json for K8s
             # Instead, we query limits dynamically from Datadog alongside usage metrics
+            cpu_result, mem_result = next(svc_results)
 
             # 1a) CPU request (usage + limits combined)
-            cpu_usage_query, cpu_limits_query = svc_cpu_with_limits_query(env_tag, s_filter)
-            body_cpu = _build_combined_metrics_request(v2_from_ms, v2_to_ms, cpu_usage_query, cpu_limits_query)
-
             cpu_usage_series: Dict[str, List[Tuple[int, float]]] = {}
             cpu_limits_series: Dict[str, List[Tuple[int, float]]] = {}
             try:
-                r_cpu = await client.post(V2_TIMESERIES_URL, headers=headers, json=body_cpu, timeout=60.0)
-                r_cpu.raise_for_status()
-                attrs = r_cpu.json().get("data", {}).get("attributes", {})
+                attrs = _unwrap(cpu_result)
                 cpu_usage_series, cpu_limits_series = _extract_series_with_limits(attrs, ["kube_container_name"])
             except Exception as e:
                 warnings.append(f"Service '{s_filter}': CPU query error — {e}")
@@ -451,15 +1028,10 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
                 continue
 
             # 1b) Memory request (usage + limits combined)
-            mem_usage_query, mem_limits_query = svc_mem_with_limits_query(env_tag, s_filter)
-            body_mem = _build_combined_metrics_request(v2_from_ms, v2_to_ms, mem_usage_query, mem_limits_query)
-
             mem_usage_series: Dict[str, List[Tuple[int, float]]] = {}
             mem_limits_series: Dict[str, List[Tuple[int, float]]] = {}
             try:
-                r_mem = await client.post(V2_TIMESERIES_URL, headers=headers, json=body_mem, timeout=60.0)
-                r_mem.raise_for_status()
-                attrs = r_mem.json().get("data", {}).get("attributes", {})
+                attrs = _unwrap(mem_result)
                 mem_usage_series, mem_limits_series = _extract_series_with_limits(attrs, ["kube_container_name"])
             except Exception as e:
                 warnings.append(f"Service '{s_filter}': Memory query error — {e}")
@@ -567,8 +1139,7 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
         # -------------------------------------------------------------
         # 2) Pods - Using DYNAMIC limits from Datadog
         # -------------------------------------------------------------
-        for pod in pods:
-            pod_filter = pod.get("pod_filter") or pod.get("kube_service")
+        for pod, pod_filter in zip(pods, pod_filters):
             if not pod_filter:
                 warn_msg = f"Pod entry skipped — no 'pod_filter' or 'kube_service' key found. Keys present: {list(pod.keys())}"
                 warnings.append(warn_msg)
@@ -581,16 +1152,14 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
             normalized_filter = pod_filter.rstrip("*")
             pod_id_tag_keys = ["kube_service", "kube_pod_name", "kube_container_name"]
 
-            # 2a) CPU request (usage + limits combined)
-            cpu_usage_query, cpu_limits_query = pod_cpu_with_limits_query(kube_namespace, pod_filter)
-            body_cpu = _build_combined_metrics_request(v2_from_ms, v2_to_ms, cpu_usage_query, cpu_limits_query)
+            # Primary and (when needed) fallback responses, fetched above
+            (cpu_result, cpu_fb_result), (mem_result, mem_fb_result) = next(pod_results)
 
+            # 2a) CPU request (usage + limits combined)
             pod_cpu_usage_series: Dict[str, List[Tuple[int, float]]] = {}
             pod_cpu_limits_series: Dict[str, List[Tuple[int, float]]] = {}
             try:
-                r_cpu = await client.post(V2_TIMESERIES_URL, headers=headers, json=body_cpu, timeout=60.0)
-                r_cpu.raise_for_status()
-                attrs = r_cpu.json().get("data", {}).get("attributes", {})
+                attrs = _unwrap(cpu_result)
                 pod_cpu_usage_series, pod_cpu_limits_series = _extract_series_with_limits(
                     attrs, pod_id_tag_keys, default_identifier=normalized_filter
                 )
@@ -600,16 +1169,7 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
                 if not pod_cpu_usage_series:
                     warnings.append(f"Pod '{pod_filter}': primary CPU query (by kube_service) returned no data; retrying with fallback (by kube_namespace)")
                     await ctx.warning(warnings[-1])
-                    if kube_namespace:
-                        fb_cpu_usage = f"avg:kubernetes.cpu.usage.total{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_namespace}}"
-                        fb_cpu_limits = f"sum:kubernetes.cpu.limits{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_namespace}}"
-                    else:
-                        fb_cpu_usage = f"avg:kubernetes.cpu.usage.total{{kube_service:{pod_filter}}} by {{kube_namespace}}"
-                        fb_cpu_limits = f"sum:kubernetes.cpu.limits{{kube_service:{pod_filter}}} by {{kube_namespace}}"
-                    body_cpu_fb = _build_combined_metrics_request(v2_from_ms, v2_to_ms, fb_cpu_usage, fb_cpu_limits)
-                    r_cpu_fb = await client.post(V2_TIMESERIES_URL, headers=headers, json=body_cpu_fb, timeout=60.0)
-                    r_cpu_fb.raise_for_status()
-                    attrs_fb = r_cpu_fb.json().get("data", {}).get("attributes", {})
+                    attrs_fb = _unwrap(cpu_fb_result)
                     pod_cpu_usage_series, pod_cpu_limits_series = _extract_series_with_limits(
                         attrs_fb, pod_id_tag_keys, default_identifier=normalized_filter
                     )
@@ -619,15 +1179,10 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
                 continue
 
             # 2b) Memory request (usage + limits combined)
-            mem_usage_query, mem_limits_query = pod_mem_with_limits_query(kube_namespace, pod_filter)
-            body_mem = _build_combined_metrics_request(v2_from_ms, v2_to_ms, mem_usage_query, mem_limits_query)
-
             pod_mem_usage_series: Dict[str, List[Tuple[int, float]]] = {}
             pod_mem_limits_series: Dict[str, List[Tuple[int, float]]] = {}
             try:
-                r_mem = await client.post(V2_TIMESERIES_URL, headers=headers, json=body_mem, timeout=60.0)
-                r_mem.raise_for_status()
-                attrs = r_mem.json().get("data", {}).get("attributes", {})
+                attrs = _unwrap(mem_result)
                 pod_mem_usage_series, pod_mem_limits_series = _extract_series_with_limits(
                     attrs, pod_id_tag_keys, default_identifier=normalized_filter
                 )
@@ -637,16 +1192,7 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
                 if not pod_mem_usage_series:
                     warnings.append(f"Pod '{pod_filter}': primary Memory query (by kube_service) returned no data; retrying with fallback (by kube_pod_name)")
                     await ctx.warning(warnings[-1])
-                    if kube_namespace:
-                        fb_mem_usage = f"sum:kubernetes.memory.usage{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_pod_name}}"
-                        fb_mem_limits = f"sum:kubernetes.memory.limits{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_pod_name}}"
-                    else:
-                        fb_mem_usage = f"sum:kubernetes.memory.usage{{kube_service:{pod_filter}}} by {{kube_pod_name}}"
-                        fb_mem_limits = f"sum:kubernetes.memory.limits{{kube_service:{pod_filter}}} by {{kube_pod_name}}"
-                    body_mem_fb = _build_combined_metrics_request(v2_from_ms, v2_to_ms, fb_mem_usage, fb_mem_limits)
-                    r_mem_fb = await client.post(V2_TIMESERIES_URL, headers=headers, json=body_mem_fb, timeout=60.0)
-                    r_mem_fb.raise_for_status()
-                    attrs_fb = r_mem_fb.json().get("data", {}).get("attributes", {})
+                    attrs_fb = _unwrap(mem_fb_result)
                     pod_mem_usage_series, pod_mem_limits_series = _extract_series_with_limits(
                         attrs_fb, pod_id_tag_keys, default_identifier=normalized_filter
                     )
@@ -762,10 +1308,81 @@ async def collect_kubernetes_metrics(env_name: str, start_time: str, end_time: s
         "date_range": {"start": str(start_time), "end": str(end_time), "tz": tz_label},
         "aggregates": aggregates,
         "warnings": warnings,
+        "cache": _cache_summary(limiter),
     }
 
     return {"files": files, "summary": summary}
 
+async def _fetch_service_series(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    env_tag: str,
+    from_ms: int,
+    to_ms: int,
+    svc_filters: List[str],
+) -> List[Tuple[Any, Any]]:
+    """Fetch (cpu_attrs, mem_attrs) for every service filter, concurrently."""
+    cpu_results, mem_results = await asyncio.gather(
+        _fetch_combined_series(client, limiter, headers, from_ms, to_ms,
+                               [svc_cpu_with_limits_query(env_tag, f) for f in svc_filters]),
+        _fetch_combined_series(client, limiter, headers, from_ms, to_ms,
+                               [svc_mem_with_limits_query(env_tag, f) for f in svc_filters]),
+    )
+    return list(zip(cpu_results, mem_results))
+
+
+async def _fetch_pod_series(
+    client: httpx.AsyncClient,
+    limiter: Dict[str, Any],
+    headers: Dict[str, str],
+    kube_namespace: Optional[str],
+    from_ms: int,
+    to_ms: int,
+    pod_filters: List[str],
+) -> List[Tuple[Tuple[Any, Any], Tuple[Any, Any]]]:
+    """
+    Fetch CPU and Memory attributes for every pod filter, concurrently.
+
+    Pods whose primary (by kube_service) query returns no usage data also
+    get their fallback query issued here, so the caller never waits on a
+    request. Returns ((cpu, cpu_fallback), (mem, mem_fallback)) per pod;
+    a fallback is None when it was not needed.
+    """
+    pod_id_tag_keys = ["kube_service", "kube_pod_name", "kube_container_name"]
+
+    async def _with_fallbacks(primary: List[Any], fallback_query) -> List[Tuple[Any, Any]]:
+        needs_fallback = []
+        for pod_filter, result in zip(pod_filters, primary):
+            if isinstance(result, Exception):
+                continue
+            try:
+                usage, _ = _extract_series_with_limits(result, pod_id_tag_keys, default_identifier=pod_filter.rstrip("*"))
+            except Exception:
+                continue  # reported when the caller parses the same response
+            if not usage:
+                needs_fallback.append(pod_filter)
+
+        fallback_results = await _fetch_combined_series(
+            client, limiter, headers, from_ms, to_ms,
+            [fallback_query(kube_namespace, f) for f in needs_fallback],
+        )
+        fallbacks = dict(zip(needs_fallback, fallback_results))
+        return [(result, fallbacks.get(f)) for f, result in zip(pod_filters, primary)]
+
+    async def _cpu():
+        primary = await _fetch_combined_series(client, limiter, headers, from_ms, to_ms,
+                                               [pod_cpu_with_limits_query(kube_namespace, f) for f in pod_filters])
+        return await _with_fallbacks(primary, pod_cpu_fallback_query)
+
+    async def _mem():
+        primary = await _fetch_combined_series(client, limiter, headers, from_ms, to_ms,
+                                               [pod_mem_with_limits_query(kube_namespace, f) for f in pod_filters])
+        return await _with_fallbacks(primary, pod_mem_fallback_query)
+
+    cpu_results, mem_results = await asyncio.gather(_cpu(), _mem())
+    return list(zip(cpu_results, mem_results))
+
 # -----------------------------
 # Query builder functions
 # -----------------------------
@@ -893,6 +1510,34 @@ def pod_mem_with_limits_query(kube_namespace: Optional[str], pod_filter: str) ->
     return usage, limits
 
 
+def pod_cpu_fallback_query(kube_namespace: Optional[str], pod_filter: str) -> Tuple[str, str]:
+    """
+    Return (usage_query, limits_query) for the pod CPU fallback, grouped by
+    kube_namespace. Used when the kube_service grouping returns no usage data.
+    """
+    if kube_namespace:
+        usage = f"avg:kubernetes.cpu.usage.total{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_namespace}}"
+        limits = f"sum:kubernetes.cpu.limits{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_namespace}}"
+    else:
+        usage = f"avg:kubernetes.cpu.usage.total{{kube_service:{pod_filter}}} by {{kube_namespace}}"
+        limits = f"sum:kubernetes.cpu.limits{{kube_service:{pod_filter}}} by {{kube_namespace}}"
+    return usage, limits
+
+
+def pod_mem_fallback_query(kube_namespace: Optional[str], pod_filter: str) -> Tuple[str, str]:
+    """
+    Return (usage_query, limits_query) for the pod Memory fallback, grouped by
+    kube_pod_name. Used when the kube_service grouping returns no usage data.
+    """
+    if kube_namespace:
+        usage = f"sum:kubernetes.memory.usage{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_pod_name}}"
+        limits = f"sum:kubernetes.memory.limits{{kube_service:{pod_filter},kube_namespace:{kube_namespace}}} by {{kube_pod_name}}"
+    else:
+        usage = f"sum:kubernetes.memory.usage{{kube_service:{pod_filter}}} by {{kube_pod_name}}"
+        limits = f"sum:kubernetes.memory.limits{{kube_service:{pod_filter}}} by {{kube_pod_name}}"
+    return usage, limits
+
+
 # Small helper to normalize v2 timeseries into: { identifier -> [(ts_ms, value), ...] }
 def _extract_series(attrs: Dict[str, Any], id_tag_keys: List[str]) -> Dict[str, List[Tuple[int, float]]]:
     times = attrs.get("times", []) or []
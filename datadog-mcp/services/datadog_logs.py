@@ -2,13 +2,24 @@ import httpx
 import json
 import csv
 import os
+import asyncio
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Optional, Union
 from dotenv import load_dotenv
 from pathlib import Path
 from fastmcp import FastMCP, Context    # ✅ FastMCP 2.x import
 from utils.config import load_config
 from utils.datadog_config_loader import load_environment_json, load_custom_queries_json
+from services.datadog_api import _dd_request, _new_request_limiter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    _PYARROW_AVAILABLE = False
 
 # -----------------------------------------------
 # Bootstrap
@@ -20,6 +31,20 @@ artifacts_base = config["artifacts"]["artifacts_path"]
 environments_json_path = config["datadog"]["environments_json_path"]
 configured_tz = config.get("datadog", {}).get("time_zone", "UTC")
 log_page_limit = config.get("datadog", {}).get("log_page_limit", 1000)
+log_max_total = int(dd_config.get("log_max_total", 100000) or 0)      # 0 = no cap
+log_time_slices = max(1, int(dd_config.get("log_time_slices", 8)))
+log_write_parquet = bool(dd_config.get("log_write_parquet", True))
+
+# Shortest sub-interval worth its own cursor chain
+MIN_LOG_SLICE_MS = 60 * 1000
+# Rows per Parquet row group when merging the slice files
+PARQUET_BATCH_ROWS = 50000
+
+LOG_CSV_FIELDS = [
+    'env_name', 'env_tag', 'query_type', 'id', 'timestamp_utc', 'message', 'status',
+    'service', 'host', 'level', 'source', 'http_status_code', 'http_method',
+    'error_kind', 'custom_attributes'
+]
 
 DD_API_KEY = os.getenv("DD_API_KEY")
 DD_APP_KEY = os.getenv("DD_APP_KEY")
@@ -170,54 +195,34 @@ def _parse_logs_response(response_json: dict) -> Tuple[List[dict], Optional[str]
     
     return logs, next_cursor
 
-def _logs_to_csv(logs: List[dict], env_name: str, env_tag: str, query_type: str) -> str:
+def _log_to_row(log: dict, env_name: str, env_tag: str, query_type: str) -> dict:
     """
-    Convert logs to CSV format.
+    Convert one parsed log entry to a CSV row (LOG_CSV_FIELDS).
     Args:
-        logs (List[dict]): List of log entries.
+        log (dict): Log entry from _parse_logs_response().
         env_name (str): Environment name.
         env_tag (str): Environment tag.
         query_type (str): Query type used to fetch logs.
     Returns:
-        str: CSV formatted string of logs.
+        dict: CSV row keyed by LOG_CSV_FIELDS.
     """
-    if not logs:
-        return "env_name,env_tag,query_type,id,timestamp_utc,message,status,service,host,level,source,http_status_code,http_method,error_kind,custom_attributes\n"
-    
-    csv_rows = []
-    fieldnames = [
-        'env_name', 'env_tag', 'query_type', 'id', 'timestamp_utc', 'message', 'status', 
-        'service', 'host', 'level', 'source', 'http_status_code', 'http_method', 
-        'error_kind', 'custom_attributes'
-    ]
-    
-    for log in logs:
-        row = {
-            'env_name': env_name,
-            'env_tag': env_tag,
-            'query_type': query_type,
-            'id': log.get('id', ''),
-            'timestamp_utc': log.get('timestamp', ''),
-            'message': log.get('message', '').replace('\n', ' ').replace('\r', ' ')[:500],  # Truncate long messages
-            'status': log.get('status', ''),
-            'service': log.get('service', ''),
-            'host': log.get('host', ''),
-            'level': log.get('level', ''),
-            'source': log.get('source', ''),
-            'http_status_code': log.get('http_status_code', ''),
-            'http_method': log.get('http_method', ''),
-            'error_kind': log.get('error_kind', ''),
-            'custom_attributes': log.get('custom_attributes', '')
-        }
-        csv_rows.append(row)
-    
-    # Generate CSV content
-    import io
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(csv_rows)
-    return output.getvalue()
+    return {
+        'env_name': env_name,
+        'env_tag': env_tag,
+        'query_type': query_type,
+        'id': log.get('id', ''),
+        'timestamp_utc': log.get('timestamp', ''),
+        'message': log.get('message', '').replace('\n', ' ').replace('\r', ' ')[:500],  # Truncate long messages
+        'status': log.get('status', ''),
+        'service': log.get('service', ''),
+        'host': log.get('host', ''),
+        'level': log.get('level', ''),
+        'source': log.get('source', ''),
+        'http_status_code': log.get('http_status_code', ''),
+        'http_method': log.get('http_method', ''),
+        'error_kind': log.get('error_kind', ''),
+        'custom_attributes': log.get('custom_attributes', '')
+    }
 
 def _normalize_timestamp(timestamp: str) -> str:
     """
@@ -268,6 +273,22 @@ def _iso_to_epoch_ms(iso_timestamp: str) -> str:
     dt = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
     return str(int(dt.timestamp() * 1000))
 
+def _epoch_ms_to_iso(epoch_ms: int) -> str:
+    """Convert epoch milliseconds to ISO 8601 (UTC), keeping milliseconds only when non-zero."""
+    dt = datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc)
+    if epoch_ms % 1000:
+        return dt.strftime('%Y-%m-%dT%H:%M:%S.') + f"{epoch_ms % 1000:03d}Z"
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _slice_window(start_ms: int, end_ms: int, slices: int) -> List[Tuple[int, int]]:
+    """
+    Split [start_ms, end_ms] into up to `slices` contiguous sub-intervals of at
+    least MIN_LOG_SLICE_MS each, in time order.
+    """
+    slices = max(1, min(slices, (end_ms - start_ms) // MIN_LOG_SLICE_MS))
+    bounds = [start_ms + (end_ms - start_ms) * i // slices for i in range(slices + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
 async def _is_custom_query(query_type: str, custom_query: Optional[str] = None) -> bool:
     """
     Determine if a query type is a custom query (eligible for POST search fallback).
@@ -283,110 +304,242 @@ async def _is_custom_query(query_type: str, custom_query: Optional[str] = None)
     log_queries = (custom_queries_config or {}).get("log_queries", {}) or {}
     return query_type in log_queries
 
-async def _post_search_logs(
-    query: str,
-    start_iso: str,
-    end_iso: str,
-    headers: dict,
-    ctx: Context,
-    verify_ssl,
-) -> Tuple[List[dict], int]:
+def _new_log_sink(env_name: str, env_tag: str, query_type: str, parts: int) -> Dict[str, Any]:
+    """
+    Shared state of one collection with `parts` slice files, indexed by
+    their position in the merge (their priority): the priority of the first
+    part that wrote each log id, per-part counters, and the summary
+    counters filled in by _merge_log_parts().
     """
-    Execute a POST search against /api/v2/logs/events/search.
+    return {
+        'row_args': (env_name, env_tag, query_type),
+        'seen_ids': {},
+        'unique': [0] * parts,      # ids first written by this part
+        'kept': [0] * parts,        # rows of the part in the final CSV
+        'duplicates': [0] * parts,  # rows dropped as already seen
+        'cut': [False] * parts,     # rows left out of the CSV by the cap
+        'written': 0,
+        'status_counts': {},
+        'level_counts': {},
+        'service_counts': {},
+    }
 
-    Used as a fallback for custom queries when the GET endpoint returns
-    incomplete results. Handles pagination via cursor in the JSON body.
+def _sink_full(sink: Dict[str, Any], priority: Optional[int] = None) -> bool:
+    """
+    True once the parts merged up to and including `priority` (all parts
+    when None) hold log_max_total distinct logs, so later logs cannot make
+    it into the CSV.
+    """
+    if not log_max_total:
+        return False
+    unique = sink['unique'] if priority is None else sink['unique'][:priority + 1]
+    return sum(unique) >= log_max_total
+
+def _sink_logs(sink: Dict[str, Any], priority: int, logs: List[dict], writer) -> Tuple[int, bool]:
+    """
+    Write the logs of part `priority` that no earlier part has written,
+    until _sink_full() for that part. Returns (written, stopped), where
+    stopped means the cap cut the page short.
+    """
+    seen_ids = sink['seen_ids']
+    written = 0
+    for log in logs:
+        log_id = log.get('id')
+        owner = seen_ids.get(log_id) if log_id else None
+        if owner is not None and owner <= priority:
+            sink['duplicates'][priority] += 1
+            continue
+        if _sink_full(sink, priority):
+            return written, True
+        if owner is not None:
+            # A later part wrote it first; it is dropped from that part at merge
+            sink['unique'][owner] -= 1
+        if log_id:
+            seen_ids[log_id] = priority
+        sink['unique'][priority] += 1
+        writer.writerow(_log_to_row(log, *sink['row_args']))
+        written += 1
+    return written, False
+
+async def _fetch_log_slice(
+    fetch_page: Callable[[Optional[str]], Awaitable[dict]],
+    sink: Dict[str, Any],
+    priority: int,
+    part_path: Path,
+    ctx: Context,
+    error_label: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Follow one sub-interval's cursor chain, writing each page to `part_path`
+    as it arrives (CSV rows, no header). The slice stops early once the
+    parts merged before it, and its own, reach log_max_total.
 
     Args:
-        query: Datadog log query string.
-        start_iso: Start timestamp in ISO 8601 format (converted to epoch ms internally).
-        end_iso: End timestamp in ISO 8601 format (converted to epoch ms internally).
-        headers: HTTP headers dict with DD API/APP keys.
+        fetch_page: Returns the response JSON for a cursor (None = first page).
+        sink: Shared state from _new_log_sink().
+        priority: Position of `part_path` in the merge order.
+        part_path: Slice file, merged by _merge_log_parts().
         ctx: Workflow context for logging.
-        verify_ssl: SSL verification setting (bool or path string).
+        error_label: When set, HTTP errors are reported with this label and
+            end the slice instead of propagating.
 
     Returns:
-        Tuple of (logs_list, pages_fetched). Returns empty list on failure
-        so the caller can fall back to GET-only results.
+        dict: pages, fetched (raw logs returned), written, and stopped
+            (1 if the cap ended the slice before its last page).
     """
-    start_ms = _iso_to_epoch_ms(start_iso)
-    end_ms = _iso_to_epoch_ms(end_iso)
-
-    body = {
-        "filter": {
-            "query": query,
-            "from": start_ms,
-            "to": end_ms,
-        },
-        "sort": "-timestamp",
-        "page": {
-            "limit": min(log_page_limit, 1000),
-        },
-    }
-
-    all_logs: List[dict] = []
-    page_count = 0
-
-    timeout_config = httpx.Timeout(30.0, connect=10.0)
-    async with httpx.AsyncClient(verify=verify_ssl, timeout=timeout_config) as client:
-        while len(all_logs) < log_page_limit and page_count < 10:
-            page_count += 1
-
+    counts = {'pages': 0, 'fetched': 0, 'written': 0, 'stopped': 0}
+    cursor = None
+    with open(part_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=LOG_CSV_FIELDS)
+        while not _sink_full(sink, priority):
             try:
-                response = await client.post(
-                    V2_LOGS_SEARCH_URL, headers=headers, json=body
-                )
-                response.raise_for_status()
-                response_json = response.json()
-
-                logs, next_cursor = _parse_logs_response(response_json)
-                all_logs.extend(logs)
-
-                if not next_cursor:
-                    break
-
-                body["page"]["cursor"] = next_cursor
-
+                response_json = await fetch_page(cursor)
             except httpx.HTTPStatusError as e:
-                await ctx.error(
-                    f"POST search HTTP error: {e.response.status_code} — {e.response.text}"
-                )
+                if error_label is None:
+                    raise
+                await ctx.error(f"{error_label} HTTP error: {e.response.status_code} — {e.response.text}")
                 break
             except httpx.RequestError as e:
-                await ctx.error(f"POST search request failed: {str(e)}")
+                if error_label is None:
+                    raise
+                await ctx.error(f"{error_label} request failed: {str(e)}")
                 break
 
-    return all_logs, page_count
+            logs, cursor = _parse_logs_response(response_json)
+            counts['pages'] += 1
+            counts['fetched'] += len(logs)
+            written, stopped = _sink_logs(sink, priority, logs, writer)
+            counts['written'] += written
 
-def _deduplicate_logs(
-    primary_logs: List[dict], secondary_logs: List[dict]
-) -> Tuple[List[dict], int]:
+            if stopped:
+                counts['stopped'] = 1
+                break
+            if not cursor:
+                break
+        else:
+            counts['stopped'] = 1
+    return counts
+
+async def _fetch_log_slices(
+    slice_fetchers: List[Callable[[Optional[str]], Awaitable[dict]]],
+    sink: Dict[str, Any],
+    priorities: List[int],
+    part_paths: List[Path],
+    ctx: Context,
+    error_label: Optional[str] = None,
+) -> List[Dict[str, int]]:
     """
-    Merge two log lists, deduplicating by log 'id'.
-    Primary logs take precedence; secondary logs are appended only if their
-    id is not already present in the primary set.
-
-    Args:
-        primary_logs: First log list (GET results) — all entries are kept.
-        secondary_logs: Second log list (POST results) — only unique entries are appended.
+    Run every slice's cursor chain concurrently (requests are bounded by the
+    shared limiter) and return each slice's counters, in input order. If a
+    slice raises, the others are cancelled and the error propagates.
+    """
+    tasks = [
+        asyncio.ensure_future(_fetch_log_slice(fetch_page, sink, priority, part_path, ctx, error_label))
+        for fetch_page, priority, part_path in zip(slice_fetchers, priorities, part_paths)
+    ]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
-    Returns:
-        Tuple of (merged_logs, duplicate_count_removed).
+def _sum_slice_counts(results: List[Dict[str, int]]) -> Dict[str, int]:
+    totals = {'pages': 0, 'fetched': 0, 'written': 0, 'stopped': 0}
+    for counts in results:
+        for name, value in counts.items():
+            totals[name] += value
+    return totals
+
+def _merge_log_parts(
+    part_paths: List[Path],
+    csv_path: Path,
+    parquet_path: Optional[Path],
+    sink: Dict[str, Any],
+) -> Optional[Path]:
     """
-    seen_ids = {log["id"] for log in primary_logs if log.get("id")}
-    unique_secondary = []
-    dup_count = 0
-
-    for log in secondary_logs:
-        log_id = log.get("id")
-        if log_id and log_id in seen_ids:
-            dup_count += 1
-        else:
-            if log_id:
-                seen_ids.add(log_id)
-            unique_secondary.append(log)
+    Concatenate slice files into the final CSV (header once) and, when
+    `parquet_path` is given and pyarrow is installed, a Parquet copy with
+    the same columns (all strings). Returns the Parquet path if written.
+
+    Rows are kept in `part_paths` order: the first row of each log id, up
+    to log_max_total rows, so a capped collection is one contiguous time
+    range. The sink's kept/duplicates counters and summary counts are
+    filled from the kept rows.
+    """
+    parquet_writer = None
+    if parquet_path is not None and _PYARROW_AVAILABLE:
+        schema = pa.schema([(name, pa.string()) for name in LOG_CSV_FIELDS])
+        parquet_writer = pq.ParquetWriter(str(parquet_path), schema)
+
+    def _flush(batch: List[List[str]]) -> None:
+        columns = list(zip(*batch))
+        parquet_writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(col, type=pa.string()) for col in columns], names=LOG_CSV_FIELDS
+        ))
+
+    id_pos = LOG_CSV_FIELDS.index('id')
+    status_pos = LOG_CSV_FIELDS.index('status')
+    level_pos = LOG_CSV_FIELDS.index('level')
+    service_pos = LOG_CSV_FIELDS.index('service')
+    kept_ids = set()
 
-    return primary_logs + unique_secondary, dup_count
+    try:
+        with open(csv_path, 'w', encoding='utf-8', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow(LOG_CSV_FIELDS)
+            batch: List[List[str]] = []
+            for priority, part_path in enumerate(part_paths):
+                with open(part_path, 'r', encoding='utf-8', newline='') as part:
+                    for row in csv.reader(part):
+                        if log_max_total and sink['written'] >= log_max_total:
+                            sink['cut'][priority] = True
+                            break
+                        log_id = row[id_pos]
+                        if log_id and log_id in kept_ids:
+                            sink['duplicates'][priority] += 1
+                            continue
+                        if log_id:
+                            kept_ids.add(log_id)
+                        writer.writerow(row)
+                        sink['written'] += 1
+                        sink['kept'][priority] += 1
+                        for counts, pos in (
+                            (sink['status_counts'], status_pos),
+                            (sink['level_counts'], level_pos),
+                            (sink['service_counts'], service_pos),
+                        ):
+                            counts[row[pos]] = counts.get(row[pos], 0) + 1
+                        if parquet_writer is not None:
+                            batch.append(row)
+                            if len(batch) >= PARQUET_BATCH_ROWS:
+                                _flush(batch)
+                                batch = []
+            if parquet_writer is not None and batch:
+                _flush(batch)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    return parquet_path if parquet_writer is not None else None
+
+def _slice_report(
+    method: str,
+    bounds: Tuple[int, int],
+    counts: Dict[str, int],
+    sink: Dict[str, Any],
+    priority: int,
+) -> Dict[str, Any]:
+    """Per-slice entry of the collect_logs() result."""
+    return {
+        'method': method,
+        'from': _epoch_ms_to_iso(bounds[0]),
+        'to': _epoch_ms_to_iso(bounds[1]),
+        'pages': counts['pages'],
+        'log_count': sink['kept'][priority],
+        'truncated': bool(counts['stopped']) or sink['cut'][priority],
+    }
 
 # -----------------------------------------------
 # Logs (v2) API - Search Logs
@@ -415,9 +568,14 @@ async def collect_logs(env_name: str, start_time: str, end_time: str, query_type
     Returns:
         dict: Dictionary containing:
             - 'csv_file': Path to output CSV file
+            - 'parquet_file': Path to the Parquet copy (None when disabled or pyarrow is not installed)
             - 'summary': Summary statistics (status_counts, level_counts, top_services)
-            - 'log_count': Total number of logs collected
+            - 'log_count': Total number of logs collected (deduplicated by id)
             - 'pages_fetched': Number of API pages retrieved
+            - 'truncated': True when collection stopped at log_max_total
+            - 'time_slices': Number of sub-intervals fetched in parallel
+            - 'slices': Per-slice method, from/to, pages, log_count and
+              truncated (logs of that slice missing because of the cap)
             - 'query': The actual query string used
             - 'time_range': Start/end timestamps used
             - 'env_name': Environment name
@@ -471,7 +629,6 @@ async def collect_logs(env_name: str, start_time: str, end_time: str, query_type
         await ctx.info(f"Fetching logs for {env_name} from {start_iso} to {end_iso}")
 
         # API request setup
-        url = V2_LOGS_URL
         headers = {
             'DD-API-KEY': DD_API_KEY,
             'DD-APPLICATION-KEY': DD_APP_KEY,
@@ -479,114 +636,144 @@ async def collect_logs(env_name: str, start_time: str, end_time: str, query_type
             'Accept': 'application/json'
         }
         
-        params = {
-            'filter[from]': start_iso,
-            'filter[to]': end_iso,
-            'filter[query]': query,
-            'page[limit]': min(log_page_limit, 1000),  # API max is 1000
-            'sort': 'timestamp'
-        }
-        
-        # Collect all logs with pagination
-        all_logs = []
-        next_cursor = None
-        page_count = 0
-        
-        verify_ssl = get_ssl_verify_setting()
-        async with httpx.AsyncClient(verify=verify_ssl) as client:
-            while len(all_logs) < log_page_limit and page_count < 10:  # Safety limit on pages
-                if next_cursor:
-                    params['page[cursor]'] = next_cursor
+        # Save to artifacts directory
+        if not run_id:
+            run_id = datetime.now().strftime('%Y-%m-%d_%H%M%S_UTC')
 
-                try:
-                    response = await client.get(url, headers=headers, params=params)
-                    response.raise_for_status()
-                    response_json = response.json()
-                    
-                    logs, next_cursor = _parse_logs_response(response_json)
-                    all_logs.extend(logs)
-                    page_count += 1
-                    
-                    if not next_cursor:
-                        break
-                
-                except httpx.RequestError as e:
-                    await ctx.error(f"HTTP request failed: {str(e)}")
-                    raise Exception(f"Datadog API request failed: {str(e)}")
-        
-        # Limit to requested number
-        all_logs = all_logs[:log_page_limit]
-        get_log_count = len(all_logs)
+        artifacts_path = Path(artifacts_base)
+        run_artifacts_dir = artifacts_path / run_id / 'datadog'
+        run_artifacts_dir.mkdir(parents=True, exist_ok=True)
+
+        # Generate filename
+        safe_query_type = query_type.replace('_', '-')
+        csv_filename = f"logs_{safe_query_type}_{env_name.lower()}.csv"
+        csv_filepath = run_artifacts_dir / csv_filename
+        parquet_filepath = csv_filepath.with_suffix('.parquet') if log_write_parquet else None
+
+        # Split the window into sub-intervals, each followed by its own cursor
+        # chain; pages are written to per-slice files as they arrive and
+        # deduplicated by log id across slices. Each slice file has a fixed
+        # place in the merge, so log_max_total keeps the first logs in that
+        # order rather than whichever slices answered first.
+        slices = _slice_window(int(_iso_to_epoch_ms(start_iso)), int(_iso_to_epoch_ms(end_iso)), log_time_slices)
+        page_limit = min(log_page_limit, 1000)  # API max is 1000
+        sink = _new_log_sink(env_name, env_tag, query_type, 2 * len(slices))
+        limiter = _new_request_limiter()
+
+        def _get_fetcher(from_ms: int, to_ms: int):
+            params = {
+                'filter[from]': _epoch_ms_to_iso(from_ms),
+                'filter[to]': _epoch_ms_to_iso(to_ms),
+                'filter[query]': query,
+                'page[limit]': page_limit,
+                'sort': 'timestamp'
+            }
+
+            async def _fetch_page(cursor: Optional[str]) -> dict:
+                page_params = {**params, 'page[cursor]': cursor} if cursor else params
+                response = await _dd_request(client, limiter, "GET", V2_LOGS_URL, headers=headers, params=page_params)
+                response.raise_for_status()
+                return response.json()
+            return _fetch_page
+
+        def _post_fetcher(from_ms: int, to_ms: int):
+            body = {
+                "filter": {"query": query, "from": str(from_ms), "to": str(to_ms)},
+                "sort": "-timestamp",
+                "page": {"limit": page_limit},
+            }
+
+            async def _fetch_page(cursor: Optional[str]) -> dict:
+                page_body = {**body, "page": {**body["page"], "cursor": cursor}} if cursor else body
+                response = await _dd_request(client, limiter, "POST", V2_LOGS_SEARCH_URL, headers=headers, json=page_body)
+                response.raise_for_status()
+                return response.json()
+            return _fetch_page
+
+        get_parts = [run_artifacts_dir / f".{csv_filename}.get{i}.part" for i in range(len(slices))]
+        post_parts = [run_artifacts_dir / f".{csv_filename}.post{i}.part" for i in range(len(slices))]
+        # GET sorts oldest first and POST search newest first, so GET slices
+        # are merged oldest first, then POST slices newest first.
+        get_priorities = list(range(len(slices)))
+        post_priorities = [2 * len(slices) - 1 - i for i in range(len(slices))]
+        merge_order = list(get_parts)
 
-        # --- POST search fallback for custom queries ---
         is_custom = await _is_custom_query(query_type, custom_query)
         post_log_count = 0
         dedup_count = 0
         post_search_used = False
         search_methods = ["GET"]
 
-        if is_custom:
-            post_search_used = True
-            search_methods.append("POST")
-
-            post_logs, post_pages = await _post_search_logs(
-                query=query,
-                start_iso=start_iso,
-                end_iso=end_iso,
-                headers=headers,
-                ctx=ctx,
-                verify_ssl=verify_ssl,
-            )
-            post_log_count = len(post_logs)
-            page_count += post_pages
-
-            if get_log_count == 0 and post_log_count > 0:
-                await ctx.info(
-                    f"GET returned 0 results; POST returned {post_log_count}. Using POST results."
+        verify_ssl = get_ssl_verify_setting()
+        timeout_config = httpx.Timeout(30.0, connect=10.0)
+        try:
+            async with httpx.AsyncClient(verify=verify_ssl, timeout=timeout_config) as client:
+                try:
+                    get_results = await _fetch_log_slices(
+                        [_get_fetcher(*bounds) for bounds in slices], sink, get_priorities, get_parts, ctx
+                    )
+                except httpx.RequestError as e:
+                    await ctx.error(f"HTTP request failed: {str(e)}")
+                    raise Exception(f"Datadog API request failed: {str(e)}")
+                get_counts = _sum_slice_counts(get_results)
+                get_log_count = get_counts['written']
+                page_count = get_counts['pages']
+
+                # --- POST search fallback for custom queries ---
+                # Used when the GET endpoint returns incomplete results; only
+                # logs not already returned by GET are added.
+                if is_custom and not _sink_full(sink):
+                    post_search_used = True
+                    search_methods.append("POST")
+
+                    post_results = await _fetch_log_slices(
+                        [_post_fetcher(*bounds) for bounds in slices], sink, post_priorities, post_parts, ctx,
+                        error_label="POST search",
+                    )
+                    merge_order += post_parts[::-1]
+                    post_counts = _sum_slice_counts(post_results)
+                    post_log_count = post_counts['fetched']
+                    page_count += post_counts['pages']
+
+                    if get_log_count == 0 and post_log_count > 0:
+                        await ctx.info(
+                            f"GET returned 0 results; POST returned {post_log_count}. Using POST results."
+                        )
+                    elif post_log_count == 0:
+                        await ctx.info("POST search also returned 0 results.")
+
+            # Write CSV (and Parquet) file
+            parquet_written = _merge_log_parts(merge_order, csv_filepath, parquet_filepath, sink)
+            get_log_count = sum(sink['kept'][:len(slices)])
+
+            slice_reports = [
+                _slice_report("GET", bounds, counts, sink, priority)
+                for bounds, counts, priority in zip(slices, get_results, get_priorities)
+            ]
+            if post_search_used:
+                slice_reports += [
+                    _slice_report("POST", bounds, counts, sink, priority)
+                    for bounds, counts, priority in zip(slices, post_results, post_priorities)
+                ]
+                dedup_count = sum(sink['duplicates'][len(slices):])
+            truncated = any(report['truncated'] for report in slice_reports)
+
+            if truncated:
+                cut = [f"{r['method']} {r['from']}–{r['to']}" for r in slice_reports if r['truncated']]
+                await ctx.warning(
+                    f"Log collection stopped at log_max_total ({log_max_total}) logs; "
+                    f"incomplete slices: {', '.join(cut)}"
                 )
-                all_logs = post_logs[:log_page_limit]
-            elif get_log_count > 0 and post_log_count > 0:
-                all_logs, dedup_count = _deduplicate_logs(all_logs, post_logs)
-                all_logs = all_logs[:log_page_limit]
-            elif post_log_count == 0:
-                await ctx.info("POST search also returned 0 results.")
-
-        await ctx.info(f"Retrieved {len(all_logs)} logs (final)")
+            await ctx.info(f"Retrieved {sink['written']} logs (final)")
+        finally:
+            for part_path in get_parts + post_parts:
+                if part_path.exists():
+                    part_path.unlink()
 
-        # Generate CSV content
-        csv_content = _logs_to_csv(all_logs, env_name, env_tag, query_type)
+        status_counts = sink['status_counts']
+        level_counts = sink['level_counts']
+        service_counts = sink['service_counts']
 
-        # Save to artifacts directory
-        if not run_id:
-            run_id = datetime.now().strftime('%Y-%m-%d_%H%M%S_UTC')
-        
-        artifacts_path = Path(artifacts_base)
-        run_artifacts_dir = artifacts_path / run_id / 'datadog'
-        run_artifacts_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate filename
-        safe_query_type = query_type.replace('_', '-')
-        csv_filename = f"logs_{safe_query_type}_{env_name.lower()}.csv"
-        csv_filepath = run_artifacts_dir / csv_filename
-        
-        # Write CSV file
-        with open(csv_filepath, 'w', encoding='utf-8', newline='') as f:
-            f.write(csv_content)
-
-        # Summary statistics
-        status_counts = {}
-        level_counts = {}
-        service_counts = {}
-        
-        for log in all_logs:
-            status = log.get('status', 'unknown')
-            level = log.get('level', 'unknown')
-            service = log.get('service', 'unknown')
-            
-            status_counts[status] = status_counts.get(status, 0) + 1
-            level_counts[level] = level_counts.get(level, 0) + 1
-            service_counts[service] = service_counts.get(service, 0) + 1
-        
         return {
             'env_name': env_name,
             'env_tag': env_tag,
@@ -596,9 +783,13 @@ async def collect_logs(env_name: str, start_time: str, end_time: str, query_type
                 'start': start_iso,
                 'end': end_iso
             },
-            'log_count': len(all_logs),
+            'log_count': sink['written'],
             'pages_fetched': page_count,
             'csv_file': str(csv_filepath),
+            'parquet_file': str(parquet_written) if parquet_written else None,
+            'truncated': truncated,
+            'time_slices': len(slices),
+            'slices': slice_reports,
             'run_id': run_id,
             'summary': {
                 'status_counts': status_counts,
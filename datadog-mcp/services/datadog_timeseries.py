@@ -15,13 +15,16 @@ from services.datadog_api import (
     _parse_to_utc,
     _ensure_artifacts_dir,
     _ensure_ready,
+    _cache_summary,
+    _fetch_timeseries_bodies,
+    _new_request_limiter,
+    _unwrap,
     _write_csv_header,
     _sanitize_filename,
     _normalize_k8s_filter,
     get_ssl_verify_setting,
     DD_API_KEY,
     DD_APP_KEY,
-    V2_TIMESERIES_URL,
 )
 
 # Group tag keys that represent actual container/pod identifiers.
@@ -150,18 +153,36 @@ async def collect_kpi_timeseries(
     }
     verify_ssl = get_ssl_verify_setting()
 
+    # Build every request (one per template entity, one per static group)
+    # and send them concurrently; results are processed in query order below.
+    group_entities: Dict[str, List[Tuple[str, Dict[str, str]]]] = {}
+    bodies: List[Dict[str, Any]] = []
+    for qn in query_names:
+        group = kpi_queries[qn]
+        interval = group.get("interval", 300000)
+        query_defs = group.get("queries", [])
+        formulas = group.get("formulas", [])
+        if _is_template_query(group):
+            group_entities[qn] = _resolve_entities(env_config, group, detected_scope)
+            for _, placeholders in group_entities[qn]:
+                substituted_queries = _substitute_placeholders(query_defs, placeholders, env_tag)
+                bodies.append(_build_kpi_request(v2_from_ms, v2_to_ms, substituted_queries, formulas, interval))
+        else:
+            bodies.append(_build_kpi_request(v2_from_ms, v2_to_ms, query_defs, formulas, interval))
+
     async with httpx.AsyncClient(verify=verify_ssl) as client:
+        limiter = _new_request_limiter()
+        results = iter(await _fetch_timeseries_bodies(client, limiter, headers, bodies))
+
         for qn in query_names:
             group = kpi_queries[qn]
             description = group.get("description", "")
-            interval = group.get("interval", 300000)
             query_defs = group.get("queries", [])
-            formulas = group.get("formulas", [])
 
             metric_names = [q["name"] for q in query_defs]
 
             if _is_template_query(group):
-                entities = _resolve_entities(env_config, group, detected_scope)
+                entities = group_entities[qn]
                 if not entities:
                     warn = f"Query group '{qn}': no matching entities in environment for placeholder iteration."
                     warnings.append(warn)
@@ -171,12 +192,9 @@ async def collect_kpi_timeseries(
                 datapoints_per_entity: Dict[str, int] = {}
                 for entity_name, placeholders in entities:
                     substituted_queries = _substitute_placeholders(query_defs, placeholders, env_tag)
-                    body = _build_kpi_request(v2_from_ms, v2_to_ms, substituted_queries, formulas, interval)
 
                     try:
-                        resp = await client.post(V2_TIMESERIES_URL, headers=headers, json=body, timeout=60.0)
-                        resp.raise_for_status()
-                        attrs = resp.json().get("data", {}).get("attributes", {})
+                        attrs = _unwrap(next(results))
                     except Exception as e:
                         warn = f"Query group '{qn}', entity '{entity_name}': API error — {e}"
                         warnings.append(warn)
@@ -206,12 +224,9 @@ async def collect_kpi_timeseries(
             else:
                 # Static query
                 target_entity = group.get("target_entity", qn)
-                body = _build_kpi_request(v2_from_ms, v2_to_ms, query_defs, formulas, interval)
 
                 try:
-                    resp = await client.post(V2_TIMESERIES_URL, headers=headers, json=body, timeout=60.0)
-                    resp.raise_for_status()
-                    attrs = resp.json().get("data", {}).get("attributes", {})
+                    attrs = _unwrap(next(results))
                 except Exception as e:
                     warn = f"Query group '{qn}' (static): API error — {e}"
                     warnings.append(warn)
@@ -275,6 +290,7 @@ async def collect_kpi_timeseries(
         "date_range": {"start": str(start_time), "end": str(end_time), "tz": tz_label},
         "per_query_summary": per_query_summary,
         "warnings": warnings,
+        "cache": _cache_summary(limiter),
     }
 
     return {"files": files, "summary": summary}
@@ -444,10 +460,10 @@ def _build_kpi_request(
     return {
         "data": {
             "type": "timeseries_request",
-            "interval": interval,
             "attributes": {
                 "from": from_ms,
                 "to": to_ms,
+                "interval": interval,
                 "queries": queries,
                 "formulas": list(formulas),
             }
@@ -0,0 +1,344 @@
+"""
+timeseries_cache.py
+
+Persistent, range-aware cache for Datadog metric queries, backed by SQLite.
+
+Entries are keyed by (request kind, API site, query, interval) and hold the
+points of every returned series together with the time ranges that have
+been fetched ("coverage"). A later request for the same query only needs to
+fetch the parts of its window that are not covered yet:
+
+    conn = get_timeseries_cache()
+    key = make_cache_key("v2", base_url, request_key, interval_ms)
+    for gap_from, gap_to in missing_ranges(conn, key, from_ms, to_ms):
+        ... fetch the gap, then store_segment(conn, key, gap_from, gap_to, series)
+    series = load_series(conn, key, from_ms, to_ms, interval_ms)
+
+Series are stored in a response-neutral form, ``(sid, meta, points)``:
+``sid`` identifies the series across fetches, ``meta`` is the JSON-able
+series metadata and ``points`` is a list of ``(ts_ms, value)`` with None for
+empty buckets. Converting to/from the v1/v2 response shapes is up to the
+caller (services/datadog_api.py).
+
+Coverage newer than ``settle_seconds`` is never recorded, so windows that
+touch the present are re-fetched until Datadog has finished ingesting them.
+Entries expire after ``ttl_hours`` and least-recently-used entries are
+evicted once the estimated size exceeds ``max_size_mb``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.config import load_config
+
+config = load_config()
+cache_cfg = config.get("metrics_cache", {}) or {}
+
+# Bump when the cached series of a key can no longer be trusted, so old
+# entries stop matching and age out (2: v2 rollup interval is now applied)
+_KEY_VERSION = 2
+
+# Rough on-disk cost of one point row (key, sid, ts, value + index overhead)
+_BYTES_PER_POINT = 64
+
+_CONNECTIONS: Dict[str, sqlite3.Connection] = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    key TEXT NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_key ON coverage (key);
+CREATE TABLE IF NOT EXISTS series (
+    key TEXT NOT NULL,
+    sid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    meta TEXT NOT NULL,
+    PRIMARY KEY (key, sid)
+);
+CREATE TABLE IF NOT EXISTS points (
+    key TEXT NOT NULL,
+    sid TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL,
+    PRIMARY KEY (key, sid, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+# -----------------------------------------------
+# Configuration
+# -----------------------------------------------
+
+def _cache_path() -> str:
+    return cache_cfg.get("path") or os.path.join(
+        config["artifacts"]["artifacts_path"], ".cache", "datadog_timeseries.sqlite"
+    )
+
+
+def _ttl_seconds() -> float:
+    return float(cache_cfg.get("ttl_hours", 168)) * 3600
+
+
+def _max_bytes() -> int:
+    return int(float(cache_cfg.get("max_size_mb", 512)) * 1024 * 1024)
+
+
+def _settle_ms() -> int:
+    return int(float(cache_cfg.get("settle_seconds", 300)) * 1000)
+
+
+def get_timeseries_cache() -> Optional[sqlite3.Connection]:
+    """
+    Return the shared cache connection, or None when metrics_cache.enabled
+    is false or the database cannot be opened.
+    """
+    if not cache_cfg.get("enabled", True):
+        return None
+
+    path = _cache_path()
+    conn = _CONNECTIONS.get(path)
+    if conn is not None:
+        return conn
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.executescript(_SCHEMA)
+        conn.commit()
+    except (OSError, sqlite3.Error):
+        return None
+
+    _CONNECTIONS[path] = conn
+    return conn
+
+
+def make_cache_key(kind: str, base_url: str, request_key: Any, interval_ms: int) -> str:
+    """Stable cache key for one entity's query (anything JSON-serializable)."""
+    raw = json.dumps([_KEY_VERSION, kind, base_url, request_key, int(interval_ms)], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# -----------------------------------------------
+# Coverage
+# -----------------------------------------------
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(conn: sqlite3.Connection, key: str, from_ms: int, to_ms: int) -> List[Tuple[int, int]]:
+    """
+    Return the sub-ranges of [from_ms, to_ms] not covered by the entry.
+
+    An entry older than ttl_hours is dropped first, so the whole window is
+    reported missing.
+    """
+    row = conn.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return [(from_ms, to_ms)]
+    if time.time() - row[0] > _ttl_seconds():
+        _delete_entry(conn, key)
+        conn.commit()
+        return [(from_ms, to_ms)]
+
+    covered = _merge_ranges(conn.execute(
+        "SELECT start_ms, end_ms FROM coverage WHERE key = ? AND end_ms > ? AND start_ms < ?",
+        (key, from_ms, to_ms),
+    ).fetchall())
+
+    gaps: List[Tuple[int, int]] = []
+    cursor = from_ms
+    for start, end in covered:
+        if start > cursor:
+            gaps.append((cursor, min(start, to_ms)))
+        cursor = max(cursor, end)
+        if cursor >= to_ms:
+            break
+    if cursor < to_ms:
+        gaps.append((cursor, to_ms))
+    return gaps
+
+
+# -----------------------------------------------
+# Read / write
+# -----------------------------------------------
+
+def store_segment(
+    conn: sqlite3.Connection,
+    key: str,
+    kind: str,
+    from_ms: int,
+    to_ms: int,
+    series: List[Tuple[str, Dict[str, Any], List[Tuple[int, Optional[float]]]]],
+) -> None:
+    """
+    Record the response for [from_ms, to_ms]: upsert every series and its
+    points, then mark the range as covered (up to now - settle_seconds).
+    """
+    now = time.time()
+    conn.execute(
+        "INSERT INTO entries (key, kind, created, last_used) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET last_used = excluded.last_used",
+        (key, kind, now, now),
+    )
+
+    next_position = conn.execute(
+        "SELECT COALESCE(MAX(position) + 1, 0) FROM series WHERE key = ?", (key,)
+    ).fetchone()[0]
+    for sid, meta, points in series:
+        existing = conn.execute("SELECT meta FROM series WHERE key = ? AND sid = ?", (key, sid)).fetchone()
+        if existing is None:
+            conn.execute(
+                "INSERT INTO series (key, sid, position, meta) VALUES (?, ?, ?, ?)",
+                (key, sid, next_position, json.dumps(meta)),
+            )
+            next_position += 1
+        else:
+            # Keep earlier metadata (e.g. units) when this segment has none
+            merged = {**json.loads(existing[0]), **{k: v for k, v in meta.items() if v is not None}}
+            conn.execute("UPDATE series SET meta = ? WHERE key = ? AND sid = ?", (json.dumps(merged), key, sid))
+        conn.executemany(
+            "INSERT OR REPLACE INTO points (key, sid, ts, value) VALUES (?, ?, ?, ?)",
+            [(key, sid, int(ts), value) for ts, value in points],
+        )
+
+    covered_to = min(to_ms, int(now * 1000) - _settle_ms())
+    if covered_to > from_ms:
+        conn.execute("INSERT INTO coverage (key, start_ms, end_ms) VALUES (?, ?, ?)", (key, from_ms, covered_to))
+
+    point_count = conn.execute("SELECT COUNT(*) FROM points WHERE key = ?", (key,)).fetchone()[0]
+    conn.execute("UPDATE entries SET bytes = ? WHERE key = ?", (point_count * _BYTES_PER_POINT, key))
+    conn.commit()
+
+
+def load_series(
+    conn: sqlite3.Connection,
+    key: str,
+    from_ms: int,
+    to_ms: int,
+    interval_ms: int,
+) -> List[Tuple[Dict[str, Any], List[Tuple[int, Optional[float]]]]]:
+    """
+    Return ``[(meta, points)]`` for the window, series in first-seen order.
+
+    A point is included when its bucket [ts, ts + interval_ms) overlaps the
+    window, which matches the buckets Datadog returns for that window.
+    Series with no points in the window (e.g. pods from an earlier run that
+    shares the key) are skipped, as a live fetch would not return them.
+    """
+    conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+    conn.commit()
+
+    result = []
+    for sid, meta in conn.execute(
+        "SELECT sid, meta FROM series WHERE key = ? ORDER BY position", (key,)
+    ).fetchall():
+        points = conn.execute(
+            "SELECT ts, value FROM points WHERE key = ? AND sid = ? AND ts > ? AND ts <= ? ORDER BY ts",
+            (key, sid, from_ms - interval_ms, to_ms),
+        ).fetchall()
+        if points:
+            result.append((json.loads(meta), points))
+    return result
+
+
+# -----------------------------------------------
+# Eviction and stats
+# -----------------------------------------------
+
+def _delete_entry(conn: sqlite3.Connection, key: str) -> None:
+    for table in ("entries", "coverage", "series", "points"):
+        conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+
+
+def drop_entry(conn: sqlite3.Connection, key: str) -> None:
+    """Remove one entry (points, coverage and series) from the cache."""
+    _delete_entry(conn, key)
+    conn.commit()
+
+
+def evict(conn: sqlite3.Connection) -> int:
+    """
+    Drop expired entries, then least-recently-used entries until the
+    estimated size is under max_size_mb. Returns the number removed.
+    """
+    removed = 0
+    expired = conn.execute(
+        "SELECT key FROM entries WHERE created < ?", (time.time() - _ttl_seconds(),)
+    ).fetchall()
+    for (key,) in expired:
+        _delete_entry(conn, key)
+        removed += 1
+
+    total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+    limit = _max_bytes()
+    if total > limit:
+        for key, size in conn.execute("SELECT key, bytes FROM entries ORDER BY last_used").fetchall():
+            _delete_entry(conn, key)
+            removed += 1
+            total -= size
+            if total <= limit:
+                break
+
+    if removed:
+        conn.commit()
+    return removed
+
+
+def record_stats(conn: sqlite3.Connection, counters: Dict[str, int]) -> None:
+    """Add a run's counters (hits, misses, ...) to the lifetime totals."""
+    conn.executemany(
+        "INSERT INTO stats (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        [(name, int(value)) for name, value in counters.items() if value],
+    )
+    conn.commit()
+
+
+def cache_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Lifetime counters plus the current size of the cache."""
+    entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM entries").fetchone()
+    counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+    path = _cache_path()
+    return {
+        "path": path,
+        "entries": entries,
+        "estimated_mb": round(size / (1024 * 1024), 3),
+        "file_mb": round(os.path.getsize(path) / (1024 * 1024), 3) if os.path.exists(path) else 0.0,
+        "max_size_mb": round(_max_bytes() / (1024 * 1024), 3),
+        "ttl_hours": _ttl_seconds() / 3600,
+        **counters,
+    }
+
+
+def clear_cache(conn: sqlite3.Connection) -> int:
+    """Remove every entry and reset the counters. Returns entries removed."""
+    entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    for table in ("entries", "coverage", "series", "points", "stats"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    conn.execute("VACUUM")
+    return entries
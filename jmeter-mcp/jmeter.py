@@ -26,6 +26,7 @@ from services.jmx_editor import (
     analyze_jmx_file as _analyze_jmx,
     add_jmx_component as _add_jmx_component,
     edit_jmx_component as _edit_jmx_component,
+    batch_edit_jmx_components as _batch_edit_jmx_components,
 )
 from services.jmx.component_registry import list_supported_components as _list_components
 
@@ -577,6 +578,52 @@ async def edit_jmeter_component(
     )
 
 
+@mcp.tool()
+async def batch_edit_jmeter_components(
+    test_run_id: str,
+    edits: list,
+    ctx: Context,
+    jmx_filename: str = "",
+    dry_run: bool = False,
+) -> dict:
+    """
+    Edit many JMeter components in a JMX script in one call.
+
+    Same operations as edit_jmeter_component, but the script is parsed,
+    backed up and saved once for the whole batch. Use this instead of
+    repeated edit_jmeter_component calls when changing many components.
+    All node_ids refer to the script as returned by analyze_jmeter_script;
+    if any edit is invalid or any node_id is unknown, nothing is changed.
+
+    Args:
+        test_run_id (str): Unique identifier for the test run.
+        edits (list): List of edit dicts, each with:
+            - "target_node_id": node_id of the component to edit
+            - "operations": list of operations, as for edit_jmeter_component
+        ctx (Context): FastMCP context for state/error details.
+        jmx_filename (str): Optional JMX filename override. If empty,
+            auto-discovers the most recent ai-generated script.
+        dry_run (bool): If True, validate and preview changes without
+            saving to disk. Default: False.
+
+    Returns:
+        dict: {
+            "status": "OK" | "ERROR",
+            "message": str,
+            "test_run_id": str,
+            "jmx_path": str,
+            "backup_path": str | None,
+            "dry_run": bool,
+            "edits_applied": int,
+            "operations_applied": int,
+            "change_summaries": list  (one per edit, as in edit_jmeter_component)
+        }
+    """
+    return await _batch_edit_jmx_components(
+        test_run_id, edits, jmx_filename, dry_run, ctx
+    )
+
+
 @mcp.tool()
 async def list_jmeter_component_types(
     ctx: Context,
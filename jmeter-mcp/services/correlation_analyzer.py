@@ -46,6 +46,7 @@ from services.correlations.extractors import (
     extract_sources,
 )
 from services.correlations.matchers import (
+    build_usage_index,
     detect_orphan_ids,
     extract_ids_from_request_url,
     find_usage_in_body,
@@ -80,6 +81,7 @@ __all__ = [
     "find_usage_in_headers",
     "find_usage_in_body",
     "find_usages",
+    "build_usage_index",
     "extract_ids_from_request_url",
     "detect_orphan_ids",
     # Utils
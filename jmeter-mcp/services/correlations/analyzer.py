@@ -29,7 +29,13 @@ from .extractors import (
     extract_oauth_params_from_request_urls,
     extract_sources_multi,
 )
-from .matchers import detect_orphan_ids, detect_progressive_auth_tokens, find_usages, resolve_best_source
+from .matchers import (
+    build_usage_index,
+    detect_orphan_ids,
+    detect_progressive_auth_tokens,
+    find_usages,
+    resolve_best_source,
+)
 from .naming import (
     generate_correlation_naming_entry,
     generate_variable_name,
@@ -234,11 +240,14 @@ def _find_correlations(network_data: Dict[str, Any]) -> Tuple[List[Dict[str, Any
     correlations: List[Dict[str, Any]] = []
     correlation_counter = 0
 
-    # Phase 2: Find usages and resolve best source for ambiguous values
+    # Phase 2: Find usages and resolve best source for ambiguous values.
+    # The request text is indexed once so each value only visits the
+    # requests that can contain it.
+    usage_index = build_usage_index(entries)
     for value_str, sources in source_groups.items():
         # Find usages forward from the earliest source for this value
         earliest = min(sources, key=lambda s: s.get("entry_index", 0))
-        all_usages = find_usages(earliest, entries)
+        all_usages = find_usages(earliest, entries, usage_index)
 
         # Check for OAuth form_post tokens (always emit, even without usages)
         form_post_source = next(
@@ -3,15 +3,26 @@ Phase 2 & 3: Usage detection and orphan ID detection.
 
 Phase 2: Find usages of source values in subsequent requests
 Phase 3: Detect orphan IDs (values in requests with no identifiable source)
+
+Phase 2 runs once per candidate value over all later requests. For large
+captures, build_usage_index() pre-computes a trigram index of the request
+text and pre-parses JSON bodies once, so each value is only matched
+against the few requests that can contain it.
 """
 
 import json
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from .classifiers import classify_value_type
 from .constants import EMAIL_RE, GUID_RE, JWT_RE, NUMERIC_ID_RE, SKIP_HEADERS_USAGE, SKIP_VALUES, ID_KEY_PATTERNS, SAML_PARAMS
-from .utils import value_matches, walk_json_all_values
+from .utils import normalize_for_comparison, value_matches, walk_json_all_values
+
+# Substring length used by the Phase 2 usage index
+_USAGE_GRAM_SIZE = 3
+
+# Trigrams intersected per value; more only narrows an already small set
+_USAGE_MAX_GRAMS = 4
 
 
 # === Phase 2: Usage Detection ===
@@ -89,8 +100,18 @@ def find_usage_in_headers(value_str: str, headers: Dict[str, Any]) -> List[Dict[
     return usages
 
 
-def find_usage_in_body(value_str: str, post_data: str) -> List[Dict[str, Any]]:
-    """Find value in request body."""
+def find_usage_in_body(
+    value_str: str,
+    post_data: str,
+    body_values: Optional[Dict[str, Tuple[str, str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find value in request body.
+
+    ``body_values`` is the pre-parsed form of a JSON body from
+    build_usage_index() (see _index_json_body); when omitted the body is
+    parsed here.
+    """
     usages = []
     
     if not post_data or not value_str:
@@ -101,25 +122,22 @@ def find_usage_in_body(value_str: str, post_data: str) -> List[Dict[str, Any]]:
         return usages
     
     # Try to parse as JSON for better location info
-    try:
-        json_data = json.loads(post_data)
-        # Search ALL values in JSON, not just ID-like keys
-        for json_path, value, key_name in walk_json_all_values(json_data):
-            str_value = str(value)
-            if str_value.lower() in SKIP_VALUES:
-                continue
-            # Use EXACT match for JSON values to avoid false positives
-            if str_value == value_str:
-                usages.append({
-                    "location_type": "request_body_json",
-                    "location_key": key_name,
-                    "location_json_path": json_path,
-                    "location_pattern": f"{key_name}={{VALUE}}",
-                    "request_example_fragment": post_data[:200],
-                })
-                return usages  # One match is enough
-    except (json.JSONDecodeError, TypeError):
-        pass
+    if body_values is None:
+        body_values = _index_json_body(post_data)
+
+    # Search ALL values in JSON, not just ID-like keys.
+    # Use EXACT match for JSON values to avoid false positives
+    json_match = body_values.get(value_str)
+    if json_match is not None:
+        json_path, key_name = json_match
+        usages.append({
+            "location_type": "request_body_json",
+            "location_key": key_name,
+            "location_json_path": json_path,
+            "location_pattern": f"{key_name}={{VALUE}}",
+            "request_example_fragment": post_data[:200],
+        })
+        return usages  # One match is enough
     
     # Fallback: plain text match
     if value_matches(value_str, post_data):
@@ -134,14 +152,122 @@ def find_usage_in_body(value_str: str, post_data: str) -> List[Dict[str, Any]]:
     return usages
 
 
+def _index_json_body(post_data: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Map each string form of a JSON body's values to the (json_path, key_name)
+    of its first occurrence, skipping SKIP_VALUES. Non-JSON bodies map to {}.
+    """
+    body_values: Dict[str, Tuple[str, str]] = {}
+    try:
+        json_data = json.loads(post_data)
+    except (json.JSONDecodeError, TypeError):
+        return body_values
+
+    for json_path, value, key_name in walk_json_all_values(json_data):
+        str_value = str(value)
+        if str_value.lower() in SKIP_VALUES:
+            continue
+        body_values.setdefault(str_value, (json_path, key_name))
+    return body_values
+
+
+def _entry_search_texts(entry: Dict[str, Any]) -> List[str]:
+    """
+    Every string a usage in this entry can be matched against: the URL,
+    non-plumbing header values and the body, each with its URL-decoded form.
+    """
+    texts: List[str] = []
+    haystacks = [entry.get("url", "") or "", entry.get("post_data") or ""]
+    for name, val in (entry.get("headers") or {}).items():
+        if val is not None and name.lower() not in SKIP_HEADERS_USAGE:
+            haystacks.append(str(val))
+
+    for haystack in haystacks:
+        if haystack:
+            texts.extend(normalize_for_comparison(haystack))
+    return texts
+
+
+def build_usage_index(
+    entries: List[Tuple[int, int, str, Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Build the Phase 2 search index for a capture, once per analysis.
+
+    Every usage find_usages() reports requires one form of the value (raw or
+    URL-decoded) to be a substring of one of the entry's search texts, so
+    the value's trigrams must all occur in that entry. The index maps each
+    trigram to the positions of the entries containing it, which lets
+    find_usages() skip every entry that cannot match while producing the
+    same usages in the same order. JSON request bodies are parsed once here
+    instead of once per (value, entry) pair.
+
+    Returns:
+        Dict with ``grams`` (trigram -> ascending entry positions) and
+        ``bodies`` (entry position -> pre-parsed JSON body values).
+    """
+    grams: Dict[str, List[int]] = {}
+    bodies: Dict[int, Dict[str, Tuple[str, str]]] = {}
+    n = _USAGE_GRAM_SIZE
+
+    for pos, (_entry_index, _step_number, _step_label, entry) in enumerate(entries):
+        entry_grams: Set[str] = set()
+        for text in _entry_search_texts(entry):
+            entry_grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+        for gram in entry_grams:
+            grams.setdefault(gram, []).append(pos)
+
+        post_data = entry.get("post_data") or ""
+        if post_data:
+            bodies[pos] = _index_json_body(post_data)
+
+    return {"grams": grams, "bodies": bodies}
+
+
+def _candidate_positions(value_str: str, usage_index: Dict[str, Any]) -> Optional[Set[int]]:
+    """
+    Entry positions that may contain value_str (raw or URL-decoded).
+    None means the value is too short to filter and every entry is a candidate.
+    """
+    grams = usage_index["grams"]
+    n = _USAGE_GRAM_SIZE
+    positions: Set[int] = set()
+
+    for form in normalize_for_comparison(value_str):
+        if len(form) < n:
+            return None
+        postings = []
+        for gram in {form[i:i + n] for i in range(len(form) - n + 1)}:
+            entry_positions = grams.get(gram)
+            if entry_positions is None:
+                postings = []
+                break
+            postings.append(entry_positions)
+        if not postings:
+            continue
+
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for entry_positions in postings[1:_USAGE_MAX_GRAMS]:
+            matches.intersection_update(entry_positions)
+            if not matches:
+                break
+        positions |= matches
+
+    return positions
+
+
 def find_usages(
     candidate: Dict[str, Any],
-    entries: List[Tuple[int, int, str, Dict[str, Any]]]
+    entries: List[Tuple[int, int, str, Dict[str, Any]]],
+    usage_index: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Phase 2: Find all usages of a candidate value in SUBSEQUENT requests.
     
     Only searches entries with index > candidate's entry_index (forward-only).
+    With a ``usage_index`` from build_usage_index(entries), only entries that
+    can contain the value are searched; the result is the same.
     """
     usages = []
     value_str = str(candidate.get("value", ""))
@@ -149,9 +275,17 @@ def find_usages(
     
     if not value_str:
         return usages
+
+    positions = None
+    bodies: Dict[int, Dict[str, Tuple[str, str]]] = {}
+    if usage_index is not None:
+        positions = _candidate_positions(value_str, usage_index)
+        bodies = usage_index["bodies"]
+    search = range(len(entries)) if positions is None else sorted(positions)
     
     usage_number = 0
-    for entry_index, step_number, step_label, entry in entries:
+    for pos in search:
+        entry_index, step_number, step_label, entry = entries[pos]
         # Forward-only: only search entries AFTER the source
         if entry_index <= source_entry_index:
             continue
@@ -163,7 +297,7 @@ def find_usages(
         local_usages = []
         local_usages.extend(find_usage_in_url(value_str, url))
         local_usages.extend(find_usage_in_headers(value_str, headers))
-        local_usages.extend(find_usage_in_body(value_str, post_data))
+        local_usages.extend(find_usage_in_body(value_str, post_data, bodies.get(pos)))
         
         for u in local_usages:
             usage_number += 1
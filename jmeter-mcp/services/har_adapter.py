@@ -11,17 +11,25 @@ High-level responsibilities:
 - Group entries into logical steps (by page, time gap, or single step)
 - Emit network_capture_<timestamp>.json under:
     artifacts/<run_id>/jmeter/network-capture/
+
+Entries are streamed from the HAR (utils/har_reader.py). Each kept entry is
+converted immediately and spooled to a temporary file; only a small record
+(pageref, startedDateTime, spool offset) stays in memory for step grouping.
+The capture JSON is then written step by step from the spool, so peak
+memory is bounded by the largest single entry rather than the whole HAR.
 """
 
 import json
 import logging
 import os
+import tempfile
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 from utils.config import load_config
+from utils.har_reader import open_har
 from services import network_capture
 
 logger = logging.getLogger(__name__)
@@ -42,10 +50,6 @@ _BINARY_MIME_PREFIXES = (
 
 _VALID_STRATEGIES = {"auto", "page", "time_gap", "single_step"}
 
-# File size thresholds (safeguard #4)
-_MAX_HAR_FILE_SIZE_BYTES = 200 * 1024 * 1024   # 200 MB — reject
-_WARN_HAR_FILE_SIZE_BYTES = 50 * 1024 * 1024   # 50 MB — warn
-
 # Required fields in each canonical capture entry (safeguard #3)
 _REQUIRED_ENTRY_FIELDS = {
     "request_id": str,
@@ -89,61 +93,54 @@ def convert_har_to_capture(
         FileNotFoundError: If HAR file doesn't exist.
         ValueError: If HAR file is invalid or contains no usable entries.
     """
-    har_data = _load_har_file(har_path)
-    log_obj = har_data["log"]
-    pages = log_obj.get("pages", [])
-    raw_entries = log_obj.get("entries", [])
-
-    entries_total = len(raw_entries)
-    logger.info("HAR loaded: %d entries, %d pages", entries_total, len(pages))
+    metadata, raw_entries = open_har(har_path)
+    pages = metadata["pages"]
 
     capture_config = dict(NETWORK_CAPTURE_CONFIG)
-    filtered_entries = [
-        e for e in raw_entries if _should_include_entry(e, capture_config)
-    ]
-    entries_filtered = entries_total - len(filtered_entries)
+    exclude_pseudo = capture_config.get("exclude_pseudo_headers", True)
 
-    if not filtered_entries:
-        raise ValueError(
-            f"No usable entries after filtering ({entries_total} total, "
-            f"{entries_filtered} filtered out). Check config.yaml filters."
-        )
+    with tempfile.TemporaryFile() as spool:
+        # Filter and convert while streaming; keep only grouping records
+        entries_total = 0
+        filtered_entries: List[Dict[str, Any]] = []
+        for entry in raw_entries:
+            entries_total += 1
+            if _should_include_entry(entry, capture_config):
+                filtered_entries.append(
+                    _spool_capture_entry(entry, spool, exclude_pseudo)
+                )
+        entries_filtered = entries_total - len(filtered_entries)
 
-    logger.info(
-        "After filtering: %d entries kept, %d filtered out",
-        len(filtered_entries), entries_filtered,
-    )
+        logger.info("HAR loaded: %d entries, %d pages", entries_total, len(pages))
 
-    strategy = _detect_step_strategy(filtered_entries, step_strategy)
-    logger.info("Step strategy resolved: '%s'", strategy)
+        if not filtered_entries:
+            raise ValueError(
+                f"No usable entries after filtering ({entries_total} total, "
+                f"{entries_filtered} filtered out). Check config.yaml filters."
+            )
 
-    if strategy == "page":
-        grouped = _group_entries_by_page(filtered_entries, pages, step_prefix)
-    elif strategy == "time_gap":
-        grouped = _group_entries_by_time_gap(
-            filtered_entries, time_gap_threshold_ms, step_prefix,
+        logger.info(
+            "After filtering: %d entries kept, %d filtered out",
+            len(filtered_entries), entries_filtered,
         )
-    else:
-        grouped = _group_entries_single_step(filtered_entries, step_prefix)
 
-    exclude_pseudo = capture_config.get("exclude_pseudo_headers", True)
-    per_step: Dict[str, List[Dict[str, Any]]] = {}
-    for step_idx, (step_label, entries_in_step) in enumerate(grouped.items(), start=1):
-        converted = []
-        for entry in entries_in_step:
-            capture_entry = _convert_entry_to_capture_format(
-                entry, step_idx, step_label, exclude_pseudo,
-            )
-            converted.append(capture_entry)
-        per_step[step_label] = converted
+        strategy = _detect_step_strategy(filtered_entries, step_strategy)
+        logger.info("Step strategy resolved: '%s'", strategy)
 
-    _validate_capture_output(per_step)
+        if strategy == "page":
+            grouped = _group_entries_by_page(filtered_entries, pages, step_prefix)
+        elif strategy == "time_gap":
+            grouped = _group_entries_by_time_gap(
+                filtered_entries, time_gap_threshold_ms, step_prefix,
+            )
+        else:
+            grouped = _group_entries_single_step(filtered_entries, step_prefix)
 
-    output_path = _write_step_network_capture(per_step, test_run_id)
+        output_path = _write_spooled_network_capture(grouped, spool, test_run_id)
     logger.info("Network capture written: %s", output_path)
 
-    har_version = log_obj.get("version", "unknown")
-    creator_obj = log_obj.get("creator", {})
+    har_version = metadata["version"]
+    creator_obj = metadata["creator"]
     har_creator = creator_obj.get("name", "unknown")
     _write_capture_manifest(
         run_id=test_run_id,
@@ -173,8 +170,18 @@ def validate_har_file(har_path: str) -> Dict[str, Any]:
     """
     errors: List[str] = []
 
+    capture_config = dict(NETWORK_CAPTURE_CONFIG)
+    entry_count = 0
+    filtered_count = 0
+    has_pages = False
+
     try:
-        har_data = _load_har_file(har_path)
+        metadata, entries = open_har(har_path)
+        for entry in entries:
+            entry_count += 1
+            if not _should_include_entry(entry, capture_config):
+                filtered_count += 1
+            has_pages = has_pages or bool(entry.get("pageref"))
     except (FileNotFoundError, ValueError) as exc:
         return {
             "valid": False,
@@ -186,26 +193,16 @@ def validate_har_file(har_path: str) -> Dict[str, Any]:
             "errors": [str(exc)],
         }
 
-    log_obj = har_data.get("log", {})
-    version = log_obj.get("version", "unknown")
-    pages = log_obj.get("pages", [])
-    entries = log_obj.get("entries", [])
+    version = metadata["version"]
+    pages = metadata["pages"]
 
     if version not in ("1.2", "1.1"):
         errors.append(f"Unexpected HAR version: {version}")
 
-    capture_config = dict(NETWORK_CAPTURE_CONFIG)
-    filtered_entries = [
-        e for e in entries if _should_include_entry(e, capture_config)
-    ]
-    filtered_count = len(entries) - len(filtered_entries)
-
-    has_pages = any(e.get("pageref") for e in entries)
-
     return {
         "valid": len(errors) == 0,
         "version": version,
-        "entry_count": len(entries),
+        "entry_count": entry_count,
         "page_count": len(pages),
         "has_pages": has_pages,
         "filtered_count": filtered_count,
@@ -213,59 +210,6 @@ def validate_har_file(har_path: str) -> Dict[str, Any]:
     }
 
 
-# ============================================================
-# Internal Functions — File Loading
-# ============================================================
-
-def _load_har_file(har_path: str) -> Dict[str, Any]:
-    """
-    Load, parse, and validate basic HAR JSON structure.
-
-    Includes file size guard (safeguard #4):
-    - Warns if file > 50MB
-    - Rejects if file > 200MB
-
-    Raises:
-        FileNotFoundError: If file does not exist.
-        ValueError: If file exceeds size limit or is not valid HAR JSON.
-    """
-    if not os.path.isfile(har_path):
-        raise FileNotFoundError(f"HAR file not found: {har_path}")
-
-    file_size = os.path.getsize(har_path)
-
-    if file_size > _MAX_HAR_FILE_SIZE_BYTES:
-        raise ValueError(
-            f"HAR file too large ({file_size / (1024*1024):.1f} MB). "
-            f"Maximum supported size is {_MAX_HAR_FILE_SIZE_BYTES / (1024*1024):.0f} MB."
-        )
-
-    if file_size > _WARN_HAR_FILE_SIZE_BYTES:
-        logger.warning(
-            "Large HAR file: %.1f MB — parsing may take a moment",
-            file_size / (1024 * 1024),
-        )
-
-    try:
-        with open(har_path, "r", encoding="utf-8", errors="replace") as f:
-            har_data = json.load(f)
-    except json.JSONDecodeError as exc:
-        raise ValueError(f"Invalid JSON in HAR file: {exc}") from exc
-
-    if not isinstance(har_data, dict) or "log" not in har_data:
-        raise ValueError(
-            "Invalid HAR structure: top-level object must contain a 'log' key"
-        )
-
-    log_obj = har_data["log"]
-    if "entries" not in log_obj:
-        raise ValueError(
-            "Invalid HAR structure: 'log' object must contain an 'entries' array"
-        )
-
-    return har_data
-
-
 # ============================================================
 # Internal Functions — Field Conversion
 # ============================================================
@@ -573,6 +517,35 @@ def _convert_entry_to_capture_format(
     }
 
 
+def _spool_capture_entry(
+    entry: Dict,
+    spool: IO[bytes],
+    exclude_pseudo_headers: bool = True,
+) -> Dict[str, Any]:
+    """
+    Convert a HAR entry and append it to the spool file as one JSON line.
+
+    The step is assigned later, once all entries have been grouped.
+    Returns the record used for grouping: the entry's pageref and
+    startedDateTime plus the spool offset of the converted entry.
+    """
+    capture_entry = _convert_entry_to_capture_format(
+        entry, 0, "", exclude_pseudo_headers,
+    )
+    offset = spool.tell()
+    spool.write(json.dumps(capture_entry).encode("utf-8") + b"\n")
+    return {
+        "pageref": entry.get("pageref", ""),
+        "startedDateTime": entry.get("startedDateTime", ""),
+        "spool_offset": offset,
+    }
+
+
+def _read_spooled_entry(spool: IO[bytes], offset: int) -> Dict[str, Any]:
+    spool.seek(offset)
+    return json.loads(spool.readline())
+
+
 # ============================================================
 # Internal Functions — Output (duplicated from playwright_adapter
 # to avoid coupling to private internals — safeguard #2)
@@ -610,20 +583,46 @@ def _get_network_capture_output_path(
     return os.path.join(base_dir, f"network_capture_{timestamp}.json")
 
 
-def _write_step_network_capture(
-    per_step_requests: Dict[str, List[Dict[str, Any]]],
+def _write_spooled_network_capture(
+    grouped: Dict[str, List[Dict[str, Any]]],
+    spool: IO[bytes],
     run_id: str,
     timestamp: Optional[str] = None,
 ) -> str:
     """
-    Write the step-aware mapping to a network capture JSON file.
+    Write the network capture JSON one entry at a time from the spool.
+
+    ``grouped`` maps step labels to grouping records from
+    _spool_capture_entry(). Each entry is read back, given its step
+    metadata, validated (safeguard #3) and appended to the file in the
+    layout json.dump(per_step, indent=2, ensure_ascii=False) produces. The
+    file is written under a temporary name and only moved into place once
+    every entry is valid; ``grouped`` must not be empty.
 
     Returns:
         The full path to the written JSON file.
     """
     output_path = _get_network_capture_output_path(run_id, timestamp)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(per_step_requests, f, indent=2, ensure_ascii=False)
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("{")
+            for step_idx, (step_label, records) in enumerate(grouped.items(), start=1):
+                f.write("," if step_idx > 1 else "")
+                f.write(f"\n  {json.dumps(step_label, ensure_ascii=False)}: [")
+                for idx, record in enumerate(records):
+                    entry = _read_spooled_entry(spool, record["spool_offset"])
+                    entry["step"] = _create_step_metadata(step_idx, step_label)
+                    _validate_capture_entry(entry, idx, step_label)
+                    entry_json = json.dumps(entry, indent=2, ensure_ascii=False)
+                    f.write("," if idx else "")
+                    f.write("\n    " + entry_json.replace("\n", "\n    "))
+                f.write("\n  ]")
+            f.write("\n}")
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     return output_path
 
 
@@ -631,47 +630,28 @@ def _write_step_network_capture(
 # Internal Functions — Validation (safeguard #3)
 # ============================================================
 
-def _validate_capture_output(per_step_data: Dict[str, List[Dict]]) -> None:
+def _validate_capture_entry(entry: Any, idx: int, step_label: str) -> None:
     """
-    Validate that the output matches the canonical network capture schema
-    before writing to disk.
-
-    Checks:
-    - Top-level keys are strings (step labels)
-    - Each step contains a list of entry dicts
-    - Each entry has all required fields with correct types
+    Validate a single capture entry against _REQUIRED_ENTRY_FIELDS.
 
     Raises:
-        ValueError: With a descriptive message if the schema is invalid.
+        ValueError: With a descriptive message if the entry is invalid.
     """
-    if not isinstance(per_step_data, dict):
-        raise ValueError("Capture output must be a dict (step_label -> entries)")
-
-    for step_label, entries in per_step_data.items():
-        if not isinstance(step_label, str):
-            raise ValueError(f"Step label must be a string, got: {type(step_label)}")
-
-        if not isinstance(entries, list):
+    if not isinstance(entry, dict):
+        raise ValueError(
+            f"Entry {idx} in '{step_label}' must be a dict, got: {type(entry)}"
+        )
+    for field, expected_type in _REQUIRED_ENTRY_FIELDS.items():
+        if field not in entry:
             raise ValueError(
-                f"Entries for '{step_label}' must be a list, got: {type(entries)}"
+                f"Entry {idx} in '{step_label}' missing required field: '{field}'"
+            )
+        if not isinstance(entry[field], expected_type):
+            raise ValueError(
+                f"Entry {idx} in '{step_label}' field '{field}' "
+                f"expected {expected_type.__name__}, "
+                f"got {type(entry[field]).__name__}"
             )
-
-        for idx, entry in enumerate(entries):
-            if not isinstance(entry, dict):
-                raise ValueError(
-                    f"Entry {idx} in '{step_label}' must be a dict, got: {type(entry)}"
-                )
-            for field, expected_type in _REQUIRED_ENTRY_FIELDS.items():
-                if field not in entry:
-                    raise ValueError(
-                        f"Entry {idx} in '{step_label}' missing required field: '{field}'"
-                    )
-                if not isinstance(entry[field], expected_type):
-                    raise ValueError(
-                        f"Entry {idx} in '{step_label}' field '{field}' "
-                        f"expected {expected_type.__name__}, "
-                        f"got {type(entry[field]).__name__}"
-                    )
 
 
 # ============================================================
@@ -27,6 +27,7 @@ from urllib.parse import urlparse
 from services import network_capture
 from services.jmx_editor import load_jmx, build_node_index, discover_jmx_file
 from utils.config import load_config
+from utils.har_reader import open_har
 
 logger = logging.getLogger(__name__)
 
@@ -41,9 +42,6 @@ _BINARY_MIME_PREFIXES = (
     "application/octet-stream",
 )
 
-_MAX_HAR_FILE_SIZE_BYTES = 200 * 1024 * 1024
-_WARN_HAR_FILE_SIZE_BYTES = 50 * 1024 * 1024
-
 
 def _get_comparison_config() -> dict:
     """Load har_jmx_comparison config with safe defaults."""
@@ -62,54 +60,6 @@ def _get_schema_depth() -> int:
 # Phase A — HAR Extraction
 # ============================================================
 
-def load_and_validate_har(har_path: str) -> Dict[str, Any]:
-    """
-    Load and validate a HAR file, returning the parsed JSON dict.
-
-    Replicates the same validation logic as har_adapter._load_har_file
-    without importing the private function.
-
-    Raises:
-        FileNotFoundError: If HAR file does not exist.
-        ValueError: If file exceeds size limit or is not valid HAR JSON.
-    """
-    if not os.path.isfile(har_path):
-        raise FileNotFoundError(f"HAR file not found: {har_path}")
-
-    file_size = os.path.getsize(har_path)
-
-    if file_size > _MAX_HAR_FILE_SIZE_BYTES:
-        raise ValueError(
-            f"HAR file too large ({file_size / (1024 * 1024):.1f} MB). "
-            f"Maximum supported size is {_MAX_HAR_FILE_SIZE_BYTES / (1024 * 1024):.0f} MB."
-        )
-
-    if file_size > _WARN_HAR_FILE_SIZE_BYTES:
-        logger.warning(
-            "Large HAR file: %.1f MB — parsing may take a moment",
-            file_size / (1024 * 1024),
-        )
-
-    try:
-        with open(har_path, "r", encoding="utf-8", errors="replace") as f:
-            har_data = json.load(f)
-    except json.JSONDecodeError as exc:
-        raise ValueError(f"Invalid JSON in HAR file: {exc}") from exc
-
-    if not isinstance(har_data, dict) or "log" not in har_data:
-        raise ValueError(
-            "Invalid HAR structure: top-level object must contain a 'log' key"
-        )
-
-    log_obj = har_data["log"]
-    if "entries" not in log_obj:
-        raise ValueError(
-            "Invalid HAR structure: 'log' object must contain an 'entries' array"
-        )
-
-    return har_data
-
-
 def _should_include_har_entry(entry: Dict, config: Dict) -> bool:
     """
     Determine if a HAR entry should be included in the comparison.
@@ -225,14 +175,16 @@ def extract_har_entries(har_path: str) -> Tuple[List[Dict[str, Any]], Dict[str,
     """
     Parse a HAR file and extract comparison-relevant fields from each entry.
 
+    Entries are streamed from the file, so only the extracted fields (not
+    the raw request/response bodies) are kept in memory.
+
     Returns:
         Tuple of (entries, metadata) where:
         - entries: list of normalized entry dicts
         - metadata: dict with har_file, entries_total, entries_after_filter
     """
-    har_data = load_and_validate_har(har_path)
-    raw_entries = har_data["log"].get("entries", [])
-    entries_total = len(raw_entries)
+    _metadata, raw_entries = open_har(har_path)
+    entries_total = 0
 
     capture_config = dict(NETWORK_CAPTURE_CONFIG)
     schema_depth = _get_schema_depth()
@@ -240,6 +192,7 @@ def extract_har_entries(har_path: str) -> Tuple[List[Dict[str, Any]], Dict[str,
     extracted: List[Dict[str, Any]] = []
 
     for idx, entry in enumerate(raw_entries):
+        entries_total += 1
         if not _should_include_har_entry(entry, capture_config):
             continue
 
@@ -467,6 +420,7 @@ def _walk_hierarchy_for_samplers(
     node_index: Dict[str, dict],
     root: ET.Element,
     parent_controller: Optional[str] = None,
+    elements: Optional[Dict[str, tuple]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Recursively walk the hierarchy to extract HTTP sampler details.
@@ -499,7 +453,7 @@ def _walk_hierarchy_for_samplers(
             ) if url_path_from_name else None
 
             body = None
-            elem_result = _find_element_by_node_id_lightweight(root, nid, node_index)
+            elem_result = _find_element_by_node_id_lightweight(root, nid, node_index, elements)
             if elem_result is not None:
                 body = _extract_request_body(elem_result)
 
@@ -526,7 +480,7 @@ def _walk_hierarchy_for_samplers(
 
         if node.get("children"):
             samplers.extend(_walk_hierarchy_for_samplers(
-                node["children"], node_index, root, current_controller,
+                node["children"], node_index, root, current_controller, elements,
             ))
 
     return samplers
@@ -536,15 +490,17 @@ def _find_element_by_node_id_lightweight(
     root: ET.Element,
     target_node_id: str,
     node_index: Dict[str, dict],
+    elements: Optional[Dict[str, tuple]] = None,
 ) -> Optional[ET.Element]:
     """
     Lightweight element lookup that returns just the XML element (not the full
-    triple) for body extraction. Uses the same walking logic as
-    jmx_editor.find_element_by_node_id but only returns the element itself.
+    triple) for body extraction. Uses jmx_editor.find_element_by_node_id
+    (a dict lookup when the ``elements`` map from build_node_index is given)
+    but only returns the element itself.
     """
     from services.jmx_editor import find_element_by_node_id
 
-    result = find_element_by_node_id(root, target_node_id, node_index)
+    result = find_element_by_node_id(root, target_node_id, node_index, elements)
     if result is not None:
         return result[0]
     return None
@@ -588,11 +544,12 @@ def extract_jmx_samplers(
         except (json.JSONDecodeError, OSError):
             logger.warning("Failed to read structure file, parsing JMX from scratch")
 
-    node_index, hierarchy = build_node_index(root)
+    elements: Dict[str, tuple] = {}
+    node_index, hierarchy = build_node_index(root, elements)
 
     # Even when using structure file, we rebuild from raw XML to get full
     # props (including body extraction which requires XML element access)
-    samplers = _walk_hierarchy_for_samplers(hierarchy, node_index, root)
+    samplers = _walk_hierarchy_for_samplers(hierarchy, node_index, root, elements=elements)
 
     metadata = {
         "jmx_file": os.path.basename(jmx_path),
@@ -624,30 +581,29 @@ def _pass1_exact_match(
 
     Only considers JMX samplers whose url_pattern contains no ${...}
     placeholders. Matching is case-insensitive on the normalized path.
+    Samplers are looked up by (method, normalized path); each HAR entry
+    takes the first still-unmatched sampler in JMX order.
     """
     matches: List[Dict[str, Any]] = []
 
-    static_samplers = [
-        s for s in jmx_samplers
-        if "${" not in s["url_pattern"] and s["node_id"] not in matched_jmx
-    ]
+    static_index: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for s in jmx_samplers:
+        if "${" not in s["url_pattern"] and s["node_id"] not in matched_jmx:
+            key = (s["method"], s["url_pattern_normalized"])
+            static_index.setdefault(key, []).append(s)
 
     for h_idx, har in enumerate(har_entries):
         if h_idx in matched_har:
             continue
-        for sampler in static_samplers:
+        for sampler in static_index.get((har["method"], har["url_path"]), ()):
             if sampler["node_id"] in matched_jmx:
                 continue
-            if (
-                har["method"] == sampler["method"]
-                and har["url_path"] == sampler["url_pattern_normalized"]
-            ):
-                matches.append(_build_match(
-                    har, sampler, h_idx, confidence="high", match_pass=1,
-                ))
-                matched_har.add(h_idx)
-                matched_jmx.add(sampler["node_id"])
-                break
+            matches.append(_build_match(
+                har, sampler, h_idx, confidence="high", match_pass=1,
+            ))
+            matched_har.add(h_idx)
+            matched_jmx.add(sampler["node_id"])
+            break
 
     return matches
 
@@ -664,6 +620,10 @@ def _pass2_parameterized_match(
     For JMX samplers with ${...} in the URL pattern (url_regex) or
     {param}/{{param}} in the sampler name (name_regex), match against
     HAR url_path + method.
+
+    Samplers are indexed in a path-segment trie (see _build_param_trie);
+    only the samplers the trie returns for a HAR path are tested with
+    their regexes, in JMX order.
     """
     matches: List[Dict[str, Any]] = []
 
@@ -671,17 +631,17 @@ def _pass2_parameterized_match(
         s for s in jmx_samplers
         if (s["url_regex"] or s["name_regex"]) and s["node_id"] not in matched_jmx
     ]
+    trie = _build_param_trie(param_samplers)
 
     for h_idx, har in enumerate(har_entries):
         if h_idx in matched_har:
             continue
 
         candidates: List[Dict[str, Any]] = []
-        for sampler in param_samplers:
+        for pos in _param_trie_candidates(trie, har["method"], har["url_path"]):
+            sampler = param_samplers[pos]
             if sampler["node_id"] in matched_jmx:
                 continue
-            if har["method"] != sampler["method"]:
-                continue
 
             matched_via = None
             if sampler["url_regex"]:
@@ -719,6 +679,112 @@ def _pass2_parameterized_match(
     return matches
 
 
+# Trie key for a path segment that is not a plain literal
+_TRIE_WILDCARD = None
+
+
+def _pattern_segments(pattern: str, placeholder_re: "re.Pattern") -> List[Optional[str]]:
+    """
+    Split a URL pattern into '/'-separated segments for the Pass 2 trie.
+
+    Mirrors the regexes built by _build_url_regex_from_pattern/_name: a
+    placeholder becomes [^/]+, so it never spans a '/'. Segments that are
+    pure ASCII literals are returned lowercased; segments containing a
+    placeholder or non-ASCII text (where IGNORECASE matching is not plain
+    lowercasing) are returned as _TRIE_WILDCARD.
+    """
+    segments: List[Optional[str]] = []
+    current: List[str] = []
+    wildcard = False
+    last_end = 0
+    pieces = []
+    for m in placeholder_re.finditer(pattern):
+        pieces.append((pattern[last_end:m.start()], True))
+        last_end = m.end()
+    pieces.append((pattern[last_end:], False))
+
+    for literal, followed_by_placeholder in pieces:
+        parts = literal.split("/")
+        for i, part in enumerate(parts):
+            if i > 0:
+                text = "".join(current)
+                segments.append(_TRIE_WILDCARD if wildcard or not text.isascii() else text.lower())
+                current, wildcard = [], False
+            current.append(part)
+        if followed_by_placeholder:
+            wildcard = True
+
+    text = "".join(current)
+    segments.append(_TRIE_WILDCARD if wildcard or not text.isascii() else text.lower())
+    return segments
+
+
+def _build_param_trie(param_samplers: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index Pass 2 samplers by method and URL path segments.
+
+    Each trie node is {"lit": {segment: node}, "any": node or None,
+    "end": [sampler positions]}. A sampler is inserted once per regex it
+    has (URL pattern and/or name), so the trie returns a superset of the
+    samplers whose regex can match a path with the same segment count.
+    """
+    tries: Dict[str, Dict[str, Any]] = {}
+    for pos, sampler in enumerate(param_samplers):
+        shapes = []
+        if sampler["url_regex"]:
+            shapes.append(_pattern_segments(sampler["url_pattern"], _VAR_PLACEHOLDER_RE))
+        if sampler["name_regex"]:
+            shapes.append(_pattern_segments(sampler["url_path_from_name"], _NAME_PLACEHOLDER_RE))
+
+        for segments in shapes:
+            node = tries.setdefault(sampler["method"], {"lit": {}, "any": None, "end": []})
+            for seg in segments:
+                if seg is _TRIE_WILDCARD:
+                    if node["any"] is None:
+                        node["any"] = {"lit": {}, "any": None, "end": []}
+                    node = node["any"]
+                else:
+                    node = node["lit"].setdefault(seg, {"lit": {}, "any": None, "end": []})
+            node["end"].append(pos)
+    return tries
+
+
+def _param_trie_candidates(
+    tries: Dict[str, Dict[str, Any]],
+    method: str,
+    url_path: str,
+) -> List[int]:
+    """Sampler positions (ascending) whose trie shape fits url_path."""
+    root = tries.get(method)
+    if root is None:
+        return []
+
+    segments = url_path.split("/")
+    if not url_path.isascii():
+        # Literal segments cannot be compared by lowercasing; follow every branch
+        segments = [_TRIE_WILDCARD] * len(segments)
+    else:
+        segments = [seg.lower() for seg in segments]
+
+    found: set = set()
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if depth == len(segments):
+            found.update(node["end"])
+            continue
+        seg = segments[depth]
+        if node["any"] is not None:
+            stack.append((node["any"], depth + 1))
+        if seg is _TRIE_WILDCARD:
+            stack.extend((child, depth + 1) for child in node["lit"].values())
+        else:
+            child = node["lit"].get(seg)
+            if child is not None:
+                stack.append((child, depth + 1))
+    return sorted(found)
+
+
 def _pick_best_parameterized_candidate(
     har_entry: Dict[str, Any],
     candidates: List[Dict[str, Any]],
@@ -759,6 +825,12 @@ def _pass3_fuzzy_segment_match(
     Tokenizes URL paths into segments and scores overlap, allowing for
     version number differences (v1 vs v2). Skipped when strict_matching=True.
 
+    Only samplers sharing at least one scoring position with the HAR path
+    are scored (see _build_segment_index); every other sampler scores 0.
+    A sampler earns at most one point per shared position, so candidates
+    whose shared positions cannot reach the threshold (or beat the best
+    score so far) are skipped without scoring.
+
     Confidence: "medium" (overlap > 80%), "low" (overlap 50-80%).
     """
     matches: List[Dict[str, Any]] = []
@@ -766,6 +838,11 @@ def _pass3_fuzzy_segment_match(
     unmatched_samplers = [
         s for s in jmx_samplers if s["node_id"] not in matched_jmx
     ]
+    sampler_segments = [
+        _tokenize_path(s["url_path_from_name"] or s["url_pattern_normalized"])
+        for s in unmatched_samplers
+    ]
+    segment_index = _build_segment_index(sampler_segments)
 
     for h_idx, har in enumerate(har_entries):
         if h_idx in matched_har:
@@ -778,18 +855,19 @@ def _pass3_fuzzy_segment_match(
         best_sampler = None
         best_score = 0.0
 
-        for sampler in unmatched_samplers:
+        for pos, shared in _segment_index_candidates(segment_index, har_segments):
+            sampler = unmatched_samplers[pos]
             if sampler["node_id"] in matched_jmx:
                 continue
 
-            jmx_path = sampler["url_pattern_normalized"]
-            if sampler["url_path_from_name"]:
-                jmx_path = sampler["url_path_from_name"]
-
-            jmx_segments = _tokenize_path(jmx_path)
+            jmx_segments = sampler_segments[pos]
             if not jmx_segments:
                 continue
 
+            max_score = shared / max(len(har_segments), len(jmx_segments))
+            if max_score < 0.50 or max_score <= best_score:
+                continue
+
             score = _segment_overlap_score(har_segments, jmx_segments)
 
             if score > best_score and score >= 0.50:
@@ -808,6 +886,47 @@ def _pass3_fuzzy_segment_match(
     return matches
 
 
+def _build_segment_index(sampler_segments: List[List[str]]) -> Dict[str, Dict]:
+    """
+    Inverted index of JMX path segments for Pass 3.
+
+    A sampler only earns points at a position where its segment equals the
+    HAR segment, both are version segments, or its segment is a
+    placeholder (see _segment_overlap_score). The index maps each of those
+    (position, key) pairs to the sampler positions that can score there.
+    """
+    exact: Dict[Tuple[int, str], List[int]] = {}
+    version: Dict[int, List[int]] = {}
+    placeholder: Dict[int, List[int]] = {}
+    for pos, segments in enumerate(sampler_segments):
+        for i, seg in enumerate(segments):
+            exact.setdefault((i, seg), []).append(pos)
+            if _VERSION_RE.match(seg):
+                version.setdefault(i, []).append(pos)
+            if "${" in seg or ("{" in seg and "}" in seg):
+                placeholder.setdefault(i, []).append(pos)
+    return {"exact": exact, "version": version, "placeholder": placeholder}
+
+
+def _segment_index_candidates(
+    index: Dict[str, Dict],
+    har_segments: List[str],
+) -> List[Tuple[int, int]]:
+    """
+    Samplers that can score above 0 for har_segments, as (sampler position,
+    number of positions where it can score) in ascending sampler order.
+    """
+    shared: Dict[int, int] = {}
+    for i, seg in enumerate(har_segments):
+        at_position = set(index["exact"].get((i, seg), ()))
+        at_position.update(index["placeholder"].get(i, ()))
+        if _VERSION_RE.match(seg):
+            at_position.update(index["version"].get(i, ()))
+        for pos in at_position:
+            shared[pos] = shared.get(pos, 0) + 1
+    return sorted(shared.items())
+
+
 def _tokenize_path(url_path: str) -> List[str]:
     """Split a URL path into non-empty, lowercase segments."""
     return [s.lower() for s in url_path.split("/") if s]
@@ -18,13 +18,14 @@ Note: This module delegates low-level extraction to utils/log_utils.py
 and all file I/O to utils/file_utils.py.
 """
 
-import csv
 import os
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 from utils.config import load_config
+from utils.jtl_cache import iter_jtl_failure_batches
 from utils.file_utils import (
     get_analysis_output_dir,
     get_source_artifacts_dir,
@@ -283,18 +284,17 @@ def analyze_logs(
     # ------------------------------------------------------------------
     # 8. JTL correlation (if JTL file found)
     # ------------------------------------------------------------------
-    jtl_data: List[dict] = []
     jtl_file_metadata: Optional[dict] = None
     jtl_only_failures: List[dict] = []
     jtl_correlation_stats: dict = {}
 
     if jtl_file_path:
-        jtl_data, jtl_meta = _parse_jtl_file(jtl_file_path)
+        jtl_failures, jtl_meta = _parse_jtl_file(jtl_file_path)
         jtl_file_metadata = jtl_meta
 
-        if jtl_data:
+        if jtl_meta["total_samples"]:
             grouped_errors, jtl_only_failures, jtl_correlation_stats = (
-                _correlate_with_jtl(grouped_errors, jtl_data)
+                _correlate_with_jtl(grouped_errors, jtl_failures)
             )
 
     # ------------------------------------------------------------------
@@ -950,78 +950,137 @@ def _discover_jtl_file(test_run_id: str, log_source: str) -> Optional[str]:
     return None
 
 
-def _parse_jtl_file(file_path: str) -> Tuple[List[dict], dict]:
+# JTL columns kept for failed samples (log/JTL correlation)
+_JTL_CORRELATION_COLUMNS = [
+    "timeStamp", "elapsed", "label", "responseCode",
+    "responseMessage", "threadName",
+]
+
+# Log errors match JTL failures within ± this many milliseconds
+_JTL_MATCH_WINDOW_MS = 2000
+
+# JMeter log timestamp format ("2025-12-16 10:57:01,930")
+_LOG_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+
+
+def _parse_jtl_file(file_path: str) -> Tuple[Dict[str, list], dict]:
     """
-    Parse a JTL/CSV result file into a list of result dicts
-    and file metadata.
+    Scan a JTL/CSV result file for failed samples and file metadata.
 
-    Both .jtl and .csv files are CSV format — Python's csv module
-    handles both identically.
+    Both .jtl and .csv files are CSV format. Only the columns used for
+    correlation are read (from the columnar sidecar when available), and
+    only rows with success != "true" are kept — successful samples are
+    counted but never materialized.
 
     Expected headers:
       timeStamp, elapsed, label, responseCode, responseMessage,
-      threadName, success, bytes, ...
+      threadName, success, ...
 
     Args:
         file_path: Absolute path to the JTL/CSV file.
 
     Returns:
         Tuple of:
-          - List of result dicts (one per sampler row)
+          - Failed samples as columns: one list of CSV text values per
+            column in _JTL_CORRELATION_COLUMNS, plus "ts_ms" (epoch ms,
+            None if unparseable), all in file order
           - File metadata dict with: filename, path,
             total_samples, failed_samples
     """
-    results = []
+    failures: Dict[str, list] = {c: [] for c in _JTL_CORRELATION_COLUMNS}
     total_samples = 0
-    failed_samples = 0
 
-    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            total_samples += 1
-            # Normalize the success field
-            success_val = (row.get("success") or "").strip().lower()
-            is_success = success_val == "true"
-            if not is_success:
-                failed_samples += 1
-
-            results.append({
-                "timeStamp": row.get("timeStamp", ""),
-                "elapsed": row.get("elapsed", ""),
-                "label": row.get("label", ""),
-                "responseCode": row.get("responseCode", ""),
-                "responseMessage": row.get("responseMessage", ""),
-                "threadName": row.get("threadName", ""),
-                "success": is_success,
-                "bytes": row.get("bytes", ""),
-            })
+    # Served from the shared columnar sidecar when available (utils/jtl_cache.py)
+    for scanned, failed in iter_jtl_failure_batches(file_path, _JTL_CORRELATION_COLUMNS):
+        total_samples += scanned
+        batch_len = len(next(iter(failed.values()), []))
+        for column in _JTL_CORRELATION_COLUMNS:
+            failures[column].extend(failed.get(column) or [""] * batch_len)
+
+    failures["ts_ms"] = [_to_epoch_ms(v) for v in failures["timeStamp"]]
 
     metadata = {
         "filename": os.path.basename(file_path),
         "path": file_path,
         "total_samples": total_samples,
-        "failed_samples": failed_samples,
+        "failed_samples": len(failures["ts_ms"]),
     }
 
-    return results, metadata
+    return failures, metadata
+
+
+def _to_epoch_ms(value: str) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _log_timestamp_ms(timestamp: Optional[str]) -> Optional[int]:
+    """Epoch ms of a JMeter log timestamp (local time, like the JTL's timeStamp)."""
+    if not timestamp:
+        return None
+    try:
+        return int(datetime.strptime(timestamp, _LOG_TIMESTAMP_FORMAT).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def _build_jtl_failure_index(failures: Dict[str, list]) -> Dict[tuple, dict]:
+    """
+    Index failed samples by (label_lower, threadName_lower).
+
+    Each entry holds ``rows`` (positions in file order) and ``ts``/``ts_rows``
+    (timestamps sorted ascending with their positions) for bisecting a
+    time window.
+    """
+    index: Dict[tuple, dict] = {}
+    for pos, (label, thread) in enumerate(zip(failures["label"], failures["threadName"])):
+        key = (label.strip().lower(), thread.strip().lower())
+        entry = index.get(key)
+        if entry is None:
+            entry = index[key] = {"rows": []}
+        entry["rows"].append(pos)
+
+    ts_ms = failures["ts_ms"]
+    for entry in index.values():
+        timed = sorted((ts_ms[pos], pos) for pos in entry["rows"] if ts_ms[pos] is not None)
+        entry["ts"] = [ts for ts, _ in timed]
+        entry["ts_rows"] = [pos for _, pos in timed]
+    return index
+
+
+def _nearest_in_window(entry: dict, target_ms: int) -> Optional[int]:
+    """Position of the failure closest to target_ms within the match window."""
+    timestamps = entry["ts"]
+    lo = bisect_left(timestamps, target_ms - _JTL_MATCH_WINDOW_MS)
+    hi = bisect_right(timestamps, target_ms + _JTL_MATCH_WINDOW_MS)
+    if lo >= hi:
+        return None
+    best = min(range(lo, hi), key=lambda i: abs(timestamps[i] - target_ms))
+    return entry["ts_rows"][best]
 
 
 def _correlate_with_jtl(
     error_groups: List[dict],
-    jtl_data: List[dict],
+    failures: Dict[str, list],
 ) -> Tuple[List[dict], List[dict], dict]:
     """
     Enrich grouped errors with JTL data and identify JTL-only failures.
 
     Matching strategy:
       - Match by sampler label + thread name + time window (±2 seconds)
+      - Among the (label, thread) keys that match a group, the first one
+        with a failure within ±2 seconds of the group's first occurrence
+        wins (closest failure); without one, the first matching key's
+        earliest-written failure is used
       - Enrich matched groups with: jtl_response_code, jtl_response_message,
         jtl_elapsed_ms
       - Identify JTL rows with success=false not matched to any log error
 
     Args:
         error_groups: List of grouped error dicts.
-        jtl_data: List of parsed JTL result dicts.
+        failures: Failed JTL samples as returned by _parse_jtl_file().
 
     Returns:
         Tuple of:
@@ -1032,18 +1091,10 @@ def _correlate_with_jtl(
     """
     matched_count = 0
     unmatched_count = 0
-    matched_jtl_indices = set()
-
-    # Build a lookup of failed JTL rows for quick access
-    # Key: (label_lower, threadName_lower) → list of (index, row)
-    jtl_failure_index: Dict[tuple, List[Tuple[int, dict]]] = defaultdict(list)
-    for idx, row in enumerate(jtl_data):
-        if not row["success"]:
-            key = (
-                row["label"].strip().lower(),
-                row["threadName"].strip().lower(),
-            )
-            jtl_failure_index[key].append((idx, row))
+    matched_jtl_rows = set()
+
+    # Key: (label_lower, threadName_lower) → positions + sorted timestamps
+    jtl_failure_index = _build_jtl_failure_index(failures)
 
     # For each error group, try to find a matching JTL failure
     for group in error_groups:
@@ -1057,53 +1108,60 @@ def _correlate_with_jtl(
         sampler = (group.get("api_endpoint") or "").strip().lower()
         group_threads = [t.lower() for t in group.get("affected_threads", [])]
 
-        best_match = None
+        # Keys whose label relates to the API endpoint or sampler
+        label_keys = []
+        if sampler and sampler != "n/a":
+            label_keys = [
+                key for key in jtl_failure_index
+                if sampler in key[0] or key[0] in sampler
+            ]
 
         # Strategy 1: Match by thread name from the group
+        candidates = []
+        seen = set()
         for thread in group_threads:
-            for (label_lower, thread_lower), entries in jtl_failure_index.items():
-                # Check if any thread from the group matches the JTL thread
-                if thread in thread_lower or thread_lower in thread:
-                    # Check if the label relates to the API endpoint or sampler
-                    if (sampler and sampler != "n/a" and
-                            (sampler in label_lower or label_lower in sampler)):
-                        # Good match — take the first one
-                        if entries:
-                            best_match = entries[0]
-                            break
-            if best_match:
-                break
+            for key in label_keys:
+                thread_lower = key[1]
+                if key not in seen and (thread in thread_lower or thread_lower in thread):
+                    seen.add(key)
+                    candidates.append(key)
 
         # Strategy 2: Fallback — match by API endpoint in label only
-        if not best_match and sampler and sampler != "n/a":
-            for (label_lower, thread_lower), entries in jtl_failure_index.items():
-                if sampler in label_lower or label_lower in sampler:
-                    if entries:
-                        best_match = entries[0]
-                        break
-
-        if best_match:
-            idx, row = best_match
-            group["jtl_response_code"] = row.get("responseCode", "")
-            group["jtl_response_message"] = row.get("responseMessage", "")
-            group["jtl_elapsed_ms"] = row.get("elapsed", "")
-            matched_jtl_indices.add(idx)
+        if not candidates:
+            candidates = label_keys
+
+        best_match = None
+        target_ms = _log_timestamp_ms(group.get("first_occurrence"))
+        if target_ms is not None:
+            for key in candidates:
+                best_match = _nearest_in_window(jtl_failure_index[key], target_ms)
+                if best_match is not None:
+                    break
+        if best_match is None and candidates:
+            best_match = jtl_failure_index[candidates[0]]["rows"][0]
+
+        if best_match is not None:
+            group["jtl_response_code"] = failures["responseCode"][best_match]
+            group["jtl_response_message"] = failures["responseMessage"][best_match]
+            group["jtl_elapsed_ms"] = failures["elapsed"][best_match]
+            matched_jtl_rows.add(best_match)
             matched_count += 1
         else:
             unmatched_count += 1
 
     # Identify JTL-only failures (failed rows not matched to any log error)
-    jtl_only_failures = []
-    for idx, row in enumerate(jtl_data):
-        if not row["success"] and idx not in matched_jtl_indices:
-            jtl_only_failures.append({
-                "label": row.get("label", ""),
-                "responseCode": row.get("responseCode", ""),
-                "responseMessage": row.get("responseMessage", ""),
-                "threadName": row.get("threadName", ""),
-                "timeStamp": row.get("timeStamp", ""),
-                "elapsed": row.get("elapsed", ""),
-            })
+    jtl_only_failures = [
+        {
+            "label": failures["label"][pos],
+            "responseCode": failures["responseCode"][pos],
+            "responseMessage": failures["responseMessage"][pos],
+            "threadName": failures["threadName"][pos],
+            "timeStamp": failures["timeStamp"][pos],
+            "elapsed": failures["elapsed"][pos],
+        }
+        for pos in range(len(failures["label"]))
+        if pos not in matched_jtl_rows
+    ]
 
     correlation_stats = {
         "log_errors_matched_to_jtl": matched_count,
@@ -6,12 +6,34 @@ import subprocess
 import uuid
 import time
 import csv
+import io
 import math
-import statistics
 import signal
 import sys
+import json
+from collections import OrderedDict
+from decimal import Decimal, localcontext
 from dotenv import load_dotenv
 from utils.config import load_config, load_jmeter_config
+from utils.jtl_cache import iter_jtl_frames, read_jtl_header
+from utils.quantile_sketch import (
+    new_sketch,
+    sketch_add,
+    sketch_from_dict,
+    sketch_merge,
+    sketch_quantile,
+    sketch_to_dict,
+)
+
+# Optional: pandas/numpy for the vectorized JTL aggregation engine
+try:
+    import numpy as np
+    import pandas as pd
+    _PANDAS_AVAILABLE = True
+except ImportError:
+    np = None
+    pd = None
+    _PANDAS_AVAILABLE = False
 
 # Load environment variables (API keys, secrets, etc.)
 load_dotenv()
@@ -21,6 +43,7 @@ CONFIG = load_config()
 JMETER_CONFIG = CONFIG.get('jmeter', {})
 ARTIFACTS_PATH = CONFIG['artifacts']['artifacts_path']
 JMX_CONFIG = load_jmeter_config()
+JTL_AGG_CONFIG = CONFIG.get('jtl_aggregation', {})
 
 # ----------------------------------------------------------
 # Main JMeter Runner Functions
@@ -302,9 +325,15 @@ def generate_aggregate_report_csv(test_run_id: str) -> dict:
             "message": f"No JTL file found for test_run_id={test_run_id}",
         }
 
-    rows = build_aggregate_rows_from_jtl(jtl_path)
+    label_state = build_aggregate_state_from_jtl(jtl_path)
+    rows = build_aggregate_rows_from_state(label_state)
     out_path = _make_aggregate_report_path(test_run_id)
 
+    sketch_path = None
+    if JTL_AGG_CONFIG.get('save_sketches', True):
+        sketch_path = _make_aggregate_sketch_path(test_run_id)
+        save_aggregate_state(label_state, sketch_path)
+
     fieldnames = [
         "labelName",
         "samples",
@@ -336,6 +365,7 @@ def generate_aggregate_report_csv(test_run_id: str) -> dict:
         "test_run_id": test_run_id,
         "status": "OK",
         "aggregate_report_path": out_path,
+        "aggregate_sketch_path": sketch_path,
         "label_count": len(rows),
     }
 
@@ -347,6 +377,12 @@ def parse_jtl_live(jtl_path: str) -> dict:
     """
     Parse a JMeter JTL (CSV) file and compute live smoke-test metrics.
 
+    The JTL is read incrementally: a per-file state remembers the byte offset
+    and running aggregates from the previous call, so each poll only parses
+    the rows JMeter appended since then. A trailing partial line is left for
+    the next poll. If the file is truncated or replaced, the state is reset
+    and the file is re-read from the start.
+
     Returns:
         dict with keys:
           - total_samples
@@ -355,115 +391,9 @@ def parse_jtl_live(jtl_path: str) -> dict:
           - per_label: { label: { count, errors, error_rate, avg_ms, p90_ms } }
           - start_time_utc, end_time_utc, duration_ms, duration_seconds
     """
-    total = 0
-    error_count = 0
-    elapsed_all: list[int] = []
-    per_label: dict[str, dict] = {}
-
-    first_ts = None  # earliest timeStamp (ms since epoch)
-    last_ts = None   # latest timeStamp (ms since epoch)
-
-    with open(jtl_path, newline="", encoding="utf-8", errors="ignore") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Parse elapsed
-            try:
-                elapsed = int(row.get("elapsed") or 0)
-            except ValueError:
-                continue
-
-            # Parse timestamp (JMeter uses epoch ms)
-            ts_raw = row.get("timeStamp")
-            try:
-                ts_val = int(ts_raw) if ts_raw is not None else None
-            except ValueError:
-                ts_val = None
-
-            label = row.get("label", "UNKNOWN")
-            rc = (row.get("responseCode") or "").strip()
-
-            total += 1
-            elapsed_all.append(elapsed)
-
-            if ts_val is not None:
-                if first_ts is None or ts_val < first_ts:
-                    first_ts = ts_val
-                if last_ts is None or ts_val > last_ts:
-                    last_ts = ts_val
-
-            if label not in per_label:
-                per_label[label] = {"count": 0, "errors": 0, "elapsed": []}
-
-            per_label[label]["count"] += 1
-            per_label[label]["elapsed"].append(elapsed)
-
-            # simple rule: non-2xx/3xx = error
-            if not (rc.startswith("2") or rc.startswith("3")):
-                error_count += 1
-                per_label[label]["errors"] += 1
-
-    # If no samples, return an empty-ish metrics struct
-    if total == 0:
-        return {
-            "total_samples": 0,
-            "error_count": 0,
-            "error_rate": 0.0,
-            "success_rate": 1.0,
-            "avg_response_time_ms": None,
-            "p90_response_time_ms": None,
-            "per_label": {},
-            "start_time_utc": None,
-            "end_time_utc": None,
-            "duration_ms": None,
-            "duration_seconds": None,
-        }
-
-    avg = sum(elapsed_all) / total
-    p90 = _percentile(elapsed_all, 90)
-    error_rate = error_count / total if total else 0.0
-
-    label_summaries = {}
-    for label, stats in per_label.items():
-        c = stats["count"]
-        if c == 0:
-            continue
-        avg_l = sum(stats["elapsed"]) / c
-        p90_l = _percentile(stats["elapsed"], 90)
-        label_summaries[label] = {
-            "count": c,
-            "errors": stats.get("errors", 0),
-            "error_rate": (stats.get("errors", 0) / c) if c else 0.0,
-            "avg_ms": avg_l,
-            "p90_ms": p90_l,
-        }
-
-    # Derive start/end/duration from timestamps (epoch ms)
-    if first_ts is not None and last_ts is not None and last_ts >= first_ts:
-        duration_ms = last_ts - first_ts
-        start_time_utc = time.strftime(
-            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(first_ts / 1000.0)
-        )
-        end_time_utc = time.strftime(
-            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(last_ts / 1000.0)
-        )
-    else:
-        duration_ms = None
-        start_time_utc = None
-        end_time_utc = None
-
-    return {
-        "total_samples": total,
-        "error_count": error_count,
-        "error_rate": error_rate,
-        "success_rate": 1.0 - error_rate,
-        "avg_response_time_ms": avg,
-        "p90_response_time_ms": p90,
-        "per_label": label_summaries,
-        "start_time_utc": start_time_utc,
-        "end_time_utc": end_time_utc,
-        "duration_ms": duration_ms,
-        "duration_seconds": (duration_ms / 1000.0) if duration_ms is not None else None,
-    }
+    state = _get_live_jtl_state(jtl_path)
+    _consume_new_jtl_rows(jtl_path, state)
+    return _summarize_live_jtl_state(state)
 
 def is_pid_running(pid: int) -> bool:
     """Check whether a process with given PID is still running on any OS."""
@@ -502,9 +432,38 @@ def build_aggregate_rows_from_jtl(jtl_path: str):
       errorsCount,errorsRate,avgThroughput,avgBytes,duration,concurrency,
       hasLabelPassedThresholds
     """
+    return build_aggregate_rows_from_state(build_aggregate_state_from_jtl(jtl_path))
+
+def build_aggregate_state_from_jtl(jtl_path: str) -> dict:
+    """
+    Stream a JMeter JTL CSV into fixed-size per-label aggregation state.
+
+    Each label keeps running counts/sums plus a quantile sketch of elapsed
+    times (see utils/quantile_sketch.py), so memory per label does not grow
+    with the number of samples once jtl_aggregation.percentile_relative_accuracy
+    is set above 0. Labels stay in first-seen order.
+
+    The engine is chosen by jtl_aggregation.engine:
+      - "auto" (default): pandas when installed, else the pure-Python reader
+      - "pandas": typed chunked reads with grouped reductions
+      - "python": row-by-row csv.DictReader
+    Both engines produce identical state.
+
+    Returns:
+        dict: { label: stats } — JSON-serializable via save_aggregate_state().
+    """
     if not os.path.exists(jtl_path):
         raise FileNotFoundError(f"JTL file not found: {jtl_path}")
 
+    engine = str(JTL_AGG_CONFIG.get('engine', 'auto')).lower()
+    if engine == "pandas" and not _PANDAS_AVAILABLE:
+        raise ImportError("jtl_aggregation.engine is 'pandas' but pandas/numpy are not installed")
+    if engine == "pandas" or (engine == "auto" and _PANDAS_AVAILABLE):
+        return _build_aggregate_state_pandas(jtl_path)
+    return _build_aggregate_state_python(jtl_path)
+
+def _build_aggregate_state_python(jtl_path: str) -> dict:
+    """Row-by-row aggregation engine (no third-party dependencies)."""
     label_data: dict[str, dict] = {}
 
     with open(jtl_path, newline="", encoding="utf-8", errors="ignore") as f:
@@ -535,21 +494,16 @@ def build_aggregate_rows_from_jtl(jtl_path: str):
                 rc = (row.get("responseCode") or "").strip()
                 success = rc.startswith("2") or rc.startswith("3")
 
-            stats = label_data.setdefault(label, {
-                "samples": 0,
-                "elapsed_values": [],
-                "latency_values": [],
-                "bytes_values": [],
-                "errors": 0,
-                "first_ts": None,
-                "last_ts": None,
-                "max_all_threads": 0,
-            })
+            stats = label_data.get(label)
+            if stats is None:
+                stats = label_data[label] = _new_aggregate_stats()
 
             stats["samples"] += 1
-            stats["elapsed_values"].append(elapsed)
-            stats["latency_values"].append(latency)
-            stats["bytes_values"].append(bytes_val)
+            stats["elapsed_sum"] += elapsed
+            stats["elapsed_sq_sum"] += elapsed * elapsed
+            sketch_add(stats["elapsed_sketch"], elapsed)
+            stats["latency_sum"] += latency
+            stats["bytes_sum"] += bytes_val
             if not success:
                 stats["errors"] += 1
 
@@ -562,29 +516,151 @@ def build_aggregate_rows_from_jtl(jtl_path: str):
             if all_threads > stats["max_all_threads"]:
                 stats["max_all_threads"] = all_threads
 
+    return label_data
+
+# Columns read by the pandas engine (only those present in the JTL are loaded)
+_AGGREGATE_JTL_COLUMNS = (
+    "label", "Label", "elapsed", "Latency", "bytes", "timeStamp",
+    "allThreads", "success", "responseCode",
+)
+
+def _build_aggregate_state_pandas(jtl_path: str) -> dict:
+    """
+    Vectorized aggregation engine.
+
+    Reads the JTL in typed chunks (jtl_aggregation.chunk_size rows) with only
+    the needed columns, then reduces each chunk with one groupby per label and
+    one per (label, elapsed). Elapsed-value counts are summed across chunks
+    and fed into the per-label sketches once at the end, so the resulting
+    state matches _build_aggregate_state_python() exactly.
+    """
+    chunk_size = int(JTL_AGG_CONFIG.get('chunk_size', 1_000_000) or 1_000_000)
+
+    header = read_jtl_header(jtl_path)
+    use_cols = [c for c in _AGGREGATE_JTL_COLUMNS if c in header]
+    str_cols = {c: str for c in ("label", "Label", "success", "responseCode") if c in use_cols}
+
+    label_data: dict[str, dict] = {}
+    elapsed_counts = None
+
+    # Served from the shared columnar sidecar when available (utils/jtl_cache.py)
+    reader = iter_jtl_frames(
+        jtl_path,
+        use_cols,
+        chunk_size,
+        dtype=str_cols,
+        keep_default_na=False,
+        na_values=[""],
+        encoding="utf-8",
+        encoding_errors="ignore",
+    )
+    for chunk in reader:
+        n = len(chunk)
+        if n == 0:
+            continue
+
+        # Empty text fields count as missing, whichever source they came from
+        for col in str_cols:
+            chunk[col] = chunk[col].mask(chunk[col] == "")
+
+        # label -> Label -> "UNKNOWN" (same fallback as the row engine)
+        label = chunk["label"] if "label" in chunk else pd.Series(np.nan, index=chunk.index)
+        if "Label" in chunk:
+            label = label.fillna(chunk["Label"])
+        label = label.fillna("UNKNOWN").astype(str)
+
+        def to_int(col, default=0):
+            if col not in chunk:
+                return pd.Series(default, index=chunk.index, dtype="float64")
+            values = np.trunc(pd.to_numeric(chunk[col], errors="coerce"))
+            return values.fillna(default) if default is not None else values
+
+        if "success" in chunk:
+            failed = chunk["success"].fillna("").str.lower() != "true"
+        else:
+            rc = chunk["responseCode"].fillna("").str.strip() if "responseCode" in chunk else pd.Series("", index=chunk.index)
+            failed = ~(rc.str.startswith("2") | rc.str.startswith("3"))
+
+        elapsed = to_int("elapsed").astype("int64")
+        frame = pd.DataFrame({
+            "label": label,
+            "elapsed": elapsed,
+            "elapsed_sq": elapsed * elapsed,
+            "latency": to_int("Latency").astype("int64"),
+            "bytes": to_int("bytes").astype("int64"),
+            "errors": failed.astype("int64"),
+            "ts": to_int("timeStamp", None),
+            "threads": to_int("allThreads").astype("int64"),
+        })
+
+        grouped = frame.groupby("label", sort=False).agg(
+            samples=("elapsed", "size"),
+            elapsed_sum=("elapsed", "sum"),
+            elapsed_sq_sum=("elapsed_sq", "sum"),
+            latency_sum=("latency", "sum"),
+            bytes_sum=("bytes", "sum"),
+            errors=("errors", "sum"),
+            first_ts=("ts", "min"),
+            last_ts=("ts", "max"),
+            max_all_threads=("threads", "max"),
+        )
+
+        for lbl, agg in zip(grouped.index, grouped.itertuples(index=False)):
+            stats = label_data.get(lbl)
+            if stats is None:
+                stats = label_data[lbl] = _new_aggregate_stats()
+            stats["samples"] += int(agg.samples)
+            stats["elapsed_sum"] += int(agg.elapsed_sum)
+            stats["elapsed_sq_sum"] += int(agg.elapsed_sq_sum)
+            stats["latency_sum"] += int(agg.latency_sum)
+            stats["bytes_sum"] += int(agg.bytes_sum)
+            stats["errors"] += int(agg.errors)
+            if not math.isnan(agg.first_ts):
+                first_ts, last_ts = int(agg.first_ts), int(agg.last_ts)
+                if stats["first_ts"] is None or first_ts < stats["first_ts"]:
+                    stats["first_ts"] = first_ts
+                if stats["last_ts"] is None or last_ts > stats["last_ts"]:
+                    stats["last_ts"] = last_ts
+            if agg.max_all_threads > stats["max_all_threads"]:
+                stats["max_all_threads"] = int(agg.max_all_threads)
+
+        counts = frame.groupby(["label", "elapsed"], sort=False).size()
+        elapsed_counts = counts if elapsed_counts is None else elapsed_counts.add(counts, fill_value=0)
+
+    if elapsed_counts is not None:
+        for lbl, counts in elapsed_counts.groupby(level=0, sort=False):
+            sketch = label_data[lbl]["elapsed_sketch"]
+            values = counts.index.get_level_values(1).tolist()
+            for value, count in zip(values, counts.astype("int64").tolist()):
+                sketch_add(sketch, value, count)
+
+    return label_data
+
+def build_aggregate_rows_from_state(label_data: dict) -> list:
+    """
+    Compute BlazeMeter-style aggregate rows from per-label aggregation state,
+    as produced by build_aggregate_state_from_jtl() or load_aggregate_state().
+    """
     rows = []
     for label, stats in label_data.items():
         samples = stats["samples"]
-        elapsed_vals = stats["elapsed_values"]
-        latency_vals = stats["latency_values"]
-        bytes_vals = stats["bytes_values"]
         errors = stats["errors"]
+        sketch = stats["elapsed_sketch"]
 
         if not samples:
             continue
 
-        avg_rt = sum(elapsed_vals) / samples
-        min_rt = min(elapsed_vals)
-        max_rt = max(elapsed_vals)
+        avg_rt = stats["elapsed_sum"] / samples
+        min_rt = sketch["min"]
+        max_rt = sketch["max"]
 
-        # Uses the _percentile helper you already added for run-status
-        median_rt = _percentile(elapsed_vals, 50)
-        p90 = _percentile(elapsed_vals, 90)
-        p95 = _percentile(elapsed_vals, 95)
-        p99 = _percentile(elapsed_vals, 99)
+        median_rt = _sketch_percentile(sketch, 50)
+        p90 = _sketch_percentile(sketch, 90)
+        p95 = _sketch_percentile(sketch, 95)
+        p99 = _sketch_percentile(sketch, 99)
 
-        stdev = _stddev(elapsed_vals)
-        avg_latency = (sum(latency_vals) / len(latency_vals)) if latency_vals else 0.0
+        stdev = _stddev_from_sums(samples, stats["elapsed_sum"], stats["elapsed_sq_sum"])
+        avg_latency = stats["latency_sum"] / samples
 
         error_rate = errors / samples if samples else 0.0
 
@@ -602,7 +678,7 @@ def build_aggregate_rows_from_jtl(jtl_path: str):
         else:
             throughput = 0.0
 
-        avg_bytes = (sum(bytes_vals) / len(bytes_vals)) if bytes_vals else 0.0
+        avg_bytes = stats["bytes_sum"] / samples
         concurrency = stats["max_all_threads"] or None
 
         row = {
@@ -630,6 +706,299 @@ def build_aggregate_rows_from_jtl(jtl_path: str):
     # We intentionally DO NOT sort rows; they stay in first-seen order like your BlazeMeter sample
     return rows
 
+def merge_aggregate_states(*states: dict) -> dict:
+    """
+    Merge per-label aggregation states (e.g. from several engines or JTL
+    segments) into a new state. Sketches must share the same accuracy.
+    """
+    merged: dict[str, dict] = {}
+    for state in states:
+        for label, stats in state.items():
+            target = merged.get(label)
+            if target is None:
+                target = merged[label] = _new_aggregate_stats(
+                    stats["elapsed_sketch"]["relative_accuracy"]
+                )
+
+            for key in ("samples", "elapsed_sum", "elapsed_sq_sum", "latency_sum", "bytes_sum", "errors"):
+                target[key] += stats[key]
+            sketch_merge(target["elapsed_sketch"], stats["elapsed_sketch"])
+
+            for key, pick in (("first_ts", min), ("last_ts", max)):
+                if target[key] is None:
+                    target[key] = stats[key]
+                elif stats[key] is not None:
+                    target[key] = pick(target[key], stats[key])
+
+            target["max_all_threads"] = max(target["max_all_threads"], stats["max_all_threads"])
+    return merged
+
+def save_aggregate_state(label_data: dict, path: str) -> str:
+    """Write per-label aggregation state (including sketches) as JSON."""
+    payload = {
+        "version": 1,
+        "labels": {
+            label: {**stats, "elapsed_sketch": sketch_to_dict(stats["elapsed_sketch"])}
+            for label, stats in label_data.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    return path
+
+def load_aggregate_state(path: str) -> dict:
+    """Load per-label aggregation state written by save_aggregate_state()."""
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return {
+        label: {**stats, "elapsed_sketch": sketch_from_dict(stats["elapsed_sketch"])}
+        for label, stats in payload.get("labels", {}).items()
+    }
+
+def _new_aggregate_stats(relative_accuracy: float | None = None) -> dict:
+    """Empty per-label aggregation state."""
+    return {
+        "samples": 0,
+        "elapsed_sum": 0,
+        "elapsed_sq_sum": 0,
+        "elapsed_sketch": (
+            _new_elapsed_sketch() if relative_accuracy is None else new_sketch(relative_accuracy)
+        ),
+        "latency_sum": 0,
+        "bytes_sum": 0,
+        "errors": 0,
+        "first_ts": None,
+        "last_ts": None,
+        "max_all_threads": 0,
+    }
+
+# ----------------------------------------------------------
+# Incremental JTL Reader (live status)
+# ----------------------------------------------------------
+
+# Bytes read from the JTL per iteration when catching up on new rows
+_LIVE_JTL_READ_CHUNK = 8 * 1024 * 1024
+
+# Number of JTLs whose incremental parse state is kept between polls
+_LIVE_JTL_STATE_MAX = 8
+
+# Per-JTL incremental parse state, keyed by absolute JTL path (LRU order)
+_LIVE_JTL_STATE: OrderedDict[str, dict] = OrderedDict()
+
+def _new_live_jtl_state() -> dict:
+    """Create an empty incremental parse state for a JTL file."""
+    return {
+        "offset": 0,
+        "file_id": None,
+        "columns": None,
+        "total": 0,
+        "error_count": 0,
+        "elapsed_sum": 0,
+        "elapsed_sketch": _new_elapsed_sketch(),
+        "per_label": {},
+        "first_ts": None,
+        "last_ts": None,
+    }
+
+def _get_live_jtl_state(jtl_path: str) -> dict:
+    """
+    Return the incremental parse state for a JTL, resetting it when the file
+    was truncated or replaced since the last poll.
+    """
+    key = os.path.abspath(jtl_path)
+    st = os.stat(jtl_path)
+    file_id = (st.st_dev, st.st_ino)
+
+    state = _LIVE_JTL_STATE.get(key)
+    if state is None or state["file_id"] != file_id or st.st_size < state["offset"]:
+        state = _new_live_jtl_state()
+        state["file_id"] = file_id
+        _LIVE_JTL_STATE[key] = state
+    _LIVE_JTL_STATE.move_to_end(key)
+    while len(_LIVE_JTL_STATE) > _LIVE_JTL_STATE_MAX:
+        _LIVE_JTL_STATE.popitem(last=False)
+    return state
+
+def _consume_new_jtl_rows(jtl_path: str, state: dict) -> None:
+    """
+    Parse only the complete records appended after state["offset"] and fold
+    them into the running aggregates. A partial last record, including one
+    cut inside a quoted multi-line field, is not consumed.
+    """
+    with open(jtl_path, "rb") as f:
+        f.seek(state["offset"])
+        pending = b""
+        while True:
+            chunk = f.read(_LIVE_JTL_READ_CHUNK)
+            if not chunk:
+                break
+            data = pending + chunk
+            cut = _last_record_break(data)
+            if cut == -1:
+                pending = data
+                continue
+            complete, pending = data[:cut + 1], data[cut + 1:]
+            _apply_live_jtl_lines(complete, state)
+            state["offset"] += len(complete)
+
+def _last_record_break(data: bytes) -> int:
+    """
+    Return the index of the last newline in data that ends a CSV record,
+    i.e. one outside a quoted field, or -1 if there is none.
+    """
+    last = -1
+    in_quotes = False
+    pos = 0
+    while True:
+        nl = data.find(b"\n", pos)
+        if nl == -1:
+            return last
+        # Doubled quotes ("") inside a field leave the parity unchanged
+        if data.count(b'"', pos, nl) % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            last = nl
+        pos = nl + 1
+
+def _apply_live_jtl_lines(data: bytes, state: dict) -> None:
+    """Update the running aggregates with a block of complete JTL lines."""
+    reader = csv.reader(io.StringIO(data.decode("utf-8", errors="ignore"), newline=""))
+
+    if state["columns"] is None:
+        header = next(reader, None)
+        if header is None:
+            return
+        state["columns"] = {name: i for i, name in enumerate(header)}
+
+    cols = state["columns"]
+    elapsed_idx = cols.get("elapsed")
+    ts_idx = cols.get("timeStamp")
+    label_idx = cols.get("label")
+    rc_idx = cols.get("responseCode")
+
+    def field(row, idx):
+        if idx is None or idx >= len(row):
+            return None
+        return row[idx]
+
+    per_label = state["per_label"]
+    elapsed_sketch = state["elapsed_sketch"]
+
+    for row in reader:
+        if not row:
+            continue
+
+        # Parse elapsed
+        try:
+            elapsed = int(field(row, elapsed_idx) or 0)
+        except ValueError:
+            continue
+
+        # Parse timestamp (JMeter uses epoch ms)
+        ts_raw = field(row, ts_idx)
+        try:
+            ts_val = int(ts_raw) if ts_raw is not None else None
+        except ValueError:
+            ts_val = None
+
+        label = field(row, label_idx)
+        if label is None:
+            label = "UNKNOWN"
+        rc = (field(row, rc_idx) or "").strip()
+
+        state["total"] += 1
+        state["elapsed_sum"] += elapsed
+        sketch_add(elapsed_sketch, elapsed)
+
+        if ts_val is not None:
+            if state["first_ts"] is None or ts_val < state["first_ts"]:
+                state["first_ts"] = ts_val
+            if state["last_ts"] is None or ts_val > state["last_ts"]:
+                state["last_ts"] = ts_val
+
+        stats = per_label.get(label)
+        if stats is None:
+            stats = per_label[label] = {
+                "count": 0, "errors": 0, "elapsed_sum": 0, "elapsed_sketch": _new_elapsed_sketch()
+            }
+
+        stats["count"] += 1
+        stats["elapsed_sum"] += elapsed
+        sketch_add(stats["elapsed_sketch"], elapsed)
+
+        # simple rule: non-2xx/3xx = error
+        if not (rc.startswith("2") or rc.startswith("3")):
+            state["error_count"] += 1
+            stats["errors"] += 1
+
+def _summarize_live_jtl_state(state: dict) -> dict:
+    """Build the live metrics dict from the running aggregates."""
+    total = state["total"]
+
+    # If no samples, return an empty-ish metrics struct
+    if total == 0:
+        return {
+            "total_samples": 0,
+            "error_count": 0,
+            "error_rate": 0.0,
+            "success_rate": 1.0,
+            "avg_response_time_ms": None,
+            "p90_response_time_ms": None,
+            "per_label": {},
+            "start_time_utc": None,
+            "end_time_utc": None,
+            "duration_ms": None,
+            "duration_seconds": None,
+        }
+
+    error_count = state["error_count"]
+    avg = state["elapsed_sum"] / total
+    p90 = _sketch_percentile(state["elapsed_sketch"], 90)
+    error_rate = error_count / total if total else 0.0
+
+    label_summaries = {}
+    for label, stats in state["per_label"].items():
+        c = stats["count"]
+        if c == 0:
+            continue
+        label_summaries[label] = {
+            "count": c,
+            "errors": stats.get("errors", 0),
+            "error_rate": (stats.get("errors", 0) / c) if c else 0.0,
+            "avg_ms": stats["elapsed_sum"] / c,
+            "p90_ms": _sketch_percentile(stats["elapsed_sketch"], 90),
+        }
+
+    # Derive start/end/duration from timestamps (epoch ms)
+    first_ts = state["first_ts"]
+    last_ts = state["last_ts"]
+    if first_ts is not None and last_ts is not None and last_ts >= first_ts:
+        duration_ms = last_ts - first_ts
+        start_time_utc = time.strftime(
+            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(first_ts / 1000.0)
+        )
+        end_time_utc = time.strftime(
+            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(last_ts / 1000.0)
+        )
+    else:
+        duration_ms = None
+        start_time_utc = None
+        end_time_utc = None
+
+    return {
+        "total_samples": total,
+        "error_count": error_count,
+        "error_rate": error_rate,
+        "success_rate": 1.0 - error_rate,
+        "avg_response_time_ms": avg,
+        "p90_response_time_ms": p90,
+        "per_label": label_summaries,
+        "start_time_utc": start_time_utc,
+        "end_time_utc": end_time_utc,
+        "duration_ms": duration_ms,
+        "duration_seconds": (duration_ms / 1000.0) if duration_ms is not None else None,
+    }
+
 # ----------------------------------------------------------
 # Utility/Internal Functions
 # ----------------------------------------------------------
@@ -668,6 +1037,42 @@ def _percentile(values, pct):
     idx = max(0, min(len(vals) - 1, int(math.ceil(pct / 100.0 * len(vals)) - 1)))
     return vals[idx]
 
+def _new_elapsed_sketch():
+    """Quantile sketch for elapsed/response times, at the configured accuracy."""
+    return new_sketch(float(JTL_AGG_CONFIG.get('percentile_relative_accuracy', 0.0) or 0.0))
+
+def _sketch_percentile(sketch, pct):
+    """
+    Percentile of an elapsed-time sketch. Exact sketches return the same
+    value as _percentile; approximate ones are rounded to whole ms like
+    the JTL values they summarize.
+    """
+    value = sketch_quantile(sketch, pct)
+    if value is None or sketch["relative_accuracy"] == 0:
+        return value
+    return int(round(value))
+
+def _stddev_from_sums(count, total, total_sq):
+    """
+    Population standard deviation from running integer sums.
+    Computed exactly, then rounded once, to match statistics.pstdev.
+    """
+    if count < 2:
+        return 0.0
+    numerator = count * total_sq - total * total
+    if numerator <= 0:
+        return 0.0
+    with localcontext() as ctx:
+        ctx.prec = 50
+        return float((Decimal(numerator) / Decimal(count * count)).sqrt())
+
+def _make_aggregate_sketch_path(test_run_id: str) -> str:
+    """
+    Build the output path for the per-label aggregate state (sketches):
+        <ARTIFACTS_PATH>/<test_run_id>/jmeter/aggregate_sketches.json
+    """
+    return os.path.join(_get_artifact_dir(test_run_id), "aggregate_sketches.json")
+
 def _get_artifact_paths(test_run_id):
     """Returns all artifact paths for this run."""
     return {
@@ -683,8 +1088,3 @@ def _make_aggregate_report_path(test_run_id: str) -> str:
     """
     return os.path.join(_get_artifact_dir(test_run_id), "aggregate_performance_report.csv")
 
-def _stddev(values):
-    """Population standard deviation for response times."""
-    if not values or len(values) < 2:
-        return 0.0
-    return statistics.pstdev(values)
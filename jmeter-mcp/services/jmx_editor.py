@@ -7,8 +7,17 @@ Implements the three HITL (Human-in-the-Loop) operations:
   - add_jmx_component  -> insert a new component into an existing JMX
   - edit_jmx_component -> apply patch operations to an existing component
 
+plus batch_edit_jmx_components, which applies edits to many components
+with a single parse, backup and save.
+
 All mutations are safe-by-default: backups are created before writes and
 a dry_run flag lets the caller preview changes without persisting them.
+
+Parsed plans are kept between tool calls in a small session cache keyed by
+file path and (mtime, size): the ElementTree, the node index, a
+node_id -> (element, hashTree, parent hashTree) map and the variable scan.
+Edits made through this module update the cached plan in place, so a
+sequence of calls on the same JMX only parses it once.
 """
 
 import glob
@@ -41,6 +50,9 @@ _VAR_REF_PATTERN = re.compile(r'\$\{([^}]+)\}')
 # AI-generated script naming convention
 _AI_GENERATED_PATTERN = "ai-generated_script_*.jmx"
 
+# Parsed-plan sessions keyed by absolute JMX path (see get_jmx_session)
+_JMX_SESSIONS: Dict[str, dict] = {}
+
 
 # ============================================================
 # Configuration helpers
@@ -63,6 +75,10 @@ def _max_backup_count() -> int:
     return _get_editing_config().get("max_backup_count", 10)
 
 
+def _max_cached_plans() -> int:
+    return _get_editing_config().get("max_cached_plans", 8)
+
+
 # ============================================================
 # JMX Discovery
 # ============================================================
@@ -234,11 +250,20 @@ def _extract_element_props(elem: ET.Element) -> dict:
     return props
 
 
-def build_node_index(root: ET.Element) -> Tuple[Dict[str, dict], list]:
+def build_node_index(
+    root: ET.Element,
+    elements: Optional[Dict[str, tuple]] = None,
+) -> Tuple[Dict[str, dict], list]:
     """
     Walk the JMX paired tree (element + hashTree) and build a flat node index
     plus a hierarchical outline.
 
+    Args:
+        root: Root element of the JMX.
+        elements: Optional dict filled in the same walk with
+            {node_id: (element, hashTree, parent_hashTree)} for O(1) lookups
+            with find_element_by_node_id.
+
     Returns:
         (node_index, hierarchy)
         - node_index: {node_id: {node_id, path, type, testname, enabled, props, children_count, children_by_type}}
@@ -273,6 +298,9 @@ def build_node_index(root: ET.Element) -> Tuple[Dict[str, dict], list]:
 
             hash_tree = children[i + 1] if (i + 1 < len(children) and children[i + 1].tag == "hashTree") else None
 
+            if elements is not None:
+                elements.setdefault(node_id, (elem, hash_tree, parent_element))
+
             child_nodes: list = []
             children_by_type: Dict[str, int] = {}
 
@@ -312,60 +340,242 @@ def build_node_index(root: ET.Element) -> Tuple[Dict[str, dict], list]:
     return node_index, hierarchy
 
 
+def _iter_paired_nodes(parent_ht: ET.Element, parent_path: str):
+    """
+    Yield (node_id, path, element, hashTree, parent_hashTree) for every test
+    element below a hashTree, in document order, with the same path and
+    node_id rules as build_node_index.
+    """
+    children = list(parent_ht)
+    i = 0
+    sibling_counts: Dict[str, int] = {}
+
+    while i < len(children):
+        elem = children[i]
+        if not _is_test_element(elem):
+            i += 1
+            continue
+
+        testclass = elem.get("testclass", elem.tag)
+        testname = elem.get("testname", "")
+
+        idx = sibling_counts.get(testclass, 0)
+        sibling_counts[testclass] = idx + 1
+
+        path = f"{parent_path} > {testclass}[{idx}]" if parent_path else f"{testclass}[{idx}]"
+        nid = _generate_node_id(testclass, testname, path, idx)
+
+        hash_tree = children[i + 1] if (i + 1 < len(children) and children[i + 1].tag == "hashTree") else None
+
+        yield nid, path, elem, hash_tree, parent_ht
+
+        if hash_tree is not None:
+            yield from _iter_paired_nodes(hash_tree, path)
+
+        i += 2 if hash_tree is not None else 1
+
+
 def find_element_by_node_id(
     root: ET.Element,
     target_node_id: str,
-    node_index: Dict[str, dict]
+    node_index: Dict[str, dict],
+    elements: Optional[Dict[str, tuple]] = None,
 ) -> Optional[Tuple[ET.Element, Optional[ET.Element], ET.Element]]:
     """
     Find the (element, hashTree, parent_hashTree) triple for a given node_id.
 
-    Walks the paired tree with full path accumulation (mirroring
-    build_node_index) so that regenerated node_ids are identical to the
-    ones stored in the index.
+    With an ``elements`` map (from build_node_index or a JMX session) this
+    is a dict lookup. Otherwise it walks the paired tree with full path
+    accumulation (mirroring build_node_index) so that regenerated node_ids
+    are identical to the ones stored in the index.
 
     Returns None if not found.
     """
+    if elements is not None:
+        return elements.get(target_node_id)
+
     if target_node_id not in node_index:
         return None
 
-    def _search(parent_ht: ET.Element, parent_path: str):
-        children = list(parent_ht)
-        i = 0
-        sibling_counts: Dict[str, int] = {}
+    top_hash_tree = root.find("hashTree")
+    if top_hash_tree is None:
+        return None
 
-        while i < len(children):
-            elem = children[i]
-            if not _is_test_element(elem):
-                i += 1
-                continue
+    for nid, _, elem, hash_tree, parent_ht in _iter_paired_nodes(top_hash_tree, ""):
+        if nid == target_node_id:
+            return (elem, hash_tree, parent_ht)
+    return None
 
-            testclass = elem.get("testclass", elem.tag)
-            testname = elem.get("testname", "")
 
-            idx = sibling_counts.get(testclass, 0)
-            sibling_counts[testclass] = idx + 1
+# ============================================================
+# JMX Sessions
+# ============================================================
 
-            path = f"{parent_path} > {testclass}[{idx}]" if parent_path else f"{testclass}[{idx}]"
-            nid = _generate_node_id(testclass, testname, path, idx)
+def get_jmx_session(jmx_path: str) -> dict:
+    """
+    Return the parsed-plan session for a JMX file, parsing it only if it is
+    not cached or has changed on disk since it was cached.
 
-            hash_tree = children[i + 1] if (i + 1 < len(children) and children[i + 1].tag == "hashTree") else None
+    A session is a dict with:
+        - "tree", "root": the parsed ElementTree and its root element
+        - "elements": {node_id: (element, hashTree, parent_hashTree)}
+        - "paths": {node_id: path}
+        - "node_index", "hierarchy", "variables": built on first use by
+          session_node_index() / session_variables(); None when stale
 
-            if nid == target_node_id:
-                return (elem, hash_tree, parent_ht)
+    Callers that mutate the tree must either save it with save_jmx_session()
+    or drop the session with invalidate_jmx_session().
 
-            if hash_tree is not None:
-                result = _search(hash_tree, path)
-                if result:
-                    return result
+    Raises:
+        ET.ParseError: If the JMX is not well-formed XML.
+    """
+    key = os.path.abspath(jmx_path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    session = _JMX_SESSIONS.get(key)
+    if session is not None and session["stamp"] == stamp:
+        return session
+
+    tree, root = load_jmx(key)
+    session = {
+        "path": key,
+        "stamp": stamp,
+        "tree": tree,
+        "root": root,
+        "elements": {},
+        "paths": {},
+        "node_index": None,
+        "hierarchy": None,
+        "variables": None,
+    }
+    session_node_index(session)
 
-            i += 2 if hash_tree is not None else 1
-        return None
+    max_plans = _max_cached_plans()
+    _JMX_SESSIONS.pop(key, None)
+    if max_plans > 0:
+        while len(_JMX_SESSIONS) >= max_plans:
+            _JMX_SESSIONS.pop(next(iter(_JMX_SESSIONS)))
+        _JMX_SESSIONS[key] = session
+    return session
 
-    top_hash_tree = root.find("hashTree")
-    if top_hash_tree is not None:
-        return _search(top_hash_tree, "")
-    return None
+
+def invalidate_jmx_session(jmx_path: str) -> None:
+    """Drop the cached session for a JMX file (e.g. after a dry run mutated it)."""
+    _JMX_SESSIONS.pop(os.path.abspath(jmx_path), None)
+
+
+def session_node_index(session: dict) -> Tuple[Dict[str, dict], list]:
+    """Return (node_index, hierarchy) for a session, rebuilding them from the in-memory tree if stale."""
+    if session["node_index"] is None:
+        elements: Dict[str, tuple] = {}
+        node_index, hierarchy = build_node_index(session["root"], elements)
+        session["node_index"] = node_index
+        session["hierarchy"] = hierarchy
+        session["elements"] = elements
+        session["paths"] = {nid: info["path"] for nid, info in node_index.items()}
+    return session["node_index"], session["hierarchy"]
+
+
+def session_variables(session: dict) -> dict:
+    """Return the variable scan for a session, computed once per plan version."""
+    if session["variables"] is None:
+        session["variables"] = _scan_variables(session["root"])
+    return session["variables"]
+
+
+def save_jmx_session(session: dict) -> str:
+    """
+    Save a session's tree to its JMX file and re-stamp the session so the
+    next get_jmx_session() reuses the in-memory plan instead of re-parsing.
+    """
+    jmx_path = session["path"]
+    try:
+        save_jmx(session["tree"], jmx_path)
+    except Exception:
+        invalidate_jmx_session(jmx_path)
+        raise
+    st = os.stat(jmx_path)
+    session["stamp"] = (st.st_mtime_ns, st.st_size)
+    return jmx_path
+
+
+def _backup_and_save_session(session: dict, test_run_id: str) -> Optional[str]:
+    """Back up the JMX (if enabled) and save the session; returns the backup path."""
+    backup_path = None
+    if _should_create_backup():
+        try:
+            backup_path = create_backup(session["path"], test_run_id)
+        except Exception:
+            invalidate_jmx_session(session["path"])
+            raise
+    save_jmx_session(session)
+    return backup_path
+
+
+def _mark_session_modified(session: dict) -> None:
+    """Invalidate the derived views of a session after an in-place edit."""
+    session["node_index"] = None
+    session["hierarchy"] = None
+    session["variables"] = None
+
+
+def _session_rename_node(session: dict, node_id: str, elem: ET.Element) -> str:
+    """
+    Re-key a renamed element in the session's lookup maps.
+
+    A node_id hashes the element's own testname and its testclass path, so
+    renaming only changes the id of the renamed element itself.
+    """
+    path = session["paths"].pop(node_id, None)
+    triple = session["elements"].pop(node_id, None)
+    if path is None or triple is None:
+        return node_id
+
+    testclass = elem.get("testclass", elem.tag)
+    idx = int(path.rsplit("[", 1)[1][:-1])
+    new_id = _generate_node_id(testclass, elem.get("testname", ""), path, idx)
+    session["elements"][new_id] = triple
+    session["paths"][new_id] = path
+    return new_id
+
+
+def _session_subtree_ids(parent_ht: ET.Element, parent_path: str) -> List[str]:
+    return [nid for nid, *_ in _iter_paired_nodes(parent_ht, parent_path)]
+
+
+def _session_reindex_subtree(
+    session: dict,
+    parent_ht: ET.Element,
+    parent_path: str,
+    old_ids: List[str],
+) -> None:
+    """
+    Replace the lookup entries of everything below ``parent_ht`` after its
+    children changed (sibling indexes, and so node_ids, may have shifted).
+    """
+    elements = session["elements"]
+    paths = session["paths"]
+    for nid in old_ids:
+        elements.pop(nid, None)
+        paths.pop(nid, None)
+    for nid, path, elem, hash_tree, parent in _iter_paired_nodes(parent_ht, parent_path):
+        elements.setdefault(nid, (elem, hash_tree, parent))
+        paths.setdefault(nid, path)
+
+
+def _node_not_found_message(session: dict, label: str, node_id: str) -> str:
+    node_index, _ = session_node_index(session)
+    available_ids = [
+        f"  {nid}: [{info['type']}] {info['testname']}"
+        for nid, info in list(node_index.items())[:20]
+    ]
+    hint = "\n".join(available_ids)
+    return (
+        f"{label} node_id '{node_id}' not found. "
+        f"Run analyze_jmeter_script first to get valid node_ids. "
+        f"Available nodes (first 20):\n{hint}"
+    )
 
 
 # ============================================================
@@ -475,7 +685,7 @@ async def analyze_jmx_file(
         }
 
     try:
-        tree, root = load_jmx(jmx_path)
+        session = get_jmx_session(jmx_path)
     except ET.ParseError as e:
         return {
             "status": "ERROR",
@@ -484,7 +694,7 @@ async def analyze_jmx_file(
             "jmx_path": jmx_path,
         }
 
-    node_index, hierarchy = build_node_index(root)
+    node_index, hierarchy = session_node_index(session)
 
     # Build summary counts
     type_counts: Dict[str, int] = {}
@@ -523,7 +733,7 @@ async def analyze_jmx_file(
     # Build variables for detailed/full (or when export needs it)
     variables: Optional[dict] = None
     if detail_level in ("detailed", "full") or export_detail in ("detailed", "full"):
-        variables = _scan_variables(root)
+        variables = session_variables(session)
 
     # Build human-readable outline
     outline = _build_outline_text(hierarchy)
@@ -622,7 +832,7 @@ async def add_jmx_component(
         }
 
     try:
-        tree, root = load_jmx(jmx_path)
+        session = get_jmx_session(jmx_path)
     except ET.ParseError as e:
         return {
             "status": "ERROR",
@@ -631,23 +841,12 @@ async def add_jmx_component(
             "jmx_path": jmx_path,
         }
 
-    node_index, _ = build_node_index(root)
-
     # Find parent element
-    found = find_element_by_node_id(root, parent_node_id, node_index)
+    found = find_element_by_node_id(session["root"], parent_node_id, None, session["elements"])
     if found is None:
-        available_ids = [
-            f"  {nid}: [{info['type']}] {info['testname']}"
-            for nid, info in list(node_index.items())[:20]
-        ]
-        hint = "\n".join(available_ids)
         return {
             "status": "ERROR",
-            "message": (
-                f"Parent node_id '{parent_node_id}' not found. "
-                f"Run analyze_jmeter_script first to get valid node_ids. "
-                f"Available nodes (first 20):\n{hint}"
-            ),
+            "message": _node_not_found_message(session, "Parent", parent_node_id),
             "test_run_id": test_run_id,
             "jmx_path": jmx_path,
         }
@@ -700,23 +899,20 @@ async def add_jmx_component(
             "change_summary": change_summary,
         }
 
-    # Insert into parent's hashTree
+    # Insert into parent's hashTree; a "first" insert shifts the sibling
+    # indexes (and so the node_ids) of everything below the parent
+    parent_path = session["paths"][parent_node_id]
+    old_ids = _session_subtree_ids(parent_hash_tree, parent_path) if position == "first" else []
     if position == "first":
         parent_hash_tree.insert(0, new_hash_tree)
         parent_hash_tree.insert(0, new_elem)
     else:
         parent_hash_tree.append(new_elem)
         parent_hash_tree.append(new_hash_tree)
+    _session_reindex_subtree(session, parent_hash_tree, parent_path, old_ids)
+    _mark_session_modified(session)
 
-    # Backup and save
-    backup_path = None
-    if _should_create_backup():
-        backup_path = create_backup(jmx_path, test_run_id)
-
-    save_jmx(tree, jmx_path)
-
-    # Rebuild index to get the new node_id
-    _, _ = build_node_index(root)
+    backup_path = _backup_and_save_session(session, test_run_id)
 
     return {
         "status": "OK",
@@ -739,98 +935,51 @@ async def add_jmx_component(
 _SUPPORTED_OPS = {"rename", "set_prop", "replace_in_body", "toggle_enabled"}
 
 
-async def edit_jmx_component(
-    test_run_id: str,
-    target_node_id: str,
-    operations: list,
-    jmx_filename: str,
-    dry_run: bool,
-    ctx,
-) -> dict:
-    """
-    Apply one or more edit operations to an existing JMeter component.
-
-    Args:
-        test_run_id: Test run identifier.
-        target_node_id: node_id of the component to edit (from analyze output).
-        operations: List of operation dicts. Each must have an "op" key.
-            Supported ops:
-              - {"op": "rename", "value": "New Name"}
-              - {"op": "set_prop", "name": "HTTPSampler.method", "value": "POST"}
-              - {"op": "replace_in_body", "find": "old_text", "replace": "new_text"}
-              - {"op": "toggle_enabled", "value": true/false}
-        jmx_filename: Optional filename override.
-        dry_run: If True, validate and preview without saving.
-        ctx: FastMCP context.
-
-    Returns:
-        dict with status, change summary (before/after), backup path.
-    """
-    # Validate operations
+def _validate_edit_operations(operations: list) -> Optional[str]:
+    """Return an error message if the operation list is invalid, else None."""
     if not operations:
-        return {
-            "status": "ERROR",
-            "message": "No operations provided. Supply at least one operation.",
-            "test_run_id": test_run_id,
-        }
+        return "No operations provided. Supply at least one operation."
 
     for i, op in enumerate(operations):
         if not isinstance(op, dict) or "op" not in op:
-            return {
-                "status": "ERROR",
-                "message": f"Operation at index {i} is missing the 'op' field.",
-                "test_run_id": test_run_id,
-            }
+            return f"Operation at index {i} is missing the 'op' field."
         if op["op"] not in _SUPPORTED_OPS:
-            return {
-                "status": "ERROR",
-                "message": (
-                    f"Unsupported operation '{op['op']}' at index {i}. "
-                    f"Supported: {sorted(_SUPPORTED_OPS)}"
-                ),
-                "test_run_id": test_run_id,
-            }
+            return (
+                f"Unsupported operation '{op['op']}' at index {i}. "
+                f"Supported: {sorted(_SUPPORTED_OPS)}"
+            )
+    return None
 
-    try:
-        jmx_path = discover_jmx_file(test_run_id, jmx_filename)
-    except FileNotFoundError as e:
-        return {
-            "status": "ERROR",
-            "message": str(e),
-            "test_run_id": test_run_id,
-        }
 
-    try:
-        tree, root = load_jmx(jmx_path)
-    except ET.ParseError as e:
-        return {
-            "status": "ERROR",
-            "message": f"Failed to parse JMX file: {e}",
-            "test_run_id": test_run_id,
-            "jmx_path": jmx_path,
-        }
+def _find_named_prop(elem: ET.Element, prop_type: str, prop_name: str) -> Optional[ET.Element]:
+    """
+    Direct child <prop_type name="prop_name">, compared literally rather than
+    through an XPath predicate, so names with quotes or brackets are safe.
+    """
+    for child in elem.iterfind(prop_type):
+        if child.get("name") == prop_name:
+            return child
+    return None
 
-    node_index, _ = build_node_index(root)
 
-    found = find_element_by_node_id(root, target_node_id, node_index)
-    if found is None:
-        available_ids = [
-            f"  {nid}: [{info['type']}] {info['testname']}"
-            for nid, info in list(node_index.items())[:20]
-        ]
-        hint = "\n".join(available_ids)
-        return {
-            "status": "ERROR",
-            "message": (
-                f"Target node_id '{target_node_id}' not found. "
-                f"Run analyze_jmeter_script first to get valid node_ids. "
-                f"Available nodes (first 20):\n{hint}"
-            ),
-            "test_run_id": test_run_id,
-            "jmx_path": jmx_path,
-        }
+def _apply_edit_operations(
+    session: dict,
+    target_node_id: str,
+    target_elem: ET.Element,
+    operations: list,
+) -> Tuple[List[dict], str]:
+    """
+    Apply validated edit operations to an element of a session's plan and
+    keep the session's lookup maps in step.
 
-    target_elem, target_hash_tree, _ = found
+    Returns:
+        (changes, node_id) — change records (before/after) in operation
+        order, and the element's node_id after the edit (a rename changes it).
+
+    Edits are made in place. If this raises, the caller must drop the
+    session with invalidate_jmx_session() so a partial edit is not saved
+    by a later call.
+    """
     changes: List[dict] = []
 
     for op in operations:
@@ -840,6 +989,7 @@ async def edit_jmx_component(
             old_name = target_elem.get("testname", "")
             new_name = op.get("value", "")
             target_elem.set("testname", new_name)
+            target_node_id = _session_rename_node(session, target_node_id, target_elem)
             changes.append({
                 "op": "rename",
                 "before": old_name,
@@ -853,12 +1003,12 @@ async def edit_jmx_component(
 
             _PROP_TYPES = ("stringProp", "intProp", "boolProp", "longProp")
 
-            existing = target_elem.find(f"{prop_type}[@name='{prop_name}']")
+            existing = _find_named_prop(target_elem, prop_type, prop_name)
             if existing is None:
                 for alt_type in _PROP_TYPES:
                     if alt_type == prop_type:
                         continue
-                    existing = target_elem.find(f"{alt_type}[@name='{prop_name}']")
+                    existing = _find_named_prop(target_elem, alt_type, prop_name)
                     if existing is not None:
                         break
 
@@ -925,6 +1075,86 @@ async def edit_jmx_component(
                 "after": new_enabled,
             })
 
+    _mark_session_modified(session)
+    return changes, target_node_id
+
+
+async def edit_jmx_component(
+    test_run_id: str,
+    target_node_id: str,
+    operations: list,
+    jmx_filename: str,
+    dry_run: bool,
+    ctx,
+) -> dict:
+    """
+    Apply one or more edit operations to an existing JMeter component.
+
+    Args:
+        test_run_id: Test run identifier.
+        target_node_id: node_id of the component to edit (from analyze output).
+        operations: List of operation dicts. Each must have an "op" key.
+            Supported ops:
+              - {"op": "rename", "value": "New Name"}
+              - {"op": "set_prop", "name": "HTTPSampler.method", "value": "POST"}
+              - {"op": "replace_in_body", "find": "old_text", "replace": "new_text"}
+              - {"op": "toggle_enabled", "value": true/false}
+        jmx_filename: Optional filename override.
+        dry_run: If True, validate and preview without saving.
+        ctx: FastMCP context.
+
+    Returns:
+        dict with status, change summary (before/after), backup path.
+    """
+    error = _validate_edit_operations(operations)
+    if error:
+        return {
+            "status": "ERROR",
+            "message": error,
+            "test_run_id": test_run_id,
+        }
+
+    try:
+        jmx_path = discover_jmx_file(test_run_id, jmx_filename)
+    except FileNotFoundError as e:
+        return {
+            "status": "ERROR",
+            "message": str(e),
+            "test_run_id": test_run_id,
+        }
+
+    try:
+        session = get_jmx_session(jmx_path)
+    except ET.ParseError as e:
+        return {
+            "status": "ERROR",
+            "message": f"Failed to parse JMX file: {e}",
+            "test_run_id": test_run_id,
+            "jmx_path": jmx_path,
+        }
+
+    found = find_element_by_node_id(session["root"], target_node_id, None, session["elements"])
+    if found is None:
+        return {
+            "status": "ERROR",
+            "message": _node_not_found_message(session, "Target", target_node_id),
+            "test_run_id": test_run_id,
+            "jmx_path": jmx_path,
+        }
+
+    target_elem, _, _ = found
+    try:
+        changes, _ = _apply_edit_operations(session, target_node_id, target_elem, operations)
+    except Exception as e:
+        # Earlier operations already changed the cached plan; discard it
+        invalidate_jmx_session(jmx_path)
+        return {
+            "status": "ERROR",
+            "message": f"Failed to apply edit operations, JMX left unchanged: {e}",
+            "test_run_id": test_run_id,
+            "jmx_path": jmx_path,
+        }
+
     change_summary = {
         "target_node_id": target_node_id,
         "target_testname": target_elem.get("testname", ""),
@@ -934,6 +1164,8 @@ async def edit_jmx_component(
     }
 
     if dry_run:
+        # The preview edited the cached plan; drop it so the file is re-read
+        invalidate_jmx_session(jmx_path)
         return {
             "status": "OK",
             "message": (
@@ -946,12 +1178,7 @@ async def edit_jmx_component(
             "change_summary": change_summary,
         }
 
-    # Backup and save
-    backup_path = None
-    if _should_create_backup():
-        backup_path = create_backup(jmx_path, test_run_id)
-
-    save_jmx(tree, jmx_path)
+    backup_path = _backup_and_save_session(session, test_run_id)
 
     return {
         "status": "OK",
@@ -966,3 +1193,154 @@ async def edit_jmx_component(
         "dry_run": False,
         "change_summary": change_summary,
     }
+
+
+# ============================================================
+# Batch Edit
+# ============================================================
+
+async def batch_edit_jmx_components(
+    test_run_id: str,
+    edits: list,
+    jmx_filename: str,
+    dry_run: bool,
+    ctx,
+) -> dict:
+    """
+    Apply edit operations to many JMeter components with one parse, one
+    backup and one save.
+
+    All target node_ids refer to the plan as it was before the batch (i.e.
+    the analyze output), even if an earlier edit in the batch renames a
+    component. Every edit is validated and every target resolved before
+    anything is changed, so an invalid batch leaves the JMX untouched.
+
+    Args:
+        test_run_id: Test run identifier.
+        edits: List of {"target_node_id": str, "operations": [...]} dicts;
+            operations are the same as for edit_jmx_component.
+        jmx_filename: Optional filename override.
+        dry_run: If True, validate and preview without saving.
+        ctx: FastMCP context.
+
+    Returns:
+        dict with status, one change summary per edit, backup path.
+    """
+    if not edits or not isinstance(edits, list):
+        return {
+            "status": "ERROR",
+            "message": "No edits provided. Supply at least one {target_node_id, operations} entry.",
+            "test_run_id": test_run_id,
+        }
+
+    for i, edit in enumerate(edits):
+        if not isinstance(edit, dict) or not edit.get("target_node_id"):
+            return {
+                "status": "ERROR",
+                "message": f"Edit at index {i} is missing the 'target_node_id' field.",
+                "test_run_id": test_run_id,
+            }
+        error = _validate_edit_operations(edit.get("operations"))
+        if error:
+            return {
+                "status": "ERROR",
+                "message": f"Edit at index {i} ({edit['target_node_id']}): {error}",
+                "test_run_id": test_run_id,
+            }
+
+    try:
+        jmx_path = discover_jmx_file(test_run_id, jmx_filename)
+    except FileNotFoundError as e:
+        return {
+            "status": "ERROR",
+            "message": str(e),
+            "test_run_id": test_run_id,
+        }
+
+    try:
+        session = get_jmx_session(jmx_path)
+    except ET.ParseError as e:
+        return {
+            "status": "ERROR",
+            "message": f"Failed to parse JMX file: {e}",
+            "test_run_id": test_run_id,
+            "jmx_path": jmx_path,
+        }
+
+    targets = []
+    for i, edit in enumerate(edits):
+        found = find_element_by_node_id(session["root"], edit["target_node_id"], None, session["elements"])
+        if found is None:
+            return {
+                "status": "ERROR",
+                "message": (
+                    f"Edit at index {i}: "
+                    + _node_not_found_message(session, "Target", edit["target_node_id"])
+                ),
+                "test_run_id": test_run_id,
+                "jmx_path": jmx_path,
+            }
+        targets.append(found[0])
+
+    # Original node_id -> current node_id, for components renamed earlier in the batch
+    current_ids: Dict[str, str] = {}
+    change_summaries: List[dict] = []
+    total_ops = 0
+
+    for i, (edit, target_elem) in enumerate(zip(edits, targets)):
+        target_node_id = edit["target_node_id"]
+        try:
+            changes, new_id = _apply_edit_operations(
+                session, current_ids.get(target_node_id, target_node_id),
+                target_elem, edit["operations"],
+            )
+        except Exception as e:
+            # Earlier edits already changed the cached plan; discard it
+            invalidate_jmx_session(jmx_path)
+            return {
+                "status": "ERROR",
+                "message": f"Edit at index {i} ({target_node_id}) failed, JMX left unchanged: {e}",
+                "test_run_id": test_run_id,
+                "jmx_path": jmx_path,
+            }
+        current_ids[target_node_id] = new_id
+        total_ops += len(changes)
+        change_summaries.append({
+            "target_node_id": target_node_id,
+            "target_testname": target_elem.get("testname", ""),
+            "target_type": target_elem.get("testclass", target_elem.tag),
+            "operations_applied": len(changes),
+            "changes": changes,
+        })
+
+    if dry_run:
+        # The preview edited the cached plan; drop it so the file is re-read
+        invalidate_jmx_session(jmx_path)
+        return {
+            "status": "OK",
+            "message": (
+                f"[DRY RUN] Would apply {total_ops} operation(s) to "
+                f"{len(edits)} component(s)."
+            ),
+            "test_run_id": test_run_id,
+            "jmx_path": jmx_path,
+            "dry_run": True,
+            "edits_applied": len(edits),
+            "operations_applied": total_ops,
+            "change_summaries": change_summaries,
+        }
+
+    backup_path = _backup_and_save_session(session, test_run_id)
+
+    return {
+        "status": "OK",
+        "message": f"Applied {total_ops} operation(s) to {len(edits)} component(s).",
+        "test_run_id": test_run_id,
+        "jmx_path": jmx_path,
+        "jmx_filename": os.path.basename(jmx_path),
+        "backup_path": backup_path,
+        "dry_run": False,
+        "edits_applied": len(edits),
+        "operations_applied": total_ops,
+        "change_summaries": change_summaries,
+    }
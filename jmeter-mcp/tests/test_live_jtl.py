@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from services import jmeter_runner  # noqa: E402
+
+HEADER = (
+    "timeStamp,elapsed,label,responseCode,responseMessage,success,"
+    "failureMessage,bytes,sentBytes,Latency\n"
+)
+ROWS = (
+    "1700000000000,120,A,200,OK,true,,512,150,100\n"
+    '1700000001000,340,B,500,Server Error,false,"Assertion failed:\n'
+    'expected 200",256,150,300\n'
+    "1700000002000,90,A,200,OK,true,,512,150,80\n"
+)
+
+
+def test_live_jtl_poll_inside_quoted_newline_matches_full_parse(tmp_path):
+    content = HEADER + ROWS
+    cut = content.index("Assertion failed:\n") + len("Assertion failed:\n")
+
+    polled = tmp_path / "polled.jtl"
+    polled.write_text(content[:cut], encoding="utf-8")
+    jmeter_runner.parse_jtl_live(str(polled))
+    with open(polled, "a", encoding="utf-8") as f:
+        f.write(content[cut:])
+    live = jmeter_runner.parse_jtl_live(str(polled))
+
+    full = tmp_path / "full.jtl"
+    full.write_text(content, encoding="utf-8")
+    expected = jmeter_runner.parse_jtl_live(str(full))
+
+    assert live["total_samples"] == expected["total_samples"] == 3
+    assert sorted(live["per_label"]) == sorted(expected["per_label"]) == ["A", "B"]
+    assert live == expected
+
+
+def test_live_jtl_state_is_bounded(tmp_path):
+    for i in range(jmeter_runner._LIVE_JTL_STATE_MAX + 3):
+        path = tmp_path / f"run{i}.jtl"
+        path.write_text(HEADER + ROWS, encoding="utf-8")
+        jmeter_runner.parse_jtl_live(str(path))
+    assert len(jmeter_runner._LIVE_JTL_STATE) <= jmeter_runner._LIVE_JTL_STATE_MAX
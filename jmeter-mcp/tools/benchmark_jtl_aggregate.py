@@ -0,0 +1,120 @@
+"""
+JTL Aggregate Report Benchmark
+
+Times the two aggregation engines behind generate_aggregate_report
+(services/jmeter_runner.py) on the same JTL and checks that they produce
+identical report rows:
+
+  - python: row-by-row csv.DictReader engine
+  - pandas: typed chunked reads with grouped reductions
+
+If no JTL is given, a synthetic one is generated (5,000,000 rows by default)
+with realistic column layout, 300 labels and a ~2% error rate.
+
+Usage:
+  python benchmark_jtl_aggregate.py                          # 5M-row synthetic JTL
+  python benchmark_jtl_aggregate.py --rows 1000000           # Smaller synthetic JTL
+  python benchmark_jtl_aggregate.py --jtl path/to/test-results.csv
+  python benchmark_jtl_aggregate.py --engines pandas         # Skip the slow engine
+
+Requirements:
+  - jmeter-mcp/config.yaml and jmeter-mcp/jmeter_config.yaml must exist
+  - pandas and numpy installed (pip install "jmeter-mcp[analysis]")
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+JMETER_MCP_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(JMETER_MCP_DIR))
+
+from services import jmeter_runner  # noqa: E402
+
+JTL_HEADER = (
+    "timeStamp,elapsed,label,responseCode,responseMessage,threadName,dataType,"
+    "success,failureMessage,bytes,sentBytes,grpThreads,allThreads,URL,Latency,"
+    "IdleTime,Connect\n"
+)
+
+
+def generate_jtl(path: str, rows: int, labels: int = 300, seed: int = 42) -> None:
+    """Write a synthetic JTL with `rows` samples spread over `labels` labels."""
+    rng = random.Random(seed)
+    label_names = [f"TC{i // 10:02d}_S{i % 10:02d}_Request_{i}" for i in range(labels)]
+    start_ts = 1_700_000_000_000
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(JTL_HEADER)
+        lines = []
+        for i in range(rows):
+            label = label_names[rng.randrange(labels)]
+            elapsed = int(rng.lognormvariate(5.5, 0.6))
+            failed = rng.random() < 0.02
+            rc, msg, ok = ("500", "Internal Server Error", "false") if failed else ("200", "OK", "true")
+            threads = min(200, 1 + i * 200 // rows)
+            lines.append(
+                f"{start_ts + i * 3},{elapsed},{label},{rc},{msg},Thread Group 1-{threads},text,"
+                f"{ok},,{rng.randrange(500, 20000)},512,{threads},{threads},"
+                f"https://example.com/api/{label},{int(elapsed * 0.8)},0,{rng.randrange(0, 20)}\n"
+            )
+            if len(lines) >= 100_000:
+                f.writelines(lines)
+                lines.clear()
+        f.writelines(lines)
+
+
+def run_engine(engine: str, jtl_path: str):
+    """Build aggregate rows with one engine; returns (rows, seconds)."""
+    jmeter_runner.JTL_AGG_CONFIG["engine"] = engine
+    started = time.perf_counter()
+    rows = jmeter_runner.build_aggregate_rows_from_jtl(jtl_path)
+    return rows, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JTL aggregate report engines")
+    parser.add_argument("--jtl", help="Existing JTL to benchmark (default: generate a synthetic one)")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Rows in the synthetic JTL")
+    parser.add_argument("--labels", type=int, default=300, help="Labels in the synthetic JTL")
+    parser.add_argument(
+        "--engines", nargs="+", default=["python", "pandas"], choices=["python", "pandas"],
+        help="Engines to run (default: both)",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = None
+    jtl_path = args.jtl
+    if not jtl_path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        jtl_path = os.path.join(tmp_dir.name, "test-results.csv")
+        print(f"Generating synthetic JTL: {args.rows:,} rows, {args.labels} labels ...")
+        generate_jtl(jtl_path, args.rows, args.labels)
+
+    size_mb = os.path.getsize(jtl_path) / (1024 * 1024)
+    print(f"JTL: {jtl_path} ({size_mb:,.1f} MB)")
+
+    results = {}
+    for engine in args.engines:
+        rows, seconds = run_engine(engine, jtl_path)
+        results[engine] = rows
+        print(f"  {engine:<7} {seconds:8.2f}s  ({len(rows)} labels)")
+
+    if len(results) == 2:
+        identical = results["python"] == results["pandas"]
+        print(f"Rows identical: {identical}")
+        if not identical:
+            return 1
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+JTL Cache Copy Check
+
+utils/jtl_cache.py is used by three MCP servers (jmeter-mcp, perfanalysis-mcp,
+blazemeter-mcp). Each server is installed and run as its own project, so each
+ships its own copy of the module. The jmeter-mcp copy is the source of truth;
+the other two must stay byte-identical to it.
+
+This script compares the copies and exits with status 1 if any of them
+differs from the jmeter-mcp copy. With --fix it overwrites the other copies
+with the jmeter-mcp one instead.
+
+Usage:
+  python check_jtl_cache_sync.py          # Exit 1 if any copy differs
+  python check_jtl_cache_sync.py --fix    # Copy jmeter-mcp's module to the others
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+
+SOURCE = REPO_ROOT / "jmeter-mcp" / "utils" / "jtl_cache.py"
+COPIES = [
+    REPO_ROOT / "perfanalysis-mcp" / "utils" / "jtl_cache.py",
+    REPO_ROOT / "blazemeter-mcp" / "utils" / "jtl_cache.py",
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that jtl_cache.py copies match jmeter-mcp's.")
+    parser.add_argument("--fix", action="store_true", help="Overwrite differing copies with jmeter-mcp's module")
+    args = parser.parse_args()
+
+    source = SOURCE.read_bytes()
+    stale = [copy for copy in COPIES if not copy.exists() or copy.read_bytes() != source]
+
+    if not stale:
+        print(f"All {len(COPIES) + 1} copies of jtl_cache.py are identical.")
+        return 0
+
+    for copy in stale:
+        rel = copy.relative_to(REPO_ROOT)
+        if args.fix:
+            shutil.copyfile(SOURCE, copy)
+            print(f"Updated {rel}")
+        else:
+            print(f"{rel} differs from {SOURCE.relative_to(REPO_ROOT)}")
+
+    if args.fix:
+        return 0
+    print("Run with --fix to copy jmeter-mcp/utils/jtl_cache.py over the others.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+har_reader.py
+
+Streaming reader for HAR (HTTP Archive) files, shared by the HAR adapter
+(services/har_adapter.py) and the HAR/JMX diff engine
+(services/har_jmx_diffengine.py).
+
+HARs with embedded response bodies can reach several GB. Instead of
+json.load()-ing the whole document, the reader:
+
+1. Scans the file once for the small ``log`` metadata (version, creator,
+   pages) and validates the HAR structure.
+2. Yields ``log.entries`` one entry at a time, so a caller that does not
+   keep raw entries only ever holds the largest single entry in memory.
+
+    metadata, entries = open_har(har_path)
+    for entry in entries:
+        ...
+
+ijson is optional. Without it the file is parsed with json.load() and is
+subject to the historical 200 MB limit; with it there is no size limit.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, Tuple
+
+try:
+    import ijson
+    _IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    _IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# File size thresholds (safeguard #4); the hard limit only applies to
+# json.load(), streaming keeps memory bounded regardless of file size
+MAX_HAR_FILE_SIZE_BYTES = 200 * 1024 * 1024   # 200 MB — reject (no ijson)
+WARN_HAR_FILE_SIZE_BYTES = 50 * 1024 * 1024   # 50 MB — warn
+
+# Characters read per chunk by the streaming parser
+_READ_CHUNK_CHARS = 1024 * 1024
+
+_NO_LOG_ERROR = "Invalid HAR structure: top-level object must contain a 'log' key"
+_NO_ENTRIES_ERROR = "Invalid HAR structure: 'log' object must contain an 'entries' array"
+
+
+def open_har(har_path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Validate a HAR file and return its metadata and an entry iterator.
+
+    Args:
+        har_path: Full path to the HAR file.
+
+    Returns:
+        Tuple of (metadata, entries) where metadata is
+        {"version": str, "creator": dict, "pages": list} and entries yields
+        each item of ``log.entries`` in file order. The iterator may only
+        be consumed once.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is too large to load without ijson, is not
+            valid JSON, or is not a HAR (also raised while iterating if the
+            entries array turns out to be malformed).
+    """
+    if not os.path.isfile(har_path):
+        raise FileNotFoundError(f"HAR file not found: {har_path}")
+
+    file_size = os.path.getsize(har_path)
+
+    if not _IJSON_AVAILABLE and file_size > MAX_HAR_FILE_SIZE_BYTES:
+        raise ValueError(
+            f"HAR file too large ({file_size / (1024*1024):.1f} MB). "
+            f"Maximum supported size is {MAX_HAR_FILE_SIZE_BYTES / (1024*1024):.0f} MB "
+            f"(install ijson to stream larger files)."
+        )
+
+    if file_size > WARN_HAR_FILE_SIZE_BYTES:
+        logger.warning(
+            "Large HAR file: %.1f MB — parsing may take a moment",
+            file_size / (1024 * 1024),
+        )
+
+    if not _IJSON_AVAILABLE:
+        log_obj = _load_har_log(har_path)
+        return _log_metadata(log_obj), iter(log_obj.get("entries", []))
+
+    metadata = _scan_har_metadata(har_path)
+    return metadata, _iter_har_entries(har_path)
+
+
+# ============================================================
+# Internal helpers
+# ============================================================
+
+class _Utf8Reader:
+    """
+    Bytes view of a text file for ijson. Decoding happens in the text layer
+    (errors="replace"), so invalid UTF-8 is tolerated like json.load().
+    """
+
+    def __init__(self, text_file):
+        self._text_file = text_file
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson probes the file type with read(0)
+        if size == 0:
+            return b""
+        return self._text_file.read(size if size > 0 else _READ_CHUNK_CHARS).encode("utf-8")
+
+
+def _open_text(har_path: str):
+    return open(har_path, "r", encoding="utf-8", errors="replace")
+
+
+def _load_har_log(har_path: str) -> Dict[str, Any]:
+    """json.load() fallback: parse the document and return its ``log`` object."""
+    try:
+        with _open_text(har_path) as f:
+            har_data = json.load(f)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON in HAR file: {exc}") from exc
+
+    if not isinstance(har_data, dict) or "log" not in har_data:
+        raise ValueError(_NO_LOG_ERROR)
+
+    log_obj = har_data["log"]
+    if "entries" not in log_obj:
+        raise ValueError(_NO_ENTRIES_ERROR)
+
+    return log_obj
+
+
+def _log_metadata(log_obj: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": log_obj.get("version", "unknown"),
+        "creator": log_obj.get("creator", {}),
+        "pages": log_obj.get("pages", []),
+    }
+
+
+def _scan_har_metadata(har_path: str) -> Dict[str, Any]:
+    """
+    Collect ``log`` metadata with the event parser, without building entries.
+
+    HAR writers put version, creator and pages before entries, in which case
+    the scan stops as soon as the entries array starts. Otherwise it skips
+    over the entries to reach the remaining fields.
+    """
+    metadata: Dict[str, Any] = {}
+    found = {"version", "creator", "pages"}
+    has_log = False
+    has_entries = False
+    builder = None
+    building = ""
+
+    try:
+        with _open_text(har_path) as f:
+            events = ijson.parse(_Utf8Reader(f), use_float=True)
+            first = next(events, None)
+            if first is None or first[1] != "start_map":
+                raise ValueError(_NO_LOG_ERROR)
+
+            for prefix, event, value in events:
+                if builder is not None:
+                    if prefix == building and event in ("end_map", "end_array"):
+                        builder.event(event, value)
+                        metadata[building.split(".", 1)[1]] = builder.value
+                        builder = None
+                    else:
+                        builder.event(event, value)
+                    continue
+
+                if prefix == "" and event == "map_key" and value == "log":
+                    has_log = True
+                elif prefix == "log" and event == "map_key" and value == "entries":
+                    has_entries = True
+                    if found.issubset(metadata):
+                        break
+                elif prefix == "log.version" and event in ("string", "number"):
+                    metadata["version"] = value
+                elif prefix in ("log.creator", "log.pages") and event in ("start_map", "start_array"):
+                    building = prefix
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+    except ijson.JSONError as exc:
+        raise ValueError(f"Invalid JSON in HAR file: {exc}") from exc
+
+    if not has_log:
+        raise ValueError(_NO_LOG_ERROR)
+    if not has_entries:
+        raise ValueError(_NO_ENTRIES_ERROR)
+
+    return _log_metadata(metadata)
+
+
+def _iter_har_entries(har_path: str) -> Iterator[Dict[str, Any]]:
+    """Yield ``log.entries`` items one at a time."""
+    try:
+        with _open_text(har_path) as f:
+            yield from ijson.items(_Utf8Reader(f), "log.entries.item", use_float=True)
+    except ijson.JSONError as exc:
+        raise ValueError(f"Invalid JSON in HAR file: {exc}") from exc
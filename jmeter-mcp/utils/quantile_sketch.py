@@ -0,0 +1,175 @@
+"""
+quantile_sketch.py
+
+Mergeable streaming quantile sketch for JTL response-time percentiles.
+
+A sketch is a plain JSON-serializable dict, so it can be kept in per-label
+aggregation state, written next to a run's artifacts and merged later:
+
+    sketch = new_sketch(relative_accuracy=0.01)
+    sketch_add(sketch, 523)
+    p90 = sketch_quantile(sketch, 90)
+
+Values are counted in logarithmic buckets (DDSketch-style): every quantile
+returned is within ``relative_accuracy`` of the exact nearest-rank value,
+and the number of buckets only depends on the dynamic range of the data
+(about 700 buckets for 1 ms .. 1,000,000 ms at 1% accuracy), not on the
+number of samples.
+
+A ``relative_accuracy`` of 0 switches the sketch to exact mode: one bucket
+per distinct value, giving the same results as sorting the full list of
+values. Exact mode is the right choice for integer millisecond data when
+percentiles must match the unsketched report byte-for-byte.
+
+This module is stateless and has no side effects.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+
+def new_sketch(relative_accuracy: float = 0.0) -> Dict[str, Any]:
+    """
+    Create an empty sketch.
+
+    Args:
+        relative_accuracy: Maximum relative error of returned quantiles
+            (e.g. 0.01 for 1%). 0 keeps exact per-value counts.
+    """
+    if relative_accuracy < 0 or relative_accuracy >= 1:
+        raise ValueError(f"relative_accuracy must be in [0, 1), got {relative_accuracy}")
+    return {
+        "relative_accuracy": float(relative_accuracy),
+        "count": 0,
+        "zero_count": 0,
+        "min": None,
+        "max": None,
+        "bins": {},
+    }
+
+
+def sketch_add(sketch: Dict[str, Any], value: float, count: int = 1) -> None:
+    """Add ``count`` occurrences of ``value`` to the sketch."""
+    if count <= 0:
+        return
+
+    sketch["count"] += count
+    if sketch["min"] is None or value < sketch["min"]:
+        sketch["min"] = value
+    if sketch["max"] is None or value > sketch["max"]:
+        sketch["max"] = value
+
+    alpha = sketch["relative_accuracy"]
+    if alpha == 0:
+        bins = sketch["bins"]
+        bins[value] = bins.get(value, 0) + count
+        return
+
+    if value <= 0:
+        sketch["zero_count"] += count
+        return
+
+    key = _bucket_key(value, alpha)
+    bins = sketch["bins"]
+    bins[key] = bins.get(key, 0) + count
+
+
+def sketch_merge(target: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge ``other`` into ``target`` in place and return ``target``.
+
+    Both sketches must use the same relative accuracy.
+    """
+    if target["relative_accuracy"] != other["relative_accuracy"]:
+        raise ValueError(
+            "Cannot merge sketches with different relative accuracy: "
+            f"{target['relative_accuracy']} vs {other['relative_accuracy']}"
+        )
+    if not other["count"]:
+        return target
+
+    target["count"] += other["count"]
+    target["zero_count"] += other["zero_count"]
+    for bound, pick in (("min", min), ("max", max)):
+        if target[bound] is None:
+            target[bound] = other[bound]
+        elif other[bound] is not None:
+            target[bound] = pick(target[bound], other[bound])
+
+    bins = target["bins"]
+    for key, c in other["bins"].items():
+        bins[key] = bins.get(key, 0) + c
+    return target
+
+
+def sketch_quantile(sketch: Dict[str, Any], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile (0-100) of the values added to the sketch.
+
+    Uses the same rank rule as the JTL report's ``_percentile`` helper.
+    Returns None for an empty sketch.
+    """
+    total = sketch["count"]
+    if not total:
+        return None
+
+    rank = max(0, min(total - 1, int(math.ceil(pct / 100.0 * total)) - 1))
+
+    alpha = sketch["relative_accuracy"]
+    seen = sketch["zero_count"]
+    if seen > rank:
+        return max(0, sketch["min"])
+
+    for key in sorted(sketch["bins"]):
+        seen += sketch["bins"][key]
+        if seen > rank:
+            if alpha == 0:
+                return key
+            value = _bucket_value(key, alpha)
+            return min(max(value, sketch["min"]), sketch["max"])
+    return sketch["max"]
+
+
+def sketch_to_dict(sketch: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a JSON-safe copy of the sketch (bucket keys as strings)."""
+    out = dict(sketch)
+    out["bins"] = {str(k): c for k, c in sketch["bins"].items()}
+    return out
+
+
+def sketch_from_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a sketch saved with ``sketch_to_dict``."""
+    sketch = new_sketch(data.get("relative_accuracy", 0.0))
+    sketch["count"] = int(data.get("count", 0))
+    sketch["zero_count"] = int(data.get("zero_count", 0))
+    sketch["min"] = data.get("min")
+    sketch["max"] = data.get("max")
+    sketch["bins"] = {_parse_key(k): int(c) for k, c in data.get("bins", {}).items()}
+    return sketch
+
+
+# ============================================================
+# Internal helpers
+# ============================================================
+
+def _gamma(alpha: float) -> float:
+    return (1 + alpha) / (1 - alpha)
+
+
+def _bucket_key(value: float, alpha: float) -> int:
+    """Index of the logarithmic bucket (gamma^(k-1), gamma^k] holding value."""
+    return int(math.ceil(math.log(value) / math.log(_gamma(alpha))))
+
+
+def _bucket_value(key: int, alpha: float) -> float:
+    """Representative value of a bucket; within alpha of every value in it."""
+    gamma = _gamma(alpha)
+    return 2 * gamma ** key / (gamma + 1)
+
+
+def _parse_key(key: str):
+    """Bucket keys are ints in log mode and raw values in exact mode."""
+    try:
+        return int(key)
+    except ValueError:
+        return float(key)
@@ -20,6 +20,7 @@ import json
 import math
 import datetime
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -35,6 +36,8 @@ from utils.file_processor import (
     write_markdown_output,
 )
 from utils.kpi_utils import discover_kpi_files, load_kpi_pivoted
+from utils.jtl_cache import read_jtl_columns, read_jtl_header
+from utils.grouped_quantiles import grouped_quantiles
 from services.kpi_analyzer import detect_kpi_bottlenecks
 
 # ---------------------------------------------------------------------------
@@ -61,6 +64,7 @@ BN_DEFAULTS = {
     "memory_high_pct": None,      # falls back to resource_thresholds.memory.high
     "raw_metric_degrade_pct": 50.0,  # relative increase from baseline to flag when utilization % unavailable (no K8s limits)
     "max_jtl_rows": None,         # None = load all rows; set to cap memory on very large JTL files
+    "multi_tier_workers": 1,      # >1 = evaluate endpoints for multi-tier bottlenecks in a process pool
 }
 
 
@@ -347,17 +351,18 @@ def _detect_engine_count(df: pd.DataFrame) -> int:
 def _load_jtl(path: Path, cfg: Dict) -> Optional[pd.DataFrame]:
     """Load raw JTL CSV with memory-optimised I/O.
 
-    Applies three techniques to handle large JTL files (hundreds of MB):
+    Applies four techniques to handle large JTL files (hundreds of MB):
       1. ``usecols`` — only loads the columns the analyser actually uses.
       2. Explicit ``dtype`` map — avoids pandas object-column overhead and
          uses ``category`` for low-cardinality string columns (label, Hostname).
       3. Configurable ``max_jtl_rows`` — safety valve for extremely large files.
+      4. Shared columnar sidecar (``utils/jtl_cache.py``) — repeat loads of the
+         same JTL are served from a memory-mapped Parquet copy.
     """
     try:
         required = {"timeStamp", "elapsed", "label", "responseCode", "success", "allThreads"}
 
-        header = pd.read_csv(path, nrows=0)
-        available = set(header.columns)
+        available = set(read_jtl_header(str(path)))
         if not required.issubset(available):
             missing = required - available
             print(f"[bottleneck_analyzer] Missing columns: {missing}")
@@ -380,13 +385,7 @@ def _load_jtl(path: Path, cfg: Dict) -> Optional[pd.DataFrame]:
 
         max_rows = cfg.get("max_jtl_rows")
 
-        df = pd.read_csv(
-            path,
-            usecols=use_cols,
-            dtype=dtype_map,
-            low_memory=True,
-            nrows=max_rows,
-        )
+        df = read_jtl_columns(str(path), use_cols, dtype=dtype_map, nrows=max_rows)
 
         if max_rows and len(df) >= max_rows:
             print(f"[bottleneck_analyzer] Row limit applied: loaded {max_rows:,} of available rows")
@@ -601,6 +600,25 @@ def _compute_bucket_concurrency(
     )
 
 
+def _compute_bucket_percentiles(
+    df: pd.DataFrame, bucket_seconds: int, quantiles: Dict[str, float],
+) -> pd.DataFrame:
+    """Response-time percentiles per time bucket in one vectorized pass.
+
+    ``df`` must be indexed by timestamp. Buckets use the same bins as
+    ``df.resample(f"{bucket_seconds}s")`` (empty buckets included, as NaN), and
+    values match ``x.quantile(q)`` per bucket. See ``utils/grouped_quantiles.py``.
+    """
+    grouper = df.groupby(pd.Grouper(freq=f"{bucket_seconds}s"))
+    values = grouped_quantiles(
+        df["elapsed"].to_numpy(),
+        grouper.ngroup().to_numpy(),
+        list(quantiles.values()),
+        n_groups=grouper.ngroups,
+    )
+    return pd.DataFrame(values, index=grouper.size().index, columns=list(quantiles))
+
+
 def _build_time_buckets(jtl_df: pd.DataFrame, cfg: Dict) -> pd.DataFrame:
     """
     Bucket JTL data into fixed-width time windows.
@@ -615,17 +633,17 @@ def _build_time_buckets(jtl_df: pd.DataFrame, cfg: Dict) -> pd.DataFrame:
 
     concurrency_series = _compute_bucket_concurrency(df, bucket_seconds)
 
-    resampled = df.resample(f"{bucket_seconds}s").agg(
-        p50=("elapsed", lambda x: x.quantile(0.50) if len(x) else np.nan),
-        p90=("elapsed", lambda x: x.quantile(0.90) if len(x) else np.nan),
-        p95=("elapsed", lambda x: x.quantile(0.95) if len(x) else np.nan),
+    percentiles = _compute_bucket_percentiles(
+        df, bucket_seconds, {"p50": 0.50, "p90": 0.90, "p95": 0.95},
+    )
+    resampled = df.assign(is_error=~df["success"]).resample(f"{bucket_seconds}s").agg(
         avg_rt=("elapsed", "mean"),
         max_rt=("elapsed", "max"),
         total_requests=("elapsed", "count"),
-        error_count=("success", lambda x: (~x).sum()),
+        error_count=("is_error", "sum"),
     )
 
-    resampled = resampled.join(concurrency_series)
+    resampled = percentiles.join(resampled).join(concurrency_series)
 
     resampled["throughput_rps"] = resampled["total_requests"] / bucket_seconds
     resampled["error_rate"] = (
@@ -1026,6 +1044,114 @@ def _check_persistence(
     return actual_ratio >= persistence_ratio, round(actual_ratio, 4)
 
 
+def _scan_sustained_windows(
+    breach: np.ndarray,
+    sustained: int,
+    reset: Optional[np.ndarray] = None,
+    skip: Optional[np.ndarray] = None,
+    values: Optional[np.ndarray] = None,
+    threshold: Optional[float] = None,
+    comparator: str = "gte",
+) -> Dict[str, np.ndarray]:
+    """
+    Find every sustained window in a bucket series in one vectorized pass.
+
+    Equivalent to the detectors' bucket-by-bucket scan: a window starts at a
+    breaching bucket and qualifies once ``sustained`` consecutive buckets
+    breach.  A ``reset`` bucket (e.g. missing data) or a non-breaching bucket
+    ends the run; a ``skip`` bucket (outlier) is ignored -- it neither
+    extends nor ends the run.
+
+    Args:
+        breach:     Boolean mask, True where the bucket breaches the threshold.
+        sustained:  Consecutive breaching buckets required.
+        reset:      Boolean mask of buckets that always end a run.
+        skip:       Boolean mask of buckets to ignore (reset wins over skip).
+        values:     Optional metric values; with ``threshold``, the persistence
+                    ratio of each window is computed as in ``_check_persistence``.
+        threshold:  Degradation threshold for the persistence ratio.
+        comparator: 'gte' or 'lte', as in ``_check_persistence``.
+
+    Returns:
+        Dict of equal-length arrays, one entry per qualifying window in order:
+        ``onset`` (first breaching bucket), ``confirm`` (bucket where the run
+        reached ``sustained``), ``end`` (last breaching bucket of the run),
+        ``skipped`` (skip buckets before ``confirm``) and, when ``values`` is
+        given, ``persistence`` (unrounded ratio from ``onset`` to the end).
+    """
+    breach = np.asarray(breach, dtype=bool)
+    n = len(breach)
+    reset = np.zeros(n, dtype=bool) if reset is None else np.asarray(reset, dtype=bool)
+    skip = np.zeros(n, dtype=bool) if skip is None else np.asarray(skip, dtype=bool) & ~reset
+    sustained = max(1, int(sustained))
+
+    # Runs of breaching buckets among the buckets the scan actually evaluates
+    kept = np.flatnonzero(~skip)
+    state = breach[kept] & ~reset[kept]
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], state, [False])).astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    qualifying = (ends - starts) >= sustained
+    starts, ends = starts[qualifying], ends[qualifying]
+
+    confirm = kept[starts + sustained - 1]
+    windows = {
+        "onset": kept[starts],
+        "confirm": confirm,
+        "end": kept[ends - 1],
+        "skipped": np.cumsum(skip)[confirm],
+    }
+    if values is not None and threshold is not None:
+        ratios = _persistence_ratios(values, threshold, comparator)
+        windows["persistence"] = ratios[windows["onset"]]
+    return windows
+
+
+def _persistence_ratios(
+    values: np.ndarray, threshold: float, comparator: str = "gte",
+) -> np.ndarray:
+    """
+    ``_check_persistence`` ratio for every possible onset at once.
+
+    Element ``i`` is the fraction of non-missing buckets from ``i`` to the end
+    that stay degraded (NaN when none remain), computed with suffix sums.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    if comparator == "gte":
+        degraded = valid & (values >= threshold)
+    else:  # lte
+        degraded = valid & (values <= threshold)
+
+    degraded_after = np.cumsum(degraded[::-1])[::-1]
+    valid_after = np.cumsum(valid[::-1])[::-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid_after > 0, degraded_after / valid_after, np.nan)
+
+
+def _first_sustained_window(
+    windows: Dict[str, np.ndarray], required_persistence: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    First window from ``_scan_sustained_windows`` as plain ints, or None.
+
+    With ``required_persistence`` (and a ``persistence`` array in
+    ``windows``), adds ``is_persistent`` and the rounded ``persistence_ratio``
+    exactly as ``_check_persistence`` returns them.
+    """
+    if not len(windows["onset"]):
+        return None
+
+    first = {key: int(windows[key][0]) for key in ("onset", "confirm", "end", "skipped")}
+    if required_persistence is not None and "persistence" in windows:
+        ratio = windows["persistence"][0]
+        if np.isnan(ratio):
+            first["is_persistent"], first["persistence_ratio"] = False, 0.0
+        else:
+            first["is_persistent"] = bool(ratio >= required_persistence)
+            first["persistence_ratio"] = round(float(ratio), 4)
+    return first
+
+
 # ---------------------------------------------------------------------------
 # 1. Latency Degradation
 # ---------------------------------------------------------------------------
@@ -1057,149 +1183,121 @@ def _detect_latency_degradation(
     p90_series = active["p90"]  # already smoothed by _apply_outlier_filtering
     has_outlier_col = "is_outlier" in active.columns
 
-    sustained_count = 0
-    onset_pos = None  # position within 'active' where consecutive degradation started
-    outliers_skipped = 0
-
-    for pos in range(len(active)):
-        p90 = p90_series.iloc[pos]
-        if pd.isna(p90):
-            sustained_count = 0
-            onset_pos = None
-            continue
-
-        # Skip outlier buckets -- do not let them anchor an onset or count as sustained
-        if has_outlier_col and active["is_outlier"].iloc[pos]:
-            outliers_skipped += 1
-            continue
-
-        if p90 >= threshold_ms:
-            if sustained_count == 0:
-                onset_pos = pos  # mark the start of this consecutive run
-            sustained_count += 1
+    p90_values = p90_series.to_numpy(dtype=float)
+    missing = np.isnan(p90_values)
+    outliers = active["is_outlier"].to_numpy(dtype=bool) if has_outlier_col else None
+
+    # First sustained run above threshold, with its persistence over the rest
+    # of the test. Outlier buckets neither anchor an onset nor count as sustained.
+    window = _first_sustained_window(
+        _scan_sustained_windows(
+            p90_values >= threshold_ms, sustained, reset=missing, skip=outliers,
+            values=p90_values, threshold=threshold_ms, comparator="gte",
+        ),
+        required_persistence,
+    )
+    if window is not None:  # only report the first onset
+        onset_pos = window["onset"]
+        outliers_skipped = window["skipped"]
+        is_persistent = window["is_persistent"]
+        actual_persistence = window["persistence_ratio"]
+
+        row = active.iloc[onset_pos]
+        p90_at_onset = p90_series.iloc[onset_pos]
+        delta_pct_val = (p90_at_onset - baseline_p90) / baseline_p90 * 100
+
+        if is_persistent:
+            classification = "bottleneck"
+            confidence = "high"
         else:
-            sustained_count = 0
-            onset_pos = None
-
-        if sustained_count >= sustained and onset_pos is not None:
-            # --- Persistence check ---
-            is_persistent, actual_persistence = _check_persistence(
-                p90_series, onset_pos, threshold_ms, required_persistence, comparator="gte"
-            )
-
-            row = active.iloc[onset_pos]
-            p90_at_onset = p90_series.iloc[onset_pos]
-            delta_pct_val = (p90_at_onset - baseline_p90) / baseline_p90 * 100
-
-            if is_persistent:
-                classification = "bottleneck"
-                confidence = "high"
-            else:
-                classification = "transient_spike"
-                confidence = "low"
-
-            findings.append(_make_finding(
-                bottleneck_type="latency_degradation",
-                scope="overall",
-                scope_name="ALL",
-                concurrency=row["concurrency"],
-                metric_name="p90_response_time_ms",
-                metric_value=p90_at_onset,
-                baseline_value=baseline_p90,
-                severity=_classify_severity_v2(
-                    delta_pct=delta_pct_val,
-                    persistence_ratio=actual_persistence,
-                    classification=classification,
-                    scope="overall",
-                    bottleneck_type="latency_degradation",
-                ),
-                confidence=confidence,
-                classification=classification,
+            classification = "transient_spike"
+            confidence = "low"
+
+        findings.append(_make_finding(
+            bottleneck_type="latency_degradation",
+            scope="overall",
+            scope_name="ALL",
+            concurrency=row["concurrency"],
+            metric_name="p90_response_time_ms",
+            metric_value=p90_at_onset,
+            baseline_value=baseline_p90,
+            severity=_classify_severity_v2(
+                delta_pct=delta_pct_val,
                 persistence_ratio=actual_persistence,
-                outlier_filtered=outliers_skipped > 0,
-                **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
-                evidence=(
-                    f"P90 latency reached {p90_at_onset:.0f}ms (baseline {baseline_p90:.0f}ms, "
-                    f"+{delta_pct_val:.1f}%) at {row['concurrency']:.0f} concurrent users. "
-                    f"Persistence: {actual_persistence:.0%} of remaining buckets stayed degraded"
-                    f"{' (confirmed bottleneck)' if is_persistent else ' (transient spike, recovered)'}"
-                    + (f". {outliers_skipped} outlier bucket(s) filtered." if outliers_skipped else "")
-                ),
-                test_run_id=test_run_id,
-            ))
-            break  # only report the first onset
+                classification=classification,
+                scope="overall",
+                bottleneck_type="latency_degradation",
+            ),
+            confidence=confidence,
+            classification=classification,
+            persistence_ratio=actual_persistence,
+            outlier_filtered=outliers_skipped > 0,
+            **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
+            evidence=(
+                f"P90 latency reached {p90_at_onset:.0f}ms (baseline {baseline_p90:.0f}ms, "
+                f"+{delta_pct_val:.1f}%) at {row['concurrency']:.0f} concurrent users. "
+                f"Persistence: {actual_persistence:.0%} of remaining buckets stayed degraded"
+                f"{' (confirmed bottleneck)' if is_persistent else ' (transient spike, recovered)'}"
+                + (f". {outliers_skipped} outlier bucket(s) filtered." if outliers_skipped else "")
+            ),
+            test_run_id=test_run_id,
+        ))
 
     # --- SLA breach check (also with persistence) ---
     sla = _get_sla_threshold(cfg, sla_id=sla_id)  # profile/file-level default SLA
-    sustained_count = 0
-    onset_pos = None
-    sla_outliers_skipped = 0
-
-    for pos in range(len(active)):
-        p90 = p90_series.iloc[pos]
-        if pd.isna(p90):
-            sustained_count = 0
-            onset_pos = None
-            continue
-
-        if has_outlier_col and active["is_outlier"].iloc[pos]:
-            sla_outliers_skipped += 1
-            continue
-
-        if p90 >= sla:
-            if sustained_count == 0:
-                onset_pos = pos
-            sustained_count += 1
+    window = _first_sustained_window(
+        _scan_sustained_windows(
+            p90_values >= sla, sustained, reset=missing, skip=outliers,
+            values=p90_values, threshold=sla, comparator="gte",
+        ),
+        required_persistence,
+    )
+    if window is not None:
+        onset_pos = window["onset"]
+        sla_outliers_skipped = window["skipped"]
+        is_persistent = window["is_persistent"]
+        actual_persistence = window["persistence_ratio"]
+
+        row = active.iloc[onset_pos]
+        p90_at_onset = p90_series.iloc[onset_pos]
+
+        if is_persistent:
+            classification = "bottleneck"
+            confidence = "high"
         else:
-            sustained_count = 0
-            onset_pos = None
-
-        if sustained_count >= sustained and onset_pos is not None:
-            is_persistent, actual_persistence = _check_persistence(
-                p90_series, onset_pos, sla, required_persistence, comparator="gte"
-            )
-
-            row = active.iloc[onset_pos]
-            p90_at_onset = p90_series.iloc[onset_pos]
-
-            if is_persistent:
-                classification = "bottleneck"
-                confidence = "high"
-            else:
-                classification = "transient_spike"
-                confidence = "low"
-
-            sla_delta_pct = (p90_at_onset - sla) / sla * 100 if sla > 0 else 0.0
-            findings.append(_make_finding(
-                bottleneck_type="latency_degradation",
-                scope="overall",
-                scope_name="ALL",
-                concurrency=row["concurrency"],
-                metric_name="p90_sla_breach",
-                metric_value=p90_at_onset,
-                baseline_value=sla,
-                severity=_classify_severity_v2(
-                    delta_pct=sla_delta_pct,
-                    persistence_ratio=actual_persistence,
-                    classification=classification,
-                    scope="overall",
-                    bottleneck_type="latency_degradation",
-                ),
-                confidence=confidence,
-                classification=classification,
+            classification = "transient_spike"
+            confidence = "low"
+
+        sla_delta_pct = (p90_at_onset - sla) / sla * 100 if sla > 0 else 0.0
+        findings.append(_make_finding(
+            bottleneck_type="latency_degradation",
+            scope="overall",
+            scope_name="ALL",
+            concurrency=row["concurrency"],
+            metric_name="p90_sla_breach",
+            metric_value=p90_at_onset,
+            baseline_value=sla,
+            severity=_classify_severity_v2(
+                delta_pct=sla_delta_pct,
                 persistence_ratio=actual_persistence,
-                outlier_filtered=sla_outliers_skipped > 0,
-                **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
-                evidence=(
-                    f"P90 latency {p90_at_onset:.0f}ms exceeded SLA threshold {sla}ms "
-                    f"at {row['concurrency']:.0f} concurrent users. "
-                    f"Persistence: {actual_persistence:.0%} of remaining buckets stayed above SLA"
-                    f"{' (confirmed)' if is_persistent else ' (transient, recovered)'}"
-                    + (f". {sla_outliers_skipped} outlier bucket(s) filtered." if sla_outliers_skipped else "")
-                ),
-                test_run_id=test_run_id,
-            ))
-            break
+                classification=classification,
+                scope="overall",
+                bottleneck_type="latency_degradation",
+            ),
+            confidence=confidence,
+            classification=classification,
+            persistence_ratio=actual_persistence,
+            outlier_filtered=sla_outliers_skipped > 0,
+            **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
+            evidence=(
+                f"P90 latency {p90_at_onset:.0f}ms exceeded SLA threshold {sla}ms "
+                f"at {row['concurrency']:.0f} concurrent users. "
+                f"Persistence: {actual_persistence:.0%} of remaining buckets stayed above SLA"
+                f"{' (confirmed)' if is_persistent else ' (transient, recovered)'}"
+                + (f". {sla_outliers_skipped} outlier bucket(s) filtered." if sla_outliers_skipped else "")
+            ),
+            test_run_id=test_run_id,
+        ))
 
     return findings
 
@@ -1232,76 +1330,63 @@ def _detect_error_rate_increase(
     err_series = active["error_rate"]  # already smoothed
     has_outlier_col = "is_outlier" in active.columns
 
-    sustained_count = 0
-    onset_pos = None
-    outliers_skipped = 0
+    err_values = err_series.to_numpy(dtype=float)
+    outliers = active["is_outlier"].to_numpy(dtype=bool) if has_outlier_col else None
 
-    for pos in range(len(active)):
-        err = err_series.iloc[pos]
-        if pd.isna(err):
-            sustained_count = 0
-            onset_pos = None
-            continue
-
-        if has_outlier_col and active["is_outlier"].iloc[pos]:
-            outliers_skipped += 1
-            continue
-
-        if err >= effective_threshold:
-            if sustained_count == 0:
-                onset_pos = pos
-            sustained_count += 1
+    window = _first_sustained_window(
+        _scan_sustained_windows(
+            err_values >= effective_threshold, sustained, reset=np.isnan(err_values), skip=outliers,
+            values=err_values, threshold=effective_threshold, comparator="gte",
+        ),
+        required_persistence,
+    )
+    if window is not None:
+        onset_pos = window["onset"]
+        outliers_skipped = window["skipped"]
+        is_persistent = window["is_persistent"]
+        actual_persistence = window["persistence_ratio"]
+
+        row = active.iloc[onset_pos]
+        err_at_onset = err_series.iloc[onset_pos]
+
+        if is_persistent:
+            classification = "bottleneck"
+            confidence = "high"
         else:
-            sustained_count = 0
-            onset_pos = None
-
-        if sustained_count >= sustained and onset_pos is not None:
-            is_persistent, actual_persistence = _check_persistence(
-                err_series, onset_pos, effective_threshold, required_persistence, comparator="gte"
-            )
-
-            row = active.iloc[onset_pos]
-            err_at_onset = err_series.iloc[onset_pos]
-
-            if is_persistent:
-                classification = "bottleneck"
-                confidence = "high"
-            else:
-                classification = "transient_spike"
-                confidence = "low"
-
-            err_delta_pct = (err_at_onset - baseline_error) / baseline_error * 100 if baseline_error > 0 else err_at_onset * 100
-            findings.append(_make_finding(
-                bottleneck_type="error_rate_increase",
-                scope="overall",
-                scope_name="ALL",
-                concurrency=row["concurrency"],
-                metric_name="error_rate_pct",
-                metric_value=err_at_onset,
-                baseline_value=baseline_error,
-                severity=_classify_severity_v2(
-                    delta_pct=err_delta_pct,
-                    persistence_ratio=actual_persistence,
-                    classification=classification,
-                    scope="overall",
-                    bottleneck_type="error_rate_increase",
-                    delta_thresholds=(50.0, 200.0, 500.0),  # error rate uses wider thresholds
-                ),
-                confidence=confidence,
-                classification=classification,
+            classification = "transient_spike"
+            confidence = "low"
+
+        err_delta_pct = (err_at_onset - baseline_error) / baseline_error * 100 if baseline_error > 0 else err_at_onset * 100
+        findings.append(_make_finding(
+            bottleneck_type="error_rate_increase",
+            scope="overall",
+            scope_name="ALL",
+            concurrency=row["concurrency"],
+            metric_name="error_rate_pct",
+            metric_value=err_at_onset,
+            baseline_value=baseline_error,
+            severity=_classify_severity_v2(
+                delta_pct=err_delta_pct,
                 persistence_ratio=actual_persistence,
-                outlier_filtered=outliers_skipped > 0,
-                **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
-                evidence=(
-                    f"Error rate reached {err_at_onset:.2f}% (baseline {baseline_error:.2f}%) "
-                    f"at {row['concurrency']:.0f} concurrent users. "
-                    f"Persistence: {actual_persistence:.0%} of remaining buckets stayed elevated"
-                    f"{' (confirmed bottleneck)' if is_persistent else ' (transient spike, recovered)'}"
-                    + (f". {outliers_skipped} outlier bucket(s) filtered." if outliers_skipped else "")
-                ),
-                test_run_id=test_run_id,
-            ))
-            break
+                classification=classification,
+                scope="overall",
+                bottleneck_type="error_rate_increase",
+                delta_thresholds=(50.0, 200.0, 500.0),  # error rate uses wider thresholds
+            ),
+            confidence=confidence,
+            classification=classification,
+            persistence_ratio=actual_persistence,
+            outlier_filtered=outliers_skipped > 0,
+            **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
+            evidence=(
+                f"Error rate reached {err_at_onset:.2f}% (baseline {baseline_error:.2f}%) "
+                f"at {row['concurrency']:.0f} concurrent users. "
+                f"Persistence: {actual_persistence:.0%} of remaining buckets stayed elevated"
+                f"{' (confirmed bottleneck)' if is_persistent else ' (transient spike, recovered)'}"
+                + (f". {outliers_skipped} outlier bucket(s) filtered." if outliers_skipped else "")
+            ),
+            test_run_id=test_run_id,
+        ))
 
     return findings
 
@@ -1335,84 +1420,71 @@ def _detect_throughput_plateau(
     active["tps_pct_change"] = active["throughput_rps"].pct_change(periods=3) * 100
     active["conc_pct_change"] = active["concurrency"].pct_change(periods=3) * 100
 
-    plateau_count = 0
-    onset_pos = None
-    outliers_skipped = 0
-
-    for pos in range(len(active)):
-        tps_change = active["tps_pct_change"].iloc[pos]
-        conc_change = active["conc_pct_change"].iloc[pos]
-
-        if pd.isna(tps_change) or pd.isna(conc_change):
-            plateau_count = 0
-            onset_pos = None
-            continue
+    tps_change = active["tps_pct_change"].to_numpy(dtype=float)
+    conc_change = active["conc_pct_change"].to_numpy(dtype=float)
+    outliers = active["is_outlier"].to_numpy(dtype=bool) if has_outlier_col else None
+
+    # Concurrency is rising but throughput is flat or declining
+    window = _first_sustained_window(_scan_sustained_windows(
+        (conc_change > 5.0) & (tps_change < plateau_pct),
+        sustained,
+        reset=np.isnan(tps_change) | np.isnan(conc_change),
+        skip=outliers,
+    ))
+    if window is not None:
+        onset_pos = window["onset"]
+        outliers_skipped = window["skipped"]
+
+        # For throughput plateau, persistence means throughput stays at or below
+        # the level it was at onset. Use the onset throughput as the ceiling.
+        onset_tps = active["throughput_rps"].iloc[onset_pos]
+        is_persistent, actual_persistence = _check_persistence(
+            active["throughput_rps"], onset_pos, onset_tps * 1.05, required_persistence,
+            comparator="lte"  # throughput staying at or below onset level = still plateaued
+        )
 
-        if has_outlier_col and active["is_outlier"].iloc[pos]:
-            outliers_skipped += 1
-            continue
+        row = active.iloc[onset_pos]
 
-        # Concurrency is rising but throughput is flat or declining
-        if conc_change > 5.0 and tps_change < plateau_pct:
-            if plateau_count == 0:
-                onset_pos = pos
-            plateau_count += 1
+        if is_persistent:
+            classification = "bottleneck"
+            confidence = "high"
         else:
-            plateau_count = 0
-            onset_pos = None
-
-        if plateau_count >= sustained and onset_pos is not None:
-            # For throughput plateau, persistence means throughput stays at or below
-            # the level it was at onset. Use the onset throughput as the ceiling.
-            onset_tps = active["throughput_rps"].iloc[onset_pos]
-            is_persistent, actual_persistence = _check_persistence(
-                active["throughput_rps"], onset_pos, onset_tps * 1.05, required_persistence,
-                comparator="lte"  # throughput staying at or below onset level = still plateaued
-            )
+            classification = "transient_spike"
+            confidence = "low"
 
-            row = active.iloc[onset_pos]
-
-            if is_persistent:
-                classification = "bottleneck"
-                confidence = "high"
-            else:
-                classification = "transient_spike"
-                confidence = "low"
-
-            tps_delta_pct = (
-                (onset_tps - baseline["throughput_rps"]) / baseline["throughput_rps"] * 100
-                if baseline["throughput_rps"] > 0 else 0.0
-            )
-            findings.append(_make_finding(
-                bottleneck_type="throughput_plateau",
-                scope="overall",
-                scope_name="ALL",
-                concurrency=row["concurrency"],
-                metric_name="throughput_rps",
-                metric_value=onset_tps,
-                baseline_value=baseline["throughput_rps"],
-                severity=_classify_severity_v2(
-                    delta_pct=tps_delta_pct,
-                    persistence_ratio=actual_persistence,
-                    classification=classification,
-                    scope="overall",
-                    bottleneck_type="throughput_plateau",
-                ),
-                confidence=confidence,
-                classification=classification,
+        tps_delta_pct = (
+            (onset_tps - baseline["throughput_rps"]) / baseline["throughput_rps"] * 100
+            if baseline["throughput_rps"] > 0 else 0.0
+        )
+        findings.append(_make_finding(
+            bottleneck_type="throughput_plateau",
+            scope="overall",
+            scope_name="ALL",
+            concurrency=row["concurrency"],
+            metric_name="throughput_rps",
+            metric_value=onset_tps,
+            baseline_value=baseline["throughput_rps"],
+            severity=_classify_severity_v2(
+                delta_pct=tps_delta_pct,
                 persistence_ratio=actual_persistence,
-                outlier_filtered=outliers_skipped > 0,
-                **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
-                evidence=(
-                    f"Throughput plateaued at {onset_tps:.1f} RPS "
-                    f"while concurrency rose to {row['concurrency']:.0f} users. "
-                    f"Persistence: {actual_persistence:.0%} of remaining buckets stayed flat"
-                    f"{' (confirmed bottleneck)' if is_persistent else ' (transient, recovered)'}"
-                    + (f". {outliers_skipped} outlier bucket(s) filtered." if outliers_skipped else "")
-                ),
-                test_run_id=test_run_id,
-            ))
-            break
+                classification=classification,
+                scope="overall",
+                bottleneck_type="throughput_plateau",
+            ),
+            confidence=confidence,
+            classification=classification,
+            persistence_ratio=actual_persistence,
+            outlier_filtered=outliers_skipped > 0,
+            **_onset_fields(row["bucket_start"], warmup + onset_pos, test_start_time),
+            evidence=(
+                f"Throughput plateaued at {onset_tps:.1f} RPS "
+                f"while concurrency rose to {row['concurrency']:.0f} users. "
+                f"Persistence: {actual_persistence:.0%} of remaining buckets stayed flat"
+                f"{' (confirmed bottleneck)' if is_persistent else ' (transient, recovered)'}"
+                + (f". {outliers_skipped} outlier bucket(s) filtered." if outliers_skipped else "")
+            ),
+            test_run_id=test_run_id,
+        ))
 
     return findings
 
@@ -1437,68 +1509,44 @@ def _detect_infra_saturation(
     if not has_cpu and not has_mem:
         return findings
 
-    cpu_sustained = 0
-    mem_sustained = 0
-    cpu_flagged = False
-    mem_flagged = False
-
     active_slice = buckets_df.iloc[warmup:]
-    for pos, (idx, row) in enumerate(active_slice.iterrows()):
-        bucket_idx = warmup + pos  # absolute bucket index
-
-        # CPU saturation
-        cpu = row.get("avg_cpu", np.nan)
-        if pd.notna(cpu) and cpu >= cpu_threshold:
-            cpu_sustained += 1
-        else:
-            cpu_sustained = 0
-
-        if cpu_sustained >= sustained and not cpu_flagged:
-            cpu_flagged = True
-            findings.append(_make_finding(
-                bottleneck_type="infrastructure_saturation",
-                scope="infrastructure",
-                scope_name="CPU",
-                concurrency=row["concurrency"],
-                metric_name="avg_cpu_util_pct",
-                metric_value=cpu,
-                baseline_value=baseline.get("avg_cpu", 0),
-                severity="critical" if cpu >= 90 else "high",
-                confidence="high",
-                **_onset_fields(row["bucket_start"], bucket_idx, test_start_time),
-                evidence=(
-                    f"CPU utilization reached {cpu:.1f}% (threshold {cpu_threshold}%) "
-                    f"at {row['concurrency']:.0f} concurrent users"
-                ),
-                test_run_id=test_run_id,
-            ))
-
-        # Memory saturation
-        mem = row.get("avg_memory", np.nan)
-        if pd.notna(mem) and mem >= mem_threshold:
-            mem_sustained += 1
-        else:
-            mem_sustained = 0
+    candidates = []  # (confirm_pos, order, finding kwargs) -- reported in scan order
+    for order, (resource, col, threshold) in enumerate((
+        ("CPU", "avg_cpu", cpu_threshold),
+        ("Memory", "avg_memory", mem_threshold),
+    )):
+        if col not in active_slice.columns:
+            continue
+        values = active_slice[col].to_numpy(dtype=float)
+        window = _first_sustained_window(
+            _scan_sustained_windows(~np.isnan(values) & (values >= threshold), sustained)
+        )
+        if window is not None:
+            candidates.append((window["confirm"], order, resource, col, threshold, values))
 
-        if mem_sustained >= sustained and not mem_flagged:
-            mem_flagged = True
-            findings.append(_make_finding(
-                bottleneck_type="infrastructure_saturation",
-                scope="infrastructure",
-                scope_name="Memory",
-                concurrency=row["concurrency"],
-                metric_name="avg_memory_util_pct",
-                metric_value=mem,
-                baseline_value=baseline.get("avg_memory", 0),
-                severity="critical" if mem >= 95 else "high",
-                confidence="high",
-                **_onset_fields(row["bucket_start"], bucket_idx, test_start_time),
-                evidence=(
-                    f"Memory utilization reached {mem:.1f}% (threshold {mem_threshold}%) "
-                    f"at {row['concurrency']:.0f} concurrent users"
-                ),
-                test_run_id=test_run_id,
-            ))
+    for pos, _, resource, col, threshold, values in sorted(candidates, key=lambda c: c[:2]):
+        # Reported at the bucket where the run became sustained
+        row = active_slice.iloc[pos]
+        bucket_idx = warmup + pos  # absolute bucket index
+        value = values[pos]
+        is_cpu = resource == "CPU"
+        findings.append(_make_finding(
+            bottleneck_type="infrastructure_saturation",
+            scope="infrastructure",
+            scope_name=resource,
+            concurrency=row["concurrency"],
+            metric_name="avg_cpu_util_pct" if is_cpu else "avg_memory_util_pct",
+            metric_value=value,
+            baseline_value=baseline.get(col, 0),
+            severity="critical" if value >= (90 if is_cpu else 95) else "high",
+            confidence="high",
+            **_onset_fields(row["bucket_start"], bucket_idx, test_start_time),
+            evidence=(
+                f"{resource} utilization reached {value:.1f}% (threshold {threshold}%) "
+                f"at {row['concurrency']:.0f} concurrent users"
+            ),
+            test_run_id=test_run_id,
+        ))
 
     return findings
 
@@ -1903,11 +1951,12 @@ def _detect_capacity_risks(
         cpu_dynamic_threshold = None
         mem_dynamic_threshold = None
 
-    # Build set of bucket indices covered by degradation windows (absolute index)
-    degraded_buckets: set = set()
-    for w in degradation_windows:
-        for b in range(w["onset_bucket_index"], w["end_bucket_index"] + 1):
-            degraded_buckets.add(b)
+    # Bucket ranges covered by degradation windows (absolute index, inclusive)
+    degraded_ranges = [
+        (w["onset_bucket_index"], w["end_bucket_index"])
+        for w in degradation_windows
+        if w["onset_bucket_index"] <= w["end_bucket_index"]
+    ]
 
     # --- Sustained High Utilization Scan ---
     resource_configs = []
@@ -1926,164 +1975,153 @@ def _detect_capacity_risks(
         if col not in active.columns or active[col].isna().all():
             continue
 
-        # Find contiguous runs above threshold (post-warmup)
-        above = active[col] >= threshold
-        onset_pos = None
-        run_length = 0
-
-        for pos in range(len(active)):
-            if pd.isna(active[col].iloc[pos]):
-                run_length = 0
-                onset_pos = None
-                continue
-
-            if above.iloc[pos]:
-                if run_length == 0:
-                    onset_pos = pos
-                run_length += 1
-            else:
-                run_length = 0
-                onset_pos = None
-
-            if run_length >= sustained and onset_pos is not None:
-                # Found sustained high utilization -- check persistence
-                is_persistent, actual_persistence = _check_persistence(
-                    active[col], onset_pos, threshold, required_persistence, comparator="gte"
-                )
+        # First contiguous run above threshold (post-warmup)
+        values = active[col].to_numpy(dtype=float)
+        window = _first_sustained_window(
+            _scan_sustained_windows(
+                values >= threshold, sustained, reset=np.isnan(values),
+                values=values, threshold=threshold, comparator="gte",
+            ),
+            required_persistence,
+        )
+        if window is None:
+            continue
 
-                if not is_persistent:
-                    # Not sustained enough -- skip
-                    break
+        # Found sustained high utilization -- check persistence
+        onset_pos = window["onset"]
+        actual_persistence = window["persistence_ratio"]
+        if not window["is_persistent"]:
+            # Not sustained enough -- skip
+            continue
 
-                # Check overlap with degradation windows
-                abs_onset = warmup + onset_pos
-                abs_end = warmup + len(active) - 1  # persistent = through end
-                overlaps_degradation = any(
-                    b in degraded_buckets for b in range(abs_onset, abs_end + 1)
-                )
+        # Check overlap with degradation windows
+        abs_onset = warmup + onset_pos
+        abs_end = warmup + len(active) - 1  # persistent = through end
+        overlaps_degradation = any(
+            start <= abs_end and end >= abs_onset for start, end in degraded_ranges
+        )
 
-                if overlaps_degradation:
-                    # Already captured by Phase 2a
-                    break
-
-                # This is a capacity risk -- infra stressed but performance held
-                window_slice = active.iloc[onset_pos:]
-                avg_util = float(window_slice[col].mean())
-                # Use max_cpu / max_memory columns if available
-                max_col = "max_cpu" if resource == "CPU" else "max_memory"
-                if max_col in active.columns and active[max_col].iloc[onset_pos:].notna().any():
-                    max_util = float(active[max_col].iloc[onset_pos:].max())
-                else:
-                    max_util = float(window_slice[col].max())
+        if overlaps_degradation:
+            # Already captured by Phase 2a
+            continue
 
-                # Performance during this window
-                p90_during = float(window_slice["p90"].mean()) if "p90" in window_slice.columns else None
-                within_sla = p90_during < sla if p90_during is not None and sla else None
+        # This is a capacity risk -- infra stressed but performance held
+        window_slice = active.iloc[onset_pos:]
+        avg_util = float(window_slice[col].mean())
+        # Use max_cpu / max_memory columns if available
+        max_col = "max_cpu" if resource == "CPU" else "max_memory"
+        if max_col in active.columns and active[max_col].iloc[onset_pos:].notna().any():
+            max_util = float(active[max_col].iloc[onset_pos:].max())
+        else:
+            max_util = float(window_slice[col].max())
 
-                # Duration in minutes
-                duration_buckets = len(window_slice)
-                duration_minutes = duration_buckets * cfg["bucket_seconds"] / 60
+        # Performance during this window
+        p90_during = float(window_slice["p90"].mean()) if "p90" in window_slice.columns else None
+        within_sla = p90_during < sla if p90_during is not None and sla else None
 
-                r_unit = cpu_unit if resource == "CPU" else mem_unit
-                baseline_val = baseline.get(f"avg_{resource.lower()}", 0)
+        # Duration in minutes
+        duration_buckets = len(window_slice)
+        duration_minutes = duration_buckets * cfg["bucket_seconds"] / 60
 
-                if is_raw:
-                    # Raw mode: report in raw units, no headroom
-                    delta_from_baseline = (
-                        round((avg_util - baseline_val) / baseline_val * 100, 1)
-                        if baseline_val > 0 else None
-                    )
-                    evidence = (
-                        f"{resource} usage averaged {avg_util:.3f} {r_unit} "
-                        f"(peak {max_util:.3f} {r_unit}) for "
-                        f"{duration_minutes:.0f} minutes while response times remained "
-                        f"{'within SLA' if within_sla else 'healthy'} "
-                        f"(avg P90={p90_during:.0f}ms). "
-                        f"Baseline {resource} was {baseline_val:.3f} {r_unit}"
-                    )
-                    if delta_from_baseline is not None:
-                        evidence += f" (+{delta_from_baseline}% from baseline)."
-                    else:
-                        evidence += "."
-                    evidence += (
-                        f" Resource limits are not defined for this K8s service. "
-                        f"Unable to determine utilization % or remaining capacity. "
-                        f"Consider setting K8s resource limits for more accurate analysis."
-                    )
-                    infra_ctx = {
-                        "status": "capacity_risk",
-                        "resource": resource,
-                        "limits_available": False,
-                        "metric_mode": "raw",
-                        "avg_value": round(avg_util, 4),
-                        "max_value": round(max_util, 4),
-                        "unit": r_unit,
-                        "baseline_value": round(baseline_val, 4),
-                        "delta_from_baseline_pct": delta_from_baseline,
-                        "threshold_applied": f"relative (raw_metric_degrade_pct: {raw_degrade_pct}%)",
-                        "headroom_pct": None,
-                        "performance_during_window": {
-                            "avg_p90": round(p90_during, 1) if p90_during is not None else None,
-                            "sla_threshold": sla,
-                            "within_sla": within_sla,
-                        },
-                        "duration_minutes": round(duration_minutes, 1),
-                        "persistence_ratio": actual_persistence,
-                    }
-                    metric_name = f"avg_{resource.lower()}_{r_unit}"
-                else:
-                    # Percentage mode: report with headroom
-                    headroom = round(100.0 - avg_util, 1)
-                    evidence = (
-                        f"{resource} averaged {avg_util:.1f}% (peak {max_util:.1f}%) for "
-                        f"{duration_minutes:.0f} minutes while response times remained "
-                        f"{'within SLA' if within_sla else 'healthy'} "
-                        f"(avg P90={p90_during:.0f}ms). "
-                        f"System has approximately {headroom}% {resource} headroom "
-                        f"before saturation. "
-                        f"Consider scaling {resource} allocation before increasing load further."
-                    )
-                    infra_ctx = {
-                        "status": "capacity_risk",
-                        "resource": resource,
-                        "limits_available": True,
-                        "metric_mode": "percentage",
-                        "avg_utilization": round(avg_util, 1),
-                        "max_utilization": round(max_util, 1),
-                        "threshold": threshold,
-                        "headroom_pct": headroom,
-                        "performance_during_window": {
-                            "avg_p90": round(p90_during, 1) if p90_during is not None else None,
-                            "sla_threshold": sla,
-                            "within_sla": within_sla,
-                        },
-                        "duration_minutes": round(duration_minutes, 1),
-                        "persistence_ratio": actual_persistence,
-                    }
-                    metric_name = f"avg_{resource.lower()}_util_pct"
+        r_unit = cpu_unit if resource == "CPU" else mem_unit
+        baseline_val = baseline.get(f"avg_{resource.lower()}", 0)
 
-                findings.append(_make_finding(
-                    bottleneck_type="capacity_risk",
-                    scope="infrastructure",
-                    scope_name=resource,
-                    concurrency=float(active["concurrency"].iloc[onset_pos]),
-                    metric_name=metric_name,
-                    metric_value=round(avg_util, 4 if is_raw else 1),
-                    baseline_value=round(baseline_val, 4 if is_raw else 1) if baseline_val else 0,
-                    severity="medium",
-                    confidence="high" if not is_raw else "medium",
-                    classification="capacity_risk",
-                    persistence_ratio=actual_persistence,
-                    **_onset_fields(
-                        buckets_df["bucket_start"].iloc[warmup + onset_pos],
-                        warmup + onset_pos,
-                        test_start_time,
-                    ),
-                    evidence=evidence,
-                    infrastructure_context=infra_ctx,
-                    test_run_id=test_run_id,
-                ))
-                break  # Only report first sustained window per resource
+        if is_raw:
+            # Raw mode: report in raw units, no headroom
+            delta_from_baseline = (
+                round((avg_util - baseline_val) / baseline_val * 100, 1)
+                if baseline_val > 0 else None
+            )
+            evidence = (
+                f"{resource} usage averaged {avg_util:.3f} {r_unit} "
+                f"(peak {max_util:.3f} {r_unit}) for "
+                f"{duration_minutes:.0f} minutes while response times remained "
+                f"{'within SLA' if within_sla else 'healthy'} "
+                f"(avg P90={p90_during:.0f}ms). "
+                f"Baseline {resource} was {baseline_val:.3f} {r_unit}"
+            )
+            if delta_from_baseline is not None:
+                evidence += f" (+{delta_from_baseline}% from baseline)."
+            else:
+                evidence += "."
+            evidence += (
+                f" Resource limits are not defined for this K8s service. "
+                f"Unable to determine utilization % or remaining capacity. "
+                f"Consider setting K8s resource limits for more accurate analysis."
+            )
+            infra_ctx = {
+                "status": "capacity_risk",
+                "resource": resource,
+                "limits_available": False,
+                "metric_mode": "raw",
+                "avg_value": round(avg_util, 4),
+                "max_value": round(max_util, 4),
+                "unit": r_unit,
+                "baseline_value": round(baseline_val, 4),
+                "delta_from_baseline_pct": delta_from_baseline,
+                "threshold_applied": f"relative (raw_metric_degrade_pct: {raw_degrade_pct}%)",
+                "headroom_pct": None,
+                "performance_during_window": {
+                    "avg_p90": round(p90_during, 1) if p90_during is not None else None,
+                    "sla_threshold": sla,
+                    "within_sla": within_sla,
+                },
+                "duration_minutes": round(duration_minutes, 1),
+                "persistence_ratio": actual_persistence,
+            }
+            metric_name = f"avg_{resource.lower()}_{r_unit}"
+        else:
+            # Percentage mode: report with headroom
+            headroom = round(100.0 - avg_util, 1)
+            evidence = (
+                f"{resource} averaged {avg_util:.1f}% (peak {max_util:.1f}%) for "
+                f"{duration_minutes:.0f} minutes while response times remained "
+                f"{'within SLA' if within_sla else 'healthy'} "
+                f"(avg P90={p90_during:.0f}ms). "
+                f"System has approximately {headroom}% {resource} headroom "
+                f"before saturation. "
+                f"Consider scaling {resource} allocation before increasing load further."
+            )
+            infra_ctx = {
+                "status": "capacity_risk",
+                "resource": resource,
+                "limits_available": True,
+                "metric_mode": "percentage",
+                "avg_utilization": round(avg_util, 1),
+                "max_utilization": round(max_util, 1),
+                "threshold": threshold,
+                "headroom_pct": headroom,
+                "performance_during_window": {
+                    "avg_p90": round(p90_during, 1) if p90_during is not None else None,
+                    "sla_threshold": sla,
+                    "within_sla": within_sla,
+                },
+                "duration_minutes": round(duration_minutes, 1),
+                "persistence_ratio": actual_persistence,
+            }
+            metric_name = f"avg_{resource.lower()}_util_pct"
+
+        findings.append(_make_finding(
+            bottleneck_type="capacity_risk",
+            scope="infrastructure",
+            scope_name=resource,
+            concurrency=float(active["concurrency"].iloc[onset_pos]),
+            metric_name=metric_name,
+            metric_value=round(avg_util, 4 if is_raw else 1),
+            baseline_value=round(baseline_val, 4 if is_raw else 1) if baseline_val else 0,
+            severity="medium",
+            confidence="high" if not is_raw else "medium",
+            classification="capacity_risk",
+            persistence_ratio=actual_persistence,
+            **_onset_fields(
+                buckets_df["bucket_start"].iloc[warmup + onset_pos],
+                warmup + onset_pos,
+                test_start_time,
+            ),
+            evidence=evidence,
+            infrastructure_context=infra_ctx,
+            test_run_id=test_run_id,
+        ))
 
     # --- Climbing Trend Detection ---
     # Detect if CPU or Memory is trending upward over the test (potential leak)
@@ -2179,6 +2217,130 @@ def _detect_capacity_risks(
 # 7. Multi-Tier Bottlenecks (per-label analysis)
 # ---------------------------------------------------------------------------
 
+def _build_label_buckets(
+    jtl_df: pd.DataFrame, bucket_seconds: int, rolling_window: int,
+) -> pd.DataFrame:
+    """Per-(label, bucket) metrics for multi-tier detection in one grouped pass.
+
+    Returns a DataFrame indexed by (label, bucket_start) holding only non-empty
+    buckets, with columns:
+        p90_raw, p90 (rolling-median smoothed within each label),
+        total_requests, concurrency, is_outlier (MAD-based, per label)
+
+    Equivalent to resampling each label's rows separately, without building a
+    filtered copy of the JTL per label.
+    """
+    bucket = pd.Grouper(key="timestamp", freq=f"{bucket_seconds}s")
+    grouped = jtl_df.groupby(["label", bucket], observed=True, sort=True)
+
+    p90 = grouped_quantiles(
+        jtl_df["elapsed"].to_numpy(), grouped.ngroup().to_numpy(), [0.90], n_groups=grouped.ngroups,
+    )[:, 0]
+    buckets = grouped["elapsed"].count().rename("total_requests").to_frame()
+    buckets.index = buckets.index.set_names(["label", "bucket_start"])
+    buckets.insert(0, "p90_raw", p90)
+
+    # Concurrency: sum of each engine's max allThreads per bucket (max for one engine)
+    if "Hostname" in jtl_df.columns:
+        concurrency = (
+            jtl_df.groupby(["label", bucket, "Hostname"], observed=True, dropna=False)["allThreads"]
+            .max()
+            .groupby(level=[0, 1], observed=True)
+            .sum()
+        )
+    else:
+        concurrency = grouped["allThreads"].max()
+    concurrency.index = concurrency.index.set_names(["label", "bucket_start"])
+    buckets["concurrency"] = concurrency.reindex(buckets.index)
+
+    # Rolling median smoothing and MAD outlier flags, within each label
+    by_label = buckets.groupby(level="label", observed=True, sort=False)
+    buckets["p90"] = by_label["p90_raw"].transform(
+        lambda x: x.rolling(window=rolling_window, center=True, min_periods=1).median()
+    )
+    deviation = (buckets["p90_raw"] - buckets["p90"]).abs()
+    rolling_mad = deviation.groupby(level="label", observed=True, sort=False).transform(
+        lambda x: x.rolling(window=rolling_window, center=True, min_periods=1).median()
+    )
+    label_median = by_label["p90"].transform("median")
+    mad_floor = (label_median * 0.05).where(label_median > 0, 1.0)
+    buckets["is_outlier"] = deviation > 2.0 * rolling_mad.clip(lower=mad_floor)
+
+    return buckets
+
+
+def _evaluate_label_degradation(task: Tuple) -> Optional[Dict[str, Any]]:
+    """Baseline, classification, sustained scan and persistence for one label.
+
+    ``task`` is ``(label, bucket_starts, p90, is_outlier, concurrency, sla, params)``
+    with the label's non-empty buckets in time order. Module-level so it can
+    run in a process pool (``multi_tier_workers``).
+    """
+    label, bucket_starts, p90, is_outlier, concurrency, label_sla, params = task
+    warmup = params["warmup"]
+    sustained_required = params["sustained_required"]
+    n = len(p90)
+
+    # --- Per-label baseline (from early post-warmup buckets) ---
+    baseline_end = min(warmup + sustained_required, n)
+    baseline_start = warmup if baseline_end > warmup else 0
+    baseline_end = baseline_end if baseline_end > warmup else 1
+    label_baseline_p90 = float(np.mean(p90[baseline_start:baseline_end]))
+
+    # --- Classification: inherently slow vs load-induced ---
+    # If the endpoint is already above SLA at baseline, it's inherently
+    # slow -- not a load-induced bottleneck.
+    if label_baseline_p90 >= label_sla:
+        # Record as known slow endpoint (informational only)
+        return {
+            "concurrency": float(concurrency[baseline_start]),
+            "p90": label_baseline_p90,
+            "baseline_p90": label_baseline_p90,
+            "sla": label_sla,
+            "onset_ts": bucket_starts[warmup] if warmup < n else bucket_starts[0],
+            "onset_idx": warmup,
+            "is_persistent": False,
+            "persistence_ratio": None,
+            "classification": "known_slow_endpoint",
+        }
+
+    # --- Degradation threshold: endpoint must degrade from ITS OWN baseline ---
+    # Use the same degrade_pct as overall latency detection
+    label_threshold = label_baseline_p90 * (1 + params["degrade_pct"] / 100)
+    # Also require the degraded value to exceed the SLA
+    # (we don't flag sub-SLA degradation as a multi-tier bottleneck)
+    effective_threshold = max(label_threshold, label_sla)
+
+    # --- Sustained degradation scan (post-warmup, skip outliers) + persistence ---
+    active_p90 = p90[warmup:]
+    window = _first_sustained_window(
+        _scan_sustained_windows(
+            active_p90 >= effective_threshold, sustained_required,
+            reset=np.isnan(active_p90), skip=is_outlier[warmup:],
+            values=active_p90, threshold=effective_threshold, comparator="gte",
+        ),
+        params["required_persistence"],
+    )
+    if window is None:
+        return None
+
+    onset_idx = warmup + window["onset"]
+    is_persistent = window["is_persistent"]
+    actual_persistence = window["persistence_ratio"]
+
+    return {
+        "concurrency": float(concurrency[onset_idx]),
+        "p90": float(p90[onset_idx]),
+        "baseline_p90": label_baseline_p90,
+        "sla": label_sla,
+        "onset_ts": bucket_starts[onset_idx],
+        "onset_idx": onset_idx,
+        "is_persistent": is_persistent,
+        "persistence_ratio": actual_persistence,
+        "classification": "bottleneck" if is_persistent else "transient_spike",
+    }
+
+
 def _detect_multi_tier_bottlenecks(
     jtl_df: pd.DataFrame, cfg: Dict, test_run_id: str,
     test_start_time=None, sla_id: Optional[str] = None,
@@ -2189,7 +2351,8 @@ def _detect_multi_tier_bottlenecks(
 
     v0.2 (Improvement 4): Per-endpoint analysis with:
 
-    1. Per-label bucketing with rolling median smoothing.
+    1. Per-label bucketing with rolling median smoothing, computed for all
+       labels in one grouped pass over a (label, bucket) index.
     2. **Per-label baseline** computed from early buckets.
     3. An endpoint is a **load-induced bottleneck** only if its P90
        *degrades significantly from its own baseline* AND breaches the SLA.
@@ -2211,132 +2374,55 @@ def _detect_multi_tier_bottlenecks(
     if len(labels) <= 1:
         return findings  # Nothing to compare
 
-    # Per-label analysis results
-    label_results: Dict[str, Dict[str, Any]] = {}
-
+    # --- One grouped pass: per-(label, bucket) p90, smoothing, outlier flags ---
+    label_counts = jtl_df["label"].value_counts()
+    eligible = label_counts[label_counts >= 10].index
+    label_buckets = _build_label_buckets(
+        jtl_df[jtl_df["label"].isin(eligible)], bucket_seconds, rolling_window,
+    )
+    label_positions = label_buckets.groupby(level="label", observed=True, sort=False).indices
+
+    bucket_starts = label_buckets.index.get_level_values("bucket_start")
+    p90_all = label_buckets["p90"].to_numpy()
+    outlier_all = label_buckets["is_outlier"].to_numpy()
+    concurrency_all = label_buckets["concurrency"].to_numpy()
+
+    params = {
+        "warmup": warmup,
+        "sustained_required": sustained_required,
+        "required_persistence": required_persistence,
+        "degrade_pct": degrade_pct,
+    }
+    tasks = []
     for label in labels:
-        label_sla = _get_sla_threshold(cfg, label=label, sla_id=sla_id)
-
-        label_df = jtl_df[jtl_df["label"] == label].copy()
-        if len(label_df) < 10:
-            continue
-
-        # --- Per-label bucketing ---
-        label_indexed = label_df.set_index("timestamp").sort_index()
-        label_concurrency = _compute_bucket_concurrency(label_indexed, bucket_seconds)
-        resampled = label_indexed.resample(f"{bucket_seconds}s").agg(
-            p90=("elapsed", lambda x: x.quantile(0.90) if len(x) else np.nan),
-            total_requests=("elapsed", "count"),
-        )
-        resampled = resampled.join(label_concurrency)
-        resampled = resampled[resampled["total_requests"] > 0]
-
-        if len(resampled) <= warmup:
-            continue
-
-        # --- Per-label rolling median smoothing ---
-        p90_raw = resampled["p90"].copy()
-        resampled["p90"] = p90_raw.rolling(
-            window=rolling_window, center=True, min_periods=1
-        ).median()
-
-        # --- Per-label outlier detection (MAD-based) ---
-        smoothed_p90 = resampled["p90"]
-        rolling_mad = (
-            (p90_raw - smoothed_p90)
-            .abs()
-            .rolling(window=rolling_window, center=True, min_periods=1)
-            .median()
-        )
-        mad_floor = smoothed_p90.median() * 0.05 if smoothed_p90.median() > 0 else 1.0
-        rolling_mad = rolling_mad.clip(lower=mad_floor)
-        is_outlier = (p90_raw - smoothed_p90).abs() > (2.0 * rolling_mad)
-
-        # --- Per-label baseline (from early post-warmup buckets) ---
-        baseline_end = min(warmup + sustained_required, len(resampled))
-        baseline_slice = resampled.iloc[warmup:baseline_end]
-        if baseline_slice.empty:
-            baseline_slice = resampled.head(1)
-        label_baseline_p90 = float(baseline_slice["p90"].mean())
-
-        # --- Classification: inherently slow vs load-induced ---
-        # If the endpoint is already above SLA at baseline, it's inherently
-        # slow -- not a load-induced bottleneck.
-        already_above_sla = label_baseline_p90 >= label_sla
-
-        if already_above_sla:
-            # Record as known slow endpoint (informational only)
-            label_results[label] = {
-                "concurrency": float(baseline_slice["concurrency"].iloc[0]) if not baseline_slice.empty else 0.0,
-                "p90": label_baseline_p90,
-                "baseline_p90": label_baseline_p90,
-                "sla": label_sla,
-                "onset_ts": resampled.index[warmup] if warmup < len(resampled) else resampled.index[0],
-                "onset_idx": warmup,
-                "is_persistent": False,
-                "persistence_ratio": None,
-                "classification": "known_slow_endpoint",
-            }
-            continue
-
-        # --- Degradation threshold: endpoint must degrade from ITS OWN baseline ---
-        # Use the same degrade_pct as overall latency detection
-        label_threshold = label_baseline_p90 * (1 + degrade_pct / 100)
-        # Also require the degraded value to exceed the SLA
-        # (we don't flag sub-SLA degradation as a multi-tier bottleneck)
-        effective_threshold = max(label_threshold, label_sla)
-
-        # --- Sustained degradation scan (post-warmup, skip outliers) ---
-        active_start = warmup
-        sustained_count = 0
-        onset_idx = None
-
-        for idx in range(active_start, len(resampled)):
-            p90_val = resampled["p90"].iloc[idx]
-            if pd.isna(p90_val):
-                sustained_count = 0
-                onset_idx = None
-                continue
-
-            if is_outlier.iloc[idx]:
-                continue
-
-            if p90_val >= effective_threshold:
-                if sustained_count == 0:
-                    onset_idx = idx
-                sustained_count += 1
-            else:
-                sustained_count = 0
-                onset_idx = None
-
-            if sustained_count >= sustained_required and onset_idx is not None:
-                break
-        else:
-            onset_idx = None
-
-        if onset_idx is None:
+        pos = label_positions.get(label)
+        if pos is None or len(pos) <= warmup:
             continue
+        tasks.append((
+            label,
+            bucket_starts[pos],
+            p90_all[pos],
+            outlier_all[pos],
+            concurrency_all[pos],
+            _get_sla_threshold(cfg, label=label, sla_id=sla_id),
+            params,
+        ))
+
+    # --- Remaining per-label work: baseline, classification, sustained scan ---
+    workers = int(cfg.get("multi_tier_workers") or 1)
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _evaluate_label_degradation, tasks,
+                chunksize=max(1, len(tasks) // (workers * 4)),
+            ))
+    else:
+        results = [_evaluate_label_degradation(task) for task in tasks]
 
-        # --- Persistence check ---
-        is_persistent, actual_persistence = _check_persistence(
-            resampled["p90"], onset_idx, effective_threshold, required_persistence, comparator="gte"
-        )
-
-        onset_row = resampled.iloc[onset_idx]
-        onset_ts = resampled.index[onset_idx]
-        p90_at_onset = resampled["p90"].iloc[onset_idx]
-
-        label_results[label] = {
-            "concurrency": float(onset_row["concurrency"]),
-            "p90": float(p90_at_onset),
-            "baseline_p90": label_baseline_p90,
-            "sla": label_sla,
-            "onset_ts": onset_ts,
-            "onset_idx": onset_idx,
-            "is_persistent": is_persistent,
-            "persistence_ratio": actual_persistence,
-            "classification": "bottleneck" if is_persistent else "transient_spike",
-        }
+    # Per-label analysis results (kept in first-seen label order)
+    label_results: Dict[str, Dict[str, Any]] = {
+        task[0]: result for task, result in zip(tasks, results) if result is not None
+    }
 
     if not label_results:
         return findings
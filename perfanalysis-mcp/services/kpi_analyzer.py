@@ -910,6 +910,88 @@ def _align_kpi_to_buckets(
     return resampled
 
 
+# -------------------------------------------------------------------
+# Sustained-breach primitive (shared by all KPI detectors)
+# -------------------------------------------------------------------
+
+def _breach_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Run-length encode a boolean mask.
+
+    Returns ``(starts, lengths)`` — the position and length of every run of
+    consecutive ``True`` values, in order.
+    """
+    padded = np.concatenate(([False], np.asarray(mask, dtype=bool), [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    return starts, ends - starts
+
+
+def _sustained_breach(
+    breach: np.ndarray,
+    eligible: Optional[np.ndarray] = None,
+    min_buckets: int = 1,
+    min_breaches: int = 1,
+    min_persistence: float = 0.0,
+) -> Optional[Dict[str, Any]]:
+    """Find sustained threshold breaches in a per-bucket boolean mask.
+
+    A bucket breaches when ``breach`` is True and it is ``eligible`` (has
+    data; all buckets by default).  Breaching buckets are grouped into runs;
+    only runs of at least ``min_buckets`` consecutive buckets count.
+
+    Args:
+        breach:          Boolean mask, one entry per KPI bucket.
+        eligible:        Boolean mask of buckets with usable data.  The
+                         persistence ratio is computed against these.
+        min_buckets:     Minimum run length (buckets) for a breach to count.
+        min_breaches:    Minimum total breaching buckets across counted runs.
+        min_persistence: Minimum ``breach_count / eligible_count``.
+
+    Returns:
+        ``None`` when the criteria are not met, otherwise a dict with
+        ``onset_pos`` (start of the first counted run), ``breach_count``,
+        ``eligible_count``, ``persistence_ratio``, ``run_count``,
+        ``longest_run`` and ``mask`` (buckets inside counted runs).
+    """
+    breach = np.asarray(breach, dtype=bool)
+    if eligible is None:
+        eligible = np.ones(len(breach), dtype=bool)
+    else:
+        eligible = np.asarray(eligible, dtype=bool)
+        breach = breach & eligible
+
+    starts, lengths = _breach_runs(breach)
+    counted = lengths >= max(1, min_buckets)
+    if not counted.any():
+        return None
+    starts, lengths = starts[counted], lengths[counted]
+
+    breach_count = int(lengths.sum())
+    eligible_count = int(eligible.sum())
+    persistence = breach_count / eligible_count if eligible_count > 0 else 0.0
+    if breach_count < min_breaches or persistence < min_persistence:
+        return None
+
+    edges = np.zeros(len(breach) + 1, dtype=np.int64)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, starts + lengths, -1)
+
+    return {
+        "onset_pos": int(starts[0]),
+        "breach_count": breach_count,
+        "eligible_count": eligible_count,
+        "persistence_ratio": persistence,
+        "run_count": int(len(starts)),
+        "longest_run": int(lengths.max()),
+        "mask": np.cumsum(edges[:-1]) > 0,
+    }
+
+
+def _worst_breach_position(values: np.ndarray, mask: np.ndarray) -> int:
+    """Position of the largest value inside ``mask`` (first one on ties)."""
+    return int(np.argmax(np.where(mask, values, -np.inf)))
+
+
 # -------------------------------------------------------------------
 # Detector: GC pressure
 # -------------------------------------------------------------------
@@ -937,57 +1019,57 @@ def _detect_gc_pressure(
 
     latency_factor = 1.5
     warmup = cfg.get("warmup_buckets", 2)
-    findings: List[Dict] = []
-
-    for ts, row in kpi_aligned.iterrows():
-        gc_val = row.get(gc_col)
-        if pd.isna(gc_val) or gc_val <= gc_threshold:
-            continue
 
-        concurrent_bucket = _get_concurrent_bucket(buckets_df, ts)
-        if concurrent_bucket is None:
-            continue
+    gc_vals = kpi_aligned[gc_col].to_numpy(dtype=float)
+    bucket_pos = _match_concurrent_buckets(buckets_df, kpi_aligned.index)
+    p90_vals = _concurrent_bucket_values(buckets_df, bucket_pos, "p90")
 
-        bucket_p90 = concurrent_bucket.get("p90", 0)
-        if pd.isna(bucket_p90) or bucket_p90 <= baseline_p90 * latency_factor:
-            continue
+    breach = _sustained_breach(
+        (gc_vals > gc_threshold) & (p90_vals > baseline_p90 * latency_factor),
+        min_buckets=cfg.get("kpi_min_breach_buckets", 1),
+    )
+    if breach is None:
+        return []
 
-        bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
-        delta_pct = (gc_val - gc_threshold) / gc_threshold * 100
+    # Report the onset of the first sustained breach
+    pos = breach["onset_pos"]
+    ts = kpi_aligned.index[pos]
+    gc_val = gc_vals[pos]
+    concurrent_bucket = _concurrent_bucket_row(buckets_df, bucket_pos[pos])
+    bucket_p90 = concurrent_bucket.get("p90", 0)
+    bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
+    delta_pct = (gc_val - gc_threshold) / gc_threshold * 100
 
-        findings.append(make_finding_fn(
-            bottleneck_type="gc_pressure",
-            scope="service",
-            scope_name="kpi_service",
-            concurrency=float(concurrent_bucket.get("concurrency", 0)),
-            metric_name=gc_col,
-            metric_value=float(gc_val),
-            baseline_value=gc_threshold,
-            severity=classify_severity_fn(
-                delta_pct=delta_pct,
-                persistence_ratio=None,
-                classification="bottleneck",
-                scope="service",
-                bottleneck_type="gc_pressure",
-            ),
-            confidence="high" if gc_val > 95 else "medium",
+    return [make_finding_fn(
+        bottleneck_type="gc_pressure",
+        scope="service",
+        scope_name="kpi_service",
+        concurrency=float(concurrent_bucket.get("concurrency", 0)),
+        metric_name=gc_col,
+        metric_value=float(gc_val),
+        baseline_value=gc_threshold,
+        severity=classify_severity_fn(
+            delta_pct=delta_pct,
+            persistence_ratio=None,
             classification="bottleneck",
-            evidence=(
-                f"GC memory load reached {gc_val:.1f}% (threshold {gc_threshold:.0f}%) "
-                f"while P90 latency was {bucket_p90:.0f}ms "
-                f"(baseline {baseline_p90:.0f}ms, {bucket_p90/baseline_p90:.1f}x). "
-                f"GC pressure is likely contributing to latency degradation."
-            ),
-            test_run_id=test_run_id,
-            **onset_fields_fn(
-                concurrent_bucket.get("bucket_start", ts),
-                warmup + bucket_idx,
-                test_start_time,
-            ),
-        ))
-        break  # report first occurrence
-
-    return findings
+            scope="service",
+            bottleneck_type="gc_pressure",
+        ),
+        confidence="high" if gc_val > 95 else "medium",
+        classification="bottleneck",
+        evidence=(
+            f"GC memory load reached {gc_val:.1f}% (threshold {gc_threshold:.0f}%) "
+            f"while P90 latency was {bucket_p90:.0f}ms "
+            f"(baseline {baseline_p90:.0f}ms, {bucket_p90/baseline_p90:.1f}x). "
+            f"GC pressure is likely contributing to latency degradation."
+        ),
+        test_run_id=test_run_id,
+        **onset_fields_fn(
+            concurrent_bucket.get("bucket_start", ts),
+            warmup + bucket_idx,
+            test_start_time,
+        ),
+    )]
 
 
 # -------------------------------------------------------------------
@@ -1099,7 +1181,6 @@ def _detect_server_latency_spikes(
 
     spike_factor = cfg.get("kpi_latency_spike_factor", 3.0)
     warmup = cfg.get("warmup_buckets", 2)
-    findings: List[Dict] = []
 
     series = kpi_aligned[check_col].dropna()
     if len(series) < _MIN_SAMPLES_SPIKE:
@@ -1111,55 +1192,57 @@ def _detect_server_latency_spikes(
 
     spike_threshold = kpi_baseline * spike_factor
 
-    for ts, val in series.items():
-        if val <= spike_threshold:
-            continue
+    values = series.to_numpy(dtype=float)
+    bucket_pos = _match_concurrent_buckets(buckets_df, series.index)
+    p90_vals = _concurrent_bucket_values(buckets_df, bucket_pos, "p90")
 
-        concurrent_bucket = _get_concurrent_bucket(buckets_df, ts)
-        if concurrent_bucket is None:
-            continue
-
-        bucket_p90 = concurrent_bucket.get("p90", 0)
-        if pd.isna(bucket_p90) or bucket_p90 <= baseline_p90:
-            continue
+    breach = _sustained_breach(
+        (values > spike_threshold) & (p90_vals > baseline_p90),
+        min_buckets=cfg.get("kpi_min_breach_buckets", 1),
+    )
+    if breach is None:
+        return []
 
-        bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
-        delta_pct = (val - kpi_baseline) / kpi_baseline * 100
+    # Report the first spike
+    pos = breach["onset_pos"]
+    ts = series.index[pos]
+    val = float(values[pos])
+    concurrent_bucket = _concurrent_bucket_row(buckets_df, bucket_pos[pos])
+    bucket_p90 = concurrent_bucket.get("p90", 0)
+    bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
+    delta_pct = (val - kpi_baseline) / kpi_baseline * 100
 
-        findings.append(make_finding_fn(
-            bottleneck_type="server_latency_spike",
-            scope="service",
-            scope_name="kpi_service",
-            concurrency=float(concurrent_bucket.get("concurrency", 0)),
-            metric_name=check_col,
-            metric_value=float(val),
-            baseline_value=float(kpi_baseline),
-            severity=classify_severity_fn(
-                delta_pct=delta_pct,
-                persistence_ratio=None,
-                classification="bottleneck",
-                scope="service",
-                bottleneck_type="server_latency_spike",
-            ),
-            confidence="high",
+    return [make_finding_fn(
+        bottleneck_type="server_latency_spike",
+        scope="service",
+        scope_name="kpi_service",
+        concurrency=float(concurrent_bucket.get("concurrency", 0)),
+        metric_name=check_col,
+        metric_value=float(val),
+        baseline_value=float(kpi_baseline),
+        severity=classify_severity_fn(
+            delta_pct=delta_pct,
+            persistence_ratio=None,
             classification="bottleneck",
-            evidence=(
-                f"Server-side {check_col} spiked to {val:.1f}ms "
-                f"(baseline {kpi_baseline:.1f}ms, {val/kpi_baseline:.1f}x) "
-                f"while client P90 was {bucket_p90:.0f}ms at "
-                f"{concurrent_bucket.get('concurrency', 0):.0f} concurrent users. "
-                f"Server latency spike preceded/coincided with client-side degradation."
-            ),
-            test_run_id=test_run_id,
-            **onset_fields_fn(
-                concurrent_bucket.get("bucket_start", ts),
-                warmup + bucket_idx,
-                test_start_time,
-            ),
-        ))
-        break  # report first spike
-
-    return findings
+            scope="service",
+            bottleneck_type="server_latency_spike",
+        ),
+        confidence="high",
+        classification="bottleneck",
+        evidence=(
+            f"Server-side {check_col} spiked to {val:.1f}ms "
+            f"(baseline {kpi_baseline:.1f}ms, {val/kpi_baseline:.1f}x) "
+            f"while client P90 was {bucket_p90:.0f}ms at "
+            f"{concurrent_bucket.get('concurrency', 0):.0f} concurrent users. "
+            f"Server latency spike preceded/coincided with client-side degradation."
+        ),
+        test_run_id=test_run_id,
+        **onset_fields_fn(
+            concurrent_bucket.get("bucket_start", ts),
+            warmup + bucket_idx,
+            test_start_time,
+        ),
+    )]
 
 
 # -------------------------------------------------------------------
@@ -1184,53 +1267,45 @@ def _detect_throughput_divergence(
 
     warmup = cfg.get("warmup_buckets", 2)
     divergence_threshold = cfg.get("kpi_throughput_divergence_pct", 30.0)
-    findings: List[Dict] = []
-
-    matched_count = 0
-    divergent_count = 0
-    worst_divergence_pct = 0.0
-    worst_ts = None
-    worst_bucket = None
 
-    for ts, row in kpi_aligned.iterrows():
-        server_hits = row.get(hits_col)
-        if pd.isna(server_hits) or server_hits <= 0:
-            continue
-
-        concurrent_bucket = _get_concurrent_bucket(buckets_df, ts)
-        if concurrent_bucket is None:
-            continue
+    server_hits = kpi_aligned[hits_col].to_numpy(dtype=float)
+    bucket_pos = _match_concurrent_buckets(buckets_df, kpi_aligned.index)
+    client_rps = _concurrent_bucket_values(buckets_df, bucket_pos, "throughput_rps")
 
-        client_rps = concurrent_bucket.get("throughput_rps", 0)
-        if client_rps <= 0:
-            continue
-
-        matched_count += 1
+    # Windows where both sides report traffic
+    matched = (server_hits > 0) & (bucket_pos >= 0) & ~(client_rps <= 0)
+    if matched.sum() < _MIN_SAMPLES_SPIKE:
+        return []
 
-        ratio_diff = abs(server_hits - client_rps) / client_rps * 100
-        if ratio_diff > divergence_threshold:
-            divergent_count += 1
-            if ratio_diff > worst_divergence_pct:
-                worst_divergence_pct = ratio_diff
-                worst_ts = ts
-                worst_bucket = concurrent_bucket
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio_diff = np.abs(server_hits - client_rps) / client_rps * 100
 
-    if divergent_count == 0 or matched_count < _MIN_SAMPLES_SPIKE:
+    breach = _sustained_breach(
+        ratio_diff > divergence_threshold,
+        eligible=matched,
+        min_persistence=0.3,
+    )
+    if breach is None:
         return []
 
-    divergence_ratio = divergent_count / matched_count
-    if divergence_ratio < 0.3:
-        return []
+    divergent_count = breach["breach_count"]
+    matched_count = breach["eligible_count"]
+    divergence_ratio = breach["persistence_ratio"]
+
+    worst_pos = _worst_breach_position(ratio_diff, breach["mask"])
+    worst_ts = kpi_aligned.index[worst_pos]
+    worst_divergence_pct = float(ratio_diff[worst_pos])
+    worst_bucket = _concurrent_bucket_row(buckets_df, bucket_pos[worst_pos])
 
-    bucket_idx = worst_bucket.get("_bucket_idx", 0) if worst_bucket else 0
-    server_val = float(kpi_aligned.loc[worst_ts, hits_col]) if worst_ts is not None else 0
-    client_val = float(worst_bucket.get("throughput_rps", 0)) if worst_bucket else 0
+    bucket_idx = worst_bucket.get("_bucket_idx", 0)
+    server_val = float(server_hits[worst_pos])
+    client_val = float(worst_bucket.get("throughput_rps", 0))
 
-    findings.append(make_finding_fn(
+    return [make_finding_fn(
         bottleneck_type="throughput_divergence",
         scope="service",
         scope_name="kpi_service",
-        concurrency=float(worst_bucket.get("concurrency", 0)) if worst_bucket else 0,
+        concurrency=float(worst_bucket.get("concurrency", 0)),
         metric_name=f"{hits_col}_vs_client_rps",
         metric_value=server_val,
         baseline_value=client_val,
@@ -1246,13 +1321,11 @@ def _detect_throughput_divergence(
         ),
         test_run_id=test_run_id,
         **onset_fields_fn(
-            worst_bucket.get("bucket_start", worst_ts) if worst_bucket else worst_ts,
+            worst_bucket.get("bucket_start", worst_ts),
             warmup + bucket_idx,
             test_start_time,
         ),
-    ))
-
-    return findings
+    )]
 
 
 # -------------------------------------------------------------------
@@ -1282,65 +1355,65 @@ def _detect_host_cpu_saturation(
         return []
 
     warmup = cfg.get("warmup_buckets", 2)
-    findings: List[Dict] = []
 
-    for ts, row in kpi_aligned.iterrows():
-        idle_val = row.get(idle_col)
-        if pd.isna(idle_val) or idle_val > idle_threshold:
-            continue
+    idle_vals = kpi_aligned[idle_col].to_numpy(dtype=float)
+    bucket_pos = _match_concurrent_buckets(buckets_df, kpi_aligned.index)
+    p90_vals = _concurrent_bucket_values(buckets_df, bucket_pos, "p90")
 
-        concurrent_bucket = _get_concurrent_bucket(buckets_df, ts)
-        if concurrent_bucket is None:
-            continue
-
-        bucket_p90 = concurrent_bucket.get("p90", 0)
-        if pd.isna(bucket_p90) or bucket_p90 <= baseline_p90 * 1.3:
-            continue
+    breach = _sustained_breach(
+        (idle_vals <= idle_threshold) & (p90_vals > baseline_p90 * 1.3),
+        min_buckets=cfg.get("kpi_min_breach_buckets", 1),
+    )
+    if breach is None:
+        return []
 
-        bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
-        cpu_used = 100 - idle_val
+    pos = breach["onset_pos"]
+    ts = kpi_aligned.index[pos]
+    row = kpi_aligned.iloc[pos]
+    idle_val = idle_vals[pos]
+    concurrent_bucket = _concurrent_bucket_row(buckets_df, bucket_pos[pos])
+    bucket_p90 = concurrent_bucket.get("p90", 0)
+    bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
+    cpu_used = 100 - idle_val
 
-        user_col = _find_column(kpi_aligned, "cpu_user")
-        system_col = _find_column(kpi_aligned, "cpu_system")
-        user_val = row.get(user_col, 0) if user_col else 0
-        system_val = row.get(system_col, 0) if system_col else 0
+    user_col = _find_column(kpi_aligned, "cpu_user")
+    system_col = _find_column(kpi_aligned, "cpu_system")
+    user_val = row.get(user_col, 0) if user_col else 0
+    system_val = row.get(system_col, 0) if system_col else 0
 
-        delta_pct = (cpu_used - (100 - idle_threshold)) / (100 - idle_threshold) * 100
+    delta_pct = (cpu_used - (100 - idle_threshold)) / (100 - idle_threshold) * 100
 
-        findings.append(make_finding_fn(
-            bottleneck_type="host_cpu_saturation",
-            scope="host",
-            scope_name=scope_name,
-            concurrency=float(concurrent_bucket.get("concurrency", 0)),
-            metric_name=idle_col,
-            metric_value=float(cpu_used),
-            baseline_value=100 - idle_threshold,
-            severity=classify_severity_fn(
-                delta_pct=delta_pct,
-                persistence_ratio=None,
-                classification="bottleneck",
-                scope="host",
-                bottleneck_type="host_cpu_saturation",
-            ),
-            confidence="high" if idle_val < 10 else "medium",
+    return [make_finding_fn(
+        bottleneck_type="host_cpu_saturation",
+        scope="host",
+        scope_name=scope_name,
+        concurrency=float(concurrent_bucket.get("concurrency", 0)),
+        metric_name=idle_col,
+        metric_value=float(cpu_used),
+        baseline_value=100 - idle_threshold,
+        severity=classify_severity_fn(
+            delta_pct=delta_pct,
+            persistence_ratio=None,
             classification="bottleneck",
-            evidence=(
-                f"Host CPU idle dropped to {idle_val:.1f}% "
-                f"(user: {user_val:.1f}%, system: {system_val:.1f}%) "
-                f"while client P90 was {bucket_p90:.0f}ms at "
-                f"{concurrent_bucket.get('concurrency', 0):.0f} concurrent users. "
-                f"Host CPU saturation likely contributing to latency degradation."
-            ),
-            test_run_id=test_run_id,
-            **onset_fields_fn(
-                concurrent_bucket.get("bucket_start", ts),
-                warmup + bucket_idx,
-                test_start_time,
-            ),
-        ))
-        break
-
-    return findings
+            scope="host",
+            bottleneck_type="host_cpu_saturation",
+        ),
+        confidence="high" if idle_val < 10 else "medium",
+        classification="bottleneck",
+        evidence=(
+            f"Host CPU idle dropped to {idle_val:.1f}% "
+            f"(user: {user_val:.1f}%, system: {system_val:.1f}%) "
+            f"while client P90 was {bucket_p90:.0f}ms at "
+            f"{concurrent_bucket.get('concurrency', 0):.0f} concurrent users. "
+            f"Host CPU saturation likely contributing to latency degradation."
+        ),
+        test_run_id=test_run_id,
+        **onset_fields_fn(
+            concurrent_bucket.get("bucket_start", ts),
+            warmup + bucket_idx,
+            test_start_time,
+        ),
+    )]
 
 
 # -------------------------------------------------------------------
@@ -1371,63 +1444,62 @@ def _detect_host_memory_pressure(
         return []
 
     warmup = cfg.get("warmup_buckets", 2)
-    findings: List[Dict] = []
 
-    for ts, row in kpi_aligned.iterrows():
-        usable = row.get(usable_col)
-        total = row.get(total_col)
-        if pd.isna(usable) or pd.isna(total) or total <= 0:
-            continue
-
-        used_pct = (1.0 - usable / total) * 100
-        if used_pct < mem_pressure_threshold:
-            continue
+    usable_vals = kpi_aligned[usable_col].to_numpy(dtype=float)
+    total_vals = kpi_aligned[total_col].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        used_pct = np.where(total_vals > 0, (1.0 - usable_vals / total_vals) * 100, np.nan)
 
-        concurrent_bucket = _get_concurrent_bucket(buckets_df, ts)
-        if concurrent_bucket is None:
-            continue
+    bucket_pos = _match_concurrent_buckets(buckets_df, kpi_aligned.index)
+    p90_vals = _concurrent_bucket_values(buckets_df, bucket_pos, "p90")
 
-        bucket_p90 = concurrent_bucket.get("p90", 0)
-        if pd.isna(bucket_p90) or bucket_p90 <= baseline_p90 * 1.3:
-            continue
+    breach = _sustained_breach(
+        (used_pct >= mem_pressure_threshold) & (p90_vals > baseline_p90 * 1.3),
+        min_buckets=cfg.get("kpi_min_breach_buckets", 1),
+    )
+    if breach is None:
+        return []
 
-        bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
-        delta_pct = (used_pct - mem_pressure_threshold) / mem_pressure_threshold * 100
+    pos = breach["onset_pos"]
+    ts = kpi_aligned.index[pos]
+    usable = usable_vals[pos]
+    total = total_vals[pos]
+    concurrent_bucket = _concurrent_bucket_row(buckets_df, bucket_pos[pos])
+    bucket_p90 = concurrent_bucket.get("p90", 0)
+    bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
+    delta_pct = (used_pct[pos] - mem_pressure_threshold) / mem_pressure_threshold * 100
 
-        findings.append(make_finding_fn(
-            bottleneck_type="host_memory_pressure",
-            scope="host",
-            scope_name=scope_name,
-            concurrency=float(concurrent_bucket.get("concurrency", 0)),
-            metric_name=f"{usable_col}_vs_{total_col}",
-            metric_value=float(used_pct),
-            baseline_value=mem_pressure_threshold,
-            severity=classify_severity_fn(
-                delta_pct=delta_pct,
-                persistence_ratio=None,
-                classification="bottleneck",
-                scope="host",
-                bottleneck_type="host_memory_pressure",
-            ),
-            confidence="high" if used_pct > 95 else "medium",
+    return [make_finding_fn(
+        bottleneck_type="host_memory_pressure",
+        scope="host",
+        scope_name=scope_name,
+        concurrency=float(concurrent_bucket.get("concurrency", 0)),
+        metric_name=f"{usable_col}_vs_{total_col}",
+        metric_value=float(used_pct[pos]),
+        baseline_value=mem_pressure_threshold,
+        severity=classify_severity_fn(
+            delta_pct=delta_pct,
+            persistence_ratio=None,
             classification="bottleneck",
-            evidence=(
-                f"Host memory utilization at {used_pct:.1f}% "
-                f"(usable: {usable:.1f}, total: {total:.1f}) "
-                f"while client P90 was {bucket_p90:.0f}ms at "
-                f"{concurrent_bucket.get('concurrency', 0):.0f} concurrent users. "
-                f"High memory pressure may force paging and degrade performance."
-            ),
-            test_run_id=test_run_id,
-            **onset_fields_fn(
-                concurrent_bucket.get("bucket_start", ts),
-                warmup + bucket_idx,
-                test_start_time,
-            ),
-        ))
-        break
-
-    return findings
+            scope="host",
+            bottleneck_type="host_memory_pressure",
+        ),
+        confidence="high" if used_pct[pos] > 95 else "medium",
+        classification="bottleneck",
+        evidence=(
+            f"Host memory utilization at {used_pct[pos]:.1f}% "
+            f"(usable: {usable:.1f}, total: {total:.1f}) "
+            f"while client P90 was {bucket_p90:.0f}ms at "
+            f"{concurrent_bucket.get('concurrency', 0):.0f} concurrent users. "
+            f"High memory pressure may force paging and degrade performance."
+        ),
+        test_run_id=test_run_id,
+        **onset_fields_fn(
+            concurrent_bucket.get("bucket_start", ts),
+            warmup + bucket_idx,
+            test_start_time,
+        ),
+    )]
 
 
 # -------------------------------------------------------------------
@@ -1457,40 +1529,32 @@ def _detect_disk_queue_saturation(
         return []
 
     warmup = cfg.get("warmup_buckets", 2)
-    findings: List[Dict] = []
-
-    sustained_count = 0
-    total_count = 0
-    worst_val = 0.0
-    worst_ts = None
-    worst_bucket = None
-
-    for ts, row in kpi_aligned.iterrows():
-        queue_val = row.get(queue_col)
-        if pd.isna(queue_val):
-            continue
 
-        total_count += 1
-        if queue_val > queue_threshold:
-            concurrent_bucket = _get_concurrent_bucket(buckets_df, ts)
-            if concurrent_bucket is not None:
-                sustained_count += 1
-                if queue_val > worst_val:
-                    worst_val = queue_val
-                    worst_ts = ts
-                    worst_bucket = concurrent_bucket
+    queue_vals = kpi_aligned[queue_col].to_numpy(dtype=float)
+    bucket_pos = _match_concurrent_buckets(buckets_df, kpi_aligned.index)
 
-    if sustained_count < _MIN_SAMPLES_SPIKE or worst_bucket is None:
+    breach = _sustained_breach(
+        (queue_vals > queue_threshold) & (bucket_pos >= 0),
+        eligible=~np.isnan(queue_vals),
+        min_breaches=_MIN_SAMPLES_SPIKE,
+        min_persistence=0.1,
+    )
+    if breach is None:
         return []
 
-    persistence = sustained_count / total_count if total_count > 0 else 0
-    if persistence < 0.1:
-        return []
+    sustained_count = breach["breach_count"]
+    total_count = breach["eligible_count"]
+    persistence = breach["persistence_ratio"]
+
+    worst_pos = _worst_breach_position(queue_vals, breach["mask"])
+    worst_ts = kpi_aligned.index[worst_pos]
+    worst_val = queue_vals[worst_pos]
+    worst_bucket = _concurrent_bucket_row(buckets_df, bucket_pos[worst_pos])
 
     bucket_idx = worst_bucket.get("_bucket_idx", 0)
     delta_pct = (worst_val - queue_threshold) / queue_threshold * 100
 
-    findings.append(make_finding_fn(
+    return [make_finding_fn(
         bottleneck_type="disk_queue_saturation",
         scope="host",
         scope_name=scope_name,
@@ -1519,9 +1583,7 @@ def _detect_disk_queue_saturation(
             warmup + bucket_idx,
             test_start_time,
         ),
-    ))
-
-    return findings
+    )]
 
 
 # -------------------------------------------------------------------
@@ -1555,51 +1617,58 @@ def _detect_sql_contention(
     findings: List[Dict] = []
 
     if lock_col is not None:
-        lock_series = kpi_aligned[lock_col].dropna()
-        if len(lock_series) >= _MIN_SAMPLES_SPIKE:
-            lock_events = lock_series[lock_series > 0]
-            if len(lock_events) >= _MIN_SAMPLES_SPIKE:
-                worst_idx = lock_events.idxmax()
-                worst_val = float(lock_events.max())
-                concurrent_bucket = _get_concurrent_bucket(buckets_df, worst_idx)
-                if concurrent_bucket is not None:
-                    bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
-                    persistence = len(lock_events) / len(lock_series)
-                    findings.append(make_finding_fn(
-                        bottleneck_type="sql_contention",
-                        scope="host",
-                        scope_name=scope_name,
-                        concurrency=float(concurrent_bucket.get("concurrency", 0)),
-                        metric_name=lock_col,
-                        metric_value=worst_val,
-                        baseline_value=0.0,
-                        severity="high" if persistence > 0.3 else "medium",
-                        confidence="high" if persistence > 0.5 else "medium",
-                        classification="bottleneck",
-                        evidence=(
-                            f"SQL Server lock waits detected in "
-                            f"{len(lock_events)}/{len(lock_series)} windows "
-                            f"({persistence:.0%}). Peak: {worst_val:.2f}/s. "
-                            f"Lock contention can serialize database access "
-                            f"and cause application-level latency spikes."
-                        ),
-                        test_run_id=test_run_id,
-                        **onset_fields_fn(
-                            concurrent_bucket.get("bucket_start", worst_idx),
-                            warmup + bucket_idx,
-                            test_start_time,
-                        ),
-                    ))
+        lock_vals = kpi_aligned[lock_col].to_numpy(dtype=float)
+        lock_events = _sustained_breach(
+            lock_vals > 0, eligible=~np.isnan(lock_vals), min_breaches=_MIN_SAMPLES_SPIKE,
+        )
+        if lock_events is not None:
+            worst_pos = _worst_breach_position(lock_vals, lock_events["mask"])
+            worst_idx = kpi_aligned.index[worst_pos]
+            worst_val = float(lock_vals[worst_pos])
+            concurrent_bucket = _get_concurrent_bucket(buckets_df, worst_idx)
+            if concurrent_bucket is not None:
+                bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
+                persistence = lock_events["persistence_ratio"]
+                findings.append(make_finding_fn(
+                    bottleneck_type="sql_contention",
+                    scope="host",
+                    scope_name=scope_name,
+                    concurrency=float(concurrent_bucket.get("concurrency", 0)),
+                    metric_name=lock_col,
+                    metric_value=worst_val,
+                    baseline_value=0.0,
+                    severity="high" if persistence > 0.3 else "medium",
+                    confidence="high" if persistence > 0.5 else "medium",
+                    classification="bottleneck",
+                    evidence=(
+                        f"SQL Server lock waits detected in "
+                        f"{lock_events['breach_count']}/{lock_events['eligible_count']} windows "
+                        f"({persistence:.0%}). Peak: {worst_val:.2f}/s. "
+                        f"Lock contention can serialize database access "
+                        f"and cause application-level latency spikes."
+                    ),
+                    test_run_id=test_run_id,
+                    **onset_fields_fn(
+                        concurrent_bucket.get("bucket_start", worst_idx),
+                        warmup + bucket_idx,
+                        test_start_time,
+                    ),
+                ))
 
     if compile_col is not None and len(findings) == 0:
         compile_series = kpi_aligned[compile_col].dropna()
         if len(compile_series) >= _MIN_SAMPLES_TREND:
             early_baseline = compile_series.iloc[:max(3, warmup)].mean()
             if early_baseline > 0:
-                spikes = compile_series[compile_series > early_baseline * compile_spike_factor]
-                if len(spikes) >= _MIN_SAMPLES_SPIKE:
-                    worst_idx = spikes.idxmax()
-                    worst_val = float(spikes.max())
+                compile_vals = compile_series.to_numpy(dtype=float)
+                spikes = _sustained_breach(
+                    compile_vals > early_baseline * compile_spike_factor,
+                    min_breaches=_MIN_SAMPLES_SPIKE,
+                )
+                if spikes is not None:
+                    worst_pos = _worst_breach_position(compile_vals, spikes["mask"])
+                    worst_idx = compile_series.index[worst_pos]
+                    worst_val = float(compile_vals[worst_pos])
                     concurrent_bucket = _get_concurrent_bucket(buckets_df, worst_idx)
                     if concurrent_bucket is not None:
                         bucket_idx = concurrent_bucket.get("_bucket_idx", 0)
@@ -1614,7 +1683,7 @@ def _detect_sql_contention(
                             baseline_value=float(early_baseline),
                             severity=classify_severity_fn(
                                 delta_pct=delta_pct,
-                                persistence_ratio=len(spikes) / len(compile_series),
+                                persistence_ratio=spikes["persistence_ratio"],
                                 classification="bottleneck",
                                 scope="host",
                                 bottleneck_type="sql_contention",
@@ -1673,6 +1742,69 @@ def _find_column(df: pd.DataFrame, pattern: str) -> Optional[str]:
     return None
 
 
+def _match_concurrent_buckets(buckets_df: pd.DataFrame, kpi_timestamps) -> np.ndarray:
+    """Find the JTL time bucket that overlaps each KPI timestamp, in one pass.
+
+    Returns an array of positional row numbers into ``buckets_df`` (the
+    nearest ``bucket_start``; the earlier row on ties), with ``-1`` where the
+    nearest bucket is more than 120 s away.
+    """
+    kpi_ts = pd.DatetimeIndex(kpi_timestamps)
+    kpi_ts = kpi_ts.tz_localize("UTC") if kpi_ts.tz is None else kpi_ts.tz_convert("UTC")
+    matched = np.full(len(kpi_ts), -1, dtype=np.int64)
+
+    bucket_starts = pd.DatetimeIndex(pd.to_datetime(buckets_df["bucket_start"], utc=True))
+    valid = np.flatnonzero(~bucket_starts.isna())
+    if len(valid) == 0 or len(kpi_ts) == 0:
+        return matched
+
+    start_ns = bucket_starts[valid].as_unit("ns").asi8
+    order = np.argsort(start_ns, kind="stable")
+    sorted_ns = start_ns[order]
+    positions = valid[order]
+    kpi_ns = kpi_ts.as_unit("ns").asi8
+
+    # Nearest bucket is either side of the insertion point
+    right = np.searchsorted(sorted_ns, kpi_ns)
+    left = np.clip(right - 1, 0, len(sorted_ns) - 1)
+    right = np.clip(right, 0, len(sorted_ns) - 1)
+    left_diff = np.abs(kpi_ns - sorted_ns[left])
+    right_diff = np.abs(sorted_ns[right] - kpi_ns)
+    take_right = (right_diff < left_diff) | (
+        (right_diff == left_diff) & (positions[right] < positions[left])
+    )
+
+    nearest = np.where(take_right, positions[right], positions[left])
+    diff = np.where(take_right, right_diff, left_diff)
+    within = (diff <= 120 * 1_000_000_000) & ~kpi_ts.isna()
+    matched[within] = nearest[within]
+    return matched
+
+
+def _concurrent_bucket_values(
+    buckets_df: pd.DataFrame, bucket_pos: np.ndarray, column: str, default: float = 0.0,
+) -> np.ndarray:
+    """Values of a JTL bucket column at matched positions (NaN where unmatched).
+
+    ``default`` fills every matched position when the column is absent.
+    """
+    values = np.full(len(bucket_pos), np.nan)
+    hit = bucket_pos >= 0
+    if column in buckets_df.columns:
+        values[hit] = buckets_df[column].to_numpy(dtype=float)[bucket_pos[hit]]
+    else:
+        values[hit] = default
+    return values
+
+
+def _concurrent_bucket_row(buckets_df: pd.DataFrame, pos: int) -> Dict[str, Any]:
+    """Dict of a JTL bucket row's values, with ``_bucket_idx`` added."""
+    row = buckets_df.iloc[pos].to_dict()
+    label = buckets_df.index[pos]
+    row["_bucket_idx"] = int(label) if isinstance(label, (int, np.integer)) else 0
+    return row
+
+
 def _get_concurrent_bucket(
     buckets_df: pd.DataFrame, kpi_timestamp
 ) -> Optional[Dict[str, Any]]:
@@ -1681,17 +1813,7 @@ def _get_concurrent_bucket(
     Returns a dict of the bucket row's values (with ``_bucket_idx`` added),
     or ``None`` if no match within tolerance.
     """
-    kpi_ts = pd.Timestamp(kpi_timestamp)
-    if kpi_ts.tzinfo is None:
-        kpi_ts = kpi_ts.tz_localize("UTC")
-
-    bucket_starts = pd.to_datetime(buckets_df["bucket_start"], utc=True)
-    diffs = (bucket_starts - kpi_ts).abs()
-    min_idx = diffs.idxmin()
-
-    if diffs.loc[min_idx].total_seconds() > 120:
+    pos = _match_concurrent_buckets(buckets_df, [pd.Timestamp(kpi_timestamp)])[0]
+    if pos < 0:
         return None
-
-    row = buckets_df.loc[min_idx].to_dict()
-    row["_bucket_idx"] = int(min_idx) if isinstance(min_idx, (int, np.integer)) else 0
-    return row
+    return _concurrent_bucket_row(buckets_df, pos)
@@ -3,10 +3,12 @@ import os
 import re
 import json
 import csv
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
 from fastmcp import Context
 from dotenv import load_dotenv
 from utils.config import load_config
@@ -24,6 +26,7 @@ PA_CONFIG = CONFIG.get('perf_analysis', {})
 LOAD_TOOL = PA_CONFIG.get('load_tool', 'blazemeter').lower()
 APM_TOOL = PA_CONFIG.get('apm_tool', 'datadog').lower()
 ARTIFACTS_PATH = Path(ARTIFACTS_CONFIG.get('artifacts_path', '../artifacts'))
+LOG_ANALYSIS_CONFIG = PA_CONFIG.get('log_analysis', {})
 
 # ============================================================================
 # MAIN MCP TOOL FUNCTION
@@ -210,8 +213,12 @@ async def analyze_jmeter_log(
     """
     Analyze JMeter log file for errors, exceptions, and performance issues.
     
-    Uses chunked reading for large files (up to 100MB+) and pattern matching
-    based on JMeter log analysis techniques.
+    Streams the file through a memory map with a single combined pattern
+    check per line (see ``_scan_jmeter_log_range``), so multi-GB logs are
+    scanned without loading them. With ``perf_analysis.log_analysis.jmeter_log_workers``
+    > 1, logs of at least ``parallel_min_mb`` are split on line boundaries
+    and scanned in worker processes; the grouped results are merged in file
+    order. Each matching line is reported once, under its most specific pattern.
     
     Args:
         log_path: Path to jmeter.log file
@@ -231,41 +238,36 @@ async def analyze_jmeter_log(
             - line_number: Line number in log file
             - count: Number of similar occurrences
     """
-    issues = []
-    error_patterns = compile_jmeter_error_patterns()
-    
-    # For large files, use chunked reading
-    chunk_size = 1024 * 1024  # 1MB chunks
-    
     try:
-        with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            line_number = 0
-            context_buffer = []  # Keep last 5 lines for context
-            max_context = 5
-            
-            for line in f:
-                line_number += 1
-                context_buffer.append(line)
-                
-                # Keep only last max_context lines
-                if len(context_buffer) > max_context:
-                    context_buffer.pop(0)
-                
-                # Check if line matches any error pattern
-                for pattern_name, pattern_config in error_patterns.items():
-                    if pattern_config["regex"].search(line):
-                        # Extract error details
-                        issue = categorize_jmeter_error(
-                            line, 
-                            context_buffer.copy(), 
-                            pattern_name,
-                            line_number,
-                            ctx
-                        )
-                        issues.append(issue)
-        
-        # Group similar errors together
-        grouped_issues = group_errors_by_type_and_api(issues)
+        file_size = os.path.getsize(log_path)
+        workers = int(LOG_ANALYSIS_CONFIG.get("jmeter_log_workers") or 1)
+        min_parallel_bytes = float(LOG_ANALYSIS_CONFIG.get("parallel_min_mb", 256)) * 1024 * 1024
+
+        if workers > 1 and file_size >= min_parallel_bytes:
+            # Split on line boundaries, scan ranges in parallel, merge in file order
+            ranges = _split_log_on_line_boundaries(str(log_path), workers)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _scan_jmeter_log_range,
+                    [str(log_path)] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                ))
+            await ctx.info(
+                f"Scanned {log_path.name} ({file_size / (1024 * 1024):.0f} MB) "
+                f"in {len(ranges)} parallel range(s)"
+            )
+        else:
+            results = [_scan_jmeter_log_range(str(log_path), 0, file_size)]
+
+        # Merge per-range groups; line numbers are offset by the lines before each range
+        grouped: Dict[Tuple, Dict[str, Any]] = {}
+        lines_before = 0
+        for range_groups, range_lines in results:
+            _merge_issue_groups(grouped, range_groups, lines_before)
+            lines_before += range_lines
+
+        grouped_issues = _finalize_issue_groups(grouped)
         
         await ctx.info(f"JMeter log analysis complete. Found {len(grouped_issues)} unique issue groups.")
         
@@ -276,6 +278,118 @@ async def analyze_jmeter_log(
         return []
 
 
+# Lines kept for context around a matching line (current line included)
+_JMETER_CONTEXT_LINES = 5
+
+# When several patterns match one line, the line is reported once under the
+# most specific one (first in this order)
+_JMETER_PATTERN_PRIORITY = [
+    "fatal_error",
+    "connection_error",
+    "http_error",
+    "timeout",
+    "ssl_error",
+    "script_error",
+    "thread_error",
+    "exception",
+    "error_general",
+    "warning",
+]
+
+
+def _scan_jmeter_log_range(log_path: str, start: int, end: int) -> Tuple[Dict[Tuple, Dict[str, Any]], int]:
+    """
+    Scan the lines of a JMeter log that start in the byte range [start, end).
+
+    The file is memory-mapped and read line by line, so logs of several GB
+    are streamed without loading them. Each line is checked once against a
+    combined alternation of all error patterns; only lines that hit are
+    classified (one issue per line, see ``_JMETER_PATTERN_PRIORITY``). The
+    last lines are kept in a ``deque`` ring buffer for context.
+
+    Module-level so it can run in a worker process.
+
+    Returns:
+        (issue groups keyed like ``group_errors_by_type_and_api``, with line
+        numbers relative to ``start``; number of lines in the range)
+    """
+    grouped: Dict[Tuple, Dict[str, Any]] = {}
+    line_number = 0
+
+    with open(log_path, "rb") as f:
+        if end <= start or os.fstat(f.fileno()).st_size == 0:
+            return grouped, 0
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Prime the context buffer with the lines just before this range
+            context: deque = deque(_read_lines_before(mm, start, _JMETER_CONTEXT_LINES - 1),
+                                   maxlen=_JMETER_CONTEXT_LINES)
+            mm.seek(start)
+            readline = mm.readline
+
+            while mm.tell() < end:
+                raw = readline()
+                if not raw:
+                    break
+                line_number += 1
+                line = _decode_log_line(raw)
+                context.append(line)
+
+                if not _JMETER_ANY_ERROR_REGEX.search(line):
+                    continue
+
+                pattern_name = _match_jmeter_error_pattern(line)
+                if pattern_name is None:
+                    continue
+                issue = categorize_jmeter_error(line, list(context), pattern_name, line_number, None)
+                _add_issue_to_groups(grouped, issue)
+
+    return grouped, line_number
+
+
+def _split_log_on_line_boundaries(log_path: str, parts: int) -> List[Tuple[int, int]]:
+    """Split a file into up to ``parts`` byte ranges that start at line starts."""
+    size = os.path.getsize(log_path)
+    if size == 0 or parts <= 1:
+        return [(0, size)]
+
+    offsets = [0]
+    with open(log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            newline = mm.find(b"\n", max(offsets[-1], size * i // parts))
+            if newline == -1 or newline + 1 >= size:
+                break
+            offsets.append(newline + 1)
+    offsets.append(size)
+    return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
+
+def _read_lines_before(mm: mmap.mmap, pos: int, count: int) -> List[str]:
+    """The ``count`` lines that end right before byte ``pos`` (a line start)."""
+    start = pos
+    for _ in range(count):
+        if start <= 0:
+            break
+        start = mm.rfind(b"\n", 0, start - 1) + 1
+    return [_decode_log_line(raw) for raw in mm[start:pos].splitlines(keepends=True)]
+
+
+def _decode_log_line(raw: bytes) -> str:
+    """Decode a raw log line like text-mode reading (UTF-8, \\r\\n -> \\n)."""
+    line = raw.decode("utf-8", errors="ignore")
+    if line.endswith("\r\n"):
+        line = line[:-2] + "\n"
+    return line
+
+
+def _match_jmeter_error_pattern(line: str) -> Optional[str]:
+    """Name of the highest-priority JMeter error pattern matching ``line``."""
+    for pattern_name in _JMETER_PATTERN_PRIORITY:
+        if _JMETER_ERROR_PATTERNS[pattern_name]["regex"].search(line):
+            return pattern_name
+    return None
+
+
 def compile_jmeter_error_patterns() -> Dict[str, Dict]:
     """
     Compile regex patterns for JMeter error detection.
@@ -341,12 +455,23 @@ def compile_jmeter_error_patterns() -> Dict[str, Dict]:
     return patterns
 
 
+_JMETER_ERROR_PATTERNS = compile_jmeter_error_patterns()
+
+# One alternation of every pattern: a single search rejects non-matching lines
+_JMETER_ANY_ERROR_REGEX = re.compile(
+    "|".join(f"(?:{config['regex'].pattern})" for config in _JMETER_ERROR_PATTERNS.values()),
+    re.IGNORECASE,
+)
+_JMETER_TIMESTAMP_REGEX = re.compile(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})')
+_JMETER_THREAD_REGEX = re.compile(r'Thread Group \d+-\d+')
+
+
 def categorize_jmeter_error(
     line: str, 
     context_lines: List[str], 
     pattern_name: str,
     line_number: int,
-    ctx: Context
+    ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """
     Categorize a JMeter error line and extract relevant details.
@@ -356,23 +481,22 @@ def categorize_jmeter_error(
         context_lines: Surrounding lines for context
         pattern_name: Which pattern matched
         line_number: Line number in log file
-        ctx: FastMCP context
+        ctx: FastMCP context (unused; None when called from a worker process)
     
     Returns:
         Dictionary with categorized error information
     """
-    patterns = compile_jmeter_error_patterns()
-    pattern_config = patterns.get(pattern_name, {})
+    pattern_config = _JMETER_ERROR_PATTERNS.get(pattern_name, {})
     
     # Extract timestamp (JMeter format: YYYY-MM-DD HH:MM:SS,mmm)
-    timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})', line)
+    timestamp_match = _JMETER_TIMESTAMP_REGEX.search(line)
     timestamp = timestamp_match.group(1) if timestamp_match else "Unknown"
     
     # Extract API/request information
     api_request = extract_api_from_context(line, context_lines)
     
     # Extract thread information
-    thread_match = re.search(r'Thread Group \d+-\d+', line)
+    thread_match = _JMETER_THREAD_REGEX.search(line)
     thread = thread_match.group(0) if thread_match else "Unknown Thread"
     
     return {
@@ -389,6 +513,15 @@ def categorize_jmeter_error(
     }
 
 
+# Common patterns for API extraction in JMeter logs
+_JMETER_API_PATTERNS = [
+    re.compile(r'(?:GET|POST|PUT|DELETE|PATCH)\s+(https?://[^\s]+)', re.IGNORECASE),  # HTTP method + URL
+    re.compile(r'URL:\s*(https?://[^\s]+)', re.IGNORECASE),  # URL: prefix
+    re.compile(r'HTTPSampler:\s*([^\s]+)', re.IGNORECASE),  # HTTPSampler name
+    re.compile(r'Request:\s*([^\s]+)', re.IGNORECASE),  # Request name
+]
+
+
 def extract_api_from_context(line: str, context_lines: List[str]) -> str:
     """
     Extract API endpoint or request name from log line and context.
@@ -400,24 +533,16 @@ def extract_api_from_context(line: str, context_lines: List[str]) -> str:
     Returns:
         API endpoint or request identifier
     """
-    # Common patterns for API extraction in JMeter logs
-    api_patterns = [
-        r'(?:GET|POST|PUT|DELETE|PATCH)\s+(https?://[^\s]+)',  # HTTP method + URL
-        r'URL:\s*(https?://[^\s]+)',  # URL: prefix
-        r'HTTPSampler:\s*([^\s]+)',  # HTTPSampler name
-        r'Request:\s*([^\s]+)',  # Request name
-    ]
-    
     # Check current line first
-    for pattern in api_patterns:
-        match = re.search(pattern, line, re.IGNORECASE)
+    for pattern in _JMETER_API_PATTERNS:
+        match = pattern.search(line)
         if match:
             return match.group(1)
     
     # Check context lines
     for context_line in reversed(context_lines):
-        for pattern in api_patterns:
-            match = re.search(pattern, context_line, re.IGNORECASE)
+        for pattern in _JMETER_API_PATTERNS:
+            match = pattern.search(context_line)
             if match:
                 return match.group(1)
     
@@ -434,47 +559,67 @@ def group_errors_by_type_and_api(issues: List[Dict]) -> List[Dict]:
     Returns:
         List of grouped errors with aggregated counts
     """
-    grouped = defaultdict(lambda: {
-        "source": "",
-        "timestamp": "",
-        "error_type": "",
-        "severity": "",
-        "api_request": "",
-        "error_message": "",
-        "context": "",
-        "thread": "",
-        "line_numbers": [],
-        "count": 0,
-        "first_occurrence": None,
-        "last_occurrence": None
-    })
-    
+    grouped: Dict[Tuple, Dict[str, Any]] = {}
     for issue in issues:
-        # Create grouping key based on error_type, severity, and api_request
-        key = (issue["error_type"], issue["severity"], issue["api_request"])
-        
-        # Initialize if first occurrence
-        if grouped[key]["count"] == 0:
-            grouped[key].update({
-                "source": issue["source"],
-                "timestamp": issue["timestamp"],
-                "error_type": issue["error_type"],
-                "severity": issue["severity"],
-                "api_request": issue["api_request"],
-                "error_message": issue["error_message"],
-                "context": issue["context"],
-                "thread": issue["thread"],
-                "first_occurrence": issue["timestamp"]
-            })
-        
-        # Aggregate
-        grouped[key]["count"] += 1
-        grouped[key]["line_numbers"].append(issue["line_number"])
-        grouped[key]["last_occurrence"] = issue["timestamp"]
-    
-    # Convert to list and format line_numbers
+        _add_issue_to_groups(grouped, issue)
+    return _finalize_issue_groups(grouped)
+
+
+# Line numbers kept per issue group (the rest are only counted)
+_MAX_GROUP_LINE_NUMBERS = 10
+
+
+def _add_issue_to_groups(grouped: Dict[Tuple, Dict[str, Any]], issue: Dict[str, Any]) -> None:
+    """Add one issue to groups keyed by (error_type, severity, api_request)."""
+    key = (issue["error_type"], issue["severity"], issue["api_request"])
+    group = grouped.get(key)
+
+    # Initialize if first occurrence
+    if group is None:
+        group = grouped[key] = {
+            "source": issue["source"],
+            "timestamp": issue["timestamp"],
+            "error_type": issue["error_type"],
+            "severity": issue["severity"],
+            "api_request": issue["api_request"],
+            "error_message": issue["error_message"],
+            "context": issue["context"],
+            "thread": issue["thread"],
+            "line_numbers": [],
+            "count": 0,
+            "first_occurrence": issue["timestamp"],
+            "last_occurrence": None
+        }
+
+    # Aggregate
+    group["count"] += 1
+    if len(group["line_numbers"]) < _MAX_GROUP_LINE_NUMBERS:
+        group["line_numbers"].append(issue["line_number"])
+    group["last_occurrence"] = issue["timestamp"]
+
+
+def _merge_issue_groups(
+    grouped: Dict[Tuple, Dict[str, Any]],
+    other: Dict[Tuple, Dict[str, Any]],
+    line_offset: int = 0,
+) -> None:
+    """Merge groups from a later part of the same log into ``grouped``."""
+    for key, group in other.items():
+        line_numbers = [n + line_offset for n in group["line_numbers"]]
+        existing = grouped.get(key)
+        if existing is None:
+            grouped[key] = {**group, "line_numbers": line_numbers}
+            continue
+        existing["count"] += group["count"]
+        room = _MAX_GROUP_LINE_NUMBERS - len(existing["line_numbers"])
+        existing["line_numbers"].extend(line_numbers[:max(room, 0)])
+        existing["last_occurrence"] = group["last_occurrence"]
+
+
+def _finalize_issue_groups(grouped: Dict[Tuple, Dict[str, Any]]) -> List[Dict]:
+    """Format line numbers and sort groups by severity, then frequency."""
     result = []
-    for key, data in grouped.items():
+    for data in grouped.values():
         data["line_numbers"] = ",".join(map(str, data["line_numbers"][:10]))  # Limit to first 10
         if len(data["line_numbers"]) > 10:
             data["line_numbers"] += f",... (+{len(data['line_numbers']) - 10} more)"
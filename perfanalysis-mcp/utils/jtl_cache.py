@@ -0,0 +1,447 @@
+"""
+jtl_cache.py
+
+Shared columnar sidecar for JTL result files.
+
+The first consumer that reads a JTL (test-results.csv) converts it once into
+a compressed, typed Parquet file next to it:
+
+    artifacts/<run_id>/<source>/test-results.csv
+    artifacts/<run_id>/<source>/test-results.csv.parquet
+
+The sidecar records the source file's size and mtime; when either changes it
+is rebuilt. Later reads, from this or any other MCP server using the same
+module (jmeter-mcp, perfanalysis-mcp, blazemeter-mcp), memory-map the Parquet
+file and load only the columns they ask for instead of re-parsing the CSV.
+
+Numeric JMeter columns (timeStamp, elapsed, Latency, bytes, allThreads, ...)
+are stored as int64; every other column is stored as text exactly as it
+appears in the CSV (empty fields stay "").
+
+A producer that writes a JTL itself (e.g. blazemeter-mcp merging session
+JTLs) can build the sidecar in the same pass with open_jtl_cache_writer(),
+append_jtl_cache() and close_jtl_cache_writer(), so readers never have to
+convert the CSV.
+
+pyarrow is optional. Without it, or with ``jtl_cache.enabled: false`` in
+config.yaml, or if a JTL cannot be converted (e.g. a non-integer value in a
+numeric column), every reader falls back to parsing the CSV directly.
+
+Each of those servers ships its own copy of this module. Edit the jmeter-mcp
+copy and run jmeter-mcp/tools/check_jtl_cache_sync.py --fix to update the
+others; without --fix the script exits non-zero if the copies differ.
+"""
+
+import csv
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.config import load_config
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pc = None
+    pa_csv = None
+    pq = None
+    _PYARROW_AVAILABLE = False
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# === Global configuration ===
+CONFIG = load_config()
+JTL_CACHE_CONFIG = CONFIG.get("jtl_cache", {})
+
+# Bump when the sidecar layout changes so old sidecars are rebuilt
+_CACHE_VERSION = 1
+_CACHE_METADATA_KEY = b"jtl_cache"
+_CACHE_SUFFIX = ".parquet"
+
+# JMeter JTL columns that are always integers
+_INT_COLUMNS = {
+    "timeStamp", "elapsed", "bytes", "sentBytes", "grpThreads", "allThreads",
+    "Latency", "IdleTime", "Connect", "SampleCount", "ErrorCount",
+}
+
+# Strings pandas.read_csv treats as missing by default
+_PANDAS_NA_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+}
+
+# (path, size, mtime_ns) of JTLs that failed to convert in this process
+_FAILED_CONVERSIONS: set = set()
+
+
+def get_jtl_cache_path(jtl_path: str) -> str:
+    """Path of the columnar sidecar for a JTL file."""
+    return f"{jtl_path}{_CACHE_SUFFIX}"
+
+
+def ensure_jtl_cache(jtl_path: str) -> Optional[str]:
+    """
+    Return the path of an up-to-date columnar sidecar for ``jtl_path``,
+    converting the CSV if the sidecar is missing or stale.
+
+    Returns None when the cache is disabled, pyarrow is not installed, or the
+    JTL cannot be converted — callers should then read the CSV directly.
+    """
+    if not _PYARROW_AVAILABLE or not JTL_CACHE_CONFIG.get("enabled", True):
+        return None
+
+    source_key = _source_key(jtl_path)
+    if source_key is None:
+        return None
+
+    cache_path = get_jtl_cache_path(jtl_path)
+    if _read_cache_key(cache_path) == source_key:
+        return cache_path
+
+    failure_key = (os.path.abspath(jtl_path), source_key["size"], source_key["mtime_ns"])
+    if failure_key in _FAILED_CONVERSIONS:
+        return None
+
+    try:
+        _convert_jtl_to_parquet(jtl_path, cache_path, source_key)
+        return cache_path
+    except Exception as e:
+        _FAILED_CONVERSIONS.add(failure_key)
+        print(f"[jtl_cache] Could not build columnar cache for {jtl_path}: {e}")
+        return None
+
+
+def find_jtl_cache(jtl_path: str) -> Optional[str]:
+    """
+    Path of the sidecar for ``jtl_path`` if one exists and is up to date,
+    else None. Unlike ensure_jtl_cache this never converts the CSV.
+    """
+    if not _PYARROW_AVAILABLE or not JTL_CACHE_CONFIG.get("enabled", True):
+        return None
+    source_key = _source_key(jtl_path)
+    cache_path = get_jtl_cache_path(jtl_path)
+    if source_key is not None and _read_cache_key(cache_path) == source_key:
+        return cache_path
+    return None
+
+
+def read_jtl_header(jtl_path: str) -> List[str]:
+    """Column names of a JTL, from the sidecar if cached, else the CSV header."""
+    cache_path = find_jtl_cache(jtl_path)
+    if cache_path:
+        return list(pq.read_schema(cache_path).names)
+    return _read_csv_header(jtl_path)
+
+
+def read_jtl_columns(
+    jtl_path: str,
+    columns: List[str],
+    dtype: Optional[Dict[str, Any]] = None,
+    nrows: Optional[int] = None,
+):
+    """
+    Load selected JTL columns into a pandas DataFrame.
+
+    Equivalent to ``pd.read_csv(jtl_path, usecols=columns, dtype=dtype,
+    nrows=nrows)`` but served from the memory-mapped sidecar when available.
+    ``"category"`` dtypes are read straight from the Parquet dictionary pages.
+    A bounded read (``nrows`` set) uses an existing sidecar but never builds
+    one, so it only parses the first ``nrows`` rows of a cold JTL.
+    """
+    cache_path = ensure_jtl_cache(jtl_path) if nrows is None else find_jtl_cache(jtl_path)
+    if not cache_path:
+        return pd.read_csv(jtl_path, usecols=columns, dtype=dtype, low_memory=True, nrows=nrows)
+
+    dtype = dtype or {}
+    categorical = [c for c in columns if dtype.get(c) == "category"]
+    if nrows is None:
+        table = pq.read_table(cache_path, columns=list(columns), memory_map=True, read_dictionary=categorical)
+    else:
+        table = _read_parquet_head(cache_path, list(columns), categorical, nrows)
+
+    df = table.to_pandas()
+
+    # Match read_csv: default NA strings become NaN, categories are sorted
+    for col in df.columns:
+        if dtype.get(col) == "category":
+            keep = sorted(c for c in df[col].cat.categories if c not in _PANDAS_NA_VALUES)
+            df[col] = df[col].cat.set_categories(keep)
+            if nrows is not None:
+                # The head keeps the whole file's dictionary; drop unseen values
+                df[col] = df[col].cat.remove_unused_categories()
+        elif col not in _INT_COLUMNS:
+            df[col] = df[col].mask(df[col].isin(_PANDAS_NA_VALUES))
+
+    casts = {
+        c: t for c, t in dtype.items()
+        if c in df.columns and t not in ("category", "str", str)
+    }
+    return df.astype(casts) if casts else df
+
+
+def iter_jtl_frames(jtl_path: str, columns: List[str], chunk_size: int, **csv_kwargs) -> Iterator:
+    """
+    Yield pandas DataFrames of at most ``chunk_size`` rows with the selected
+    columns. ``csv_kwargs`` are passed to ``pd.read_csv`` on the CSV fallback
+    path only; numeric columns from the sidecar are already int64.
+    """
+    cache_path = ensure_jtl_cache(jtl_path)
+    if not cache_path:
+        yield from pd.read_csv(jtl_path, usecols=columns, chunksize=chunk_size, **csv_kwargs)
+        return
+
+    parquet = pq.ParquetFile(cache_path, memory_map=True)
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=list(columns)):
+        yield batch.to_pandas()
+
+
+def iter_jtl_rows(jtl_path: str, columns: List[str]) -> Iterator[Dict[str, str]]:
+    """
+    Yield one dict per JTL row with the selected columns as CSV text, the
+    same values ``csv.DictReader`` would return. Does not require pandas.
+    """
+    cache_path = ensure_jtl_cache(jtl_path)
+    if not cache_path:
+        with open(jtl_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+            for row in csv.DictReader(f):
+                yield {c: row[c] for c in columns if c in row}
+        return
+
+    parquet = pq.ParquetFile(cache_path, memory_map=True)
+    available = [c for c in columns if c in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(columns=available):
+        for row in batch.to_pylist():
+            yield {k: "" if v is None else str(v) for k, v in row.items()}
+
+
+def iter_jtl_failure_batches(
+    jtl_path: str, columns: List[str], batch_size: int = 65536,
+) -> Iterator[Tuple[int, Dict[str, List[str]]]]:
+    """
+    Scan a JTL keeping only failed samples (``success`` other than "true",
+    case-insensitive). Yields ``(rows_scanned, failed)`` per batch, where
+    ``failed`` maps each selected column to a list of CSV text values for
+    the failed rows of that batch. Successful rows are never materialized.
+    Does not require pandas.
+    """
+    cache_path = ensure_jtl_cache(jtl_path)
+    if not cache_path:
+        yield from _iter_csv_failure_batches(jtl_path, columns, batch_size)
+        return
+
+    parquet = pq.ParquetFile(cache_path, memory_map=True)
+    names = parquet.schema_arrow.names
+    available = [c for c in columns if c in names]
+    read_columns = available + (["success"] if "success" in names and "success" not in available else [])
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=read_columns):
+        scanned = batch.num_rows
+        if "success" in names:
+            success = pc.utf8_lower(pc.utf8_trim_whitespace(pc.fill_null(batch.column("success"), "")))
+            batch = batch.filter(pc.not_equal(success, "true"))
+        yield scanned, {
+            c: ["" if v is None else str(v) for v in batch.column(c).to_pylist()]
+            for c in available
+        }
+
+
+def open_jtl_cache_writer(jtl_path: str, header: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Start building the sidecar for a JTL that the caller is writing now.
+
+    Feed the CSV data with append_jtl_cache() as it is written and finish
+    with close_jtl_cache_writer() once the JTL is complete. Returns None
+    when the cache is disabled or pyarrow is not installed.
+    """
+    if not _PYARROW_AVAILABLE or not JTL_CACHE_CONFIG.get("enabled", True) or not header:
+        return None
+
+    cache_path = get_jtl_cache_path(jtl_path)
+    tmp_path = _tmp_cache_path(cache_path)
+    schema = pa.schema([(name, t) for name, t in _jtl_column_types(header).items()])
+    writer = pq.ParquetWriter(
+        tmp_path, schema, compression=JTL_CACHE_CONFIG.get("compression", "zstd")
+    )
+    return {
+        "jtl_path": jtl_path,
+        "cache_path": cache_path,
+        "tmp_path": tmp_path,
+        "header": list(header),
+        "writer": writer,
+    }
+
+
+def append_jtl_cache(state: Dict[str, Any], source) -> None:
+    """
+    Parse CSV data (header line first) from a binary file-like object and
+    append its rows to a sidecar opened with open_jtl_cache_writer().
+
+    Raises:
+        ValueError: If the CSV header differs from the sidecar's columns.
+        pyarrow.ArrowInvalid: If a value cannot be converted.
+    """
+    reader = _open_jtl_csv_reader(source, state["header"])
+    if reader.schema.names != state["header"]:
+        raise ValueError(f"JTL header {reader.schema.names} does not match {state['header']}")
+    for batch in reader:
+        state["writer"].write_batch(batch)
+
+
+def close_jtl_cache_writer(state: Dict[str, Any], commit: bool = True) -> Optional[str]:
+    """
+    Finish a sidecar started with open_jtl_cache_writer().
+
+    With commit=True the sidecar is stamped with the JTL's current size and
+    mtime and moved into place; call it only after the JTL is fully written.
+    With commit=False the partial sidecar is discarded.
+
+    Returns the sidecar path when committed, else None.
+    """
+    tmp_path = state["tmp_path"]
+    try:
+        if commit:
+            st = os.stat(state["jtl_path"])
+            source_key = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": _CACHE_VERSION}
+            state["writer"].add_key_value_metadata({_CACHE_METADATA_KEY: json.dumps(source_key).encode()})
+        state["writer"].close()
+        if commit:
+            os.replace(tmp_path, state["cache_path"])
+            return state["cache_path"]
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# ============================================================
+# Internal helpers
+# ============================================================
+
+def _read_csv_header(jtl_path: str) -> List[str]:
+    with open(jtl_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _iter_csv_failure_batches(
+    jtl_path: str, columns: List[str], batch_size: int,
+) -> Iterator[Tuple[int, Dict[str, List[str]]]]:
+    """csv.reader fallback for iter_jtl_failure_batches()."""
+    with open(jtl_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        positions = {c: header.index(c) for c in columns if c in header}
+        success_pos = header.index("success") if "success" in header else None
+
+        scanned = 0
+        failed: Dict[str, List[str]] = {c: [] for c in positions}
+        for row in reader:
+            if not row:
+                # Blank line; csv.DictReader and the sidecar skip these too
+                continue
+            scanned += 1
+            success = row[success_pos] if success_pos is not None and success_pos < len(row) else ""
+            if success.strip().lower() != "true":
+                for c, pos in positions.items():
+                    failed[c].append(row[pos] if pos < len(row) else "")
+            if scanned == batch_size:
+                yield scanned, failed
+                scanned = 0
+                failed = {c: [] for c in positions}
+        if scanned:
+            yield scanned, failed
+
+
+def _source_key(jtl_path: str) -> Optional[Dict[str, int]]:
+    """Size/mtime key a sidecar must carry to be current, or None if unreadable."""
+    try:
+        st = os.stat(jtl_path)
+    except OSError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": _CACHE_VERSION}
+
+
+def _tmp_cache_path(cache_path: str) -> str:
+    """Temporary sidecar path unique to the calling process and thread."""
+    return f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _read_parquet_head(cache_path: str, columns: List[str], categorical: List[str], nrows: int):
+    """
+    First ``nrows`` rows of the selected sidecar columns as a pyarrow Table.
+    Stops reading once enough rows are gathered instead of loading the file.
+    """
+    parquet = pq.ParquetFile(cache_path, memory_map=True, read_dictionary=categorical)
+    batches = []
+    remaining = nrows
+    for batch in parquet.iter_batches(batch_size=max(1, min(nrows, 65536)), columns=columns):
+        batches.append(batch.slice(0, remaining))
+        remaining -= batches[-1].num_rows
+        if remaining <= 0:
+            break
+    if not batches:
+        # Sidecar has no rows; reading it whole is free and keeps the schema
+        return pq.read_table(cache_path, columns=columns, memory_map=True, read_dictionary=categorical)
+    return pa.Table.from_batches(batches)
+
+
+def _jtl_column_types(header: List[str]) -> Dict[str, Any]:
+    return {
+        name: pa.int64() if name in _INT_COLUMNS else pa.string()
+        for name in header
+    }
+
+
+def _open_jtl_csv_reader(source, header: List[str]):
+    """Streaming pyarrow CSV reader with the sidecar's column types."""
+    return pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=16 * 1024 * 1024),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=_jtl_column_types(header),
+            strings_can_be_null=False,
+            null_values=[""],
+        ),
+    )
+
+
+def _read_cache_key(cache_path: str) -> Optional[Dict[str, int]]:
+    """Source key stored in the sidecar's file metadata, if readable."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        metadata = pq.read_metadata(cache_path).metadata or {}
+        return json.loads(metadata.get(_CACHE_METADATA_KEY, b"null"))
+    except Exception:
+        return None
+
+
+def _convert_jtl_to_parquet(jtl_path: str, cache_path: str, source_key: Dict[str, int]) -> None:
+    """Stream the CSV into a typed, compressed Parquet file (atomic replace)."""
+    header = _read_csv_header(jtl_path)
+    if not header:
+        raise ValueError("JTL has no header row")
+
+    reader = _open_jtl_csv_reader(jtl_path, header)
+
+    schema = reader.schema.with_metadata({_CACHE_METADATA_KEY: json.dumps(source_key).encode()})
+    tmp_path = _tmp_cache_path(cache_path)
+    try:
+        with pq.ParquetWriter(
+            tmp_path, schema, compression=JTL_CACHE_CONFIG.get("compression", "zstd")
+        ) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
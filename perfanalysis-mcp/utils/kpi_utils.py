@@ -12,6 +12,8 @@ Used by all three PerfAnalysis tools:
 Technology-neutral: works with any runtime (Java, .NET, Go, Python, etc.)
 as long as users follow the recommended naming conventions in custom_queries.json.
 """
+import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
 import pandas as pd
@@ -247,6 +249,58 @@ def get_interpretation(metric_name: str) -> str:
 # KPI Data Loading
 # -----------------------------------------------
 
+# Text columns written by the APM exporters; read as categoricals since
+# each holds a handful of distinct values repeated on every row
+_KPI_CATEGORY_COLUMNS = ("env_name", "env_tag", "scope", "hostname", "filter",
+                         "container_or_pod", "metric", "unit")
+_KPI_CSV_DTYPES: Dict[str, Any] = {
+    **{col: "category" for col in _KPI_CATEGORY_COLUMNS},
+    "value": "float64",
+}
+
+# Loaded frames keyed by the KPI files' (path, size, mtime_ns), so the KPI
+# analysis, correlation and bottleneck tools share one load per run
+_KPI_CACHE_MAX_ENTRIES = 8
+_KPI_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+
+def _kpi_files_fingerprint(kpi_files: List[Path]) -> tuple:
+    """(path, size, mtime_ns) per file; changes whenever any file is rewritten."""
+    fingerprint = []
+    for csv_file in kpi_files:
+        try:
+            stat = os.stat(csv_file)
+            fingerprint.append((str(csv_file), stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            fingerprint.append((str(csv_file), None, None))
+    return tuple(fingerprint)
+
+
+def _kpi_cache_get(key: tuple) -> Optional[pd.DataFrame]:
+    cached = _KPI_CACHE.get(key)
+    if cached is None:
+        return None
+    _KPI_CACHE.move_to_end(key)
+    # Callers are free to modify what they get back
+    return cached.copy()
+
+
+def _kpi_cache_put(key: tuple, df: pd.DataFrame) -> None:
+    _KPI_CACHE[key] = df.copy()
+    _KPI_CACHE.move_to_end(key)
+    while len(_KPI_CACHE) > _KPI_CACHE_MAX_ENTRIES:
+        _KPI_CACHE.popitem(last=False)
+
+
+def _stripped_text(df: pd.DataFrame, column: str) -> tuple:
+    """(stripped values, non-empty mask) for a text column, all-empty if absent."""
+    if column not in df.columns:
+        return np.full(len(df), "", dtype=object), np.zeros(len(df), dtype=bool)
+    text = df[column].astype("string").str.strip()
+    present = (text.notna() & text.ne("")).to_numpy(dtype=bool)
+    return text.to_numpy(dtype=object, na_value=""), present
+
+
 def _resolve_identifier(df: pd.DataFrame) -> pd.DataFrame:
     """Create a unified ``identifier`` column based on the ``scope`` column.
 
@@ -264,29 +318,47 @@ def _resolve_identifier(df: pd.DataFrame) -> pd.DataFrame:
         df["identifier"] = df.get("filter", pd.Series("unknown", index=df.index))
         return df
 
-    def _pick(row):
-        if row.get("scope") == "host":
-            val = row.get("hostname")
-            if pd.notna(val) and str(val).strip():
-                return str(val).strip()
-        val = row.get("filter")
-        if pd.notna(val) and str(val).strip():
-            return str(val).strip()
-        val = row.get("hostname")
-        if pd.notna(val) and str(val).strip():
-            return str(val).strip()
-        return "unknown"
-
-    df["identifier"] = df.apply(_pick, axis=1)
+    hostname, has_hostname = _stripped_text(df, "hostname")
+    filter_name, has_filter = _stripped_text(df, "filter")
+    is_host = (df["scope"] == "host").to_numpy(dtype=bool)
+
+    identifier = np.select(
+        [is_host & has_hostname, has_filter, has_hostname],
+        [hostname, filter_name, hostname],
+        default="unknown",
+    )
+    df["identifier"] = pd.Categorical(identifier)
     return df
 
 
+def _read_kpi_csv(csv_file: Path) -> pd.DataFrame:
+    """Read one KPI CSV with typed columns.
+
+    Falls back to an untyped read (non-numeric values become NaN) if the
+    typed read rejects the file.
+    """
+    try:
+        return pd.read_csv(csv_file, dtype=_KPI_CSV_DTYPES)
+    except ValueError:
+        df = pd.read_csv(csv_file)
+        if "value" in df.columns:
+            df["value"] = pd.to_numeric(df["value"], errors="coerce")
+        return df
+
+
+def _categories_to_object(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with its categorical columns cast to object."""
+    casts = {c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+    return df.astype(casts) if casts else df
+
+
 def load_kpi_dataframe(kpi_files: List[Path]) -> Optional[pd.DataFrame]:
     """Load all KPI CSV files into a single unified DataFrame.
 
     The returned DataFrame retains the original long-format schema plus
     a unified ``identifier`` column resolved from ``hostname`` (host scope)
-    or ``filter`` (k8s scope).
+    or ``filter`` (k8s scope). Text columns are categoricals and results
+    are cached per set of unchanged files.
 
     Args:
         kpi_files: List of kpi_metrics_*.csv file paths.
@@ -294,11 +366,16 @@ def load_kpi_dataframe(kpi_files: List[Path]) -> Optional[pd.DataFrame]:
     Returns:
         Combined DataFrame or ``None`` if all files are empty / unreadable.
     """
+    cache_key = ("raw", _kpi_files_fingerprint(kpi_files))
+    cached = _kpi_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     frames: List[pd.DataFrame] = []
 
     for csv_file in kpi_files:
         try:
-            df = pd.read_csv(csv_file)
+            df = _read_kpi_csv(csv_file)
             if df.empty:
                 continue
             df["timestamp"] = pd.to_datetime(df["timestamp_utc"], utc=True)
@@ -310,9 +387,18 @@ def load_kpi_dataframe(kpi_files: List[Path]) -> Optional[pd.DataFrame]:
     if not frames:
         return None
 
-    combined = pd.concat(frames, ignore_index=True)
+    # Concat as object columns: categories differ per file, and an all-empty
+    # text column reads as an all-NA categorical, which pandas warns about
+    # when concatenated. The columns are re-categorized below.
+    combined = pd.concat([_categories_to_object(df) for df in frames], ignore_index=True)
+    for col in _KPI_CATEGORY_COLUMNS:
+        if col in combined.columns and not isinstance(combined[col].dtype, pd.CategoricalDtype):
+            combined[col] = combined[col].astype("category")
     combined = _resolve_identifier(combined)
-    return combined.sort_values("timestamp").reset_index(drop=True)
+    combined = combined.sort_values("timestamp").reset_index(drop=True)
+
+    _kpi_cache_put(cache_key, combined)
+    return combined
 
 
 def load_kpi_pivoted(
@@ -322,7 +408,10 @@ def load_kpi_pivoted(
     """Load KPI CSVs and pivot into one-column-per-metric format.
 
     Used by the correlation and bottleneck tools where each metric needs
-    to be a separate column aligned on timestamp.
+    to be a separate column aligned on timestamp. The pivot is a single
+    groupby/unstack over (timestamp, identifier, metric); duplicate samples
+    for the same key are averaged. Results are cached per set of unchanged
+    files, so every tool in a run shares one load.
 
     Args:
         kpi_files: List of kpi_metrics_*.csv file paths.
@@ -331,36 +420,43 @@ def load_kpi_pivoted(
 
     Returns:
         DataFrame with columns: ``timestamp``, ``identifier``, and one column
-        per unique metric name.  Returns ``None`` if no data.
+        per unique metric name (in order of first appearance), sorted by
+        timestamp and identifier.  Returns ``None`` if no data.
     """
+    cache_key = ("pivoted", convert_units, _kpi_files_fingerprint(kpi_files))
+    cached = _kpi_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     raw_df = load_kpi_dataframe(kpi_files)
     if raw_df is None or raw_df.empty:
         return None
 
-    if "identifier" not in raw_df.columns:
+    if "identifier" not in raw_df.columns or "metric" not in raw_df.columns:
         return None
 
-    all_metric_dfs: List[pd.DataFrame] = []
-    for metric_name in raw_df["metric"].unique():
-        metric_slice = raw_df[raw_df["metric"] == metric_name][
-            ["timestamp", "identifier", "value"]
-        ].copy()
-        metric_slice = metric_slice.rename(columns={"value": metric_name})
-        all_metric_dfs.append(metric_slice)
-
-    if not all_metric_dfs:
+    long_df = raw_df.loc[raw_df["metric"].notna(), ["timestamp", "identifier", "metric", "value"]]
+    if long_df.empty:
         return None
 
-    result = all_metric_dfs[0]
-    for additional in all_metric_dfs[1:]:
-        result = pd.merge(
-            result, additional, on=["timestamp", "identifier"], how="outer"
-        )
+    metric_order = [str(m) for m in long_df["metric"].unique()]
+    wide = (
+        long_df.groupby(["timestamp", "identifier", "metric"], observed=True, sort=False, dropna=False)["value"]
+        .mean()
+        .unstack("metric")
+    )
+    wide.columns = [str(c) for c in wide.columns]
+    result = wide[metric_order].reset_index()
+    result.columns.name = None
+    if isinstance(result["identifier"].dtype, pd.CategoricalDtype):
+        result["identifier"] = result["identifier"].astype(object)
 
     if convert_units:
         result = convert_kpi_units(result)
 
-    return result.sort_values("timestamp").reset_index(drop=True)
+    result = result.sort_values(["timestamp", "identifier"], kind="stable").reset_index(drop=True)
+    _kpi_cache_put(cache_key, result)
+    return result
 
 
 # -----------------------------------------------
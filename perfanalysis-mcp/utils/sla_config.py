@@ -16,6 +16,7 @@ import os
 import re
 import fnmatch
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
@@ -27,8 +28,15 @@ logger = logging.getLogger(__name__)
 VALID_SLA_UNITS = {"P90", "P95", "P99"}
 SLA_CONFIG_FILENAME = "slas.yaml"
 
-# Module-level cache for loaded SLA config
+# Module-level cache for loaded SLA config, keyed on the file's (mtime, size)
 _SLA_CONFIG_CACHE: Optional[Dict[str, Any]] = None
+_SLA_CONFIG_STAMP: Optional[tuple] = None
+
+# Compiled api_override matchers per SLA profile id (rebuilt with the config)
+_COMPILED_SLA_PROFILES: Dict[str, Dict[str, Any]] = {}
+
+# Max (sla_id, label) resolutions memoized by get_sla_for_api()
+SLA_RESOLUTION_CACHE_SIZE = 65536
 
 
 # ===========================================================================
@@ -40,7 +48,10 @@ def load_sla_config(force_reload: bool = False) -> Dict[str, Any]:
     Load and validate the SLA configuration from slas.yaml.
 
     The file is expected at the root of the perfanalysis-mcp directory
-    (same level as config.yaml).
+    (same level as config.yaml). The parsed config is cached and reloaded
+    automatically when the file's modification time or size changes; a
+    reload also drops the compiled override matchers and memoized
+    per-label resolutions.
 
     Args:
         force_reload: If True, bypass the cache and reload from disk.
@@ -52,16 +63,22 @@ def load_sla_config(force_reload: bool = False) -> Dict[str, Any]:
         FileNotFoundError: If slas.yaml does not exist.
         ValueError: If the configuration schema is invalid.
     """
-    global _SLA_CONFIG_CACHE
-
-    if _SLA_CONFIG_CACHE is not None and not force_reload:
-        return _SLA_CONFIG_CACHE
+    global _SLA_CONFIG_CACHE, _SLA_CONFIG_STAMP
 
     # slas.yaml lives at the MCP root (one level up from utils/)
     mcp_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     sla_config_path = os.path.join(mcp_root, SLA_CONFIG_FILENAME)
 
-    if not os.path.exists(sla_config_path):
+    try:
+        st = os.stat(sla_config_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+
+    if _SLA_CONFIG_CACHE is not None and not force_reload and stamp == _SLA_CONFIG_STAMP:
+        return _SLA_CONFIG_CACHE
+
+    if stamp is None:
         raise FileNotFoundError(
             f"SLA configuration file not found: {sla_config_path}\n"
             f"This file is required for SLA evaluation. "
@@ -77,7 +94,10 @@ def load_sla_config(force_reload: bool = False) -> Dict[str, Any]:
 
     _validate_sla_config(config)
 
+    _COMPILED_SLA_PROFILES.clear()
+    _resolve_sla_cached.cache_clear()
     _SLA_CONFIG_CACHE = config
+    _SLA_CONFIG_STAMP = stamp
     logger.info("SLA configuration loaded successfully from '%s'.", sla_config_path)
     return config
 
@@ -341,6 +361,10 @@ def get_sla_for_api(sla_id: Optional[str], label: str) -> Dict[str, Any]:
 
     Within the same specificity level, the first match in YAML order wins.
 
+    Results are memoized per (sla_id, label) until slas.yaml changes, so
+    repeated lookups across tools and detectors cost a dict hit. The
+    returned dict is a copy and may be modified by the caller.
+
     Args:
         sla_id: The SLA profile ID to look up. If None, the file-level
                 default_sla is used directly.
@@ -359,7 +383,15 @@ def get_sla_for_api(sla_id: Optional[str], label: str) -> Dict[str, Any]:
         FileNotFoundError: If slas.yaml does not exist.
         ValueError: If sla_id is provided but not found in slas.yaml.
     """
-    config = load_sla_config()
+    # Reloads slas.yaml (and clears the memoized results) if it changed on disk
+    load_sla_config()
+    return dict(_resolve_sla_cached(sla_id, label))
+
+
+@lru_cache(maxsize=SLA_RESOLUTION_CACHE_SIZE)
+def _resolve_sla_cached(sla_id: Optional[str], label: str) -> Dict[str, Any]:
+    """Memoized body of get_sla_for_api(); cleared when slas.yaml is reloaded."""
+    config = _SLA_CONFIG_CACHE
     file_default = config["default_sla"]
 
     # ----- No sla_id → file-level default -----------------------------------
@@ -371,16 +403,16 @@ def get_sla_for_api(sla_id: Optional[str], label: str) -> Dict[str, Any]:
             source=f"{SLA_CONFIG_FILENAME}/default",
         )
 
-    # ----- Look up the SLA profile ------------------------------------------
-    profile = _find_sla_profile(config, sla_id)
-    if profile is None:
+    # ----- Look up the compiled SLA profile ---------------------------------
+    compiled = _get_compiled_profile(config, sla_id)
+    if compiled is None:
         available = [p.get("id") for p in config.get("slas", [])]
         raise ValueError(
             f"SLA profile '{sla_id}' not found in {SLA_CONFIG_FILENAME}. "
             f"Available profiles: {available}"
         )
 
-    profile_default = profile.get("default_sla", {})
+    profile_default = compiled["profile"].get("default_sla", {})
 
     # Helper: resolve a field through the inheritance chain
     # (override → profile default → file default)
@@ -392,28 +424,18 @@ def get_sla_for_api(sla_id: Optional[str], label: str) -> Dict[str, Any]:
         return file_default[field]
 
     # ----- Try to match against api_overrides (if any) ----------------------
-    overrides = profile.get("api_overrides", [])
-    if overrides and label:
-        # Classify each override by specificity
-        classified: List[tuple] = []
-        for idx, override in enumerate(overrides):
-            specificity = _classify_pattern_specificity(override["pattern"])
-            classified.append((specificity, idx, override))
-
-        # Sort: most specific first (level 1), then by YAML order within level
-        classified.sort(key=lambda x: (x[0], x[1]))
-
-        # Try matching in precedence order
-        for _specificity, _idx, override in classified:
-            if fnmatch.fnmatch(label, override["pattern"]):
-                return _build_sla_result(
-                    response_time_sla_ms=override["response_time_sla_ms"],
-                    sla_unit=_resolve("sla_unit", override),
-                    error_rate_threshold=_resolve("error_rate_threshold", override),
-                    source=f"{SLA_CONFIG_FILENAME}/{sla_id}/api_override",
-                    reason=override.get("reason"),
-                    pattern_matched=override["pattern"],
-                )
+    if compiled["regex"] is not None and label:
+        match = compiled["regex"].match(os.path.normcase(label))
+        if match:
+            override = compiled["overrides"][match.lastgroup]
+            return _build_sla_result(
+                response_time_sla_ms=override["response_time_sla_ms"],
+                sla_unit=_resolve("sla_unit", override),
+                error_rate_threshold=_resolve("error_rate_threshold", override),
+                source=f"{SLA_CONFIG_FILENAME}/{sla_id}/api_override",
+                reason=override.get("reason"),
+                pattern_matched=override["pattern"],
+            )
 
     # ----- No override matched → profile default_sla ------------------------
     if profile_default:
@@ -433,6 +455,54 @@ def get_sla_for_api(sla_id: Optional[str], label: str) -> Dict[str, Any]:
     )
 
 
+def _get_compiled_profile(
+    config: Dict[str, Any], sla_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the compiled form of an SLA profile, building it on first use.
+
+    The profile's api_overrides are sorted once into precedence order
+    (specificity level, then YAML order) and their glob patterns are joined
+    into a single anchored alternation. Python's regex engine tries the
+    alternatives left to right, so the first alternative that matches is
+    the same override the sequential fnmatch loop would have picked.
+
+    Returns:
+        Dict with ``profile``, ``regex`` (None when there are no overrides)
+        and ``overrides`` (group name → override), or None if the profile
+        does not exist.
+    """
+    compiled = _COMPILED_SLA_PROFILES.get(sla_id)
+    if compiled is not None:
+        return compiled
+
+    profile = _find_sla_profile(config, sla_id)
+    if profile is None:
+        return None
+
+    overrides = profile.get("api_overrides", [])
+    classified = sorted(
+        (_classify_pattern_specificity(override["pattern"]), idx, override)
+        for idx, override in enumerate(overrides)
+    )
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    alternatives: List[str] = []
+    for _specificity, idx, override in classified:
+        name = f"o{idx}"
+        groups[name] = override
+        # Same normalisation as fnmatch.fnmatch(label, pattern)
+        alternatives.append(f"(?P<{name}>{fnmatch.translate(os.path.normcase(override['pattern']))})")
+
+    compiled = {
+        "profile": profile,
+        "regex": re.compile("|".join(alternatives)) if alternatives else None,
+        "overrides": groups,
+    }
+    _COMPILED_SLA_PROFILES[sla_id] = compiled
+    return compiled
+
+
 def get_sla_for_labels(
     sla_id: Optional[str], labels: List[str]
 ) -> Dict[str, Dict[str, Any]]:
@@ -13,6 +13,7 @@ from scipy.stats import pearsonr, spearmanr
 from utils.config import load_config
 from utils.sla_config import get_sla_for_api, validate_sla_patterns
 from utils.kpi_utils import discover_kpi_files, load_kpi_pivoted
+from utils.jtl_cache import read_jtl_columns
 from services.kpi_analyzer import build_kpi_correlation_pairs, compute_kpi_correlations
 
 # Load configuration globally
@@ -724,7 +725,7 @@ def load_and_process_performance_data(file_path: Path, sla_threshold: float = No
             "success": "str",
         }
 
-        df = pd.read_csv(file_path, usecols=use_cols, dtype=dtype_map, low_memory=True)
+        df = read_jtl_columns(str(file_path), use_cols, dtype=dtype_map)
 
         df['timestamp'] = pd.to_datetime(df['timeStamp'], unit='ms', utc=True)
         df = df[['timestamp', 'elapsed', 'label', 'success']].copy()
@@ -833,12 +834,70 @@ def load_and_process_infrastructure_data(infra_csv_files, granularity_window):
     
     return merged_df
 
+def _build_window_api_breakdowns(perf_indexed: pd.DataFrame, windows: pd.Index,
+                                 granularity_window: int, top_k: int = 0) -> Dict:
+    """
+    Per-API stats for the given windows from a single (window, label) groupby.
+
+    Bins match perf_indexed.resample(f'{granularity_window}s'). Returns
+    {window_timestamp: (api_breakdown, total_apis)} where api_breakdown is
+    sorted by avg_response_time descending and capped to top_k when top_k > 0.
+    """
+    if len(windows) == 0 or perf_indexed.empty or 'label' not in perf_indexed.columns:
+        return {}
+
+    api_stats = perf_indexed.groupby(
+        [pd.Grouper(freq=f'{granularity_window}s'), 'label']
+    ).agg(
+        avg_response_time=('elapsed', 'mean'),
+        max_response_time=('elapsed', 'max'),
+        request_count=('elapsed', 'count'),
+        sla_violations=('sla_violation', 'sum'),
+    )
+    window_level = api_stats.index.get_level_values(0)
+    api_stats = api_stats[window_level.isin(windows)]
+    if api_stats.empty:
+        return {}
+
+    # Labels are already sorted within each window; a stable sort keeps that
+    # order for equal averages
+    api_stats = api_stats.reset_index(level=1).rename(columns={'label': 'api_name'})
+    api_stats['_window'] = api_stats.index
+    api_stats = api_stats.sort_values(['_window', 'avg_response_time'],
+                                      ascending=[True, False], kind='mergesort')
+    totals = api_stats.groupby('_window').size()
+    if top_k and top_k > 0:
+        api_stats = api_stats.groupby('_window').head(top_k)
+
+    breakdowns: Dict = {}
+    for window, api_name, avg_rt, max_rt, count, violations in zip(
+        api_stats['_window'], api_stats['api_name'], api_stats['avg_response_time'],
+        api_stats['max_response_time'], api_stats['request_count'], api_stats['sla_violations'],
+    ):
+        if window not in breakdowns:
+            breakdowns[window] = ([], int(totals[window]))
+        breakdowns[window][0].append({
+            "api_name": str(api_name),
+            "avg_response_time": float(avg_rt),
+            "max_response_time": float(max_rt),
+            "request_count": int(count),
+            "sla_violations": int(violations)
+        })
+    return breakdowns
+
 def perform_temporal_correlation_analysis(perf_df: pd.DataFrame, infra_df: pd.DataFrame, 
                                         granularity_window: int, sla_threshold: float, 
                                         resource_thresholds: Dict,
                                         environment_type: str = "k8s",
-                                        kpi_files: Optional[List[Path]] = None) -> Dict:
-    """Perform temporal correlation analysis - OPTIMIZED with pandas vectorization"""
+                                        kpi_files: Optional[List[Path]] = None,
+                                        api_breakdown_top_k: Optional[int] = None) -> Dict:
+    """Perform temporal correlation analysis - OPTIMIZED with pandas vectorization
+
+    api_breakdown_top_k caps each window's api_breakdown to the K slowest APIs
+    (default: perf_analysis.correlation_api_breakdown_top_k, 0 = all).
+    """
+    if api_breakdown_top_k is None:
+        api_breakdown_top_k = int(PFA_CONFIG.get('correlation_api_breakdown_top_k', 0) or 0)
     
     results = {
         "analysis_periods": [],
@@ -908,40 +967,16 @@ def perform_temporal_correlation_analysis(perf_df: pd.DataFrame, infra_df: pd.Da
             (merged['performance_degradation'])
         ].copy()
         
+        # Per-API stats for every (window, label) in one grouped pass, using the
+        # same bins as perf_resampled; each interesting window slices its rows
+        api_breakdowns = _build_window_api_breakdowns(
+            perf_indexed, interesting.index, granularity_window, api_breakdown_top_k
+        )
+
         # Build analysis periods from interesting windows with API breakdown
         for timestamp, row in interesting.iterrows():
-            # Get API breakdown for this time window
-            window_start = timestamp
-            window_end = timestamp + pd.Timedelta(seconds=granularity_window)
-            
-            window_apis = perf_indexed[
-                (perf_indexed.index >= window_start) & 
-                (perf_indexed.index < window_end)
-            ].copy()
-            
-            # Calculate per-API stats for this window
-            api_breakdown = []
-            if not window_apis.empty and 'label' in window_apis.columns:
-                api_stats = window_apis.groupby('label').agg({
-                    'elapsed': ['mean', 'max', 'count'],
-                    'sla_violation': 'sum'
-                }).reset_index()
-                
-                api_stats.columns = ['api_name', 'avg_response_time', 'max_response_time', 'request_count', 'sla_violations']
-                
-                # Sort by average response time descending
-                api_stats = api_stats.sort_values('avg_response_time', ascending=False)
-                
-                # Convert to list of dicts
-                for _, api_row in api_stats.iterrows():
-                    api_breakdown.append({
-                        "api_name": str(api_row['api_name']),
-                        "avg_response_time": float(api_row['avg_response_time']),
-                        "max_response_time": float(api_row['max_response_time']),
-                        "request_count": int(api_row['request_count']),
-                        "sla_violations": int(api_row['sla_violations'])
-                    })
-            
+            api_breakdown, api_total = api_breakdowns.get(timestamp, ([], 0))
+
             results["analysis_periods"].append({
                 "time_window": timestamp.isoformat(),
                 "performance_issues": {
@@ -960,7 +995,8 @@ def perform_temporal_correlation_analysis(perf_df: pd.DataFrame, infra_df: pd.Da
                     "memory_constraint": bool(row['memory_constraint']),
                     "performance_degradation": bool(row['performance_degradation'])
                 },
-                "api_breakdown": api_breakdown
+                "api_breakdown": api_breakdown,
+                **({"api_breakdown_total_apis": api_total} if api_breakdown_top_k else {})
             })
         
         # === CALCULATE CORRELATIONS (vectorized) ===
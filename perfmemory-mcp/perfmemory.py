@@ -7,7 +7,7 @@ import logging
 from fastmcp import FastMCP, Context
 from typing import Optional, Dict, Any
 
-from services.embeddings import EmbeddingProvider
+from services.embeddings import EmbeddingCache, EmbeddingProvider
 from services import session_manager as sm
 from services import graph_manager as gm
 from services.taxonomy import TaxonomyResolver
@@ -18,7 +18,24 @@ log = logging.getLogger(__name__)
 mcp = FastMCP("perfmemory")
 
 _config = load_config()
-_embedder = EmbeddingProvider(_config["embedding"])
+
+
+def _build_embedder(config: dict) -> EmbeddingProvider:
+    """Create the embedding provider, with the embedding cache when enabled."""
+    cache_cfg = config.get("embedding_cache", {})
+    cache = None
+    if cache_cfg.get("enabled", True):
+        db_config = config["database"]
+        persistent = cache_cfg.get("persistent", True)
+        cache = EmbeddingCache(
+            max_entries=cache_cfg.get("memory_entries", 1024),
+            load=(lambda model, hashes: sm.get_cached_embeddings(db_config, model, hashes)) if persistent else None,
+            save=(lambda model, entries: sm.store_cached_embeddings(db_config, model, entries)) if persistent else None,
+        )
+    return EmbeddingProvider(config["embedding"], cache=cache, batch_size=cache_cfg.get("batch_size", 64))
+
+
+_embedder = _build_embedder(_config)
 _taxonomy = TaxonomyResolver(_config.get("taxonomy", {}).get("path", ""))
 
 
@@ -739,11 +756,12 @@ async def get_memory_stats(
 
     Returns:
         dict with keys: status, total_sessions, total_attempts,
-        by_system, by_outcome, verified_count, active_count
+        by_system, by_outcome, verified_count, active_count, embedding_cache
     """
     _ = ctx
     try:
         stats = sm.get_stats(_config["database"], system_under_test)
+        stats["embedding_cache"] = _embedding_cache_stats()
         return {"status": "OK", **stats}
     except Exception as e:
         return {
@@ -754,6 +772,19 @@ async def get_memory_stats(
         }
 
 
+def _embedding_cache_stats() -> Dict[str, Any]:
+    """In-process and persistent embedding cache counters for get_memory_stats."""
+    if _embedder.cache is None:
+        return {"enabled": False}
+    result: Dict[str, Any] = {"enabled": True, **_embedder.cache.get_stats()}
+    if _embedder.cache.persistent:
+        try:
+            result["stored"] = sm.get_embedding_cache_stats(_config["database"])
+        except Exception as e:
+            result["stored_error"] = str(e)
+    return result
+
+
 # =============================================================================
 # Batch 4 — Graph Tools (Apache AGE)
 # =============================================================================
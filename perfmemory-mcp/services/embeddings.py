@@ -1,29 +1,153 @@
+import hashlib
 import logging
-from typing import List, Optional
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
 
 log = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before embedding and cache lookup.
+
+    Collapses runs of whitespace and trims the ends, so the same symptom text
+    pasted with different line breaks or indentation maps to one cache entry.
+    Case is preserved (error messages and identifiers are case-sensitive).
+    """
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def text_hash(text: str) -> str:
+    """sha256 hex digest of already-normalized text (the cache key)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Content-hash keyed embedding cache: in-memory LRU + optional persistent store.
+
+    Keys are (model, sha256(normalized text)). Lookups check the in-process
+    LRU first, then the persistent store; entries found there are promoted
+    into the LRU.
+
+    The persistent store is given as two callables so this module stays free
+    of database code (perfmemory.py wires them to session_manager):
+
+        load(model, hashes) -> {hash: embedding}
+        save(model, {hash: embedding}) -> None
+
+    If either raises (e.g. the embedding_cache table has not been created
+    yet), persistence is disabled for the rest of the process and the cache
+    keeps working in memory only.
+
+    Args:
+        max_entries: Maximum embeddings held in memory (0 disables the LRU).
+        load: Persistent lookup, or None.
+        save: Persistent insert, or None.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        load: Optional[Callable[[str, List[str]], Dict[str, List[float]]]] = None,
+        save: Optional[Callable[[str, Dict[str, List[float]]], object]] = None,
+    ):
+        self.max_entries = max_entries
+        self._load = load
+        self._save = save
+        self._lru: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+
+    @property
+    def persistent(self) -> bool:
+        return self._load is not None and self._save is not None
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Return cached embeddings for the given hashes (missing ones omitted)."""
+        found: Dict[str, List[float]] = {}
+        for h in hashes:
+            key = (model, h)
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                found[h] = self._lru[key]
+        self.stats["memory_hits"] += len(found)
+
+        remaining = [h for h in hashes if h not in found]
+        if remaining and self.persistent:
+            try:
+                stored = self._load(model, remaining)
+            except Exception:
+                log.warning("Persistent embedding cache unavailable — using memory only", exc_info=True)
+                self._load = self._save = None
+                stored = {}
+            self.stats["persistent_hits"] += len(stored)
+            for h, embedding in stored.items():
+                self._remember(model, h, embedding)
+            found.update(stored)
+
+        self.stats["misses"] += len(hashes) - len(found)
+        return found
+
+    def put_many(self, model: str, entries: Dict[str, List[float]]) -> None:
+        """Add freshly computed embeddings to memory and the persistent store."""
+        for h, embedding in entries.items():
+            self._remember(model, h, embedding)
+        if entries and self.persistent:
+            try:
+                self._save(model, entries)
+            except Exception:
+                log.warning("Persistent embedding cache unavailable — using memory only", exc_info=True)
+                self._load = self._save = None
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "memory_entries": len(self._lru),
+            "memory_max_entries": self.max_entries,
+            "persistent": self.persistent,
+            **self.stats,
+        }
+
+    def _remember(self, model: str, h: str, embedding: List[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (model, h)
+        self._lru[key] = embedding
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
 
 class EmbeddingProvider:
     """Abstraction layer for embedding providers.
 
     Supports OpenAI, Azure OpenAI, and Ollama. The provider is selected
     based on the config dict passed at initialization. All providers expose
-    the same interface: embed(text) -> list[float].
+    the same interface: embed(text) -> list[float] and
+    embed_many(texts) -> list[list[float]].
+
+    Text is whitespace-normalized before embedding. When an EmbeddingCache
+    is given, texts already embedded with the current model are served from
+    it and only the rest go to the provider, in batches of ``batch_size``.
 
     HTTP clients are created lazily on first use and reused across calls
     to avoid spinning up a new connection pool / SSL context every time.
 
     Args:
         config: The "embedding" section of the config dict from utils/config.py.
+        cache: Optional EmbeddingCache shared by all calls.
+        batch_size: Maximum texts per provider request.
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, cache: Optional[EmbeddingCache] = None, batch_size: int = 64):
         self.provider = config.get("provider", "openai")
         self.config = config
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
         self._openai_client = None
         self._azure_client = None
         self._ollama_client = None
+        self._ollama_batch_supported = True
 
     async def embed(self, text: str) -> List[float]:
         """Convert text into a vector embedding.
@@ -38,12 +162,48 @@ class EmbeddingProvider:
             ValueError: If the configured provider is unknown.
             RuntimeError: If the embedding API call fails.
         """
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Convert several texts into embeddings, one per input, in order.
+
+        Duplicate texts (after normalization) and cached texts are embedded
+        at most once; the rest are sent to the provider in batches.
+
+        Raises:
+            ValueError: If the configured provider is unknown.
+            RuntimeError: If the embedding API call fails.
+        """
+        normalized = [normalize_text(t) for t in texts]
+        hashes = [text_hash(t) for t in normalized]
+        model = self.get_model_name()
+
+        unique: Dict[str, str] = {}
+        for h, t in zip(hashes, normalized):
+            unique.setdefault(h, t)
+
+        found = self.cache.get_many(model, list(unique)) if self.cache is not None else {}
+
+        pending = [h for h in unique if h not in found]
+        computed: Dict[str, List[float]] = {}
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            vectors = await self._embed_batch([unique[h] for h in batch])
+            computed.update(zip(batch, vectors))
+
+        if computed and self.cache is not None:
+            self.cache.put_many(model, computed)
+        found.update(computed)
+        return [found[h] for h in hashes]
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with one provider request where supported."""
         if self.provider == "openai":
-            return await self._embed_openai(text)
+            return await self._embed_openai(texts)
         elif self.provider == "azure_openai":
-            return await self._embed_azure_openai(text)
+            return await self._embed_azure_openai(texts)
         elif self.provider == "ollama":
-            return await self._embed_ollama(text)
+            return await self._embed_ollama(texts)
         raise ValueError(f"Unknown embedding provider: {self.provider}")
 
     def get_model_name(self) -> str:
@@ -112,19 +272,19 @@ class EmbeddingProvider:
             self._ollama_client = httpx.AsyncClient(timeout=30.0)
         return self._ollama_client
 
-    async def _embed_openai(self, text: str) -> List[float]:
-        """Generate embedding using the OpenAI API."""
+    async def _embed_openai(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings using the OpenAI API (one request per batch)."""
         client = self._get_openai_client()
         model = self.config.get("openai_model", "text-embedding-3-small")
 
         try:
-            response = await client.embeddings.create(input=text, model=model)
-            return response.data[0].embedding
+            response = await client.embeddings.create(input=texts, model=model)
+            return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
         except Exception as e:
             raise RuntimeError(f"OpenAI embedding failed: {e}") from e
 
-    async def _embed_azure_openai(self, text: str) -> List[float]:
-        """Generate embedding using Azure OpenAI.
+    async def _embed_azure_openai(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings using Azure OpenAI (one request per batch).
 
         Requires AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT, and
         AZURE_OPENAI_DEPLOYMENT to be configured.
@@ -133,14 +293,16 @@ class EmbeddingProvider:
         deployment = self.config.get("azure_deployment", "text-embedding-3-small")
 
         try:
-            response = await client.embeddings.create(input=text, model=deployment)
-            return response.data[0].embedding
+            response = await client.embeddings.create(input=texts, model=deployment)
+            return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
         except Exception as e:
             raise RuntimeError(f"Azure OpenAI embedding failed: {e}") from e
 
-    async def _embed_ollama(self, text: str) -> List[float]:
-        """Generate embedding using a local Ollama instance.
+    async def _embed_ollama(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings using a local Ollama instance.
 
+        Uses the batch endpoint (/api/embed) and falls back to one
+        /api/embeddings request per text on Ollama versions without it.
         Requires Ollama running locally with the configured model pulled.
         """
         client = self._get_ollama_client()
@@ -148,11 +310,25 @@ class EmbeddingProvider:
         model = self.config.get("ollama_model", "nomic-embed-text")
 
         try:
-            response = await client.post(
-                f"{base_url}/api/embeddings",
-                json={"model": model, "prompt": text},
-            )
-            response.raise_for_status()
-            return response.json()["embedding"]
+            if self._ollama_batch_supported:
+                response = await client.post(
+                    f"{base_url}/api/embed",
+                    json={"model": model, "input": texts},
+                )
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    return response.json()["embeddings"]
+
+            vectors = []
+            for text in texts:
+                response = await client.post(
+                    f"{base_url}/api/embeddings",
+                    json={"model": model, "prompt": text},
+                )
+                response.raise_for_status()
+                vectors.append(response.json()["embedding"])
+            # /api/embed answered 404 but the legacy endpoint works: old Ollama
+            self._ollama_batch_supported = False
+            return vectors
         except Exception as e:
             raise RuntimeError(f"Ollama embedding failed: {e}") from e
@@ -3,8 +3,10 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
+import numpy as np
 import psycopg2
 import psycopg2.pool
+import psycopg2.extras
 import psycopg2.extensions
 from pgvector.psycopg2 import register_vector
 
@@ -587,6 +589,111 @@ def find_similar(
         _put_conn(conn, healthy=_healthy)
 
 
+# =============================================================================
+# Embedding Cache
+# =============================================================================
+
+def get_cached_embeddings(
+    db_config: dict,
+    model: str,
+    text_hashes: List[str],
+) -> Dict[str, List[float]]:
+    """Look up cached embeddings by text hash for one model.
+
+    Found entries get their hit_count and last_used_at bumped.
+
+    Returns:
+        dict mapping text_hash -> embedding for the hashes that were found.
+    """
+    if not text_hashes:
+        return {}
+    conn = _get_conn(db_config)
+    _healthy = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE embedding_cache
+                SET hit_count = hit_count + 1, last_used_at = NOW()
+                WHERE model = %s AND text_hash = ANY(%s)
+                RETURNING text_hash, embedding
+                """,
+                (model, list(text_hashes)),
+            )
+            found = {row[0]: [float(x) for x in row[1]] for row in cur.fetchall()}
+        conn.commit()
+        return found
+    except Exception:
+        _healthy = _safe_rollback(conn)
+        raise
+    finally:
+        _put_conn(conn, healthy=_healthy)
+
+
+def store_cached_embeddings(
+    db_config: dict,
+    model: str,
+    entries: Dict[str, List[float]],
+) -> int:
+    """Insert embeddings into the cache (text_hash -> embedding).
+
+    Existing entries are left untouched. Returns the number of rows inserted.
+    """
+    if not entries:
+        return 0
+    conn = _get_conn(db_config)
+    _healthy = True
+    try:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO embedding_cache (model, text_hash, embedding)
+                VALUES %s
+                ON CONFLICT (model, text_hash) DO NOTHING
+                """,
+                [(model, text_hash, np.asarray(embedding, dtype=np.float32))
+                 for text_hash, embedding in entries.items()],
+            )
+            inserted = cur.rowcount
+        conn.commit()
+        return inserted
+    except Exception:
+        _healthy = _safe_rollback(conn)
+        raise
+    finally:
+        _put_conn(conn, healthy=_healthy)
+
+
+def get_embedding_cache_stats(db_config: dict) -> Dict[str, Any]:
+    """Entry counts and total hits of the persistent embedding cache, per model."""
+    conn = _get_conn(db_config)
+    _healthy = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT model, COUNT(*), COALESCE(SUM(hit_count), 0)
+                FROM embedding_cache
+                GROUP BY model
+                ORDER BY model
+                """
+            )
+            by_model = {
+                row[0]: {"entries": row[1], "hits": int(row[2])}
+                for row in cur.fetchall()
+            }
+        return {
+            "entries": sum(m["entries"] for m in by_model.values()),
+            "by_model": by_model,
+        }
+    except Exception:
+        _healthy = _safe_rollback(conn)
+        raise
+    finally:
+        _put_conn(conn, healthy=_healthy)
+
+
 # =============================================================================
 # Stats
 # =============================================================================
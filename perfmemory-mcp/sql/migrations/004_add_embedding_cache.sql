@@ -0,0 +1,33 @@
+-- =============================================================================
+-- PerfMemory Migration: 004 — Embedding Cache Table
+-- =============================================================================
+-- Adds the embedding_cache table used by the MCP server (services/embeddings.py)
+-- to reuse embeddings of symptom text it has already seen. Entries are keyed by
+-- (model, sha256 of the normalized text), so the same error signature is only
+-- sent to the embedding provider once per model.
+--
+-- The embedding column has no fixed dimension so the table works for both the
+-- OpenAI (1536) and Ollama (768) schemas; it is never searched by similarity.
+--
+-- This script is IDEMPOTENT — safe to run multiple times.
+--
+-- Prerequisites:
+--   - pgvector extension enabled (schema_openai.sql / schema_ollama.sql)
+--
+-- Usage:
+--   psql -h localhost -U perfadmin -d perfmemory -f 004_add_embedding_cache.sql
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model           TEXT NOT NULL,
+    text_hash       TEXT NOT NULL,   -- sha256 hex of the normalized text
+    embedding       vector NOT NULL,
+    hit_count       INT NOT NULL DEFAULT 0,
+    created_at      TIMESTAMPTZ DEFAULT NOW(),
+    last_used_at    TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (model, text_hash)
+);
+
+-- Supports pruning of stale entries (e.g. DELETE ... WHERE last_used_at < ...)
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used
+    ON embedding_cache (last_used_at);
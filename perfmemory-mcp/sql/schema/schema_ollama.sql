@@ -85,6 +85,22 @@ CREATE TABLE IF NOT EXISTS debug_attempts (
     created_at          TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- =============================================================================
+-- Table: embedding_cache
+-- Embeddings already computed for a (model, normalized text) pair, so repeated
+-- symptom text skips the provider call. Not dimension-bound: it is never
+-- searched by similarity (added in migration 004).
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model           TEXT NOT NULL,
+    text_hash       TEXT NOT NULL,   -- sha256 hex of the normalized text
+    embedding       vector NOT NULL,
+    hit_count       INT NOT NULL DEFAULT 0,
+    created_at      TIMESTAMPTZ DEFAULT NOW(),
+    last_used_at    TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (model, text_hash)
+);
+
 -- =============================================================================
 -- Foreign key: debug_sessions.resolution_attempt_id -> debug_attempts.id
 -- Added after both tables exist to avoid circular dependency during creation.
@@ -142,3 +158,6 @@ CREATE INDEX IF NOT EXISTS idx_sessions_env_alias
 
 CREATE INDEX IF NOT EXISTS idx_attempts_test_case
     ON debug_attempts (test_case_id);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used
+    ON embedding_cache (last_used_at);
@@ -0,0 +1,388 @@
+"""
+PerfMemory Embedding Backfill Tool
+
+Re-embeds the symptom_text of historical debug_attempts with the currently
+configured embedding provider/model (see perfmemory-mcp/.env), e.g. after
+switching models or for attempts stored before the embedding cache existed.
+
+By default only attempts whose embedding_model differs from the current model
+(or whose embedding is missing) are selected; --all re-embeds every attempt.
+
+Each distinct symptom text (after whitespace normalization) is embedded once,
+in batches sent with bounded concurrency, and the results are written to the
+embedding_cache table so the MCP server reuses them for repeat lookups.
+
+Usage:
+  python backfill_embeddings.py                              # Dry-run — show what would be re-embedded
+  python backfill_embeddings.py --apply                      # Re-embed stale attempts
+  python backfill_embeddings.py --all --apply                # Re-embed every attempt
+  python backfill_embeddings.py --apply --batch-size 100 --concurrency 8
+
+Requirements:
+  - perfmemory-mcp/.env must exist with valid DB and embedding credentials
+  - PostgreSQL database must be running
+  - embedding_cache table (sql/migrations/004_add_embedding_cache.sql); without
+    it the backfill still runs, only without persisting the cache
+  - The embedding column dimension must match the configured model
+    (vector(1536) for OpenAI/Azure, vector(768) for Ollama)
+
+Embedding-based SIMILAR_TO graph edges are not recomputed. No DELETE, DROP,
+or TRUNCATE operations are performed.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import psycopg2
+from dotenv import dotenv_values, load_dotenv
+from pgvector.psycopg2 import register_vector
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PERFMEMORY_DIR = SCRIPT_DIR.parent
+DEFAULT_ENV_PATH = PERFMEMORY_DIR / ".env"
+LOGS_DIR = SCRIPT_DIR / "logs"
+
+sys.path.insert(0, str(PERFMEMORY_DIR))
+
+from services import session_manager as sm  # noqa: E402
+from services.embeddings import EmbeddingCache, EmbeddingProvider, normalize_text, text_hash  # noqa: E402
+from utils.config import load_config  # noqa: E402
+
+DEFAULT_CONCURRENCY = 4
+
+
+def setup_logging() -> logging.Logger:
+    """Configure dual logging: stdout + timestamped log file."""
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file = LOGS_DIR / f"backfill_embeddings_{timestamp}.log"
+
+    logger = logging.getLogger("backfill_embeddings")
+    logger.setLevel(logging.DEBUG)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter("%(message)s"))
+
+    fh = logging.FileHandler(log_file, encoding="utf-8")
+    fh.setLevel(logging.DEBUG)
+    fh.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+
+    logger.addHandler(console)
+    logger.addHandler(fh)
+
+    logger.info(f"Log file: {log_file}")
+    return logger
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Re-embed PerfMemory debug attempts with the configured embedding model.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python backfill_embeddings.py                                  # Dry-run stale attempts
+  python backfill_embeddings.py --apply                          # Re-embed stale attempts
+  python backfill_embeddings.py --all --apply                    # Re-embed everything
+  python backfill_embeddings.py --session-id <UUID> --apply      # One session only
+  python backfill_embeddings.py --apply --concurrency 8 --batch-size 100
+        """,
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Write new embeddings (without this flag, runs in dry-run mode)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Re-embed every attempt, not only those embedded with another model",
+    )
+    parser.add_argument(
+        "--include-archived",
+        action="store_true",
+        help="Also re-embed archived attempts (is_active = false)",
+    )
+    parser.add_argument("--session-id", type=str, help="Only attempts of this session")
+    parser.add_argument("--limit", type=int, help="Maximum number of attempts to process")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Texts per embedding request (default: embedding_cache.batch_size from config.yaml)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Embedding requests in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+
+    parser.add_argument("--env-file", type=str, default=str(DEFAULT_ENV_PATH),
+                        help=f"Path to .env file (default: {DEFAULT_ENV_PATH})")
+    parser.add_argument("--host", type=str, help="PostgreSQL host (overrides .env)")
+    parser.add_argument("--port", type=int, help="PostgreSQL port (overrides .env)")
+    parser.add_argument("--db", type=str, help="PostgreSQL database name (overrides .env)")
+    parser.add_argument("--user", type=str, help="PostgreSQL user (overrides .env)")
+    parser.add_argument("--password", type=str, help="PostgreSQL password (overrides .env)")
+
+    return parser.parse_args()
+
+
+def load_db_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Load database configuration from .env file with CLI overrides."""
+    env_path = Path(args.env_file)
+    if not env_path.exists():
+        print(f"ERROR: .env file not found at: {env_path}")
+        print("Create one based on .env.example with your database credentials.")
+        sys.exit(1)
+
+    env_values = dotenv_values(env_path)
+    return {
+        "host": args.host or env_values.get("POSTGRES_HOST", "localhost"),
+        "port": int(args.port or env_values.get("POSTGRES_PORT", "5432")),
+        "dbname": args.db or env_values.get("POSTGRES_DB", "perfmemory"),
+        "user": args.user or env_values.get("POSTGRES_USER", "postgres"),
+        "password": args.password or env_values.get("POSTGRES_PASSWORD", ""),
+        "sslmode": env_values.get("POSTGRES_SSLMODE", "prefer"),
+        "sslrootcert": env_values.get("POSTGRES_SSLROOTCERT", ""),
+    }
+
+
+def get_connection(db_config: Dict[str, Any]):
+    """Create a database connection with pgvector types registered."""
+    kwargs = {
+        "host": db_config["host"],
+        "port": db_config["port"],
+        "dbname": db_config["dbname"],
+        "user": db_config["user"],
+        "password": db_config["password"],
+    }
+    sslmode = db_config.get("sslmode", "prefer")
+    if sslmode and sslmode != "disable":
+        kwargs["sslmode"] = sslmode
+        sslrootcert = db_config.get("sslrootcert", "")
+        if sslrootcert:
+            kwargs["sslrootcert"] = sslrootcert
+    conn = psycopg2.connect(**kwargs)
+    register_vector(conn)
+    return conn
+
+
+def get_candidate_attempts(
+    conn,
+    model_name: str,
+    reembed_all: bool,
+    include_archived: bool,
+    session_id: str = None,
+    limit: int = None,
+) -> List[Dict[str, Any]]:
+    """Select attempts to re-embed, oldest first."""
+    conditions = []
+    params: list = []
+    if not reembed_all:
+        conditions.append("(embedding IS NULL OR embedding_model IS DISTINCT FROM %s)")
+        params.append(model_name)
+    if not include_archived:
+        conditions.append("is_active = TRUE")
+    if session_id:
+        conditions.append("session_id = %s")
+        params.append(session_id)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    limit_clause = ""
+    if limit:
+        limit_clause = "LIMIT %s"
+        params.append(limit)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT id, symptom_text, embedding_model
+            FROM debug_attempts
+            {where}
+            ORDER BY created_at
+            {limit_clause}
+            """,
+            params,
+        )
+        return [
+            {"id": str(row[0]), "symptom_text": row[1] or "", "embedding_model": row[2] or ""}
+            for row in cur.fetchall()
+        ]
+
+
+def update_attempt_embeddings(conn, rows: List[tuple], model_name: str) -> int:
+    """Write (attempt_id, embedding) pairs in one transaction. Returns rows updated."""
+    updated = 0
+    try:
+        with conn.cursor() as cur:
+            for attempt_id, embedding in rows:
+                cur.execute(
+                    "UPDATE debug_attempts SET embedding = %s::vector, embedding_model = %s WHERE id = %s",
+                    (list(embedding), model_name, attempt_id),
+                )
+                updated += cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return updated
+
+
+async def run_backfill(
+    conn,
+    embedder: EmbeddingProvider,
+    attempts: List[Dict[str, Any]],
+    batch_size: int,
+    concurrency: int,
+    log: logging.Logger,
+) -> Dict[str, int]:
+    """Embed each distinct text once (bounded concurrency) and update its attempts."""
+    model_name = embedder.get_model_name()
+    by_hash: Dict[str, List[str]] = {}
+    texts: Dict[str, str] = {}
+    for attempt in attempts:
+        normalized = normalize_text(attempt["symptom_text"])
+        h = text_hash(normalized)
+        by_hash.setdefault(h, []).append(attempt["id"])
+        texts.setdefault(h, normalized)
+
+    hashes = list(by_hash)
+    batches = [hashes[i:i + batch_size] for i in range(0, len(hashes), batch_size)]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    totals = {"updated": 0, "failed": 0, "batches_done": 0}
+
+    async def _process(batch: List[str]) -> None:
+        async with semaphore:
+            try:
+                vectors = await embedder.embed_many([texts[h] for h in batch])
+            except Exception as e:
+                totals["failed"] += sum(len(by_hash[h]) for h in batch)
+                log.error(f"  Embedding batch failed ({len(batch)} text(s)): {e}")
+                return
+
+        rows = [(attempt_id, vector) for h, vector in zip(batch, vectors) for attempt_id in by_hash[h]]
+        try:
+            totals["updated"] += update_attempt_embeddings(conn, rows, model_name)
+        except Exception as e:
+            totals["failed"] += len(rows)
+            log.error(f"  Update failed for {len(rows)} attempt(s): {e}")
+            return
+        totals["batches_done"] += 1
+        log.info(f"  Batch {totals['batches_done']}/{len(batches)}: {len(rows)} attempt(s) updated")
+
+    await asyncio.gather(*(_process(batch) for batch in batches))
+    return totals
+
+
+def main():
+    args = parse_args()
+    log = setup_logging()
+
+    # Embedding credentials come from the same .env as the MCP server
+    if Path(args.env_file).exists():
+        load_dotenv(args.env_file)
+    config = load_config()
+    cache_cfg = config.get("embedding_cache", {})
+    batch_size = max(1, args.batch_size or cache_cfg.get("batch_size", 64))
+
+    db_config = load_db_config(args)
+
+    embedder = EmbeddingProvider(
+        config["embedding"],
+        cache=EmbeddingCache(
+            max_entries=0,
+            load=lambda model, hashes: sm.get_cached_embeddings(db_config, model, hashes),
+            save=lambda model, entries: sm.store_cached_embeddings(db_config, model, entries),
+        ),
+        batch_size=batch_size,
+    )
+    model_name = embedder.get_model_name()
+
+    mode = "APPLY MODE" if args.apply else "DRY RUN"
+    log.info("")
+    log.info(f"PerfMemory Embedding Backfill Tool - {mode}")
+    log.info(f"Started:     {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    log.info(f"Provider:    {embedder.provider}")
+    log.info(f"Model:       {model_name}")
+    log.info(f"Selection:   {'all attempts' if args.all else 'attempts not embedded with ' + model_name}")
+    log.info(f"Batch size:  {batch_size}")
+    log.info(f"Concurrency: {args.concurrency}")
+    log.info("")
+
+    try:
+        conn = get_connection(db_config)
+        log.info("Database connection: OK")
+    except Exception as e:
+        log.error(f"Database connection FAILED: {e}")
+        sys.exit(1)
+
+    attempts = get_candidate_attempts(
+        conn, model_name, args.all, args.include_archived, args.session_id, args.limit
+    )
+    distinct_texts = len({text_hash(normalize_text(a["symptom_text"])) for a in attempts})
+
+    log.info("")
+    log.info(f"Attempts selected:       {len(attempts)}")
+    log.info(f"Distinct symptom texts:  {distinct_texts}")
+    for model, count in Counter(a["embedding_model"] or "(none)" for a in attempts).most_common():
+        log.info(f"  currently {model}: {count}")
+    log.info("")
+
+    if not args.apply:
+        log.info("=" * 55)
+        log.info("DRY RUN COMPLETE - no changes were made.")
+        log.info("Run with --apply to re-embed the selected attempts.")
+        log.info("=" * 55)
+        conn.close()
+        return
+
+    if not attempts:
+        log.info("Nothing to re-embed.")
+        conn.close()
+        return
+
+    log.info("=" * 55)
+    log.info("RE-EMBEDDING ATTEMPTS...")
+    log.info("=" * 55)
+    log.info("")
+
+    started = time.perf_counter()
+    try:
+        totals = asyncio.run(_run(conn, embedder, attempts, batch_size, args.concurrency, log))
+    finally:
+        conn.close()
+        sm.close_pool()
+    elapsed = time.perf_counter() - started
+
+    cache_stats = embedder.cache.get_stats()
+    log.info("")
+    log.info("=" * 55)
+    log.info(f"BACKFILL COMPLETE in {elapsed:.1f}s")
+    log.info(f"  Updated: {totals['updated']}   Failed: {totals['failed']}")
+    log.info(f"  Cache hits: {cache_stats['persistent_hits']}   Provider calls for: {cache_stats['misses']} text(s)")
+    if not cache_stats["persistent"]:
+        log.info("  NOTE: embedding_cache table unavailable — results were not cached.")
+        log.info("  Run sql/migrations/004_add_embedding_cache.sql to enable it.")
+    log.info("=" * 55)
+
+    if totals["failed"]:
+        sys.exit(1)
+
+
+async def _run(conn, embedder, attempts, batch_size, concurrency, log) -> Dict[str, int]:
+    try:
+        return await run_backfill(conn, embedder, attempts, batch_size, concurrency, log)
+    finally:
+        await embedder.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -96,7 +96,8 @@ def load_config() -> dict:
     or system environment variables.
 
     Returns:
-        dict with keys: embedding, database, search, debug
+        dict with keys: embedding, embedding_cache, database, search, graph,
+        debug, taxonomy
     """
     mcp_root = _get_mcp_root()
     env_path = mcp_root / ".env"
@@ -112,6 +113,7 @@ def load_config() -> dict:
     graph_cfg = yaml_cfg.get("graph", {})
     general_cfg = yaml_cfg.get("general", {})
     taxonomy_cfg = yaml_cfg.get("taxonomy", {})
+    embedding_cache_cfg = yaml_cfg.get("embedding_cache", {})
 
     return {
         "embedding": {
@@ -125,6 +127,12 @@ def load_config() -> dict:
             "ollama_base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
             "ollama_model": os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text"),
         },
+        "embedding_cache": {
+            "enabled": embedding_cache_cfg.get("enabled", True),
+            "memory_entries": embedding_cache_cfg.get("memory_entries", 1024),
+            "persistent": embedding_cache_cfg.get("persistent", True),
+            "batch_size": embedding_cache_cfg.get("batch_size", 64),
+        },
         "database": {
             "host": os.getenv("POSTGRES_HOST", "localhost"),
             "port": int(os.getenv("POSTGRES_PORT", "5432")),
@@ -4,24 +4,34 @@ SharePoint REST API client.
 Interacts with SharePoint's native _api/ endpoints for:
 - Form Digest management (X-RequestDigest for write operations)
 - File upload (single file, up to max_upload_size_mb)
-- Folder upload (recursive, uploads all files in a local directory)
+- Folder upload (recursive, concurrent, resumable via a local manifest)
 - Folder operations (create, list, check existence)
 
 All methods return Result[T] for consistent error handling.
 Tokens are obtained from auth_manager.get_bearer_token().
+
+Requests share one pooled httpx.AsyncClient (keep-alive, and HTTP/2 when
+the optional ``h2`` package is installed) instead of opening a new
+connection per call.
 """
 
 import asyncio
+import importlib.util
+import json
 import logging
 import os
 import time
 import uuid
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
 import httpx
 
+# h2 enables HTTP/2 support in httpx
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 from . import auth_manager
 from .errors import (
     ErrorCode,
@@ -45,6 +55,17 @@ RETRY_MAX_DELAY = _sp_cfg.get("retry_max_delay_sec", 10)
 MAX_UPLOAD_SIZE_MB = _sp_cfg.get("max_upload_size_mb", 250)
 CHUNK_SIZE_MB = _sp_cfg.get("chunk_size_mb", 10)
 CHUNK_SIZE_BYTES = CHUNK_SIZE_MB * 1024 * 1024
+UPLOAD_CONCURRENCY = max(1, int(_sp_cfg.get("upload_concurrency", 4)))
+USE_HTTP2 = bool(_sp_cfg.get("http2", True)) and _HTTP2_AVAILABLE
+RESUME_FOLDER_UPLOADS = _sp_cfg.get("resume_folder_uploads", True)
+
+# Written to the root of the local folder during a folder upload; removed
+# once every file has been uploaded, never uploaded itself
+UPLOAD_MANIFEST_NAME = ".sharepoint-upload-manifest.json"
+
+# Shared HTTP client, recreated if the event loop changes
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
 
 # Form Digest cache (valid ~30 minutes, we refresh at 25 min)
 _digest_cache: dict[str, Any] = {}
@@ -55,6 +76,32 @@ _DIGEST_REFRESH_SEC = 25 * 60
 # HTTP helpers
 # ---------------------------------------------------------------------------
 
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared pooled HTTP client for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            http2=USE_HTTP2,
+            limits=httpx.Limits(
+                max_connections=max(10, UPLOAD_CONCURRENCY * 2),
+                max_keepalive_connections=max(5, UPLOAD_CONCURRENCY),
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (it is recreated on the next request)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
 async def _get_auth_headers() -> Result[dict[str, str]]:
     """Build authorization headers using dual-mode auth (Bearer or cookies)."""
     return await auth_manager.get_auth_headers()
@@ -86,14 +133,14 @@ async def _request(
 
     for attempt in range(RETRY_MAX):
         try:
-            async with httpx.AsyncClient(timeout=effective_timeout) as client:
-                response = await client.request(
-                    method,
-                    url,
-                    headers=req_headers,
-                    json=json_body,
-                    content=data,
-                )
+            response = await _get_client().request(
+                method,
+                url,
+                headers=req_headers,
+                json=json_body,
+                content=data,
+                timeout=effective_timeout,
+            )
 
             if response.status_code < 400:
                 return ok(response)
@@ -124,14 +171,14 @@ async def _request(
                     if extra_headers:
                         retry_headers.update(extra_headers)
                     try:
-                        async with httpx.AsyncClient(timeout=effective_timeout) as client:
-                            retry_resp = await client.request(
-                                method,
-                                url,
-                                headers=retry_headers,
-                                json=json_body,
-                                content=data,
-                            )
+                        retry_resp = await _get_client().request(
+                            method,
+                            url,
+                            headers=retry_headers,
+                            json=json_body,
+                            content=data,
+                            timeout=effective_timeout,
+                        )
                         if retry_resp.status_code < 400:
                             return ok(retry_resp)
                         logger.warning("Cookie fallback also returned %d", retry_resp.status_code)
@@ -256,7 +303,8 @@ async def upload_file(
         f"/Files/add(url='{quote(filename)}',overwrite=true)"
     )
 
-    file_content = local_path.read_bytes()
+    # Read off the event loop so concurrent folder uploads keep flowing
+    file_content = await asyncio.to_thread(local_path.read_bytes)
 
     result = await _request(
         "POST",
@@ -375,71 +423,82 @@ async def upload_file_chunked(
     chunk_number = 0
     total_chunks = (file_size + CHUNK_SIZE_BYTES - 1) // CHUNK_SIZE_BYTES
 
+    # SharePoint only accepts chunks in offset order, so they are sent one
+    # at a time; the next chunk is read from disk while the current one uploads
     try:
         with open(local_file_path, "rb") as f:
-            while True:
-                chunk_data = f.read(CHUNK_SIZE_BYTES)
-                if not chunk_data:
-                    break
-
-                chunk_number += 1
-                is_last = (file_offset + len(chunk_data)) >= file_size
-
-                if chunk_number == 1 and is_last:
-                    # Single chunk that exceeds threshold but fits in one read
-                    # (edge case near the boundary)
-                    chunk_url = (
-                        f"{site_url}/_api/web/getfilebyid('{unique_id}')"
-                        f"/finishupload(uploadId=guid'{upload_guid}',fileOffset={file_offset})"
-                    )
-                elif chunk_number == 1:
-                    chunk_url = (
-                        f"{site_url}/_api/web/getfilebyid('{unique_id}')"
-                        f"/startupload(uploadId=guid'{upload_guid}')"
-                    )
-                elif is_last:
-                    chunk_url = (
-                        f"{site_url}/_api/web/getfilebyid('{unique_id}')"
-                        f"/finishupload(uploadId=guid'{upload_guid}',fileOffset={file_offset})"
-                    )
-                else:
-                    chunk_url = (
-                        f"{site_url}/_api/web/getfilebyid('{unique_id}')"
-                        f"/continueupload(uploadId=guid'{upload_guid}',fileOffset={file_offset})"
+            next_read = asyncio.ensure_future(asyncio.to_thread(f.read, CHUNK_SIZE_BYTES))
+            try:
+                while next_read is not None:
+                    chunk_data = await next_read
+                    next_read = None
+                    if not chunk_data:
+                        break
+                    if file_offset + len(chunk_data) < file_size:
+                        next_read = asyncio.ensure_future(asyncio.to_thread(f.read, CHUNK_SIZE_BYTES))
+
+                    chunk_number += 1
+                    is_last = (file_offset + len(chunk_data)) >= file_size
+
+                    if chunk_number == 1 and is_last:
+                        # Single chunk that exceeds threshold but fits in one read
+                        # (edge case near the boundary)
+                        chunk_url = (
+                            f"{site_url}/_api/web/getfilebyid('{unique_id}')"
+                            f"/finishupload(uploadId=guid'{upload_guid}',fileOffset={file_offset})"
+                        )
+                    elif chunk_number == 1:
+                        chunk_url = (
+                            f"{site_url}/_api/web/getfilebyid('{unique_id}')"
+                            f"/startupload(uploadId=guid'{upload_guid}')"
+                        )
+                    elif is_last:
+                        chunk_url = (
+                            f"{site_url}/_api/web/getfilebyid('{unique_id}')"
+                            f"/finishupload(uploadId=guid'{upload_guid}',fileOffset={file_offset})"
+                        )
+                    else:
+                        chunk_url = (
+                            f"{site_url}/_api/web/getfilebyid('{unique_id}')"
+                            f"/continueupload(uploadId=guid'{upload_guid}',fileOffset={file_offset})"
+                        )
+
+                    chunk_result = await _request(
+                        "POST",
+                        chunk_url,
+                        data=chunk_data,
+                        extra_headers=write_headers,
+                        timeout=max(HTTP_TIMEOUT, 120),
                     )
 
-                chunk_result = await _request(
-                    "POST",
-                    chunk_url,
-                    data=chunk_data,
-                    extra_headers=write_headers,
-                    timeout=max(HTTP_TIMEOUT, 120),
-                )
-
-                if not chunk_result.ok:
-                    return err(create_error(
-                        ErrorCode.UPLOAD_ERROR,
-                        f"Chunk {chunk_number}/{total_chunks} failed: {chunk_result.error.message}",
-                    ))
-
-                # Update offset from response for accuracy
-                try:
-                    resp_body = chunk_result.value.json()
-                    d = resp_body.get("d", {})
-                    if "StartUpload" in d:
-                        file_offset = int(d["StartUpload"])
-                    elif "ContinueUpload" in d:
-                        file_offset = int(d["ContinueUpload"])
-                    else:
+                    if not chunk_result.ok:
+                        return err(create_error(
+                            ErrorCode.UPLOAD_ERROR,
+                            f"Chunk {chunk_number}/{total_chunks} failed: {chunk_result.error.message}",
+                        ))
+
+                    # Update offset from response for accuracy
+                    try:
+                        resp_body = chunk_result.value.json()
+                        d = resp_body.get("d", {})
+                        if "StartUpload" in d:
+                            file_offset = int(d["StartUpload"])
+                        elif "ContinueUpload" in d:
+                            file_offset = int(d["ContinueUpload"])
+                        else:
+                            file_offset += len(chunk_data)
+                    except Exception:
                         file_offset += len(chunk_data)
-                except Exception:
-                    file_offset += len(chunk_data)
 
-                logger.info(
-                    "Chunk %d/%d uploaded (%.1f%%)",
-                    chunk_number, total_chunks,
-                    min(file_offset / file_size * 100, 100),
-                )
+                    logger.info(
+                        "Chunk %d/%d uploaded (%.1f%%)",
+                        chunk_number, total_chunks,
+                        min(file_offset / file_size * 100, 100),
+                    )
+            finally:
+                # Never close the file under a pending read
+                if next_read is not None:
+                    await asyncio.gather(next_read, return_exceptions=True)
 
     except Exception as exc:
         return err(create_error(
@@ -461,20 +520,85 @@ async def upload_file_chunked(
 # Folder upload (recursive)
 # ---------------------------------------------------------------------------
 
+def _load_upload_manifest(manifest_path: Path, site_url: str, destination_folder: str) -> dict[str, Any]:
+    """Load the resume manifest if it belongs to the same destination, else start fresh."""
+    fresh = {"siteUrl": site_url, "destinationFolder": destination_folder, "files": {}}
+    if not manifest_path.is_file():
+        return fresh
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable upload manifest %s: %s", manifest_path, exc)
+        return fresh
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("siteUrl") != site_url
+        or manifest.get("destinationFolder") != destination_folder
+        or not isinstance(manifest.get("files"), dict)
+    ):
+        return fresh
+    return manifest
+
+
+def _save_upload_manifest(manifest_path: Path, manifest: dict[str, Any]) -> bool:
+    """Atomically write the resume manifest. Returns False if it cannot be written."""
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, manifest_path)
+        return True
+    except OSError as exc:
+        logger.warning("Could not write upload manifest %s: %s", manifest_path, exc)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def _folders_by_depth(destination_folder: str, folders: set[str]) -> list[list[str]]:
+    """Group the folders (plus their ancestors below the destination) by depth."""
+    root = destination_folder.rstrip("/")
+    needed = {root}
+    for folder in folders:
+        while folder.startswith(root) and folder not in needed:
+            needed.add(folder)
+            folder = folder.rsplit("/", 1)[0]
+    levels: dict[int, list[str]] = {}
+    for folder in needed:
+        levels.setdefault(folder.count("/"), []).append(folder)
+    return [sorted(levels[depth]) for depth in sorted(levels)]
+
+
 async def upload_folder(
     site_url: str,
     destination_folder: str,
     local_folder_path: str,
+    concurrency: int | None = None,
+    resume: bool | None = None,
+    progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
 ) -> Result[dict[str, Any]]:
     """Upload an entire local folder (recursive) to a SharePoint document library.
 
     Creates the destination folder structure in SharePoint and uploads
-    all files, preserving the directory hierarchy.
+    all files, preserving the directory hierarchy. Up to ``concurrency``
+    files are uploaded at once over the shared HTTP client.
+
+    With resume enabled, finished files are recorded (with size and mtime) in
+    a manifest at the root of the local folder. If the upload is
+    interrupted or some files fail, running it again with the same
+    destination skips files that were already uploaded and have not
+    changed since. The manifest is removed once every file has been
+    uploaded. With resume disabled the manifest is neither read nor written.
 
     Args:
         site_url: Full SharePoint site URL
         destination_folder: Server-relative destination folder path
         local_folder_path: Absolute path to the local folder to upload
+        concurrency: Files uploaded in parallel (default: upload_concurrency from config)
+        resume: Use the manifest to skip finished files (default: resume_folder_uploads from config)
+        progress: Optional async callback invoked after each file with
+            {file, status, filesDone, filesTotal, error?}
 
     Returns:
         Result with upload summary (file count, total size, errors).
@@ -486,10 +610,13 @@ async def upload_folder(
             f"Local folder not found: {local_folder_path}",
         ))
 
+    concurrency = max(1, concurrency or UPLOAD_CONCURRENCY)
+    resume = RESUME_FOLDER_UPLOADS if resume is None else resume
+
     # Collect all files to upload
     files_to_upload: list[tuple[Path, str]] = []
     for file_path in local_root.rglob("*"):
-        if not file_path.is_file():
+        if not file_path.is_file() or file_path.name == UPLOAD_MANIFEST_NAME:
             continue
         relative = file_path.relative_to(local_root)
         sp_folder = destination_folder.rstrip("/")
@@ -506,39 +633,99 @@ async def upload_folder(
             "errors": [],
         })
 
-    # Collect unique folders to create
-    unique_folders = sorted(set(sp_folder for _, sp_folder in files_to_upload))
+    # Skip files a previous, unfinished run already uploaded unchanged
+    manifest_path = local_root / UPLOAD_MANIFEST_NAME
+    if resume:
+        manifest = _load_upload_manifest(manifest_path, site_url, destination_folder)
+    else:
+        manifest = {"files": {}}
+
+    pending: list[tuple[Path, str, str, os.stat_result]] = []
+    skipped_count = 0
+    for file_path, sp_folder in files_to_upload:
+        relative = file_path.relative_to(local_root).as_posix()
+        stat = file_path.stat()
+        entry = manifest["files"].get(relative)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtimeNs") == stat.st_mtime_ns:
+            skipped_count += 1
+            continue
+        pending.append((file_path, sp_folder, relative, stat))
+
+    if skipped_count:
+        logger.info("Resuming folder upload: %d file(s) already uploaded", skipped_count)
 
-    # Create all necessary folders
-    for folder_path in unique_folders:
-        folder_result = await create_folder(site_url, folder_path)
-        if not folder_result.ok:
-            logger.warning("Failed to create folder %s: %s", folder_path, folder_result.error.message)
+    # Create the necessary folders, parents before children
+    pending_folders = {sp_folder for _, sp_folder, _, _ in pending}
+    for level in _folders_by_depth(destination_folder, pending_folders) if pending else []:
+        folder_results = await asyncio.gather(*(create_folder(site_url, folder) for folder in level))
+        for folder_path, folder_result in zip(level, folder_results):
+            if not folder_result.ok:
+                logger.warning("Failed to create folder %s: %s", folder_path, folder_result.error.message)
 
-    # Upload files sequentially
+    # Upload files concurrently
     uploaded_count = 0
     total_size = 0
+    done_count = 0
     errors: list[dict[str, str]] = []
-
-    for file_path, sp_folder in files_to_upload:
-        result = await upload_file(site_url, sp_folder, str(file_path))
+    track_manifest = resume
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _upload_one(file_path: Path, sp_folder: str, relative: str, stat: os.stat_result) -> None:
+        nonlocal uploaded_count, total_size, done_count, track_manifest
+        async with semaphore:
+            result = await upload_file(site_url, sp_folder, str(file_path))
+
+        done_count += 1
+        event: dict[str, Any] = {
+            "file": relative,
+            "filesDone": done_count + skipped_count,
+            "filesTotal": len(files_to_upload),
+        }
         if result.ok:
             uploaded_count += 1
-            total_size += file_path.stat().st_size
+            total_size += stat.st_size
+            event["status"] = "uploaded"
             logger.info("Uploaded: %s -> %s", file_path.name, sp_folder)
+            if track_manifest:
+                manifest["files"][relative] = {
+                    "size": stat.st_size,
+                    "mtimeNs": stat.st_mtime_ns,
+                    "serverRelativeUrl": result.value.get("serverRelativeUrl", ""),
+                }
+                track_manifest = _save_upload_manifest(manifest_path, manifest)
         else:
             errors.append({
                 "file": str(file_path),
                 "error": result.error.message,
             })
+            event["status"] = "failed"
+            event["error"] = result.error.message
             logger.error("Failed to upload %s: %s", file_path.name, result.error.message)
 
+        if progress is not None:
+            try:
+                await progress(event)
+            except Exception as exc:
+                logger.debug("Progress callback failed: %s", exc)
+
+    await asyncio.gather(*(_upload_one(*item) for item in pending))
+
+    # A complete upload needs no resume point
+    if resume and not errors and manifest_path.exists():
+        try:
+            manifest_path.unlink()
+        except OSError as exc:
+            logger.warning("Could not remove upload manifest %s: %s", manifest_path, exc)
+
+    errors.sort(key=lambda e: e["file"])
     return ok({
         "status": "completed",
         "filesUploaded": uploaded_count,
+        "filesSkipped": skipped_count,
         "filesTotal": len(files_to_upload),
         "totalSizeBytes": total_size,
         "destinationFolder": destination_folder,
+        "concurrency": concurrency,
         "errors": errors,
     })
 
@@ -837,8 +1024,9 @@ async def download_file(
         dest_path = Path(local_destination)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        async with httpx.AsyncClient(timeout=max(HTTP_TIMEOUT, 120)) as client:
-            response = await client.get(url, headers=auth_result.value)
+        response = await _get_client().get(
+            url, headers=auth_result.value, timeout=max(HTTP_TIMEOUT, 120),
+        )
 
         if response.status_code >= 400:
             error_code = classify_http_error(response.status_code)
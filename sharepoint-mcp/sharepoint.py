@@ -17,7 +17,8 @@ Tools:
 import json
 import logging
 import sys
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
+from fastmcp.server.lifespan import lifespan
 from utils.config import load_config
 from services import (
     auth_manager,
@@ -37,7 +38,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sharepoint-mcp")
 
-mcp = FastMCP(server_cfg.get("name", "sharepoint-mcp"))
+
+@lifespan
+async def _http_client_lifespan(server):
+    """Close the pooled HTTP client on shutdown, inside the server's event loop."""
+    try:
+        yield {}
+    finally:
+        await sharepoint_api.close_client()
+
+
+mcp = FastMCP(server_cfg.get("name", "sharepoint-mcp"), lifespan=_http_client_lifespan)
 
 
 @mcp.tool()
@@ -160,13 +171,21 @@ async def sharepoint_upload_folder(
     site_url: str,
     destination_folder: str,
     local_folder_path: str,
+    ctx: Context,
+    max_concurrency: int = 0,
+    resume: bool | None = None,
 ) -> str:
     """
     Upload an entire local folder (recursive) to a SharePoint document library.
 
     All files in the local folder and its subfolders are uploaded,
     preserving the directory structure. Both site_url and
-    destination_folder are required.
+    destination_folder are required. Files are uploaded in parallel and
+    progress is reported per file.
+
+    When resume is enabled and a previous upload of the same folder to the
+    same destination was interrupted or had failures, files it already
+    uploaded (and that have not changed since) are skipped.
 
     Args:
         site_url: Full SharePoint site URL.
@@ -175,6 +194,11 @@ async def sharepoint_upload_folder(
                            Example: "/sites/PerfTesting/Shared Documents/Results/run-01"
         local_folder_path: Absolute path to the local folder to upload.
                           Example: "C:/artifacts/run-01"
+        ctx: FastMCP context (injected) used for progress reporting.
+        max_concurrency: Files uploaded in parallel (0 = upload_concurrency from config).
+        resume: Skip files already uploaded by an unfinished previous run
+                (None = resume_folder_uploads from config). When False, no
+                upload manifest is read or written.
 
     Returns:
         JSON with upload summary (files uploaded, total size, errors).
@@ -207,19 +231,34 @@ async def sharepoint_upload_folder(
             "message": "local_folder_path is required. Provide the full path to the local folder.",
         }, indent=2)
 
+    async def _report_progress(event: dict) -> None:
+        await ctx.report_progress(
+            event["filesDone"],
+            event["filesTotal"],
+            f"{event['status']}: {event['file']}",
+        )
+
     result = await sharepoint_api.upload_folder(
         site_url=site_url.strip(),
         destination_folder=destination_folder.strip(),
         local_folder_path=local_folder_path.strip(),
+        concurrency=max_concurrency or None,
+        resume=resume,
+        progress=_report_progress,
     )
 
     if result.ok:
         value = result.value
+        if value.get("status") == "empty":
+            return json.dumps(value, indent=2)
+
         msg = (
             f"Uploaded {value['filesUploaded']}/{value['filesTotal']} files "
             f"({value['totalSizeBytes'] / (1024*1024):.1f} MB) "
             f"to {value['destinationFolder']}"
         )
+        if value.get("filesSkipped"):
+            msg += f" ({value['filesSkipped']} already uploaded by a previous run)"
         if value.get("errors"):
             msg += f" ({len(value['errors'])} errors)"
 